@@ -19,35 +19,40 @@ import uuid # Importar uuid
 
 from langchain.agents import AgentExecutor
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.schema import SystemMessage, HumanMessage, AIMessage
-from langchain.tools import BaseTool, Tool, StructuredTool
+from langchain.tools import BaseTool
 from langchain.callbacks.base import BaseCallbackHandler
-from langchain.callbacks.manager import CallbackManagerForLLMRun
-from langchain_ollama import ChatOllama
-from langchain.agents import AgentType, initialize_agent
+from langchain_ollama import ChatOllama, OllamaEmbeddings
 from langchain.agents import create_tool_calling_agent
-from duckduckgo_search import DDGS
-from langchain_community.tools import DuckDuckGoSearchRun
-from langchain_openai import ChatOpenAI
-from pydantic import BaseModel, Field
-from langchain.memory import ConversationBufferMemory
-from langchain_openai.embeddings import OpenAIEmbeddings
 
 from .config import CONFIG, validar_configuracoes, obter_perfil
 from .exceptions import AgenteError
 from .ferramentas import get_available_tools
-from .logs import setup_logging
+from .ferramentas.busca import configurar_busca
+from .ferramentas.cache import configurar_cache
+from .ferramentas.coleta_web import configurar_coleta_web
+from .ferramentas.consulta_dados import configurar_consulta
+from .ferramentas.graficos import configurar_graficos
+from .ferramentas.documentos_lote import configurar_documentos_lote
+from .ferramentas.leitura import configurar_leitura, iterar_blocos
+from .ferramentas.processos import configurar_processos
+from .ferramentas.verificacao_lote import configurar_verificacao
+from .logs import setup_logging, resumir
+from .saude import monitor_saude
+from .metricas import (
+    FERRAMENTA_DURACAO, FERRAMENTA_ERROS, FERRAMENTAS_EM_ANDAMENTO,
+    MedicaoLLM, contar_tokens_resposta, identificar_modelo, registrar_busca_rag
+)
+from .rastreamento import Span, cabecalhos_trace, configurar_rastreamento, span, span_gerador
 from .gerenciador_modelos import GerenciadorModelos
+from .carregamento import ImportacaoTardia
 
-# Importar componentes para RAG
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_ollama import OllamaEmbeddings
-from langchain_chroma import Chroma
-
-# Importar loaders e splitters para documentos
-from langchain_community.document_loaders import TextLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+# Dependências pesadas importadas apenas no primeiro uso (OpenRouter, RAG e memória)
+ChatOpenAI = ImportacaoTardia("langchain_openai", "ChatOpenAI")
+OpenAIEmbeddings = ImportacaoTardia("langchain_openai.embeddings", "OpenAIEmbeddings")
+ConversationBufferMemory = ImportacaoTardia("langchain.memory", "ConversationBufferMemory")
+Chroma = ImportacaoTardia("langchain_chroma", "Chroma")
+Document = ImportacaoTardia("langchain_core.documents", "Document")
+RecursiveCharacterTextSplitter = ImportacaoTardia("langchain.text_splitter", "RecursiveCharacterTextSplitter")
 
 # Configuração de logging
 logger = setup_logging(__name__)
@@ -66,6 +71,8 @@ class AgenteCallbackHandler(BaseCallbackHandler):
         self.current_chain = None
         self.on_progress_update = on_progress_update
         self.tool_log_file = None
+        self._inicio_ferramentas: Dict[Any, float] = {}
+        self._spans_ferramentas: Dict[Any, Span] = {}
         self._initialize_tool_log()
         
     def _initialize_tool_log(self):
@@ -104,13 +111,15 @@ class AgenteCallbackHandler(BaseCallbackHandler):
     def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
         """Chamado quando o LLM inicia."""
         model_name = serialized.get("name", "LLM")
-        logger.debug(f"{model_name} iniciado com prompts: {prompts}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{model_name} iniciado com prompts: {resumir(prompts)}")
         if self.on_progress_update:
             self.on_progress_update(60, f"Processando com {model_name}...")
         
     def on_llm_end(self, response: Any, **kwargs: Any) -> None:
         """Chamado quando o LLM termina."""
-        logger.debug(f"LLM finalizado com resposta: {response}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"LLM finalizado com resposta: {resumir(response)}")
         
     def on_llm_error(self, error: Exception, **kwargs: Any) -> None:
         """Chamado quando ocorre erro no LLM."""
@@ -123,11 +132,13 @@ class AgenteCallbackHandler(BaseCallbackHandler):
         else:
             self.current_chain = "unknown_serialized_was_none"
             logger.warning("'serialized' parameter was None in on_chain_start")
-        logger.debug(f"Chain {self.current_chain} iniciada com inputs: {inputs}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Chain {self.current_chain} iniciada com inputs: {resumir(inputs)}")
         
     def on_chain_end(self, outputs: Dict[str, Any], **kwargs: Any) -> None:
         """Chamado quando uma chain termina."""
-        logger.debug(f"Chain {self.current_chain} finalizada com outputs: {outputs}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Chain {self.current_chain} finalizada com outputs: {resumir(outputs)}")
         self.current_chain = None
         
     def on_chain_error(self, error: Exception, **kwargs: Any) -> None:
@@ -138,7 +149,11 @@ class AgenteCallbackHandler(BaseCallbackHandler):
         """Chamado quando uma ferramenta inicia."""
         tool_name = serialized.get('name', 'unknown')
         self.current_tool_name = tool_name # Armazenar o nome da ferramenta atual
-        logger.debug(f"Ferramenta {tool_name} iniciada com input: {input_str}")
+        self._inicio_ferramentas[kwargs.get('run_id', tool_name)] = time.perf_counter()
+        self._spans_ferramentas[kwargs.get('run_id', tool_name)] = Span(f"ferramenta.{tool_name}", categoria="ferramenta")
+        FERRAMENTAS_EM_ANDAMENTO.inc()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Ferramenta {tool_name} iniciada com input: {resumir(input_str)}")
         if self.on_progress_update:
             self.on_progress_update(30, f"Iniciando ferramenta: {tool_name}...")
         self._log_tool_event("tool_start", {"tool_name": tool_name, "input": input_str})
@@ -146,7 +161,10 @@ class AgenteCallbackHandler(BaseCallbackHandler):
     def on_tool_end(self, output: str, **kwargs: Any) -> None:
         """Chamado quando uma ferramenta termina."""
         tool_name = getattr(self, 'current_tool_name', 'unknown') # Recuperar o nome da ferramenta
-        logger.debug(f"Ferramenta {tool_name} finalizada com output: {output}")
+        self._registrar_duracao_ferramenta(tool_name, kwargs.get('run_id', tool_name))
+        self._finalizar_span_ferramenta(kwargs.get('run_id', tool_name))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Ferramenta {tool_name} finalizada com output: {resumir(output)}")
         # TODO: Registrar o sucesso da ferramenta 'tool_name' com output 'output'
         if self.on_progress_update:
             self.on_progress_update(50, f"Ferramenta {tool_name} concluída. Continuando processamento...")
@@ -155,12 +173,29 @@ class AgenteCallbackHandler(BaseCallbackHandler):
     def on_tool_error(self, error: Exception, **kwargs: Any) -> None:
         """Chamado quando ocorre erro em uma ferramenta."""
         tool_name = getattr(self, 'current_tool_name', 'unknown') # Recuperar o nome da ferramenta
+        self._registrar_duracao_ferramenta(tool_name, kwargs.get('run_id', tool_name))
+        FERRAMENTA_ERROS.labels(tool_name).inc()
+        self._finalizar_span_ferramenta(kwargs.get('run_id', tool_name), erro=error)
         logger.error(f"Erro na ferramenta {tool_name}: {error}")
         # TODO: Registrar o erro da ferramenta 'tool_name' com erro 'error'
         if self.on_progress_update:
             self.on_progress_update(50, f"Ferramenta {tool_name} falhou.")
         self._log_tool_event("tool_error", {"tool_name": tool_name, "error": str(error)})
 
+    def _registrar_duracao_ferramenta(self, tool_name: str, chave: Any) -> None:
+        """Registra nas métricas a duração de uma execução de ferramenta."""
+        inicio = self._inicio_ferramentas.pop(chave, None)
+        if inicio is None:
+            return
+        FERRAMENTAS_EM_ANDAMENTO.dec()
+        FERRAMENTA_DURACAO.labels(tool_name).observe(time.perf_counter() - inicio)
+
+    def _finalizar_span_ferramenta(self, chave: Any, erro: Optional[BaseException] = None) -> None:
+        """Grava o span de trace de uma execução de ferramenta."""
+        span_ferramenta = self._spans_ferramentas.pop(chave, None)
+        if span_ferramenta is not None:
+            span_ferramenta.finalizar(erro=erro)
+
 class AgenteIA:
     """Classe principal do Agente IA."""
     
@@ -264,6 +299,26 @@ class AgenteIA:
             # Configuração inicial
             self.config = config or CONFIG
             self.logger = setup_logging(__name__)
+            if "rastreamento" in self.config:
+                configurar_rastreamento(self.config["rastreamento"])
+            if "cache_ferramentas" in self.config:
+                configurar_cache(self.config["cache_ferramentas"])
+            if "leitura" in self.config:
+                configurar_leitura(self.config["leitura"])
+            if "busca" in self.config:
+                configurar_busca(self.config["busca"])
+            if "processos" in self.config:
+                configurar_processos(self.config["processos"])
+            if "coleta_web" in self.config:
+                configurar_coleta_web(self.config["coleta_web"])
+            if "verificacao_urls" in self.config:
+                configurar_verificacao(self.config["verificacao_urls"])
+            if "consulta_dados" in self.config:
+                configurar_consulta(self.config["consulta_dados"])
+            if "graficos" in self.config:
+                configurar_graficos(self.config["graficos"])
+            if "documentos_lote" in self.config:
+                configurar_documentos_lote(self.config["documentos_lote"])
             self.mcp_client = mcp_client
             self.usar_openrouter = usar_openrouter
             self.verboso = verboso if verboso is not None else self.config.get("agent", {}).get("verbose", False)
@@ -318,9 +373,22 @@ class AgenteIA:
             # Carregar e analisar logs de uso de ferramentas para auto-aperfeiçoamento
             self.tool_performance_metrics = self._load_and_analyze_tool_logs()
             
-            # Verificar status inicial dos provedores
-            self.ollama_status = self._verificar_modelos_disponiveis()
-            self.openrouter_status = self._check_openrouter_status()
+            # Verificar status dos provedores em segundo plano (não bloqueia a inicialização)
+            config_saude = self.config.get("saude", {})
+            self.monitor_saude = monitor_saude
+            self.monitor_saude.registrar(
+                "ollama_modelos",
+                self._verificar_modelos_disponiveis,
+                intervalo=config_saude.get("intervalo"),
+                timeout=config_saude.get("timeout")
+            )
+            self.monitor_saude.registrar(
+                "openrouter",
+                self._check_openrouter_status,
+                intervalo=config_saude.get("intervalo"),
+                timeout=config_saude.get("timeout")
+            )
+            self.monitor_saude.iniciar()
             
         except Exception as e:
             self.logger.error(f"Erro ao inicializar AgenteIA: {e}")
@@ -554,13 +622,13 @@ class AgenteIA:
         return status
 
     def _load_documents(self, paths: List[str]) -> List[Any]:
-        """Carrega documentos dos caminhos especificados."""
+        """Carrega documentos dos caminhos especificados, em blocos (sem ler cada arquivo inteiro de uma vez)."""
         documents = []
         for path in paths:
             try:
                 if os.path.exists(path):
-                    loader = TextLoader(path)
-                    documents.extend(loader.load())
+                    for indice, bloco in enumerate(iterar_blocos(path)):
+                        documents.append(Document(page_content=bloco, metadata={"source": path, "bloco": indice}))
                 else:
                     logger.warning(f"Documento não encontrado: {path}")
             except Exception as e:
@@ -604,6 +672,11 @@ class AgenteIA:
 
     async def processar_mensagem(self, mensagem: str, usar_coder: bool = None, perfil: str = None) -> str:
         """Processa uma mensagem usando o modelo e ferramentas configuradas."""
+        with span("agente.processar_mensagem", usar_coder=usar_coder, perfil=perfil):
+            return await self._processar_mensagem(mensagem, usar_coder, perfil)
+
+    async def _processar_mensagem(self, mensagem: str, usar_coder: bool = None, perfil: str = None) -> str:
+        """Implementação de processar_mensagem (medida como um span)."""
         try:
             # Verificar se a mensagem é válida
             if not mensagem or not isinstance(mensagem, str):
@@ -613,19 +686,24 @@ class AgenteIA:
             # Verificar se RAG está habilitado e recuperar documentos relevantes
             documentos_relevantes = []
             if CONFIG["rag"]["enabled"] and self.vector_store:
+                inicio_rag = time.perf_counter()
                 try:
-                    documentos_relevantes = self.vector_store.similarity_search(
-                        mensagem,
-                        k=CONFIG["rag"]["k_retrieval"]
-                    )
+                    with span("rag.similarity_search", k=CONFIG["rag"]["k_retrieval"]):
+                        documentos_relevantes = self.vector_store.similarity_search(
+                            mensagem,
+                            k=CONFIG["rag"]["k_retrieval"]
+                        )
+                    registrar_busca_rag(time.perf_counter() - inicio_rag, len(documentos_relevantes))
                     self.logger.info(f"Recuperados {len(documentos_relevantes)} documentos relevantes")
                 except Exception as e:
+                    registrar_busca_rag(time.perf_counter() - inicio_rag, None, erro=True)
                     self.logger.error(f"Erro ao recuperar documentos relevantes: {e}")
 
             # Verificar ferramentas com alta taxa de falha
             ferramentas_disponiveis = self.ferramentas_executor.copy()
             if CONFIG["auto_improve"]["enabled"]:
-                tool_stats = self._load_and_analyze_tool_logs()
+                with span("agente.analisar_logs_ferramentas"):
+                    tool_stats = self._load_and_analyze_tool_logs()
                 for tool_name, stats in tool_stats.items():
                     if (stats["total_calls"] >= CONFIG["auto_improve"]["min_tool_calls"] and
                         stats["failure_rate"] > CONFIG["auto_improve"]["tool_failure_threshold"]):
@@ -634,7 +712,8 @@ class AgenteIA:
                             ferramentas_disponiveis.pop(tool_name)
 
             # Configurar o modelo e perfil
-            modelo, modelo_coder = self._carregar_modelos()
+            with span("agente.carregar_modelos"):
+                modelo, modelo_coder = self._carregar_modelos()
             modelo_atual = modelo_coder if usar_coder else modelo
             
             # Configurar o perfil
@@ -647,7 +726,12 @@ class AgenteIA:
                 prompt = f"Contexto relevante:\n{context}\n\nPergunta: {mensagem}"
 
             # Processar a mensagem
-            response = await modelo_atual.ainvoke(prompt)
+            provedor, nome_modelo = identificar_modelo(modelo_atual)
+            with span("llm.ainvoke", categoria="llm", provedor=provedor, modelo=nome_modelo) as span_llm, \
+                    MedicaoLLM(provedor, nome_modelo) as medicao:
+                response = await modelo_atual.ainvoke(prompt)
+                medicao.definir_tokens(contar_tokens_resposta(response))
+                span_llm.atributos.update(tokens=medicao.tokens, ttft_s=medicao.ttft)
             
             # Criar mensagens com IDs únicos
             user_message = {
@@ -670,8 +754,9 @@ class AgenteIA:
             
             # Indexar feedback se configurado
             if CONFIG["auto_improve"]["index_feedback"]:
-                self._add_message_to_vector_store(user_message)
-                self._add_message_to_vector_store(assistant_message)
+                with span("rag.indexar_mensagens"):
+                    self._add_message_to_vector_store(user_message)
+                    self._add_message_to_vector_store(assistant_message)
 
             return response
 
@@ -691,6 +776,13 @@ class AgenteIA:
         Yields:
             Tokens da resposta do agente.
         """
+        yield from span_gerador(
+            "agente.processar_mensagem_stream", self._processar_mensagem_stream(mensagem, usar_coder, perfil),
+            usar_coder=usar_coder, perfil=perfil
+        )
+
+    def _processar_mensagem_stream(self, mensagem: str, usar_coder: bool = None, perfil: str = None) -> Generator[str, None, None]:
+        """Implementação de processar_mensagem_stream (medida como um span)."""
         self.logger.info(f"Iniciando processar_mensagem_stream para: '{mensagem[:50]}...'")
 
         # 1. Determinar Target LLM
@@ -715,12 +807,15 @@ class AgenteIA:
         # 2. Preparar Prompt com RAG (if enabled)
         final_prompt = mensagem
         if self.config["rag"]["enabled"] and self.vector_store:
+            inicio_rag = time.perf_counter()
             try:
                 self.logger.debug("RAG ativado. Buscando documentos relevantes...")
-                documentos_relevantes = self.vector_store.similarity_search(
-                    mensagem,
-                    k=self.config["rag"]["k_retrieval"]
-                )
+                with span("rag.similarity_search", k=self.config["rag"]["k_retrieval"]):
+                    documentos_relevantes = self.vector_store.similarity_search(
+                        mensagem,
+                        k=self.config["rag"]["k_retrieval"]
+                    )
+                registrar_busca_rag(time.perf_counter() - inicio_rag, len(documentos_relevantes))
                 if documentos_relevantes:
                     context = "\n".join([doc.page_content for doc in documentos_relevantes])
                     final_prompt = f"Contexto relevante:\n{context}\n\nPergunta: {mensagem}"
@@ -728,6 +823,7 @@ class AgenteIA:
                 else:
                     self.logger.info("RAG: Nenhum documento relevante encontrado.")
             except Exception as e:
+                registrar_busca_rag(time.perf_counter() - inicio_rag, None, erro=True)
                 self.logger.error(f"Erro ao recuperar documentos relevantes do RAG: {e}")
                 # Continuar sem RAG em caso de erro, mas logar.
 
@@ -735,21 +831,27 @@ class AgenteIA:
         full_response_content = []
         try:
             self.logger.debug(f"Iniciando streaming do LLM com o prompt: {final_prompt[:100]}...")
-            for chunk in selected_llm.stream(final_prompt):
-                # A estrutura do chunk pode variar. Para Langchain LLMs, é geralmente um objeto AIMessageChunk.
-                content_part = ""
-                if hasattr(chunk, 'content'): # Comum para AIMessageChunk
-                    content_part = chunk.content
-                elif isinstance(chunk, str): # Alguns LLMs podem retornar strings diretamente
-                    content_part = chunk
-                else:
-                    # Tentar converter para string como fallback, mas logar aviso
-                    self.logger.warning(f"Chunk de tipo inesperado recebido: {type(chunk)}. Tentando converter para str.")
-                    content_part = str(chunk)
-
-                if content_part:
-                    yield content_part
-                    full_response_content.append(content_part)
+            provedor, nome_modelo = identificar_modelo(selected_llm)
+            with span("llm.stream", categoria="llm", provedor=provedor, modelo=nome_modelo) as span_llm, \
+                    MedicaoLLM(provedor, nome_modelo) as medicao:
+                for chunk in selected_llm.stream(final_prompt):
+                    # A estrutura do chunk pode variar. Para Langchain LLMs, é geralmente um objeto AIMessageChunk.
+                    content_part = ""
+                    if hasattr(chunk, 'content'): # Comum para AIMessageChunk
+                        content_part = chunk.content
+                    elif isinstance(chunk, str): # Alguns LLMs podem retornar strings diretamente
+                        content_part = chunk
+                    else:
+                        # Tentar converter para string como fallback, mas logar aviso
+                        self.logger.warning(f"Chunk de tipo inesperado recebido: {type(chunk)}. Tentando converter para str.")
+                        content_part = str(chunk)
+
+                    if content_part:
+                        # Cada chunk do stream corresponde a (aproximadamente) um token
+                        medicao.token()
+                        yield content_part
+                        full_response_content.append(content_part)
+                span_llm.atributos.update(tokens=medicao.tokens, ttft_s=medicao.ttft)
             self.logger.info("Streaming do LLM concluído.")
 
         except Exception as e:
@@ -786,8 +888,9 @@ class AgenteIA:
 
         if CONFIG["auto_improve"]["index_feedback"]:
             try:
-                self._add_message_to_vector_store(user_message)
-                self._add_message_to_vector_store(assistant_message)
+                with span("rag.indexar_mensagens"):
+                    self._add_message_to_vector_store(user_message)
+                    self._add_message_to_vector_store(assistant_message)
                 self.logger.info("Mensagens adicionadas ao vector store para auto-aperfeiçoamento.")
             except Exception as e:
                 self.logger.error(f"Erro ao adicionar mensagens ao vector store: {e}")
@@ -907,18 +1010,20 @@ class AgenteIA:
             # O MCP Server entenderá que esta tarefa é para executar uma ferramenta com o nome fornecido
             # Precisamos formatar a tarefa de forma que o servidor MCP consiga interpretar
             # Uma opção é enviar um dicionário com o nome da ferramenta e os parâmetros
-            tarefa_execucao = {
-                "tipo": "executar_ferramenta",
-                "nome_ferramenta": nome,
-                "parametros": kwargs
-            }
-            
-            # Distribuir a tarefa de execução da ferramenta para o MCP Server
-            # O MCP Server irá encontrar a ferramenta registrada e executá-la
-            resultado = self.mcp_client.distribuir_tarefa(
-                tarefa=json.dumps(tarefa_execucao), # Enviar o dicionário como uma string JSON
-                agente_id="Agente Principal" # Opcional: especificar o agente que deve executar, ou deixar o servidor decidir
-            )
+            with span(f"ferramenta.{nome}", categoria="ferramenta", via="mcp"):
+                tarefa_execucao = {
+                    "tipo": "executar_ferramenta",
+                    "nome_ferramenta": nome,
+                    "parametros": kwargs,
+                    "trace": cabecalhos_trace() # Propaga o trace para o MCP Server e para os workers da fila
+                }
+                
+                # Distribuir a tarefa de execução da ferramenta para o MCP Server
+                # O MCP Server irá encontrar a ferramenta registrada e executá-la
+                resultado = self.mcp_client.distribuir_tarefa(
+                    tarefa=json.dumps(tarefa_execucao), # Enviar o dicionário como uma string JSON
+                    agente_id="Agente Principal" # Opcional: especificar o agente que deve executar, ou deixar o servidor decidir
+                )
             
             self.logger.info(f"Resultado da execução da ferramenta '{nome}' via MCP Server: {resultado}")
             return resultado.get("resultado", "Resultado vazio da ferramenta") # O resultado virá dentro do dicionário de resposta da tarefa
@@ -1094,15 +1199,37 @@ class AgenteIA:
          else:
              self.logger.warning("Vector Store ou Embeddings não inicializados. Não foi possível adicionar mensagem.")
 
+    @property
+    def ollama_status(self) -> List[str]:
+        """Modelos disponíveis no Ollama segundo a última verificação em segundo plano."""
+        return self.monitor_saude.obter("ollama_modelos")["valor"] or []
+
+    @property
+    def openrouter_status(self) -> Dict[str, Any]:
+        """Status do OpenRouter segundo a última verificação em segundo plano."""
+        return self.monitor_saude.obter("openrouter")["valor"] or {
+            "online": False,
+            "message": "Verificação pendente.",
+            "model_count": 0
+        }
+
     def obter_status_agente(self) -> Dict[str, Any]:
-        """Retorna o status atual do agente e seus provedores."""
+        """Retorna o status atual do agente e seus provedores (lido do cache do monitor de saúde)."""
+        saude_ollama = self.monitor_saude.obter("ollama_modelos")
+        saude_openrouter = self.monitor_saude.obter("openrouter")
         return {
             "ollama": {
                 "online": bool(self.ollama_status), # True se houver modelos disponíveis
                 "modelos_disponiveis": self.ollama_status,
-                "loaded_model": self.llm_executor.model if self.llm_executor else "Não Carregado"
+                "loaded_model": self.llm_executor.model if self.llm_executor else "Não Carregado",
+                "verificado_em": saude_ollama["timestamp"],
+                "obsoleto": saude_ollama["obsoleto"]
+            },
+            "openrouter": {
+                **self.openrouter_status,
+                "verificado_em": saude_openrouter["timestamp"],
+                "obsoleto": saude_openrouter["obsoleto"]
             },
-            "openrouter": self.openrouter_status,
             "provedor_ativo": "openrouter" if self.usar_openrouter else "ollama",
             "loaded_coder_model": self.llm_coder.model if self.llm_coder else "Não Carregado", # Adicionar o modelo coder carregado
             # TODO: Adicionar outras métricas do agente se necessário (uso de memória interna, etc.)
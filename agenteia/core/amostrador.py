@@ -0,0 +1,277 @@
+"""
+Amostragem periódica de métricas do sistema.
+
+Uma thread coleta CPU, memória, disco, rede e os processos mais pesados em
+intervalo fixo e guarda as séries em buffers circulares de tamanho fixo
+(``array('d')``). As ferramentas de monitoramento e as rotas de métricas leem
+o último snapshot ou agregados de janela sem bloquear.
+"""
+
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+from .logs import setup_logging
+from .tabela_processos import obter_tabela
+
+logger = setup_logging(__name__)
+
+# Séries numéricas mantidas no histórico
+SERIES = (
+    "cpu_percent",
+    "memoria_percent",
+    "memoria_disponivel",
+    "disco_percent",
+    "disco_livre",
+    "rede_envio_bps",
+    "rede_recepcao_bps",
+)
+
+
+class BufferCircular:
+    """Buffer circular de floats com capacidade fixa, armazenado em ``array('d')``."""
+
+    def __init__(self, capacidade: int):
+        if capacidade <= 0:
+            raise ValueError("A capacidade do buffer deve ser positiva")
+        self.capacidade = capacidade
+        self._dados = array('d', [0.0]) * capacidade
+        self._inicio = 0
+        self._tamanho = 0
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def adicionar(self, valor: float) -> None:
+        """Adiciona um valor, descartando o mais antigo se o buffer estiver cheio."""
+        fim = (self._inicio + self._tamanho) % self.capacidade
+        self._dados[fim] = valor
+        if self._tamanho < self.capacidade:
+            self._tamanho += 1
+        else:
+            self._inicio = (self._inicio + 1) % self.capacidade
+
+    def valores(self, ultimos: Optional[int] = None) -> List[float]:
+        """Retorna os valores em ordem cronológica (opcionalmente só os ``ultimos`` N)."""
+        quantidade = self._tamanho if ultimos is None else max(0, min(ultimos, self._tamanho))
+        primeiro = (self._inicio + self._tamanho - quantidade) % self.capacidade
+        fim = primeiro + quantidade
+        if fim <= self.capacidade:
+            return self._dados[primeiro:fim].tolist()
+        return self._dados[primeiro:].tolist() + self._dados[:fim - self.capacidade].tolist()
+
+    def ultimo(self) -> Optional[float]:
+        """Retorna o valor mais recente ou None se o buffer estiver vazio."""
+        if not self._tamanho:
+            return None
+        return self._dados[(self._inicio + self._tamanho - 1) % self.capacidade]
+
+
+def coletar_psutil(top_n: int = 5) -> Dict[str, Any]:
+    """
+    Coleta uma amostra do sistema via psutil, sem chamadas bloqueantes.
+
+    Args:
+        top_n: Quantidade de processos (por uso de CPU) a incluir
+
+    Returns:
+        Dicionário com contadores brutos e a lista de processos mais pesados
+    """
+    import psutil
+
+    memoria = psutil.virtual_memory()
+    disco = psutil.disk_usage('/')
+    rede = psutil.net_io_counters()
+
+    # A tabela reaproveita os objetos Process entre amostras, então
+    # cpu_percent compara com a amostra anterior em vez de dormir
+    processos = [
+        {
+            "pid": p["pid"],
+            "name": p["nome"],
+            "cpu_percent": p["cpu_percent"] or 0.0,
+            "memory_percent": p["memoria_percent"],
+        }
+        for p in obter_tabela().consultar(ordenar_por="cpu_percent", limite=top_n)
+    ]
+
+    return {
+        "cpu_percent": psutil.cpu_percent(interval=None),
+        "cpu_nucleos": psutil.cpu_count(),
+        "memoria_percent": memoria.percent,
+        "memoria_total": memoria.total,
+        "memoria_disponivel": memoria.available,
+        "disco_percent": disco.percent,
+        "disco_total": disco.total,
+        "disco_livre": disco.free,
+        "rede_bytes_enviados": rede.bytes_sent if rede else 0,
+        "rede_bytes_recebidos": rede.bytes_recv if rede else 0,
+        "processos": processos,
+    }
+
+
+class AmostradorSistema:
+    """Coleta métricas do sistema em segundo plano e mantém séries de tamanho fixo."""
+
+    def __init__(
+        self,
+        intervalo: float = 5.0,
+        capacidade: int = 720,
+        top_n: int = 5,
+        coletor: Optional[Callable[[int], Dict[str, Any]]] = None
+    ):
+        """
+        Inicializa o amostrador.
+
+        Args:
+            intervalo: Intervalo entre amostras, em segundos
+            capacidade: Número máximo de amostras mantidas por série
+            top_n: Quantidade de processos mais pesados mantidos na última amostra
+            coletor: Função que recebe top_n e retorna a amostra bruta (padrão: psutil)
+        """
+        self.intervalo = intervalo
+        self.capacidade = capacidade
+        self.top_n = top_n
+        self.coletor = coletor or coletar_psutil
+        self._timestamps = BufferCircular(capacidade)
+        self._series = {nome: BufferCircular(capacidade) for nome in SERIES}
+        self._ultima: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def amostrar(self) -> Dict[str, Any]:
+        """Coleta uma amostra imediatamente e a adiciona às séries."""
+        agora = time.time()
+        amostra = dict(self.coletor(self.top_n))
+        amostra["timestamp"] = agora
+
+        with self._lock:
+            anterior = self._ultima
+            if anterior is not None and agora > anterior["timestamp"]:
+                decorrido = agora - anterior["timestamp"]
+                amostra["rede_envio_bps"] = max(0.0, (amostra["rede_bytes_enviados"] - anterior["rede_bytes_enviados"]) / decorrido)
+                amostra["rede_recepcao_bps"] = max(0.0, (amostra["rede_bytes_recebidos"] - anterior["rede_bytes_recebidos"]) / decorrido)
+            else:
+                amostra["rede_envio_bps"] = 0.0
+                amostra["rede_recepcao_bps"] = 0.0
+
+            self._timestamps.adicionar(agora)
+            for nome, buffer in self._series.items():
+                buffer.adicionar(float(amostra.get(nome) or 0.0))
+            self._ultima = amostra
+        return amostra
+
+    def iniciar(self) -> None:
+        """Inicia a thread de amostragem (idempotente)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._loop, name="amostrador-sistema", daemon=True)
+            self._thread.start()
+        logger.info(f"Amostrador do sistema iniciado (intervalo: {self.intervalo}s, capacidade: {self.capacidade})")
+
+    def parar(self) -> None:
+        """Interrompe a thread de amostragem."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        """Loop da thread de amostragem."""
+        while not self._parar.is_set():
+            try:
+                self.amostrar()
+            except Exception as e:
+                logger.error(f"Erro ao coletar amostra do sistema: {e}")
+            self._parar.wait(self.intervalo)
+
+    def ultimo(self) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a amostra mais recente.
+
+        Se nenhuma amostra foi coletada ainda, coleta uma na hora.
+        """
+        with self._lock:
+            ultima = self._ultima
+        if ultima is None:
+            ultima = self.amostrar()
+        return {**ultima, "idade_segundos": time.time() - ultima["timestamp"]}
+
+    def _indice_janela(self, segundos: Optional[float]) -> int:
+        """Número de amostras (as mais recentes) dentro da janela."""
+        timestamps = self._timestamps.valores()
+        if segundos is None:
+            return len(timestamps)
+        limite = time.time() - segundos
+        return sum(1 for t in timestamps if t >= limite)
+
+    def serie(self, segundos: Optional[float] = None) -> Dict[str, List[float]]:
+        """
+        Retorna as séries temporais, opcionalmente limitadas a uma janela.
+
+        Args:
+            segundos: Tamanho da janela (todo o histórico se omitido)
+
+        Returns:
+            Dicionário com a lista "timestamp" e uma lista por métrica
+        """
+        with self._lock:
+            quantidade = self._indice_janela(segundos)
+            resultado = {"timestamp": self._timestamps.valores(quantidade)}
+            for nome, buffer in self._series.items():
+                resultado[nome] = buffer.valores(quantidade)
+        return resultado
+
+    def janela(self, segundos: float) -> Dict[str, Any]:
+        """
+        Agrega as métricas de uma janela de tempo.
+
+        Args:
+            segundos: Tamanho da janela
+
+        Returns:
+            Dicionário com mínimo, máximo, média e último valor por métrica
+        """
+        serie = self.serie(segundos)
+        timestamps = serie.pop("timestamp")
+        agregado: Dict[str, Any] = {
+            "amostras": len(timestamps),
+            "inicio": timestamps[0] if timestamps else None,
+            "fim": timestamps[-1] if timestamps else None,
+        }
+        for nome, valores in serie.items():
+            if not valores:
+                agregado[nome] = None
+                continue
+            agregado[nome] = {
+                "min": min(valores),
+                "max": max(valores),
+                "media": sum(valores) / len(valores),
+                "ultimo": valores[-1],
+            }
+        return agregado
+
+
+_amostrador: Optional[AmostradorSistema] = None
+_amostrador_lock = threading.Lock()
+
+
+def obter_amostrador(iniciar: bool = True, **kwargs: Any) -> AmostradorSistema:
+    """
+    Retorna o amostrador global, criando-o no primeiro uso.
+
+    Args:
+        iniciar: Inicia a thread de amostragem (idempotente); use False para iniciá-la depois
+        **kwargs: Parâmetros de AmostradorSistema (usados apenas na criação)
+    """
+    global _amostrador
+    with _amostrador_lock:
+        if _amostrador is None:
+            _amostrador = AmostradorSistema(**kwargs)
+        if iniciar:
+            _amostrador.iniciar()
+        return _amostrador
@@ -0,0 +1,88 @@
+"""
+Importação tardia de dependências pesadas.
+
+LangChain, Chroma, pandas, python-docx, BeautifulSoup e afins custam centenas
+de milissegundos para importar. Com os utilitários deste módulo, o nome
+continua disponível no módulo que o usa (inclusive para ``unittest.mock.patch``),
+mas a importação real só acontece no primeiro uso.
+"""
+
+import importlib
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ImportacaoTardia:
+    """Referência a um módulo (ou a um atributo de módulo) importado no primeiro uso.
+
+    Uso::
+
+        pd = ImportacaoTardia("pandas")
+        Chroma = ImportacaoTardia("langchain_chroma", "Chroma")
+
+        df = pd.DataFrame(dados)          # importa pandas aqui
+        store = Chroma.from_documents(...) # importa langchain_chroma aqui
+    """
+
+    __slots__ = ("_modulo", "_atributo", "_alvo", "_lock")
+
+    def __init__(self, modulo: str, atributo: Optional[str] = None):
+        self._modulo = modulo
+        self._atributo = atributo
+        self._alvo = None
+        self._lock = threading.Lock()
+
+    def _resolver(self) -> Any:
+        if self._alvo is None:
+            with self._lock:
+                if self._alvo is None:
+                    alvo = importlib.import_module(self._modulo)
+                    if self._atributo is not None:
+                        alvo = getattr(alvo, self._atributo)
+                    self._alvo = alvo
+        return self._alvo
+
+    def __getattr__(self, nome: str) -> Any:
+        return getattr(self._resolver(), nome)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._resolver()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        nome = f"{self._modulo}.{self._atributo}" if self._atributo else self._modulo
+        estado = "carregado" if self._alvo is not None else "não carregado"
+        return f"<ImportacaoTardia {nome} ({estado})>"
+
+
+def exportacoes_tardias(pacote: str, mapa: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Cria o ``__getattr__`` (PEP 562) de um pacote que reexporta nomes de submódulos.
+
+    O submódulo só é importado quando um dos seus nomes é acessado; o valor é
+    então gravado no pacote, de modo que os acessos seguintes são diretos.
+
+    Args:
+        pacote: ``__name__`` do pacote
+        mapa: Nome exportado -> submódulo relativo (ex.: ``{"ler_arquivo": ".arquivos"}``)
+
+    Returns:
+        Função a ser atribuída a ``__getattr__`` no pacote
+    """
+    def __getattr__(nome: str) -> Any:
+        if nome not in mapa:
+            raise AttributeError(f"module {pacote!r} has no attribute {nome!r}")
+        modulo = importlib.import_module(mapa[nome], pacote)
+        valor = getattr(modulo, nome)
+        setattr(sys.modules[pacote], nome, valor)
+        return valor
+
+    return __getattr__
+
+
+def nomes_exportados(pacote: str, mapa: Dict[str, str]) -> Callable[[], List[str]]:
+    """Cria o ``__dir__`` de um pacote com exportações tardias."""
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[pacote])) | set(mapa))
+
+    return __dir__
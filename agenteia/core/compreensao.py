@@ -44,7 +44,7 @@ INTENCOES = {
     "criar": {
         "palavras_chave": ["crie", "faça", "gere", "produza", "elabore", "desenvolva", "construa", "monte", "prepare"],
         "contextos": ["arquivo", "documento", "código", "estrutura", "projeto"],
-        "ferramentas": ["criar_arquivo_codigo", "criar_estrutura_pastas", "criar_word", "criar_excel", "criar_ppt"],
+        "ferramentas": ["criar_arquivo_codigo", "criar_estrutura", "criar_word", "criar_excel", "criar_ppt"],
         "exemplos": [
             "Crie um arquivo Python para calcular médias",
             "Faça um documento Word com o resumo do projeto",
@@ -3,13 +3,14 @@ Configurações do Agente IA no estilo ChatGPT
 """
 
 import os
-import logging
 import json
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
+from .logs import configurar_logging, resumir, setup_logging
+
+logger = setup_logging(__name__)
 
 @dataclass
 class ModeloConfig:
@@ -229,8 +230,8 @@ def carregar_configuracao() -> Dict[str, Any]:
         
         with open(config_path, "r", encoding="utf-8") as f:
             config = json.load(f)
-            logger.info(f"Configurações carregadas: {config.keys()}")
-            logger.info(f"Conteúdo completo da configuração carregada: {config}")
+            logger.info(f"Configurações carregadas: {list(config.keys())}")
+            logger.debug(f"Conteúdo da configuração carregada: {resumir(config, 1000)}")
             return config
             
     except Exception as e:
@@ -239,6 +240,7 @@ def carregar_configuracao() -> Dict[str, Any]:
 
 # Carregar configurações
 CONFIG = carregar_configuracao()
+configurar_logging(CONFIG.get("logging"))
 
 def validar_configuracoes(config: Dict[str, Any]) -> bool:
     """Valida as configurações carregadas."""
@@ -253,7 +255,7 @@ def validar_configuracoes(config: Dict[str, Any]) -> bool:
         # Validar configurações do OpenRouter
         if "openrouter" in config:
             openrouter_config = config["openrouter"]
-            logger.info(f"Validando configuração do OpenRouter: {openrouter_config}")
+            logger.info(f"Validando configuração do OpenRouter (campos: {list(openrouter_config.keys())})")
             campos_obrigatorios = ["api_key", "modelo_geral", "modelo_coder", "base_url", "headers"]
             for campo in campos_obrigatorios:
                 if campo not in openrouter_config:
@@ -30,6 +30,10 @@ class FileError(ToolError):
     """Erro na manipulação de arquivos."""
     pass
 
+class ConflictError(FileError):
+    """Conflito ao aplicar uma edição (trecho não encontrado ou arquivo alterado)."""
+    pass
+
 class WebError(ToolError):
     """Erro em operações web."""
     pass
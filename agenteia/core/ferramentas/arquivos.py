@@ -4,17 +4,18 @@ Ferramentas para manipulação de arquivos
 
 import os
 import json
-import shutil
-import logging
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from agenteia.config import CONFIG
 from ..exceptions import FileError, SecurityError, ValidationError
 from ...core.logs import setup_logging
-from langchain.tools import BaseTool
+from .busca import invalidar_caminhos
+from .leitura import buscar_no_arquivo, interpretar_token, ler_fim, ler_intervalo, ler_linhas
+from .listagem import TIPO_DIRETORIO, formatar_tamanho, listar_pagina
+from .operacoes_lote import copiar_arvore, mover_arvore, remover_arvore
 
 # Configuração de logging
-logger = logging.getLogger(__name__)
+logger = setup_logging(__name__)
 
 def _normalizar_caminho(caminho: str, is_dir: bool = False) -> str:
     """
@@ -47,7 +48,7 @@ def criar_diretorio_projetos() -> Path:
     except Exception as e:
         raise FileError(f"Erro ao criar diretório de projetos: {e}")
 
-def listar_unidades() -> str:
+def listar_unidades(mcp_client: Optional[Any] = None) -> str:
     """
     Lista as unidades (drives) disponíveis no sistema.
 
@@ -91,7 +92,17 @@ def listar_unidades() -> str:
         logger.error(f"Erro ao listar unidades: {str(e)}")
         raise FileError(f"Erro ao listar unidades: {str(e)}")
 
-def listar_arquivos(diretorio: str, extensao: Optional[str] = None, mcp_client: Optional[Any] = None) -> str:
+def listar_arquivos(
+    diretorio: str,
+    extensao: Optional[str] = None,
+    mcp_client: Optional[Any] = None,
+    recursivo: bool = False,
+    profundidade_maxima: Optional[int] = None,
+    padrao: Optional[str] = None,
+    ordenar_por: str = "tipo",
+    limite: int = 200,
+    cursor: Optional[str] = None
+) -> str:
     """
     Lista arquivos em um diretório.
     
@@ -99,6 +110,12 @@ def listar_arquivos(diretorio: str, extensao: Optional[str] = None, mcp_client:
         diretorio: Caminho do diretório
         extensao: Extensão para filtrar (opcional)
         mcp_client: Instância do MCPClient para delegar a tarefa
+        recursivo: Lista também os subdiretórios
+        profundidade_maxima: Profundidade máxima da recursão
+        padrao: Glob para filtrar (ex.: "*.py" ou "src/**/test_*")
+        ordenar_por: "tipo" (pastas primeiro), "nome", "tamanho" ou "modificado"
+        limite: Máximo de itens retornados
+        cursor: Cursor informado na listagem anterior, para obter a próxima página
         
     Returns:
         Lista formatada de arquivos
@@ -110,7 +127,11 @@ def listar_arquivos(diretorio: str, extensao: Optional[str] = None, mcp_client:
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "listar_arquivos",
-                "parametros": {"diretorio": diretorio, "extensao": extensao}
+                "parametros": {
+                    "diretorio": diretorio, "extensao": extensao, "recursivo": recursivo,
+                    "profundidade_maxima": profundidade_maxima, "padrao": padrao,
+                    "ordenar_por": ordenar_por, "limite": limite, "cursor": cursor
+                }
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -123,71 +144,77 @@ def listar_arquivos(diretorio: str, extensao: Optional[str] = None, mcp_client:
         # Normaliza o caminho para Windows
         diretorio = _normalizar_caminho(diretorio, is_dir=True)
         
-        # Verifica diretório
-        if not os.path.isdir(diretorio):
-            raise FileError(f"Diretório não encontrado: {diretorio}")
+        pagina = listar_pagina(
+            diretorio,
+            ordenar_por=ordenar_por,
+            limite=limite,
+            cursor=cursor,
+            recursivo=recursivo,
+            profundidade_maxima=profundidade_maxima,
+            padrao=padrao,
+            extensao=extensao
+        )
         
-        # Lista arquivos
         arquivos = []
-        total_arquivos = 0
-        total_diretorios = 0
-        tamanho_total = 0
-        
-        for item in os.listdir(diretorio):
-            caminho = os.path.join(diretorio, item)
-            
-            # Filtra por extensão
-            if extensao and not item.endswith(extensao):
-                continue
-                
-            # Adiciona informações
-            if os.path.isfile(caminho):
-                tamanho = os.path.getsize(caminho)
-                tamanho_total += tamanho
-                total_arquivos += 1
-                # Formata o tamanho de forma legível
-                if tamanho < 1024:
-                    tamanho_str = f"{tamanho} bytes"
-                elif tamanho < 1024 * 1024:
-                    tamanho_str = f"{tamanho/1024:.1f} KB"
-                else:
-                    tamanho_str = f"{tamanho/(1024*1024):.1f} MB"
-                arquivos.append(f"📄 {item} ({tamanho_str})")
-            elif os.path.isdir(caminho):
-                total_diretorios += 1
-                arquivos.append(f"📁 {item}/")
+        for entrada in pagina.entradas:
+            if entrada.tipo == TIPO_DIRETORIO:
+                arquivos.append(f"📁 {entrada.caminho}/")
+            else:
+                arquivos.append(f"📄 {entrada.caminho} ({formatar_tamanho(entrada.tamanho)})")
         
         # Prepara o cabeçalho com informações do diretório
         cabecalho = f"Conteúdo do diretório: {diretorio}\n"
-        cabecalho += f"Total: {total_arquivos} arquivo(s) e {total_diretorios} pasta(s)\n"
-        if total_arquivos > 0:
-            if tamanho_total < 1024 * 1024:
-                tamanho_total_str = f"{tamanho_total/1024:.1f} KB"
-            else:
-                tamanho_total_str = f"{tamanho_total/(1024*1024):.1f} MB"
-            cabecalho += f"Tamanho total: {tamanho_total_str}\n"
+        cabecalho += f"Total: {pagina.total_arquivos} arquivo(s) e {pagina.total_diretorios} pasta(s)\n"
+        if pagina.total_arquivos > 0:
+            cabecalho += f"Tamanho total: {formatar_tamanho(pagina.tamanho_total)}\n"
         cabecalho += "-" * 50 + "\n"
         
         # Retorna lista formatada
-        if arquivos:
-            return cabecalho + "\n".join(sorted(arquivos))
-        else:
+        if not arquivos:
             return f"{cabecalho}Nenhum arquivo encontrado."
+        rodape = ""
+        if pagina.proximo_cursor:
+            rodape = f"\n... exibindo {len(arquivos)} itens. Para continuar, use cursor='{pagina.proximo_cursor}'"
+        return cabecalho + "\n".join(arquivos) + rodape
             
     except Exception as e:
         logger.error(f"Erro ao listar arquivos: {str(e)}")
         raise FileError(f"Erro ao listar arquivos: {str(e)}")
 
-def ler_arquivo(caminho: str, encoding: str = "utf-8") -> str:
+def ler_arquivo(
+    caminho: str,
+    encoding: str = "utf-8",
+    mcp_client: Optional[Any] = None,
+    modo: str = "completo",
+    inicio: Optional[int] = None,
+    fim: Optional[int] = None,
+    linhas: int = 50,
+    padrao: Optional[str] = None,
+    token: Optional[str] = None,
+    max_bytes: Optional[int] = None
+) -> str:
     """
     Lê o conteúdo de um arquivo de texto.
+
+    A saída é limitada ao orçamento "leitura.orcamento_bytes"; se o arquivo
+    não couber, o texto termina com um token para continuar a leitura.
     
     Args:
         caminho: Caminho do arquivo
         encoding: Codificação do arquivo (padrão: utf-8)
+        mcp_client: Instância do MCPClient para delegar a tarefa
+        modo: "completo", "inicio" (primeiras linhas), "fim" (últimas linhas),
+            "linhas" (inicio/fim são números de linha), "bytes" (inicio/fim são offsets)
+            ou "buscar" (linhas que contêm ``padrao``)
+        inicio: Linha ou byte inicial, conforme o modo
+        fim: Linha ou byte final, conforme o modo
+        linhas: Quantidade de linhas nos modos "inicio" e "fim"
+        padrao: Texto procurado no modo "buscar"
+        token: Token de continuação retornado pela leitura anterior
+        max_bytes: Orçamento da resposta (padrão: configuração)
         
     Returns:
-        Conteúdo do arquivo
+        Conteúdo do arquivo (ou do trecho pedido)
     """
     try:
         # Refatoração para usar MCP Client se disponível
@@ -196,7 +223,10 @@ def ler_arquivo(caminho: str, encoding: str = "utf-8") -> str:
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "ler_arquivo",
-                "parametros": {"caminho": caminho, "encoding": encoding}
+                "parametros": {
+                    "caminho": caminho, "encoding": encoding, "modo": modo, "inicio": inicio, "fim": fim,
+                    "linhas": linhas, "padrao": padrao, "token": token, "max_bytes": max_bytes
+                }
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -210,18 +240,45 @@ def ler_arquivo(caminho: str, encoding: str = "utf-8") -> str:
         # Verifica arquivo
         if not os.path.isfile(caminho):
             raise FileError(f"Arquivo não encontrado: {caminho}")
-        
-        # Lê arquivo
-        with open(caminho, 'r', encoding=encoding) as f:
-            conteudo = f.read()
-        
-        return conteudo
+
+        if token:
+            posicao = interpretar_token(token)
+            if os.path.abspath(posicao["caminho"]) != os.path.abspath(caminho):
+                raise ValidationError("O token de continuação pertence a outro arquivo.")
+            if posicao["fim_linha"] is not None:
+                trecho = ler_linhas(
+                    caminho, posicao["linha"], posicao["fim_linha"], max_bytes, encoding,
+                    offset=posicao["offset"], linha_offset=posicao["linha"]
+                )
+            else:
+                trecho = ler_intervalo(caminho, posicao["offset"], posicao["fim"], max_bytes, encoding)
+        elif modo == "completo":
+            trecho = ler_intervalo(caminho, 0, None, max_bytes, encoding)
+        elif modo == "bytes":
+            trecho = ler_intervalo(caminho, inicio or 0, fim, max_bytes, encoding)
+        elif modo == "linhas":
+            trecho = ler_linhas(caminho, inicio or 1, fim, max_bytes, encoding)
+        elif modo == "inicio":
+            trecho = ler_linhas(caminho, 1, linhas, max_bytes, encoding)
+        elif modo == "fim":
+            trecho = ler_fim(caminho, linhas, max_bytes, encoding)
+        elif modo == "buscar":
+            if not padrao:
+                raise ValidationError("Informe o padrão para o modo 'buscar'.")
+            ocorrencias = buscar_no_arquivo(caminho, padrao, encoding=encoding)
+            if not ocorrencias:
+                return f"Nenhuma ocorrência de '{padrao}' em {caminho}"
+            return "\n".join(f"{o['linha']}: {o['texto']}" for o in ocorrencias)
+        else:
+            raise ValidationError(f"Modo de leitura inválido: {modo}")
+
+        return trecho.formatar()
         
     except Exception as e:
         logger.error(f"Erro ao ler arquivo: {str(e)}")
         raise FileError(f"Erro ao ler arquivo: {str(e)}")
 
-def escrever_arquivo(caminho: str, conteudo: str) -> str:
+def escrever_arquivo(caminho: str, conteudo: str, mcp_client: Optional[Any] = None) -> str:
     """
     Escreve conteúdo em um arquivo.
     Cria o arquivo se não existir, sobrescreve se existir.
@@ -229,6 +286,7 @@ def escrever_arquivo(caminho: str, conteudo: str) -> str:
     Args:
         caminho: Caminho do arquivo
         conteudo: Conteúdo para escrever
+        mcp_client: Instância do MCPClient para delegar a tarefa
         
     Returns:
         Confirmação de sucesso ou erro
@@ -268,6 +326,7 @@ def escrever_arquivo(caminho: str, conteudo: str) -> str:
         # Escrever arquivo
         with open(final_caminho, 'w', encoding='utf-8') as f:
             f.write(conteudo)
+        invalidar_caminhos([final_caminho])
         
         return f"Arquivo criado com sucesso: {final_caminho}"
         
@@ -288,11 +347,9 @@ def ler_json(caminho: str, encoding: str = "utf-8") -> Dict[str, Any]:
         Dados do JSON
     """
     try:
-        # Lê arquivo
-        conteudo = ler_arquivo(caminho, encoding)
-        
-        # Converte JSON
-        return json.loads(conteudo)
+        # Lê e converte o arquivo inteiro (ler_arquivo limita o tamanho da saída)
+        with open(_normalizar_caminho(caminho, is_dir=False), 'r', encoding=encoding) as f:
+            return json.load(f)
         
     except json.JSONDecodeError as e:
         logger.error(f"Erro ao decodificar JSON: {str(e)}")
@@ -325,12 +382,13 @@ def escrever_json(caminho: str, dados: Dict[str, Any], encoding: str = "utf-8",
         logger.error(f"Erro ao escrever JSON: {str(e)}")
         raise FileError(f"Erro ao escrever JSON: {str(e)}")
 
-def criar_diretorio(caminho: str) -> str:
+def criar_diretorio(caminho: str, mcp_client: Optional[Any] = None) -> str:
     """
     Cria um novo diretório.
     
     Args:
         caminho: Caminho do diretório a ser criado
+        mcp_client: Instância do MCPClient para delegar a tarefa
         
     Returns:
         Confirmação de sucesso ou erro
@@ -379,12 +437,13 @@ def criar_diretorio(caminho: str) -> str:
         logger.error(f"Erro ao criar diretório {caminho}: {e}")
         raise FileError(f"Falha ao criar diretório: {e}")
 
-def remover_arquivo(caminho: str) -> str:
+def remover_arquivo(caminho: str, mcp_client: Optional[Any] = None) -> str:
     """
     Remove (deleta) um arquivo.
     
     Args:
         caminho: Caminho do arquivo a ser removido
+        mcp_client: Instância do MCPClient para delegar a tarefa
         
     Returns:
         Confirmação de sucesso ou erro
@@ -430,6 +489,7 @@ def remover_arquivo(caminho: str) -> str:
         
         # Remove arquivo
         os.remove(caminho)
+        invalidar_caminhos([caminho])
         
         return f"Arquivo removido com sucesso: {caminho}"
         
@@ -437,12 +497,20 @@ def remover_arquivo(caminho: str) -> str:
         logger.error(f"Erro ao remover arquivo {caminho}: {e}")
         raise FileError(f"Falha ao remover arquivo: {e}")
 
-def remover_diretorio(caminho: str) -> str:
+def remover_diretorio(
+    caminho: str,
+    mcp_client: Optional[Any] = None,
+    padrao: Optional[str] = None,
+    simular: bool = False
+) -> str:
     """
     Remove (deleta) um diretório e todo o seu conteúdo recursivamente.
     
     Args:
         caminho: Caminho do diretório a ser removido
+        mcp_client: Instância do MCPClient para delegar a tarefa
+        padrao: Glob para remover só os arquivos selecionados (ex.: "*.log")
+        simular: Apenas informa o que seria removido
         
     Returns:
         Confirmação de sucesso ou erro
@@ -454,7 +522,7 @@ def remover_diretorio(caminho: str) -> str:
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "remover_diretorio",
-                "parametros": {"caminho": caminho}
+                "parametros": {"caminho": caminho, "padrao": padrao, "simular": simular}
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -481,22 +549,32 @@ def remover_diretorio(caminho: str) -> str:
         if not os.path.isdir(caminho):
             raise FileError(f"Diretório não encontrado: {caminho}")
         
-        # Remove diretório e todo o seu conteúdo recursivamente
-        shutil.rmtree(caminho)
-        
-        return f"Diretório removido com sucesso: {caminho}"
+        # Remove os arquivos em paralelo e depois os diretórios vazios
+        resultado, plano = remover_arvore(caminho, padrao=padrao, simular=simular)
+        return resultado.formatar(plano)
         
     except Exception as e:
         logger.error(f"Erro ao remover diretório {caminho}: {e}")
         raise FileError(f"Falha ao remover diretório: {e}")
 
-def copiar_arquivo(origem: str, destino: str) -> str:
+def copiar_arquivo(
+    origem: str,
+    destino: str,
+    mcp_client: Optional[Any] = None,
+    padrao: Optional[str] = None,
+    simular: bool = False
+) -> str:
     """
-    Copia um arquivo de uma origem para um destino.
+    Copia um arquivo ou diretório (com todo o conteúdo) de uma origem para um destino.
+
+    Um destino que já é um diretório recebe a origem dentro dele.
     
     Args:
-        origem: Caminho do arquivo de origem
-        destino: Caminho do arquivo de destino
+        origem: Caminho do arquivo ou diretório de origem
+        destino: Caminho de destino
+        mcp_client: Instância do MCPClient para delegar a tarefa
+        padrao: Glob para selecionar arquivos dentro da origem (ex.: "*.py")
+        simular: Apenas informa o que seria feito
         
     Returns:
         Confirmação de sucesso ou erro
@@ -508,7 +586,7 @@ def copiar_arquivo(origem: str, destino: str) -> str:
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "copiar_arquivo",
-                "parametros": {"origem": origem, "destino": destino}
+                "parametros": {"origem": origem, "destino": destino, "padrao": padrao, "simular": simular}
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -529,26 +607,31 @@ def copiar_arquivo(origem: str, destino: str) -> str:
         #    'system32' in destino_lower or 'windows' in destino_lower:
         #     return "Acesso a pastas do Windows não é permitido."
 
-        # Verifica se o diretório de destino existe
-        if not os.path.isdir(destino):
-            raise FileError(f"Diretório de destino não encontrado: {destino}")
-        
-        # Copiar arquivo
-        shutil.copy2(origem, destino)
-        
-        return f"Arquivo copiado com sucesso: {origem} -> {destino}"
+        resultado, plano = copiar_arvore(origem, destino, padrao=padrao, simular=simular)
+        return resultado.formatar(plano)
         
     except Exception as e:
         logger.error(f"Erro ao copiar arquivo {origem} -> {destino}: {e}")
         raise FileError(f"Falha ao copiar arquivo: {e}")
 
-def mover_arquivo(origem: str, destino: str) -> str:
+def mover_arquivo(
+    origem: str,
+    destino: str,
+    mcp_client: Optional[Any] = None,
+    padrao: Optional[str] = None,
+    simular: bool = False
+) -> str:
     """
-    Move um arquivo de uma origem para um destino.
+    Move um arquivo ou diretório (com todo o conteúdo) de uma origem para um destino.
+
+    Um destino que já é um diretório recebe a origem dentro dele.
     
     Args:
-        origem: Caminho do arquivo de origem
-        destino: Caminho do arquivo de destino
+        origem: Caminho do arquivo ou diretório de origem
+        destino: Caminho de destino
+        mcp_client: Instância do MCPClient para delegar a tarefa
+        padrao: Glob para selecionar arquivos dentro da origem (ex.: "*.py")
+        simular: Apenas informa o que seria feito
         
     Returns:
         Confirmação de sucesso ou erro
@@ -560,7 +643,7 @@ def mover_arquivo(origem: str, destino: str) -> str:
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "mover_arquivo",
-                "parametros": {"origem": origem, "destino": destino}
+                "parametros": {"origem": origem, "destino": destino, "padrao": padrao, "simular": simular}
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -581,14 +664,8 @@ def mover_arquivo(origem: str, destino: str) -> str:
         #    'system32' in destino_lower or 'windows' in destino_lower:
         #     return "Acesso a pastas do Windows não é permitido."
 
-        # Verifica se o diretório de destino existe
-        if not os.path.isdir(destino):
-            raise FileError(f"Diretório de destino não encontrado: {destino}")
-        
-        # Mover arquivo
-        shutil.move(origem, destino)
-        
-        return f"Arquivo movido com sucesso: {origem} -> {destino}"
+        resultado, plano = mover_arvore(origem, destino, padrao=padrao, simular=simular)
+        return resultado.formatar(plano)
         
     except Exception as e:
         logger.error(f"Erro ao mover arquivo {origem} -> {destino}: {e}")
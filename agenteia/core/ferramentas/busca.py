@@ -0,0 +1,566 @@
+"""
+Índice de trigramas do workspace para busca no estilo grep.
+
+O índice fica em um banco SQLite: para cada arquivo de texto são guardados os
+trigramas (3 bytes, em minúsculas) que aparecem no conteúdo. Uma consulta
+literal (ou os trechos literais obrigatórios de uma expressão regular) vira
+um conjunto de trigramas; só os arquivos que contêm todos eles são lidos, e
+essa verificação roda em paralelo num pool de threads. A atualização é
+incremental: apenas arquivos com mtime/tamanho diferentes são reindexados. As
+ferramentas de escrita marcam os caminhos alterados (``invalidar_caminhos``),
+que são reindexados antes da próxima consulta; a varredura completa, que
+capta mudanças externas, roda em segundo plano.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from ..exceptions import FileError, ValidationError
+from ..logs import setup_logging
+
+logger = setup_logging(__name__)
+
+_config: Dict[str, Any] = {
+    "raiz": ".",
+    "banco": os.path.join("indice_busca", "indice.sqlite3"),
+    "ignorar": [".git", "node_modules", "__pycache__", ".venv", "venv", "vector_db", "indice_busca", "cache_web", "artefatos"],
+    "max_tamanho_arquivo": 1024 * 1024,
+    "intervalo_atualizacao": 30.0,
+    "trabalhadores": 8,
+}
+
+_MAX_TRIGRAMAS_CONSULTA = 64
+# Arquivos lidos por transação durante a atualização completa
+_LOTE_GRAVACAO = 500
+# Tamanho máximo da lista de arquivos lida por trigrama ao planejar a consulta
+_AMOSTRA_TRIGRAMA = 2000
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    id INTEGER PRIMARY KEY,
+    caminho TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    tamanho INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trigramas (
+    trigrama INTEGER NOT NULL,
+    arquivo INTEGER NOT NULL,
+    PRIMARY KEY (trigrama, arquivo)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trigramas_arquivo ON trigramas (arquivo);
+"""
+
+
+def configurar_busca(config: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Aplica a seção "busca" do config (raiz, banco, ignorar, max_tamanho_arquivo, ...).
+
+    Índices já abertos continuam válidos; novos índices usam os valores atualizados.
+    """
+    if config:
+        _config.update(config)
+
+
+def trigramas(dados: bytes) -> Set[int]:
+    """Trigramas (em minúsculas) de um conteúdo, codificados como inteiros de 24 bits."""
+    dados = dados.lower()
+    return {int.from_bytes(dados[i:i + 3], "big") for i in range(len(dados) - 2)}
+
+
+def _literais_obrigatorios(itens: Any) -> List[str]:
+    """Sequências literais que toda correspondência da expressão precisa conter."""
+    literais, atual = [], []
+    for operacao, argumento in itens:
+        if operacao is sre_parse.LITERAL:
+            atual.append(chr(argumento))
+            continue
+        if atual:
+            literais.append("".join(atual))
+            atual = []
+        if operacao is sre_parse.SUBPATTERN:
+            literais.extend(_literais_obrigatorios(argumento[-1]))
+        elif operacao in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and argumento[0] >= 1:
+            literais.extend(_literais_obrigatorios(argumento[2]))
+    if atual:
+        literais.append("".join(atual))
+    return literais
+
+
+def trigramas_da_consulta(consulta: str, regex: bool = False) -> Set[int]:
+    """
+    Trigramas que um arquivo precisa conter para poder corresponder à consulta.
+
+    Um conjunto vazio significa que o índice não restringe a busca (todos os
+    arquivos são candidatos), como em expressões sem trecho literal de 3+ caracteres.
+    """
+    if not regex:
+        return trigramas(consulta.encode("utf-8"))
+    try:
+        itens = sre_parse.parse(consulta)
+    except re.error as e:
+        raise ValidationError(f"Expressão regular inválida: {e}")
+    necessarios: Set[int] = set()
+    if any(operacao is sre_parse.BRANCH for operacao, _ in itens):
+        return necessarios
+    for literal in _literais_obrigatorios(itens):
+        necessarios |= trigramas(literal.encode("utf-8"))
+    return necessarios
+
+
+@dataclass
+class Ocorrencia:
+    """Uma linha que corresponde à consulta."""
+    caminho: str
+    linha: int
+    texto: str
+    antes: List[str] = field(default_factory=list)
+    depois: List[str] = field(default_factory=list)
+
+    def formatar(self) -> str:
+        numero = self.linha - len(self.antes)
+        linhas = [f"{self.caminho}-{numero + i}- {texto}" for i, texto in enumerate(self.antes)]
+        linhas.append(f"{self.caminho}:{self.linha}: {self.texto}")
+        linhas.extend(f"{self.caminho}-{self.linha + i + 1}- {texto}" for i, texto in enumerate(self.depois))
+        return "\n".join(linhas)
+
+
+class IndiceBusca:
+    """Índice de trigramas persistente de uma raiz do workspace."""
+
+    def __init__(
+        self,
+        raiz: str,
+        banco: str,
+        ignorar: Optional[List[str]] = None,
+        max_tamanho_arquivo: int = 1024 * 1024,
+        intervalo_atualizacao: float = 30.0,
+        trabalhadores: int = 8
+    ):
+        self.raiz = os.path.abspath(raiz)
+        if not os.path.isdir(self.raiz):
+            raise FileError(f"Diretório não encontrado: {raiz}")
+        self.banco = banco
+        self.ignorar = set(ignorar or [])
+        self.max_tamanho_arquivo = max_tamanho_arquivo
+        self.intervalo_atualizacao = intervalo_atualizacao
+        self.trabalhadores = trabalhadores
+        self._ultima_atualizacao: Optional[float] = None
+        # _lock protege a conexão; _atualizacao_lock serializa as atualizações completas
+        self._lock = threading.Lock()
+        self._atualizacao_lock = threading.Lock()
+        self._estado_lock = threading.Lock()
+        self._pendentes: Set[str] = set()
+        self._reindexados: Set[str] = set()
+        self._thread_atualizacao: Optional[threading.Thread] = None
+
+        diretorio = os.path.dirname(os.path.abspath(banco))
+        os.makedirs(diretorio, exist_ok=True)
+        self._conexao = sqlite3.connect(banco, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(_ESQUEMA)
+
+    def fechar(self) -> None:
+        with self._lock:
+            self._conexao.close()
+
+    def _percorrer(self, inicio: Optional[str] = None) -> Iterator[Tuple[str, os.stat_result]]:
+        pendentes = [inicio or self.raiz]
+        while pendentes:
+            atual = pendentes.pop()
+            try:
+                iterador = os.scandir(atual)
+            except OSError:
+                continue
+            with iterador:
+                for item in iterador:
+                    if item.name in self.ignorar:
+                        continue
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            pendentes.append(item.path)
+                        elif item.is_file(follow_symlinks=False):
+                            info = item.stat(follow_symlinks=False)
+                            if info.st_size <= self.max_tamanho_arquivo:
+                                yield os.path.relpath(item.path, self.raiz).replace(os.sep, "/"), info
+                    except OSError:
+                        continue
+
+    def _ler_texto(self, relativo: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.raiz, relativo), "rb") as f:
+                dados = f.read(self.max_tamanho_arquivo + 1)
+        except OSError:
+            return None
+        # Arquivos binários não entram no índice
+        return None if b"\0" in dados[:8192] else dados
+
+    def _gravar(self, lote: List[Tuple[str, os.stat_result, Optional[bytes]]], completa: bool = False) -> int:
+        """Grava (ou substitui) as entradas de um lote de arquivos lidos fora do lock."""
+        if not lote:
+            return 0
+        gravados = 0
+        with self._lock, self._conexao as conexao:
+            for relativo, info, dados in lote:
+                # Um arquivo reindexado por invalidar() durante a varredura completa já está mais novo
+                if completa and relativo in self._reindexados:
+                    continue
+                anterior = conexao.execute("SELECT id FROM arquivos WHERE caminho = ?", (relativo,)).fetchone()
+                if anterior:
+                    conexao.execute("DELETE FROM trigramas WHERE arquivo = ?", anterior)
+                    conexao.execute("DELETE FROM arquivos WHERE id = ?", anterior)
+                # Binários também são registrados (sem trigramas) para não serem relidos a cada atualização
+                cursor = conexao.execute(
+                    "INSERT INTO arquivos (caminho, mtime_ns, tamanho) VALUES (?, ?, ?)",
+                    (relativo, info.st_mtime_ns, info.st_size)
+                )
+                if dados is not None:
+                    id_ = cursor.lastrowid
+                    conexao.executemany(
+                        "INSERT INTO trigramas (trigrama, arquivo) VALUES (?, ?)",
+                        ((trigrama, id_) for trigrama in trigramas(dados))
+                    )
+                gravados += 1
+        return gravados
+
+    def _remover(self, caminhos: Iterable[str]) -> int:
+        removidos = 0
+        with self._lock, self._conexao as conexao:
+            for relativo in caminhos:
+                anterior = conexao.execute("SELECT id FROM arquivos WHERE caminho = ?", (relativo,)).fetchone()
+                if anterior:
+                    conexao.execute("DELETE FROM trigramas WHERE arquivo = ?", anterior)
+                    conexao.execute("DELETE FROM arquivos WHERE id = ?", anterior)
+                    removidos += 1
+        return removidos
+
+    def atualizar(self) -> Dict[str, int]:
+        """
+        Sincroniza o índice com o disco (somente arquivos novos, alterados ou removidos).
+
+        A varredura e a leitura dos arquivos acontecem fora do lock do banco,
+        então consultas continuam sendo atendidas durante a atualização.
+
+        Returns:
+            Contagens: "arquivos", "indexados" e "removidos"
+        """
+        with self._atualizacao_lock:
+            with self._lock:
+                self._reindexados.clear()
+                conhecidos = {
+                    caminho: (mtime_ns, tamanho)
+                    for caminho, mtime_ns, tamanho in self._conexao.execute("SELECT caminho, mtime_ns, tamanho FROM arquivos")
+                }
+            indexados = 0
+            vistos = set()
+            lote: List[Tuple[str, os.stat_result, Optional[bytes]]] = []
+            for relativo, info in self._percorrer():
+                vistos.add(relativo)
+                if conhecidos.get(relativo) == (info.st_mtime_ns, info.st_size):
+                    continue
+                lote.append((relativo, info, self._ler_texto(relativo)))
+                if len(lote) >= _LOTE_GRAVACAO:
+                    indexados += self._gravar(lote, completa=True)
+                    lote = []
+            indexados += self._gravar(lote, completa=True)
+            removidos = self._remover(
+                caminho for caminho in conhecidos if caminho not in vistos and caminho not in self._reindexados
+            )
+
+            self._ultima_atualizacao = time.monotonic()
+            with self._lock:
+                total = self._conexao.execute("SELECT COUNT(*) FROM arquivos").fetchone()[0]
+        if indexados or removidos:
+            logger.info(f"Índice de busca atualizado: {indexados} indexado(s), {removidos} removido(s), {total} no total")
+        return {"arquivos": total, "indexados": indexados, "removidos": removidos}
+
+    def atualizar_em_segundo_plano(self) -> None:
+        """Inicia uma atualização completa numa thread, se nenhuma estiver em andamento."""
+        with self._estado_lock:
+            if self._thread_atualizacao is not None and self._thread_atualizacao.is_alive():
+                return
+            self._thread_atualizacao = threading.Thread(
+                target=self._atualizar_sem_erros, name="indice-busca", daemon=True
+            )
+            self._thread_atualizacao.start()
+
+    def _atualizar_sem_erros(self) -> None:
+        try:
+            self.atualizar()
+        except Exception as e:
+            logger.error(f"Erro ao atualizar o índice de busca: {e}")
+
+    def invalidar(self, caminhos: Iterable[str]) -> None:
+        """
+        Marca arquivos ou diretórios alterados para reindexação antes da próxima busca.
+
+        Args:
+            caminhos: Caminhos (absolutos ou relativos ao diretório atual); os fora da raiz são ignorados
+        """
+        relativos = []
+        for caminho in caminhos:
+            relativo = os.path.relpath(os.path.abspath(caminho), self.raiz)
+            partes = relativo.split(os.sep)
+            if partes[0] == os.pardir or self.ignorar.intersection(partes):
+                continue
+            relativos.append("" if relativo == os.curdir else relativo.replace(os.sep, "/"))
+        if relativos:
+            with self._estado_lock:
+                self._pendentes.update(relativos)
+
+    def _reindexar_pendentes(self) -> None:
+        """Reindexa só os caminhos marcados por ``invalidar`` (arquivos e subárvores)."""
+        with self._estado_lock:
+            pendentes, self._pendentes = self._pendentes, set()
+        for relativo in pendentes:
+            absoluto = os.path.join(self.raiz, relativo)
+            if os.path.isdir(absoluto):
+                prefixo = f"{relativo}/" if relativo else ""
+                with self._lock:
+                    anteriores = {
+                        caminho for (caminho,) in self._conexao.execute(
+                            "SELECT caminho FROM arquivos WHERE substr(caminho, 1, ?) = ?", (len(prefixo), prefixo)
+                        )
+                    }
+                encontrados = list(self._percorrer(absoluto))
+            else:
+                anteriores = {relativo}
+                try:
+                    info = os.stat(absoluto)
+                    encontrados = [(relativo, info)] if info.st_size <= self.max_tamanho_arquivo else []
+                except OSError:
+                    encontrados = []
+            vistos = {caminho for caminho, _ in encontrados}
+            with self._lock:
+                self._reindexados.update(vistos | anteriores)
+            self._gravar([(caminho, info, self._ler_texto(caminho)) for caminho, info in encontrados])
+            self._remover(anteriores - vistos)
+
+    def candidatos(self, necessarios: Set[int]) -> List[str]:
+        """
+        Arquivos indexados que contêm todos os trigramas informados.
+
+        Cada trigrama é sondado com LIMIT; a interseção parte da lista mais
+        curta e as demais são consultadas só para esses arquivos (buscas pela
+        chave primária), então trigramas comuns não custam uma varredura.
+        """
+        with self._lock:
+            conexao = self._conexao
+            if not necessarios:
+                return [caminho for (caminho,) in conexao.execute("SELECT caminho FROM arquivos ORDER BY caminho")]
+
+            listas = []
+            for trigrama in necessarios:
+                arquivos = [a for (a,) in conexao.execute(
+                    "SELECT arquivo FROM trigramas WHERE trigrama = ? LIMIT ?", (trigrama, _AMOSTRA_TRIGRAMA + 1)
+                )]
+                if not arquivos:
+                    return []
+                listas.append((len(arquivos), trigrama, arquivos))
+            listas.sort()
+
+            if listas[0][0] > _AMOSTRA_TRIGRAMA:
+                # Todos os trigramas são comuns: agrupa um subconjunto deles (a verificação garante o resto)
+                lista = [trigrama for _, trigrama, _ in listas[:_MAX_TRIGRAMAS_CONSULTA]]
+                marcadores = ",".join("?" * len(lista))
+                consulta = (
+                    f"SELECT a.caminho FROM trigramas t JOIN arquivos a ON a.id = t.arquivo "
+                    f"WHERE t.trigrama IN ({marcadores}) GROUP BY t.arquivo HAVING COUNT(*) = ? ORDER BY a.caminho"
+                )
+                return [caminho for (caminho,) in conexao.execute(consulta, (*lista, len(lista)))]
+
+            restantes = listas[0][2]
+            for _, trigrama, _ in listas[1:]:
+                marcadores = ",".join("?" * len(restantes))
+                restantes = [a for (a,) in conexao.execute(
+                    f"SELECT arquivo FROM trigramas WHERE trigrama = ? AND arquivo IN ({marcadores})", (trigrama, *restantes)
+                )]
+                if not restantes:
+                    return []
+            marcadores = ",".join("?" * len(restantes))
+            return [caminho for (caminho,) in conexao.execute(
+                f"SELECT caminho FROM arquivos WHERE id IN ({marcadores}) ORDER BY caminho", restantes
+            )]
+
+    def _verificar(self, relativo: str, expressao: "re.Pattern", contexto: int, limite: int) -> List[Ocorrencia]:
+        dados = self._ler_texto(relativo)
+        if dados is None:
+            return []
+        linhas = dados.decode("utf-8", errors="replace").splitlines()
+        ocorrencias = []
+        for indice, texto in enumerate(linhas):
+            if expressao.search(texto):
+                ocorrencias.append(Ocorrencia(
+                    caminho=relativo,
+                    linha=indice + 1,
+                    texto=texto,
+                    antes=linhas[max(0, indice - contexto):indice],
+                    depois=linhas[indice + 1:indice + 1 + contexto]
+                ))
+                if len(ocorrencias) >= limite:
+                    break
+        return ocorrencias
+
+    def buscar(
+        self,
+        consulta: str,
+        regex: bool = False,
+        ignorar_maiusculas: bool = False,
+        padrao_arquivos: Optional[str] = None,
+        contexto: int = 0,
+        max_resultados: int = 50
+    ) -> List[Ocorrencia]:
+        """
+        Procura a consulta nos arquivos do workspace.
+
+        Args:
+            consulta: Texto literal ou expressão regular
+            regex: Interpreta a consulta como expressão regular
+            ignorar_maiusculas: Não diferencia maiúsculas/minúsculas
+            padrao_arquivos: Glob aplicado ao caminho relativo (ex.: "*.py")
+            contexto: Linhas de contexto antes e depois de cada ocorrência
+            max_resultados: Máximo de ocorrências
+
+        Returns:
+            Ocorrências ordenadas por caminho e linha
+        """
+        if not consulta:
+            raise ValidationError("A consulta não pode ser vazia.")
+        try:
+            expressao = re.compile(consulta if regex else re.escape(consulta), re.IGNORECASE if ignorar_maiusculas else 0)
+        except re.error as e:
+            raise ValidationError(f"Expressão regular inválida: {e}")
+
+        if self._ultima_atualizacao is None:
+            # Primeira consulta: o índice precisa existir
+            self.atualizar()
+        else:
+            # Arquivos alterados pelas ferramentas de escrita entram antes da consulta;
+            # mudanças externas são captadas pela atualização completa em segundo plano
+            self._reindexar_pendentes()
+            if time.monotonic() - self._ultima_atualizacao > self.intervalo_atualizacao:
+                self.atualizar_em_segundo_plano()
+
+        necessarios = trigramas_da_consulta(consulta, regex)
+        if ignorar_maiusculas:
+            # O índice só normaliza maiúsculas ASCII; trigramas com outros bytes não restringem a busca
+            necessarios = {t for t in necessarios if not t & 0x808080}
+        arquivos = self.candidatos(necessarios)
+        if padrao_arquivos:
+            arquivos = [a for a in arquivos if fnmatch.fnmatch(a, padrao_arquivos) or fnmatch.fnmatch(os.path.basename(a), padrao_arquivos)]
+
+        resultados: List[Ocorrencia] = []
+        with ThreadPoolExecutor(max_workers=self.trabalhadores) as executor:
+            # map preserva a ordem dos candidatos; o pool é encerrado ao atingir o limite
+            for ocorrencias in executor.map(lambda a: self._verificar(a, expressao, contexto, max_resultados), arquivos):
+                resultados.extend(ocorrencias)
+                if len(resultados) >= max_resultados:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+        return resultados[:max_resultados]
+
+
+_indices: Dict[Tuple[str, str], IndiceBusca] = {}
+_indices_lock = threading.Lock()
+
+
+def obter_indice(raiz: Optional[str] = None, banco: Optional[str] = None) -> IndiceBusca:
+    """Retorna (criando na primeira vez) o índice da raiz informada ou da configurada."""
+    raiz = os.path.abspath(raiz or _config["raiz"])
+    banco = banco or _config["banco"]
+    chave = (raiz, os.path.abspath(banco))
+    with _indices_lock:
+        if chave not in _indices:
+            _indices[chave] = IndiceBusca(
+                raiz,
+                banco,
+                ignorar=_config["ignorar"],
+                max_tamanho_arquivo=_config["max_tamanho_arquivo"],
+                intervalo_atualizacao=_config["intervalo_atualizacao"],
+                trabalhadores=_config["trabalhadores"]
+            )
+        return _indices[chave]
+
+
+def invalidar_caminhos(caminhos: Iterable[Optional[str]]) -> None:
+    """
+    Marca caminhos alterados (arquivos ou diretórios) nos índices abertos.
+
+    Chamada pelas ferramentas que escrevem arquivos, para que a próxima busca
+    veja o conteúdo novo sem esperar a atualização completa.
+    """
+    caminhos = [caminho for caminho in caminhos if caminho]
+    with _indices_lock:
+        indices = list(_indices.values())
+    for indice in indices:
+        indice.invalidar(caminhos)
+
+
+def buscar_no_workspace(
+    consulta: str,
+    regex: bool = False,
+    padrao_arquivos: Optional[str] = None,
+    contexto: int = 1,
+    max_resultados: int = 50,
+    diretorio: Optional[str] = None,
+    ignorar_maiusculas: bool = False,
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Procura um texto ou expressão regular em todos os arquivos do workspace.
+
+    Args:
+        consulta: Texto literal ou expressão regular
+        regex: Interpreta a consulta como expressão regular
+        padrao_arquivos: Glob para restringir os arquivos (ex.: "*.py")
+        contexto: Linhas de contexto antes e depois de cada ocorrência
+        max_resultados: Máximo de ocorrências
+        diretorio: Raiz da busca (padrão: configuração "busca.raiz")
+        ignorar_maiusculas: Não diferencia maiúsculas/minúsculas
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Ocorrências no formato "caminho:linha: texto"
+    """
+    try:
+        if mcp_client:
+            logger.info(f"Delegando buscar_no_workspace para MCP Server com consulta: {consulta}")
+            tarefa_execucao = {
+                "tipo": "executar_ferramenta",
+                "nome_ferramenta": "buscar_no_workspace",
+                "parametros": {
+                    "consulta": consulta, "regex": regex, "padrao_arquivos": padrao_arquivos,
+                    "contexto": contexto, "max_resultados": max_resultados, "diretorio": diretorio,
+                    "ignorar_maiusculas": ignorar_maiusculas
+                }
+            }
+            resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+            return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+        ocorrencias = obter_indice(diretorio).buscar(
+            consulta, regex=regex, ignorar_maiusculas=ignorar_maiusculas, padrao_arquivos=padrao_arquivos,
+            contexto=contexto, max_resultados=max_resultados
+        )
+        if not ocorrencias:
+            return f"Nenhuma ocorrência de '{consulta}'."
+        separador = "\n--\n" if contexto else "\n"
+        return separador.join(o.formatar() for o in ocorrencias)
+
+    except (ValidationError, FileError):
+        raise
+    except Exception as e:
+        logger.error(f"Erro na busca do workspace: {str(e)}")
+        raise FileError(f"Erro na busca do workspace: {str(e)}")
@@ -0,0 +1,263 @@
+"""
+Cache de resultados de ferramentas idempotentes.
+
+As entradas são mantidas em LRU com limite de memória. Resultados de
+ferramentas de arquivo são validados pelo mtime/tamanho dos caminhos
+envolvidos a cada acerto; resultados da web expiram por TTL. Ferramentas que
+alteram arquivos invalidam as entradas dos caminhos afetados.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ...core.logs import setup_logging
+from ..metricas import CACHE_FERRAMENTAS, CACHE_FERRAMENTAS_BYTES
+
+logger = setup_logging(__name__)
+
+
+@dataclass(frozen=True)
+class PoliticaCache:
+    """Como validar o resultado em cache de uma ferramenta.
+
+    Attributes:
+        caminhos: Parâmetros cujos caminhos validam a entrada (mtime e tamanho)
+        ttl: Tempo de vida em segundos (None = sem expiração)
+    """
+    caminhos: Tuple[str, ...] = ()
+    ttl: Optional[float] = None
+
+
+def normalizar_caminho(caminho: str) -> str:
+    """Caminho absoluto usado como chave de validação e invalidação."""
+    return os.path.abspath(os.path.expanduser(str(caminho).strip("\"'")))
+
+
+def _assinatura(caminho: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(caminho)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def _tamanho(valor: Any) -> int:
+    if isinstance(valor, (str, bytes)):
+        return sys.getsizeof(valor)
+    return sys.getsizeof(repr(valor))
+
+
+def _relacionados(a: str, b: str) -> bool:
+    """Um caminho é igual ao outro ou está dentro dele."""
+    return a == b or a.startswith(b.rstrip(os.sep) + os.sep) or b.startswith(a.rstrip(os.sep) + os.sep)
+
+
+@dataclass
+class _Entrada:
+    ferramenta: str
+    valor: Any
+    tamanho: int
+    assinaturas: Dict[str, Optional[Tuple[int, int]]]
+    expira_em: Optional[float]
+
+
+class CacheResultados:
+    """
+    Cache LRU de resultados, limitado por bytes e por quantidade de entradas.
+
+    Só a instância global (``metricas=True``) publica nas métricas de cache de
+    ferramentas; caches internos de outros módulos passam ``metricas=False``
+    para não sobrescrever o gauge de bytes nem somar aos contadores.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_entradas: int = 2000,
+        habilitado: bool = True,
+        metricas: bool = True
+    ):
+        self.max_bytes = max_bytes
+        self.max_entradas = max_entradas
+        self.habilitado = habilitado
+        self.metricas = metricas
+        self.ttl: Dict[str, float] = {}
+        self.desabilitadas: set = set()
+        self._entradas: "OrderedDict[str, _Entrada]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._contadores = {"acertos": 0, "falhas": 0, "invalidacoes": 0, "remocoes": 0}
+
+    def configurar(self, config: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Aplica a seção "cache_ferramentas" do config.
+
+        Args:
+            config: Dicionário com habilitado, max_bytes, max_entradas, ttl (por ferramenta) e desabilitadas
+        """
+        config = config or {}
+        with self._lock:
+            self.habilitado = bool(config.get("habilitado", self.habilitado))
+            self.max_bytes = int(config.get("max_bytes", self.max_bytes))
+            self.max_entradas = int(config.get("max_entradas", self.max_entradas))
+            self.ttl = {nome: float(valor) for nome, valor in config.get("ttl", self.ttl).items()}
+            self.desabilitadas = set(config.get("desabilitadas", self.desabilitadas))
+            if not self.habilitado:
+                self._entradas.clear()
+                self._bytes = 0
+            self._reduzir()
+
+    def ativo_para(self, ferramenta: str) -> bool:
+        """Indica se a ferramenta pode usar o cache."""
+        return self.habilitado and ferramenta not in self.desabilitadas
+
+    @staticmethod
+    def chave(ferramenta: str, argumentos: Dict[str, Any]) -> str:
+        """Chave estável para (ferramenta, argumentos normalizados)."""
+        return json.dumps([ferramenta, argumentos], sort_keys=True, ensure_ascii=False, default=str)
+
+    def obter(self, chave: str, ferramenta: str = "") -> Tuple[bool, Any]:
+        """
+        Busca um resultado, validando TTL e mtime/tamanho dos caminhos da entrada.
+
+        Args:
+            chave: Chave gerada por ``chave()``
+            ferramenta: Nome da ferramenta (para métricas)
+
+        Returns:
+            Tupla (encontrado, valor)
+        """
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                valida = entrada.expira_em is None or time.monotonic() < entrada.expira_em
+                if valida:
+                    valida = all(_assinatura(c) == a for c, a in entrada.assinaturas.items())
+                if valida:
+                    self._entradas.move_to_end(chave)
+                    self._contadores["acertos"] += 1
+                    if self.metricas:
+                        CACHE_FERRAMENTAS.labels(entrada.ferramenta, "acerto").inc()
+                    return True, entrada.valor
+                self._remover(chave)
+            self._contadores["falhas"] += 1
+        if self.metricas:
+            CACHE_FERRAMENTAS.labels(ferramenta, "falha").inc()
+        return False, None
+
+    def guardar(
+        self,
+        chave: str,
+        ferramenta: str,
+        valor: Any,
+        caminhos: Iterable[str] = (),
+        ttl: Optional[float] = None
+    ) -> None:
+        """
+        Guarda um resultado.
+
+        Args:
+            chave: Chave gerada por ``chave()``
+            ferramenta: Nome da ferramenta (para métricas e TTL configurado)
+            valor: Resultado
+            caminhos: Caminhos cujo mtime/tamanho validam a entrada
+            ttl: Tempo de vida em segundos (o config "ttl" da ferramenta tem precedência)
+        """
+        if not self.ativo_para(ferramenta):
+            return
+        tamanho = _tamanho(valor)
+        if tamanho > self.max_bytes:
+            return
+        ttl = self.ttl.get(ferramenta, ttl)
+        # A assinatura é lida depois da execução: uma alteração posterior invalida a entrada
+        entrada = _Entrada(
+            ferramenta=ferramenta,
+            valor=valor,
+            tamanho=tamanho,
+            assinaturas={normalizar_caminho(c): _assinatura(normalizar_caminho(c)) for c in caminhos},
+            expira_em=time.monotonic() + ttl if ttl else None
+        )
+        with self._lock:
+            if chave in self._entradas:
+                self._remover(chave)
+            self._entradas[chave] = entrada
+            self._bytes += tamanho
+            self._reduzir()
+
+    def invalidar_caminhos(self, caminhos: Iterable[str]) -> int:
+        """
+        Remove entradas relacionadas aos caminhos alterados (o próprio caminho, diretórios que o contêm e arquivos dentro dele).
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        alterados = [normalizar_caminho(c) for c in caminhos if c]
+        if not alterados:
+            return 0
+        with self._lock:
+            chaves = [
+                chave for chave, entrada in self._entradas.items()
+                if any(_relacionados(c, a) for c in entrada.assinaturas for a in alterados)
+            ]
+            for chave in chaves:
+                self._remover(chave)
+            self._contadores["invalidacoes"] += len(chaves)
+        return len(chaves)
+
+    def invalidar_arquivos(self) -> int:
+        """Remove todas as entradas validadas por caminhos (ex.: após um comando shell)."""
+        with self._lock:
+            chaves = [chave for chave, entrada in self._entradas.items() if entrada.assinaturas]
+            for chave in chaves:
+                self._remover(chave)
+            self._contadores["invalidacoes"] += len(chaves)
+        return len(chaves)
+
+    def limpar(self) -> None:
+        """Remove todas as entradas."""
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+            self._publicar_bytes()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Entradas, bytes em uso e contadores de acerto/falha."""
+        with self._lock:
+            total = self._contadores["acertos"] + self._contadores["falhas"]
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                **self._contadores,
+                "taxa_acerto": self._contadores["acertos"] / total if total else 0.0
+            }
+
+    def _remover(self, chave: str) -> None:
+        entrada = self._entradas.pop(chave)
+        self._bytes -= entrada.tamanho
+        self._publicar_bytes()
+
+    def _reduzir(self) -> None:
+        while self._entradas and (self._bytes > self.max_bytes or len(self._entradas) > self.max_entradas):
+            chave = next(iter(self._entradas))
+            self._remover(chave)
+            self._contadores["remocoes"] += 1
+        self._publicar_bytes()
+
+    def _publicar_bytes(self) -> None:
+        if self.metricas:
+            CACHE_FERRAMENTAS_BYTES.set(self._bytes)
+
+
+cache_resultados = CacheResultados()
+
+
+def configurar_cache(config: Optional[Dict[str, Any]] = None) -> None:
+    """Configura o cache global de resultados a partir da seção "cache_ferramentas"."""
+    cache_resultados.configurar(config)
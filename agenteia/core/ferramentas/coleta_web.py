@@ -0,0 +1,398 @@
+"""
+Coleta de páginas web em paralelo.
+
+Um único ``aiohttp.ClientSession`` (com pool de conexões) vive num loop
+asyncio dedicado; as ferramentas síncronas enviam lotes de URLs para esse
+loop. A concorrência é limitada globalmente e por host, com um intervalo
+mínimo entre requisições ao mesmo host. As respostas com ``ETag`` ou
+``Last-Modified`` são guardadas em disco e revalidadas com requisições
+condicionais (um 304 reaproveita o corpo guardado). O HTML é convertido em
+texto com lxml quando disponível (BeautifulSoup com ``html.parser`` caso
+contrário), numa thread do executor para não travar o loop.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from ..carregamento import ImportacaoTardia
+from ..logs import setup_logging
+
+logger = setup_logging(__name__)
+
+aiohttp = ImportacaoTardia("aiohttp")
+BeautifulSoup = ImportacaoTardia("bs4", "BeautifulSoup")
+DDGS = ImportacaoTardia("duckduckgo_search", "DDGS")
+
+_config: Dict[str, Any] = {
+    "max_conexoes": 20,
+    "max_por_host": 4,
+    "intervalo_por_host": 0.2,
+    "timeout": 15,
+    "max_bytes_resposta": 5 * 1024 * 1024,
+    "cache_dir": "cache_web",
+    "cache_max_bytes": 64 * 1024 * 1024,
+    "user_agent": "Mozilla/5.0 (compatible; AgenteIA/1.0)",
+}
+
+_ELEMENTOS_IGNORADOS = ("script", "style", "noscript", "template")
+
+
+def configurar_coleta_web(config: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Aplica a seção "coleta_web" do config (limites, timeout, diretório do cache...).
+
+    O coletor global é recriado na próxima coleta.
+    """
+    global _coletor
+    if config:
+        _config.update(config)
+    with _coletor_lock:
+        if _coletor is not None:
+            _coletor.fechar()
+            _coletor = None
+
+
+@dataclass
+class EntradaCache:
+    """Resposta guardada em disco, com os validadores para revalidação."""
+    url: str
+    etag: Optional[str]
+    modificado: Optional[str]
+    tipo_conteudo: Optional[str]
+    encoding: Optional[str]
+    corpo: bytes
+
+
+class CacheHTTP:
+    """
+    Cache em disco de respostas HTTP validáveis (ETag/Last-Modified).
+
+    Cada URL ocupa dois arquivos nomeados pelo SHA-256 da URL: os metadados
+    (``.json``) e o corpo (``.corpo``). Quando o total passa de ``max_bytes``,
+    as entradas menos recentes são removidas.
+    """
+
+    def __init__(self, diretorio: str, max_bytes: int = 64 * 1024 * 1024):
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        self._gravacoes = 0
+        self._lock = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminhos(self, url: str):
+        nome = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.diretorio, nome[:2], nome)
+        return base + ".json", base + ".corpo"
+
+    def obter(self, url: str) -> Optional[EntradaCache]:
+        meta, corpo = self._caminhos(url)
+        try:
+            with open(meta, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+            with open(corpo, "rb") as f:
+                conteudo = f.read()
+        except (OSError, ValueError):
+            return None
+        if dados.get("url") != url:
+            return None
+        os.utime(meta)  # marca como usada recentemente
+        return EntradaCache(
+            url, dados.get("etag"), dados.get("modificado"), dados.get("tipo_conteudo"), dados.get("encoding"), conteudo
+        )
+
+    def guardar(self, entrada: EntradaCache) -> None:
+        meta, corpo = self._caminhos(entrada.url)
+        os.makedirs(os.path.dirname(meta), exist_ok=True)
+        dados = {
+            "url": entrada.url, "etag": entrada.etag, "modificado": entrada.modificado,
+            "tipo_conteudo": entrada.tipo_conteudo, "encoding": entrada.encoding, "guardado_em": time.time(),
+        }
+        # Corpo antes dos metadados: uma entrada com .json sempre tem o corpo completo
+        for caminho, conteudo, modo in ((corpo, entrada.corpo, "wb"), (meta, json.dumps(dados).encode("utf-8"), "wb")):
+            temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, modo) as f:
+                f.write(conteudo)
+            os.replace(temporario, caminho)
+        with self._lock:
+            self._gravacoes += 1
+            podar = self._gravacoes % 32 == 0
+        if podar:
+            self.podar()
+
+    def podar(self) -> None:
+        """Remove as entradas menos recentes até o cache caber em ``max_bytes``."""
+        entradas = []
+        total = 0
+        for pasta, _, nomes in os.walk(self.diretorio):
+            for nome in nomes:
+                if not nome.endswith(".json"):
+                    continue
+                meta = os.path.join(pasta, nome)
+                corpo = meta[:-5] + ".corpo"
+                try:
+                    tamanho = os.path.getsize(meta) + os.path.getsize(corpo)
+                    entradas.append((os.path.getmtime(meta), tamanho, meta, corpo))
+                except OSError:
+                    continue
+                total += tamanho
+        for _, tamanho, meta, corpo in sorted(entradas):
+            if total <= self.max_bytes:
+                break
+            for caminho in (meta, corpo):
+                with contextlib.suppress(OSError):
+                    os.remove(caminho)
+            total -= tamanho
+
+
+class LimitadorHost:
+    """Limita requisições simultâneas por host e espaça o início delas."""
+
+    def __init__(self, max_por_host: int = 4, intervalo: float = 0.0):
+        self.max_por_host = max_por_host
+        self.intervalo = intervalo
+        self._semaforos: Dict[str, asyncio.Semaphore] = {}
+        self._proximo: Dict[str, float] = {}
+
+    @contextlib.asynccontextmanager
+    async def reservar(self, host: str) -> AsyncIterator[None]:
+        semaforo = self._semaforos.setdefault(host, asyncio.Semaphore(self.max_por_host))
+        async with semaforo:
+            # Sem await entre ler e gravar _proximo: cada requisição reserva o próprio horário
+            agora = time.monotonic()
+            inicio = max(agora, self._proximo.get(host, 0.0))
+            self._proximo[host] = inicio + self.intervalo
+            if inicio > agora:
+                await asyncio.sleep(inicio - agora)
+            yield
+
+
+@dataclass
+class RespostaWeb:
+    """Resultado da coleta de uma URL."""
+    url: str
+    status: Optional[int] = None
+    corpo: bytes = b""
+    tipo_conteudo: Optional[str] = None
+    encoding: Optional[str] = None
+    do_cache: bool = False
+    erro: Optional[str] = None
+    texto: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.erro is None
+
+
+def _limpar_texto(texto: str) -> str:
+    linhas = (linha.strip() for linha in texto.splitlines())
+    trechos = (frase.strip() for linha in linhas for frase in linha.split("  "))
+    return "\n".join(trecho for trecho in trechos if trecho)
+
+
+def extrair_texto_html(corpo: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Extrai o texto visível de um documento HTML.
+
+    Usa lxml (parser em C) quando instalado; caso contrário, BeautifulSoup
+    com ``html.parser``. Scripts, estilos e afins são descartados.
+    """
+    if not corpo.strip():
+        return ""
+    try:
+        import lxml.etree
+        import lxml.html
+    except ImportError:
+        soup = BeautifulSoup(corpo, "html.parser", from_encoding=encoding)
+        for elemento in soup(list(_ELEMENTOS_IGNORADOS)):
+            elemento.decompose()
+        return _limpar_texto(soup.get_text())
+
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    documento = lxml.html.document_fromstring(corpo, parser=parser)
+    lxml.etree.strip_elements(documento, *_ELEMENTOS_IGNORADOS, with_tail=False)
+    return _limpar_texto(documento.text_content())
+
+
+class ColetorWeb:
+    """Cliente HTTP assíncrono compartilhado, com cache e limites por host."""
+
+    def __init__(
+        self,
+        max_conexoes: int = 20,
+        max_por_host: int = 4,
+        intervalo_por_host: float = 0.2,
+        timeout: float = 15,
+        max_bytes_resposta: int = 5 * 1024 * 1024,
+        cache: Optional[CacheHTTP] = None,
+        user_agent: Optional[str] = None
+    ):
+        self.max_conexoes = max_conexoes
+        self.timeout = timeout
+        self.max_bytes_resposta = max_bytes_resposta
+        self.cache = cache
+        self.user_agent = user_agent or _config["user_agent"]
+        self.limitador = LimitadorHost(max_por_host, intervalo_por_host)
+        self._max_por_host = max_por_host
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._sessao = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    def _garantir_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="ColetorWeb", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def agendar(self, corrotina) -> "Future":
+        """Agenda uma corrotina no loop do coletor, sem esperar."""
+        return asyncio.run_coroutine_threadsafe(corrotina, self._garantir_loop())
+
+    def executar(self, corrotina) -> Any:
+        """Executa uma corrotina no loop do coletor e espera o resultado."""
+        return self.agendar(corrotina).result()
+
+    async def obter_sessao(self):
+        """Sessão HTTP compartilhada (só pode ser usada dentro do loop do coletor)."""
+        if self._sessao is None or self._sessao.closed:
+            conector = aiohttp.TCPConnector(
+                limit=self.max_conexoes, limit_per_host=self._max_por_host, ttl_dns_cache=300
+            )
+            self._sessao = aiohttp.ClientSession(
+                connector=conector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.user_agent}
+            )
+            self._semaforo = asyncio.Semaphore(self.max_conexoes)
+        return self._sessao
+
+    async def _buscar(self, url: str) -> RespostaWeb:
+        sessao = await self.obter_sessao()
+        anterior = self.cache.obter(url) if self.cache else None
+        cabecalhos = {}
+        if anterior:
+            if anterior.etag:
+                cabecalhos["If-None-Match"] = anterior.etag
+            if anterior.modificado:
+                cabecalhos["If-Modified-Since"] = anterior.modificado
+
+        try:
+            async with self._semaforo, self.limitador.reservar(urlsplit(url).netloc):
+                async with sessao.get(url, headers=cabecalhos) as resposta:
+                    if resposta.status == 304 and anterior:
+                        logger.debug(f"Página não modificada, usando o cache: {url}")
+                        return RespostaWeb(
+                            url, 304, anterior.corpo, anterior.tipo_conteudo, anterior.encoding, do_cache=True
+                        )
+                    if resposta.status >= 400:
+                        return RespostaWeb(url, resposta.status, erro=f"HTTP {resposta.status} {resposta.reason or ''}".strip())
+
+                    partes = []
+                    lidos = 0
+                    async for bloco in resposta.content.iter_chunked(64 * 1024):
+                        partes.append(bloco)
+                        lidos += len(bloco)
+                        if lidos >= self.max_bytes_resposta:
+                            logger.warning(f"Resposta truncada em {self.max_bytes_resposta} bytes: {url}")
+                            break
+                    corpo = b"".join(partes)[:self.max_bytes_resposta]
+                    coletada = RespostaWeb(url, resposta.status, corpo, resposta.content_type, resposta.charset)
+                    etag, modificado = resposta.headers.get("ETag"), resposta.headers.get("Last-Modified")
+        except asyncio.TimeoutError:
+            return RespostaWeb(url, erro=f"Timeout após {self.timeout}s")
+        except aiohttp.ClientError as e:
+            return RespostaWeb(url, erro=str(e) or type(e).__name__)
+
+        if self.cache and (etag or modificado) and lidos < self.max_bytes_resposta:
+            await asyncio.get_running_loop().run_in_executor(None, self.cache.guardar, EntradaCache(
+                url, etag, modificado, coletada.tipo_conteudo, coletada.encoding, coletada.corpo
+            ))
+        return coletada
+
+    async def _buscar_e_extrair(self, url: str) -> RespostaWeb:
+        resposta = await self._buscar(url)
+        if resposta.ok:
+            try:
+                resposta.texto = await asyncio.get_running_loop().run_in_executor(
+                    None, extrair_texto_html, resposta.corpo, resposta.encoding
+                )
+            except Exception as e:
+                resposta.erro = f"Erro ao interpretar o HTML: {e}"
+        return resposta
+
+    async def _lote(self, urls: List[str], extrair: bool) -> List[RespostaWeb]:
+        tarefa = self._buscar_e_extrair if extrair else self._buscar
+        return list(await asyncio.gather(*(tarefa(url) for url in urls)))
+
+    def buscar_lote(self, urls: List[str]) -> List[RespostaWeb]:
+        """Baixa as URLs em paralelo (na ordem recebida; erros ficam em ``erro``)."""
+        return self.executar(self._lote(list(urls), extrair=False))
+
+    def extrair_lote(self, urls: List[str]) -> List[RespostaWeb]:
+        """Baixa as URLs em paralelo e extrai o texto de cada página (em ``texto``)."""
+        return self.executar(self._lote(list(urls), extrair=True))
+
+    def fechar(self) -> None:
+        """Fecha a sessão HTTP e encerra o loop."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._sessao is not None:
+            with contextlib.suppress(Exception):
+                asyncio.run_coroutine_threadsafe(self._sessao.close(), loop).result(5)
+            self._sessao = None
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_coletor: Optional[ColetorWeb] = None
+_coletor_lock = threading.Lock()
+_ddgs = None
+_ddgs_lock = threading.Lock()
+
+
+def obter_coletor() -> ColetorWeb:
+    """Retorna o coletor global (criado na primeira vez com a configuração atual)."""
+    global _coletor
+    with _coletor_lock:
+        if _coletor is None:
+            _coletor = ColetorWeb(
+                max_conexoes=_config["max_conexoes"],
+                max_por_host=_config["max_por_host"],
+                intervalo_por_host=_config["intervalo_por_host"],
+                timeout=_config["timeout"],
+                max_bytes_resposta=_config["max_bytes_resposta"],
+                cache=CacheHTTP(_config["cache_dir"], _config["cache_max_bytes"]) if _config["cache_dir"] else None,
+                user_agent=_config["user_agent"]
+            )
+        return _coletor
+
+
+def pesquisar(query: str, max_resultados: int = 5) -> List[Dict[str, Any]]:
+    """
+    Pesquisa no DuckDuckGo reaproveitando uma única sessão DDGS.
+
+    A sessão não é segura para uso simultâneo; as pesquisas são serializadas.
+    """
+    global _ddgs
+    with _ddgs_lock:
+        if _ddgs is None:
+            _ddgs = DDGS()
+        try:
+            return list(_ddgs.text(query, max_results=max_resultados))
+        except Exception:
+            # Sessão possivelmente inválida (ex.: bloqueio temporário): recria na próxima pesquisa
+            _ddgs = None
+            raise
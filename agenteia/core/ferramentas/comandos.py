@@ -4,17 +4,18 @@ Ferramentas para execução de comandos e gerenciamento de processos
 
 import os
 import sys
+import signal
 import subprocess
-import psutil
-import logging
 import json
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union
 from datetime import datetime
 from ..exceptions import ToolError
 from ...core.logs import setup_logging
+from ..tabela_processos import obter_tabela
+from .processos import ESTADO_TIMEOUT, SEM_TIMEOUT, SESSAO_PADRAO, ProcessoGerenciado, supervisor
 
 # Configuração de logging
-logger = logging.getLogger(__name__)
+logger = setup_logging(__name__)
 
 def executar_comando(
     comando: str,
@@ -22,21 +23,30 @@ def executar_comando(
     timeout: Optional[int] = 30,
     cwd: Optional[str] = None,
     env: Optional[Dict[str, str]] = None,
+    sessao: str = SESSAO_PADRAO,
+    em_segundo_plano: bool = False,
     mcp_client: Optional[Any] = None
 ) -> str:
     """
     Executa um comando shell.
     
+    O comando roda no supervisor de processos: a saída é lida à medida que
+    é produzida para buffers de tamanho limitado (só o final de uma saída
+    muito longa é mantido) e o número de comandos simultâneos é limitado.
+    
     Args:
         comando: Comando a executar
         shell: Se deve usar shell
-        timeout: Timeout em segundos
+        timeout: Timeout em segundos (só em primeiro plano; em segundo plano o
+            comando roda até terminar ou ser encerrado com encerrar_processo)
         cwd: Diretório de trabalho
         env: Variáveis de ambiente
+        sessao: Sessão do comando (limite de concorrência por sessão)
+        em_segundo_plano: Retorna imediatamente com o id do processo
         mcp_client: Cliente MCP para delegar a execução (opcional)
         
     Returns:
-        Saída do comando
+        Saída do comando (ou o id e PID, se em segundo plano)
     """
     try:
         # Refatoração para usar MCP Client se disponível
@@ -45,7 +55,10 @@ def executar_comando(
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "executar_comando",
-                "parametros": {"comando": comando, "shell": shell, "timeout": timeout, "cwd": cwd, "env": env}
+                "parametros": {
+                    "comando": comando, "shell": shell, "timeout": timeout, "cwd": cwd, "env": env,
+                    "sessao": sessao, "em_segundo_plano": em_segundo_plano
+                }
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -53,36 +66,36 @@ def executar_comando(
             )
             return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
 
-        # Lógica existente (fallback local)
-        # Prepara ambiente
-        if env is None:
-            env = os.environ.copy()
-        
-        # Executa comando
-        processo = subprocess.run(
-            comando,
-            shell=shell,
-            timeout=timeout,
-            cwd=cwd,
-            env=env,
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
+        # Execução local pelo supervisor
+        processo = supervisor.iniciar(
+            comando, shell=shell, cwd=cwd, env=env, sessao=sessao,
+            timeout=SEM_TIMEOUT if em_segundo_plano else timeout
         )
+        if em_segundo_plano:
+            supervisor.aguardar_inicio(processo)
+            return (
+                f"Comando iniciado em segundo plano: {processo.id} (PID: {processo.pid or 'na fila'}). "
+                f"Use verificar_processo('{processo.id}') para acompanhar a saída."
+            )
+        supervisor.aguardar(processo)
         
         # Verifica erro
-        if processo.returncode != 0:
-            erro = processo.stderr.strip()
+        if processo.estado == ESTADO_TIMEOUT:
+            logger.error(f"Timeout ao executar comando: {comando}")
+            raise ToolError(f"Timeout ao executar comando: {comando}")
+        if processo.erro:
+            raise ToolError(f"Erro ao executar comando: {processo.erro}")
+        if processo.codigo_saida != 0:
+            erro = processo.stderr.texto().strip()
             if not erro:
                 erro = "Comando falhou sem mensagem de erro"
             raise ToolError(f"Erro ao executar comando: {erro}")
         
         # Retorna saída
-        return processo.stdout.strip()
+        return processo.stdout.texto().strip()
         
-    except subprocess.TimeoutExpired:
-        logger.error(f"Timeout ao executar comando: {comando}")
-        raise ToolError(f"Timeout ao executar comando: {comando}")
+    except ToolError:
+        raise
     except Exception as e:
         logger.error(f"Erro ao executar comando: {str(e)}")
         raise ToolError(f"Erro ao executar comando: {str(e)}")
@@ -92,8 +105,10 @@ def executar_comando_async(
     shell: bool = True,
     cwd: Optional[str] = None,
     env: Optional[Dict[str, str]] = None,
+    timeout: Optional[int] = None,
+    sessao: str = SESSAO_PADRAO,
     mcp_client: Optional[Any] = None
-) -> Tuple[subprocess.Popen, str]:
+) -> Tuple[ProcessoGerenciado, str]:
     """
     Executa um comando assincronamente.
     
@@ -102,62 +117,64 @@ def executar_comando_async(
         shell: Se deve usar shell
         cwd: Diretório de trabalho
         env: Variáveis de ambiente
+        timeout: Timeout em segundos (padrão do supervisor se None)
+        sessao: Sessão do comando (limite de concorrência por sessão)
         mcp_client: Cliente MCP para delegar a execução (opcional)
         
     Returns:
-        Tupla (processo, id)
+        Tupla (handle do processo, id)
     """
     try:
         # Refatoração para usar MCP Client se disponível
         if mcp_client:
             logger.info(f"Delegando executar_comando_async para MCP Server: {comando}")
-            tarefa_execucao = {
-                "tipo": "executar_ferramenta",
-                "nome_ferramenta": "executar_comando_async",
-                "parametros": {"comando": comando, "shell": shell, "cwd": cwd, "env": env}
-            }
-            # Para execução assíncrona, talvez precisemos de um tipo de retorno diferente
-            # ou uma forma de consultar o status/saída via MCP. Por enquanto, vamos apenas
-            # simular a delegação e retornar um placeholder ou levantar um NotImplementedError
-            # se a API do MCP para async não estiver definida.
-            # result = mcp_client.distribuir_tarefa(
-            #     tarefa=json.dumps(tarefa_execucao),
-            #     agente_id="Agente Local"
-            # )
-            # return result, result.get("id", "Erro: ID vazio do MCP Server.")
+            # O handle é local; via MCP use executar_comando com em_segundo_plano=True
             raise NotImplementedError("Delegação assíncrona via MCP Client não implementada completamente.")
 
-        # Prepara ambiente
-        if env is None:
-            env = os.environ.copy()
-        
-        # Executa comando
-        processo = subprocess.Popen(
-            comando,
-            shell=shell,
-            cwd=cwd,
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            encoding='utf-8'
-        )
-        
-        # Gera ID
-        id = f"cmd_{processo.pid}"
-        
-        return processo, id
+        processo = supervisor.iniciar(comando, shell=shell, cwd=cwd, env=env, timeout=timeout, sessao=sessao)
+        return processo, processo.id
         
     except Exception as e:
         logger.error(f"Erro ao executar comando assíncrono: {str(e)}")
         raise ToolError(f"Erro ao executar comando assíncrono: {str(e)}")
 
-def verificar_processo(pid: int) -> Dict[str, Any]:
+def _pid_ativo(pid: int) -> bool:
+    """Verifica no sistema operacional se um PID existe."""
+    if os.name == "nt":
+        processo = subprocess.run(
+            f"tasklist /FI \"PID eq {pid}\" /NH",
+            shell=True,
+            capture_output=True,
+            text=True,
+            encoding='utf-8'
+        )
+        return processo.returncode == 0 and str(pid) in processo.stdout
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def verificar_processo(
+    pid: Union[int, str],
+    desde: int = 0,
+    mcp_client: Optional[Any] = None
+) -> Dict[str, Any]:
     """
     Verifica status de um processo.
     
+    Para comandos do supervisor (id "cmd_N" ou PID), inclui o estado, o
+    código de saída e a saída produzida a partir do offset ``desde``; o
+    campo "proximo_offset" permite ler só o que for novo na próxima chamada.
+    Para outros processos, os dados vêm da tabela de processos (nome, CPU
+    e memória, com o CPU medido desde a amostra anterior).
+    
     Args:
-        pid: ID do processo
+        pid: ID do processo ou id do comando ("cmd_N")
+        desde: Offset da saída já lida
+        mcp_client: Cliente MCP para delegar a execução (opcional)
         
     Returns:
         Status do processo
@@ -169,7 +186,7 @@ def verificar_processo(pid: int) -> Dict[str, Any]:
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "verificar_processo",
-                "parametros": {"pid": pid}
+                "parametros": {"pid": pid, "desde": desde}
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -177,40 +194,47 @@ def verificar_processo(pid: int) -> Dict[str, Any]:
             )
             return resultado.get("resultado", {"ativo": False, "pid": pid, "comando": None, "erro": "Erro ou resultado vazio do MCP Server."})
 
-        # Verifica processo
-        processo = subprocess.run(
-            f"tasklist /FI \"PID eq {pid}\" /NH",
-            shell=True,
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
+        gerenciado = supervisor.obter(pid)
+        if gerenciado:
+            return gerenciado.para_dict(desde)
+        if isinstance(pid, str) and pid.startswith("cmd_"):
+            raise ToolError(f"Comando não encontrado: {pid}")
         
-        # Processa saída
-        if processo.returncode == 0 and str(pid) in processo.stdout:
+        pid = int(pid)
+        try:
+            info = obter_tabela().obter(pid)
+        except ImportError:
+            # Sem psutil: só é possível saber se o PID existe
             return {
-                "ativo": True,
-                "pid": pid,
-                "comando": processo.stdout.strip()
-            }
-        else:
-            return {
-                "ativo": False,
+                "ativo": _pid_ativo(pid),
                 "pid": pid,
                 "comando": None
             }
+        if info is None:
+            return {"ativo": False, "pid": pid, "comando": None}
+        return {"ativo": True, "comando": info["nome"], **info}
             
+    except ToolError:
+        raise
     except Exception as e:
         logger.error(f"Erro ao verificar processo: {str(e)}")
         raise ToolError(f"Erro ao verificar processo: {str(e)}")
 
-def encerrar_processo(pid: int, forcar: bool = False) -> str:
+def encerrar_processo(
+    pid: Union[int, str],
+    forcar: bool = False,
+    mcp_client: Optional[Any] = None
+) -> str:
     """
     Encerra um processo.
     
+    Comandos do supervisor são encerrados com todo o grupo de processos
+    (o shell e os filhos); um comando ainda na fila é cancelado.
+    
     Args:
-        pid: ID do processo
+        pid: ID do processo ou id do comando ("cmd_N")
         forcar: Se deve forçar encerramento
+        mcp_client: Cliente MCP para delegar a execução (opcional)
         
     Returns:
         Mensagem de confirmação
@@ -230,28 +254,88 @@ def encerrar_processo(pid: int, forcar: bool = False) -> str:
             )
             return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
 
+        gerenciado = supervisor.obter(pid)
+        if gerenciado:
+            if not supervisor.encerrar(gerenciado, forcar=forcar):
+                return f"Processo {gerenciado.id} não está ativo ({gerenciado.estado})"
+            return f"Processo {gerenciado.id} (PID: {gerenciado.pid}) encerrado com sucesso"
+        
         # Verifica processo
         status = verificar_processo(pid)
         if not status["ativo"]:
             return f"Processo {pid} não está ativo"
         
         # Encerra processo
-        comando = f"taskkill /F /PID {pid}" if forcar else f"taskkill /PID {pid}"
-        subprocess.run(comando, shell=True, check=True)
+        if os.name == "nt":
+            comando = f"taskkill /F /PID {pid}" if forcar else f"taskkill /PID {pid}"
+            subprocess.run(comando, shell=True, check=True)
+        else:
+            os.kill(int(pid), signal.SIGKILL if forcar else signal.SIGTERM)
         
         return f"Processo {pid} encerrado com sucesso"
         
     except subprocess.CalledProcessError as e:
         logger.error(f"Erro ao encerrar processo: {str(e)}")
         raise ToolError(f"Erro ao encerrar processo: {str(e)}")
+    except ToolError:
+        raise
     except Exception as e:
         logger.error(f"Erro ao encerrar processo: {str(e)}")
         raise ToolError(f"Erro ao encerrar processo: {str(e)}")
 
-def listar_processos() -> str:
+def _formatar_processo(processo: Dict[str, Any]) -> str:
+    cpu = "n/d" if processo["cpu_percent"] is None else f"{processo['cpu_percent']:.1f}%"
+    memoria = "N/A" if processo["memoria_rss"] is None else f"{processo['memoria_rss'] / (1024 * 1024):.1f} MB"
+    return f"- {processo['nome']} (PID: {processo['pid']}, CPU: {cpu}, Memória: {memoria})"
+
+def _listar_pelo_sistema(filtro: Optional[str], limite: Optional[int]) -> List[str]:
+    """Lista processos com tasklist/ps (quando psutil não está disponível)."""
+    if os.name == "nt":
+        comando, coluna_memoria = "tasklist /NH", 4
+    else:
+        comando, coluna_memoria = "ps -eo comm=,pid=,rss=", 2
+    processo = subprocess.run(
+        comando,
+        shell=True,
+        capture_output=True,
+        text=True,
+        encoding='utf-8'
+    )
+    if processo.returncode != 0:
+        return ["Erro ao listar processos"]
+    
+    processos = []
+    for linha in processo.stdout.strip().split('\n'):
+        partes = linha.split()
+        if len(partes) >= 2 and (not filtro or filtro.lower() in partes[0].lower()):
+            memoria = partes[coluna_memoria] if len(partes) > coluna_memoria else "N/A"
+            processos.append(f"- {partes[0]} (PID: {partes[1]}, Memória: {memoria})")
+    return sorted(processos)[:limite]
+
+# Campos de uso de recursos: sem ``decrescente``, os maiores vêm primeiro
+ORDENACAO_DECRESCENTE = ("cpu_percent", "memoria_percent", "memoria_rss")
+
+def listar_processos(
+    filtro: Optional[str] = None,
+    ordenar_por: str = "cpu_percent",
+    limite: Optional[int] = 50,
+    decrescente: Optional[bool] = None,
+    mcp_client: Optional[Any] = None
+) -> str:
     """
     Lista processos ativos.
     
+    Os comandos do supervisor aparecem primeiro, com estado e sessão. Os
+    processos do sistema vêm do snapshot da tabela de processos (atualizado
+    no máximo a cada poucos segundos), já filtrados e ordenados.
+    
+    Args:
+        filtro: Trecho do nome do processo
+        ordenar_por: cpu_percent, memoria_percent, memoria_rss, threads, criado_em, pid ou nome
+        limite: Quantidade máxima de processos do sistema (top-N)
+        decrescente: Maiores primeiro; por padrão, só para CPU e memória
+        mcp_client: Cliente MCP para delegar a execução (opcional)
+        
     Returns:
         Lista formatada de processos
     """
@@ -262,7 +346,9 @@ def listar_processos() -> str:
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "listar_processos",
-                "parametros": {}
+                "parametros": {
+                    "filtro": filtro, "ordenar_por": ordenar_por, "limite": limite, "decrescente": decrescente
+                }
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -270,33 +356,26 @@ def listar_processos() -> str:
             )
             return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
 
-        # Lista processos
-        processo = subprocess.run(
-            "tasklist /NH",
-            shell=True,
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
+        gerenciados = [
+            f"- {p.id} (PID: {p.pid}, Estado: {p.estado}, Sessão: {p.sessao}): {p.comando}"
+            for p in supervisor.listar()
+        ]
+        cabecalho = ["Comandos gerenciados:"] + gerenciados + [""] if gerenciados else []
         
-        # Processa saída
-        if processo.returncode == 0:
-            linhas = processo.stdout.strip().split('\n')
-            processos = []
-            
-            for linha in linhas:
-                if linha.strip():
-                    partes = linha.split()
-                    if len(partes) >= 2:
-                        nome = partes[0]
-                        pid = partes[1]
-                        memoria = partes[4] if len(partes) > 4 else "N/A"
-                        processos.append(f"- {nome} (PID: {pid}, Memória: {memoria})")
-            
-            return "\n".join(sorted(processos))
-        else:
-            return "Erro ao listar processos"
+        try:
+            if decrescente is None:
+                decrescente = ordenar_por in ORDENACAO_DECRESCENTE
+            processos = obter_tabela().consultar(
+                filtro=filtro, ordenar_por=ordenar_por, decrescente=decrescente, limite=limite
+            )
+            linhas = [_formatar_processo(p) for p in processos]
+        except ImportError:
+            linhas = _listar_pelo_sistema(filtro, limite)
+        
+        return "\n".join(cabecalho + linhas)
             
+    except ValueError as e:
+        raise ToolError(str(e))
     except Exception as e:
         logger.error(f"Erro ao listar processos: {str(e)}")
         raise ToolError(f"Erro ao listar processos: {str(e)}")
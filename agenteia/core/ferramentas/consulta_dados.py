@@ -0,0 +1,784 @@
+"""
+Consultas a arquivos de dados (CSV, JSON Lines, JSON, XML e Parquet).
+
+Filtros e projeção são aplicados durante a leitura e todas as métricas
+pedidas são calculadas numa única passada agrupada; só o resultado, pequeno,
+volta para o agente.
+
+Há dois motores com a mesma semântica e os mesmos tipos de valor:
+
+* ``pyarrow`` (se instalado): CSV e JSON Lines são carregados uma vez como
+  tabelas Arrow e mantidos num cache LRU por caminho, mtime e tamanho;
+  Parquet é lido com ``pyarrow.dataset``, que leva filtros e colunas até o
+  arquivo (só os row groups e colunas necessários são lidos).
+* ``python``: os registros são lidos em streaming pelos leitores de
+  ``conversao``, com memória limitada ao estado da agregação (ou aos
+  ``limite`` melhores registros, quando há ordenação).
+
+Nos dois, células de CSV viram números, booleanos ou None (célula vazia)
+como na inferência do Arrow, datas voltam como texto ISO e os literais dos
+filtros são convertidos para o tipo da coluna (``{"ano": "2024"}`` vale para
+uma coluna numérica).
+"""
+
+import heapq
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, time as hora
+from functools import reduce
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..carregamento import ImportacaoTardia
+from ..exceptions import ValidationError
+from ..logs import setup_logging
+from .cache import normalizar_caminho
+from .conversao import EXTENSOES, delimitador_padrao, ler_registros
+
+logger = setup_logging(__name__)
+
+pa = ImportacaoTardia("pyarrow")
+pc = ImportacaoTardia("pyarrow.compute")
+
+_config: Dict[str, Any] = {
+    "motor": "auto",
+    "cache_max_bytes": 512 * 1024 * 1024,
+    "limite_padrao": 50,
+}
+
+OPERADORES = ("==", "!=", ">", ">=", "<", "<=", "in", "nao_in", "contem")
+
+FUNCOES = ("soma", "media", "min", "max", "contagem", "distintos")
+
+_SINONIMOS = {
+    "sum": "soma", "mean": "media", "avg": "media", "média": "media", "count": "contagem",
+    "nunique": "distintos", "count_distinct": "distintos", "minimo": "min", "maximo": "max",
+}
+
+_FUNCOES_ARROW = {
+    "soma": "sum", "media": "mean", "min": "min", "max": "max", "contagem": "count", "distintos": "count_distinct",
+}
+
+_FILTRO_TEXTO = re.compile(
+    r"^\s*(.+?)\s*(==|!=|>=|<=|>|<|=)\s*(.+?)\s*$|^\s*(\S+)\s+(in|nao_in|contem|contains)\s+(.+?)\s*$"
+)
+_METRICA_TEXTO = re.compile(r"^\s*(\w+)\s*\(\s*([^)]*?)\s*\)\s*$")
+
+# Mesmos textos que o leitor de CSV do Arrow aceita como booleano
+_VERDADEIROS = ("true", "True", "TRUE")
+_FALSOS = ("false", "False", "FALSE")
+
+
+def configurar_consulta(config: Optional[Dict[str, Any]] = None) -> None:
+    """Aplica a seção "consulta_dados" do config (motor, cache_max_bytes, limite_padrao)."""
+    if config:
+        _config.update(config)
+        _tabelas.max_bytes = _config["cache_max_bytes"]
+
+
+def _numero(valor: Any) -> Optional[float]:
+    """Valor numérico de um campo (CSV traz tudo como texto); None se não for número."""
+    if isinstance(valor, bool):
+        return int(valor)
+    if isinstance(valor, (int, float)):
+        return valor
+    if isinstance(valor, str):
+        texto = valor.strip()
+        try:
+            return int(texto)
+        except ValueError:
+            try:
+                return float(texto)
+            except ValueError:
+                return None
+    return None
+
+
+def _vazio(valor: Any) -> bool:
+    return valor is None or valor == ""
+
+
+def _tipar(valor: str) -> Any:
+    """Célula de CSV com o tipo que o Arrow inferiria: número, booleano, None (vazia) ou texto."""
+    if valor == "":
+        return None
+    if valor in _VERDADEIROS or valor in _FALSOS:
+        return valor in _VERDADEIROS
+    numero = _numero(valor)
+    return valor if numero is None else numero
+
+
+def _tipar_registros(registros: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for registro in registros:
+        yield {chave: _tipar(valor) if isinstance(valor, str) else valor for chave, valor in registro.items()}
+
+
+def _valor_saida(valor: Any) -> Any:
+    # Datas do Arrow voltam como texto, como no motor python
+    return valor.isoformat() if isinstance(valor, (date, datetime, hora)) else valor
+
+
+def _literal_arrow(valor: Any, tipo: Any) -> Any:
+    """Literal de filtro convertido para o tipo da coluna; None se não couber nele."""
+    try:
+        if pa.types.is_boolean(tipo):
+            if isinstance(valor, str):
+                texto = valor.strip().lower()
+                if texto not in ("true", "1", "sim", "false", "0", "nao", "não"):
+                    return None
+                valor = texto in ("true", "1", "sim")
+            return pa.scalar(bool(valor))
+        if pa.types.is_integer(tipo) or pa.types.is_floating(tipo) or pa.types.is_decimal(tipo):
+            numero = _numero(valor)
+            return None if numero is None else pa.scalar(numero)
+        if pa.types.is_string(tipo) or pa.types.is_large_string(tipo):
+            return pa.scalar(str(valor), type=tipo)
+        return pa.scalar(valor).cast(tipo)
+    except (pa.lib.ArrowException, TypeError, ValueError, OverflowError):
+        return None
+
+
+def _chave_ordenacao(valor: Any) -> Tuple:
+    numero = _numero(valor)
+    return (1, numero) if numero is not None else (2, str(valor))
+
+
+@dataclass(frozen=True)
+class Filtro:
+    """Condição ``coluna operador valor``."""
+    coluna: str
+    operador: str
+    valor: Any
+
+    def testar(self, valor: Any) -> bool:
+        """Avalia a condição num valor lido em Python."""
+        if self.operador in ("nao_in", "!=") and _vazio(valor):
+            # Como no Arrow: comparação com nulo não seleciona a linha
+            return False
+        if self.operador in ("in", "nao_in"):
+            candidatos = self.valor if isinstance(self.valor, (list, tuple, set)) else [self.valor]
+            presente = any(self._igual(valor, c) for c in candidatos)
+            return presente if self.operador == "in" else not presente
+        if self.operador == "contem":
+            return not _vazio(valor) and str(self.valor).lower() in str(valor).lower()
+        if self.operador == "==":
+            return self._igual(valor, self.valor)
+        if self.operador == "!=":
+            return not self._igual(valor, self.valor)
+        if _vazio(valor):
+            return False
+        a, b = _numero(valor), _numero(self.valor)
+        if a is None or b is None:
+            a, b = str(valor), str(self.valor)
+        return {">": a > b, ">=": a >= b, "<": a < b, "<=": a <= b}[self.operador]
+
+    @staticmethod
+    def _igual(valor: Any, referencia: Any) -> bool:
+        if valor == referencia:
+            return True
+        if isinstance(referencia, bool) and isinstance(valor, str):
+            return valor.strip().lower() in (("true", "1", "sim") if referencia else ("false", "0", "nao", "não"))
+        if isinstance(valor, bool) and isinstance(referencia, str):
+            # Literal convertido para o tipo da célula, como em _literal_arrow
+            return referencia.strip().lower() in (("true", "1", "sim") if valor else ("false", "0", "nao", "não"))
+        a, b = _numero(valor), _numero(referencia)
+        if a is not None and b is not None:
+            return a == b
+        return not _vazio(valor) and str(valor) == str(referencia)
+
+    def expressao(self, tipo: Any) -> Any:
+        """
+        Expressão equivalente do ``pyarrow.compute``.
+
+        Args:
+            tipo: Tipo Arrow da coluna; os literais são convertidos para ele e,
+                se algum não couber, a coluna é comparada como texto
+        """
+        campo = pc.field(self.coluna)
+        texto = pa.types.is_string(tipo) or pa.types.is_large_string(tipo)
+        if self.operador == "contem":
+            return pc.match_substring(campo if texto else campo.cast(pa.string()), str(self.valor), ignore_case=True)
+
+        valores = list(self.valor) if isinstance(self.valor, (list, tuple, set)) else [self.valor]
+        literais = [_literal_arrow(valor, tipo) for valor in valores]
+        if any(literal is None for literal in literais):
+            campo, literais = campo.cast(pa.string()), [pa.scalar(str(valor)) for valor in valores]
+        if self.operador in ("in", "nao_in"):
+            expressao = reduce(lambda a, b: a | b, (campo == literal for literal in literais), pc.scalar(False))
+            return expressao if self.operador == "in" else ~expressao
+        literal = literais[0]
+        return {
+            "==": campo == literal, "!=": campo != literal, ">": campo > literal,
+            ">=": campo >= literal, "<": campo < literal, "<=": campo <= literal,
+        }[self.operador]
+
+
+@dataclass(frozen=True)
+class Metrica:
+    """Métrica ``funcao(coluna)`` com o nome usado na saída; sem coluna, contagem conta linhas."""
+    nome: str
+    funcao: str
+    coluna: Optional[str] = None
+
+
+class _Acumulador:
+    """Estado de uma métrica num grupo."""
+
+    __slots__ = ("funcao", "total", "quantidade", "valor", "distintos")
+
+    def __init__(self, funcao: str):
+        self.funcao = funcao
+        self.total = 0
+        self.quantidade = 0
+        self.valor = None
+        self.distintos = set() if funcao == "distintos" else None
+
+    def adicionar(self, valor: Any) -> None:
+        funcao = self.funcao
+        if funcao == "contagem":
+            self.quantidade += not _vazio(valor)
+        elif funcao in ("soma", "media"):
+            numero = _numero(valor)
+            if numero is not None:
+                self.total += numero
+                self.quantidade += 1
+        elif funcao == "distintos":
+            if not _vazio(valor):
+                self.distintos.add(valor if not isinstance(valor, (list, dict)) else json.dumps(valor, sort_keys=True))
+        elif not _vazio(valor):
+            numero = _numero(valor)
+            valor = numero if numero is not None else valor
+            if self.valor is None:
+                self.valor = valor
+            else:
+                atual, novo = _chave_ordenacao(self.valor), _chave_ordenacao(valor)
+                if (novo < atual) if funcao == "min" else (novo > atual):
+                    self.valor = valor
+
+    def resultado(self) -> Any:
+        if self.funcao == "contagem":
+            return self.quantidade
+        if self.funcao == "soma":
+            return self.total if self.quantidade else None
+        if self.funcao == "media":
+            return self.total / self.quantidade if self.quantidade else None
+        if self.funcao == "distintos":
+            return len(self.distintos)
+        return self.valor
+
+
+def _json_ou_texto(valor: Any) -> Any:
+    """Parâmetros vindos do LLM podem chegar como JSON em texto."""
+    if isinstance(valor, str) and valor.strip()[:1] in ("[", "{"):
+        try:
+            return json.loads(valor)
+        except json.JSONDecodeError:
+            pass
+    return valor
+
+
+def _lista(valor: Any) -> List[str]:
+    valor = _json_ou_texto(valor)
+    if not valor:
+        return []
+    if isinstance(valor, str):
+        return [parte.strip() for parte in valor.split(",") if parte.strip()]
+    return [str(item) for item in valor]
+
+
+def _valor_literal(texto: str) -> Any:
+    try:
+        return json.loads(texto)
+    except json.JSONDecodeError:
+        return texto.strip("\"'")
+
+
+def _normalizar_filtros(filtros: Any) -> List[Filtro]:
+    filtros = _json_ou_texto(filtros)
+    if not filtros:
+        return []
+    itens: List[Tuple[str, str, Any]] = []
+    if isinstance(filtros, dict):
+        for coluna, valor in filtros.items():
+            if isinstance(valor, dict):
+                itens.extend((coluna, operador, v) for operador, v in valor.items())
+            elif isinstance(valor, (list, tuple)):
+                itens.append((coluna, "in", list(valor)))
+            else:
+                itens.append((coluna, "==", valor))
+    else:
+        for item in [filtros] if isinstance(filtros, str) else filtros:
+            if isinstance(item, dict):
+                itens.append((item.get("coluna"), item.get("operador", "=="), item.get("valor")))
+            elif isinstance(item, str):
+                encontrado = _FILTRO_TEXTO.match(item)
+                if not encontrado:
+                    raise ValidationError(f"Filtro inválido: {item!r} (use 'coluna >= valor' ou 'coluna contem texto')")
+                coluna, operador, valor = [g for g in encontrado.groups() if g is not None]
+                itens.append((coluna, operador, _valor_literal(valor)))
+            elif isinstance(item, (list, tuple)) and len(item) == 3:
+                itens.append(tuple(item))
+            else:
+                raise ValidationError(f"Filtro inválido: {item!r}")
+
+    resultado = []
+    for coluna, operador, valor in itens:
+        operador = {"=": "==", "not in": "nao_in", "contains": "contem"}.get(operador, operador)
+        if not coluna or operador not in OPERADORES:
+            raise ValidationError(f"Filtro inválido: {coluna!r} {operador!r} (operadores: {', '.join(OPERADORES)})")
+        resultado.append(Filtro(str(coluna), operador, valor))
+    return resultado
+
+
+def _normalizar_metricas(metricas: Any) -> List[Metrica]:
+    """
+    ``{"nome": "funcao(coluna)"}``, ``{"coluna": "funcao"}`` ou ``["funcao(coluna)", ...]``.
+
+    ``contagem`` sem coluna (``{"total": "contagem()"}``) conta as linhas do grupo.
+    """
+    metricas = _json_ou_texto(metricas)
+    if not metricas:
+        return []
+    if isinstance(metricas, str):
+        metricas = [parte.strip() for parte in re.split(r",\s*(?![^()]*\))", metricas) if parte.strip()]
+    pares = metricas.items() if isinstance(metricas, dict) else ((texto, texto) for texto in metricas)
+
+    resultado = []
+    for nome, especificacao in pares:
+        encontrado = _METRICA_TEXTO.match(str(especificacao))
+        if encontrado:
+            funcao, coluna = encontrado.group(1), encontrado.group(2) or None
+        else:
+            funcao, coluna = str(especificacao).strip(), None
+            if isinstance(metricas, dict) and funcao != "contagem":
+                coluna = nome
+        funcao = _SINONIMOS.get(funcao.lower(), funcao.lower())
+        if funcao not in FUNCOES:
+            raise ValidationError(f"Função de agregação desconhecida: {funcao} (use {', '.join(FUNCOES)})")
+        if coluna is None and funcao != "contagem":
+            raise ValidationError(f"A métrica {nome!r} precisa de uma coluna: {funcao}(coluna)")
+        resultado.append(Metrica(str(nome), funcao, coluna))
+    return resultado
+
+
+@dataclass
+class Consulta:
+    """Consulta já validada."""
+    colunas: List[str] = field(default_factory=list)
+    filtros: List[Filtro] = field(default_factory=list)
+    agrupar_por: List[str] = field(default_factory=list)
+    metricas: List[Metrica] = field(default_factory=list)
+    ordenar_por: Optional[str] = None
+    decrescente: bool = False
+    limite: Optional[int] = None
+
+    @classmethod
+    def criar(
+        cls,
+        colunas: Any = None,
+        filtros: Any = None,
+        agrupar_por: Any = None,
+        metricas: Any = None,
+        ordenar_por: Optional[str] = None,
+        decrescente: bool = False,
+        limite: Optional[int] = None
+    ) -> "Consulta":
+        """Normaliza os parâmetros (listas, dicionários ou texto) e valida operadores e funções."""
+        consulta = cls(
+            _lista(colunas), _normalizar_filtros(filtros), _lista(agrupar_por), _normalizar_metricas(metricas),
+            ordenar_por or None, bool(decrescente), int(limite) if limite is not None else None
+        )
+        if consulta.agrupar_por and not consulta.metricas:
+            consulta.metricas = [Metrica("contagem", "contagem")]
+        if consulta.agregada and consulta.ordenar_por and consulta.ordenar_por not in consulta.colunas_saida():
+            raise ValidationError(
+                f"Só é possível ordenar o resultado agregado por: {', '.join(consulta.colunas_saida())}"
+            )
+        return consulta
+
+    @property
+    def agregada(self) -> bool:
+        return bool(self.agrupar_por or self.metricas)
+
+    def colunas_lidas(self) -> Optional[List[str]]:
+        """Colunas necessárias para responder (None = todas)."""
+        if not self.agregada and not self.colunas:
+            return None
+        necessarias = self.agrupar_por + [m.coluna for m in self.metricas if m.coluna] if self.agregada else self.colunas
+        necessarias = necessarias + [f.coluna for f in self.filtros]
+        if self.ordenar_por and not self.agregada:
+            necessarias.append(self.ordenar_por)
+        return list(dict.fromkeys(necessarias))
+
+    def colunas_saida(self) -> List[str]:
+        if self.agregada:
+            return self.agrupar_por + [m.nome for m in self.metricas]
+        return list(self.colunas)
+
+
+@dataclass
+class ResultadoConsulta:
+    """Linhas resultantes de uma consulta."""
+    colunas: List[str]
+    linhas: List[Dict[str, Any]]
+    linhas_lidas: int
+    motor: str
+    segundos: float
+
+    def formatar(self, max_caracteres: int = 60) -> str:
+        """Tabela Markdown com uma linha de resumo."""
+        def celula(valor: Any) -> str:
+            if valor is None:
+                return ""
+            if isinstance(valor, float):
+                valor = round(valor, 4)
+            texto = str(valor).replace("|", "\\|").replace("\n", " ")
+            return texto if len(texto) <= max_caracteres else texto[:max_caracteres - 1] + "…"
+
+        if not self.linhas:
+            return f"Nenhuma linha encontrada ({self.linhas_lidas} linha(s) lida(s))."
+        tabela = [
+            "| " + " | ".join(self.colunas) + " |",
+            "|" + "---|" * len(self.colunas),
+            *("| " + " | ".join(celula(linha.get(c)) for c in self.colunas) + " |" for linha in self.linhas),
+        ]
+        tabela.append(
+            f"\n{len(self.linhas)} linha(s) de resultado; {self.linhas_lidas} linha(s) lida(s) "
+            f"em {self.segundos:.2f}s ({self.motor})."
+        )
+        return "\n".join(tabela)
+
+
+def _ordenar(linhas: Iterable[Dict[str, Any]], coluna: str, decrescente: bool, limite: Optional[int]) -> List[Dict]:
+    """Ordena mantendo valores vazios no fim; com limite, guarda só os ``limite`` primeiros (heap)."""
+    def chave(linha: Dict[str, Any]) -> Tuple:
+        valor = linha.get(coluna)
+        if _vazio(valor):
+            return (0,) if decrescente else (3,)
+        return _chave_ordenacao(valor)
+
+    if limite is None:
+        return sorted(linhas, key=chave, reverse=decrescente)
+    return (heapq.nlargest if decrescente else heapq.nsmallest)(limite, linhas, key=chave)
+
+
+def executar_consulta(registros: Iterable[Dict[str, Any]], consulta: Consulta) -> Tuple[List[str], List[Dict], int]:
+    """
+    Executa a consulta em Python sobre registros lidos em sequência.
+
+    Returns:
+        (colunas, linhas, quantidade de registros lidos)
+    """
+    lidos = 0
+    filtros = consulta.filtros
+
+    def selecionados() -> Iterable[Dict[str, Any]]:
+        nonlocal lidos
+        for registro in registros:
+            lidos += 1
+            if all(f.testar(registro.get(f.coluna)) for f in filtros):
+                yield registro
+
+    if consulta.agregada:
+        metricas = consulta.metricas
+        grupos: Dict[Tuple, List[_Acumulador]] = {}
+        for registro in selecionados():
+            chave = tuple(registro.get(c) for c in consulta.agrupar_por)
+            acumuladores = grupos.get(chave)
+            if acumuladores is None:
+                acumuladores = grupos[chave] = [_Acumulador(m.funcao) for m in metricas]
+            for metrica, acumulador in zip(metricas, acumuladores):
+                acumulador.adicionar(registro.get(metrica.coluna) if metrica.coluna else True)
+        if not grupos and not consulta.agrupar_por:
+            grupos[()] = [_Acumulador(m.funcao) for m in metricas]
+        linhas = [
+            {**dict(zip(consulta.agrupar_por, chave)), **{m.nome: a.resultado() for m, a in zip(metricas, acumuladores)}}
+            for chave, acumuladores in grupos.items()
+        ]
+        if consulta.ordenar_por:
+            linhas = _ordenar(linhas, consulta.ordenar_por, consulta.decrescente, consulta.limite)
+        elif consulta.limite is not None:
+            linhas = linhas[:consulta.limite]
+        return consulta.colunas_saida(), linhas, lidos
+
+    if consulta.ordenar_por:
+        linhas = _ordenar(selecionados(), consulta.ordenar_por, consulta.decrescente, consulta.limite)
+    else:
+        # Sem ordenação, a leitura para assim que o limite é atingido
+        linhas = list(itertools.islice(selecionados(), consulta.limite))
+    colunas = consulta.colunas or list(dict.fromkeys(chave for linha in linhas for chave in linha))
+    if consulta.colunas:
+        linhas = [{c: linha.get(c) for c in colunas} for linha in linhas]
+    return colunas, linhas, lidos
+
+
+class CacheTabelas:
+    """Tabelas Arrow por caminho, validadas por mtime e tamanho, em LRU limitado por bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entradas: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def obter(self, caminho: str) -> Optional[Any]:
+        estado = os.stat(caminho)
+        with self._lock:
+            entrada = self._entradas.get(caminho)
+            if entrada is None:
+                return None
+            if entrada[:2] != (estado.st_mtime_ns, estado.st_size):
+                self._remover(caminho)
+                return None
+            self._entradas.move_to_end(caminho)
+            return entrada[2]
+
+    def guardar(self, caminho: str, estado: os.stat_result, tabela: Any) -> None:
+        with self._lock:
+            if caminho in self._entradas:
+                self._remover(caminho)
+            if tabela.nbytes > self.max_bytes:
+                return
+            self._entradas[caminho] = (estado.st_mtime_ns, estado.st_size, tabela)
+            self._bytes += tabela.nbytes
+            while self._bytes > self.max_bytes:
+                self._remover(next(iter(self._entradas)))
+
+    def _remover(self, caminho: str) -> None:
+        self._bytes -= self._entradas.pop(caminho)[2].nbytes
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+
+_tabelas = CacheTabelas(_config["cache_max_bytes"])
+
+
+def _tem_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _carregar_tabela(caminho: str, formato: str, delimitador: str) -> Any:
+    caminho = normalizar_caminho(caminho)
+    tabela = _tabelas.obter(caminho)
+    if tabela is None:
+        estado = os.stat(caminho)
+        if formato == "csv":
+            from pyarrow import csv as pa_csv
+            tabela = pa_csv.read_csv(
+                caminho,
+                parse_options=pa_csv.ParseOptions(delimiter=delimitador),
+                # Só a célula vazia é nula, como em _tipar
+                convert_options=pa_csv.ConvertOptions(null_values=[""], strings_can_be_null=True)
+            )
+        else:
+            from pyarrow import json as pa_json
+            tabela = pa_json.read_json(caminho)
+        _tabelas.guardar(caminho, estado, tabela)
+        logger.debug(f"Tabela carregada: {caminho} ({tabela.num_rows} linhas, {tabela.nbytes} bytes)")
+    return tabela
+
+
+def validar_colunas(disponiveis: Iterable[str], consulta: Consulta) -> None:
+    """Falha com ValidationError se a consulta usa colunas que não estão em ``disponiveis``."""
+    disponiveis = list(disponiveis)
+    ausentes = [c for c in consulta.colunas_lidas() or [] if c not in disponiveis]
+    if ausentes:
+        raise ValidationError(f"Coluna(s) inexistente(s): {', '.join(ausentes)}. Disponíveis: {', '.join(disponiveis)}")
+
+
+def _filtro_arrow(schema: Any, consulta: Consulta) -> Any:
+    expressao = None
+    for filtro in consulta.filtros:
+        atual = filtro.expressao(schema.field(filtro.coluna).type)
+        expressao = atual if expressao is None else expressao & atual
+    return expressao
+
+
+def _executar_arrow(caminho: str, formato: str, consulta: Consulta, delimitador: str) -> Tuple[List[str], List[Dict], int]:
+    colunas = consulta.colunas_lidas()
+
+    try:
+        if formato == "parquet":
+            import pyarrow.dataset as pa_ds
+            conjunto = pa_ds.dataset(caminho, format="parquet")
+            validar_colunas(conjunto.schema.names, consulta)
+            lidos = conjunto.count_rows()
+            tabela = conjunto.to_table(columns=colunas, filter=_filtro_arrow(conjunto.schema, consulta))
+        else:
+            tabela = _carregar_tabela(caminho, formato, delimitador)
+            validar_colunas(tabela.schema.names, consulta)
+            lidos = tabela.num_rows
+            expressao = _filtro_arrow(tabela.schema, consulta)
+            if expressao is not None:
+                tabela = tabela.filter(expressao)
+            if colunas is not None:
+                tabela = tabela.select(colunas)
+
+        if consulta.agregada:
+            tabela = _agregar_arrow(tabela, consulta)
+        if consulta.ordenar_por:
+            tabela = tabela.sort_by([(consulta.ordenar_por, "descending" if consulta.decrescente else "ascending")])
+        if consulta.limite is not None:
+            tabela = tabela.slice(0, consulta.limite)
+    except pa.lib.ArrowException as e:
+        raise ValidationError(f"Consulta inválida para {caminho}: {e}")
+
+    saida = consulta.colunas_saida() or tabela.schema.names
+    linhas = [{chave: _valor_saida(valor) for chave, valor in linha.items()} for linha in tabela.select(saida).to_pylist()]
+    return saida, linhas, lidos
+
+
+def _agregar_arrow(tabela: Any, consulta: Consulta) -> Any:
+    """Todas as métricas numa única passada (``group_by().aggregate``)."""
+    if not consulta.agrupar_por:
+        valores = {}
+        for metrica in consulta.metricas:
+            if metrica.coluna is None:
+                valores[metrica.nome] = [tabela.num_rows]
+            else:
+                valores[metrica.nome] = [getattr(pc, _FUNCOES_ARROW[metrica.funcao])(tabela[metrica.coluna]).as_py()]
+        return pa.table(valores)
+
+    especificacoes: Dict[Tuple[str, str], Any] = {}
+    for metrica in consulta.metricas:
+        if metrica.coluna is None:
+            chave = (consulta.agrupar_por[0], "count")
+            especificacoes[chave] = (*chave, pc.CountOptions(mode="all"))
+        else:
+            chave = (metrica.coluna, _FUNCOES_ARROW[metrica.funcao])
+            especificacoes.setdefault(chave, chave)
+    agregado = tabela.group_by(consulta.agrupar_por).aggregate(list(especificacoes.values()))
+
+    colunas = {c: agregado[c] for c in consulta.agrupar_por}
+    for metrica in consulta.metricas:
+        coluna, funcao = (consulta.agrupar_por[0], "count") if metrica.coluna is None else (
+            metrica.coluna, _FUNCOES_ARROW[metrica.funcao]
+        )
+        colunas[metrica.nome] = agregado[f"{coluna}_{funcao}"]
+    return pa.table(colunas)
+
+
+def detectar_formato(caminho: str) -> str:
+    """Formato pela extensão (csv, tsv, json, jsonl, xml ou parquet)."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in (".parquet", ".pq"):
+        return "parquet"
+    formato = EXTENSOES.get(extensao)
+    if formato is None:
+        raise ValidationError(f"Não foi possível deduzir o formato de {caminho}; informe o formato explicitamente.")
+    return formato
+
+
+def consultar(
+    caminho: str,
+    colunas: Any = None,
+    filtros: Any = None,
+    agrupar_por: Any = None,
+    metricas: Any = None,
+    ordenar_por: Optional[str] = None,
+    decrescente: bool = False,
+    limite: Optional[int] = None,
+    formato: Optional[str] = None,
+    motor: Optional[str] = None
+) -> ResultadoConsulta:
+    """
+    Consulta um arquivo de dados.
+
+    Args:
+        caminho: Arquivo CSV, TSV, JSON, JSON Lines, XML ou Parquet
+        colunas: Colunas do resultado (consultas sem agregação)
+        filtros: ``{"coluna": valor}``, ``{"coluna": {">=": 10}}``, ``[["coluna", ">=", 10]]`` ou ``["coluna >= 10"]``
+        agrupar_por: Colunas de agrupamento
+        metricas: ``{"nome": "funcao(coluna)"}`` com soma, media, min, max, contagem ou distintos
+        ordenar_por: Coluna do resultado usada na ordenação
+        decrescente: Ordem decrescente
+        limite: Máximo de linhas do resultado (None = todas)
+        formato: Formato do arquivo (deduzido da extensão se omitido)
+        motor: "pyarrow", "python" ou "auto" (padrão do config)
+
+    Returns:
+        Resultado com as linhas, as colunas e quantas linhas foram lidas
+    """
+    inicio = time.perf_counter()
+    if not os.path.isfile(caminho):
+        raise ValidationError(f"Arquivo não encontrado: {caminho}")
+    formato = (formato or detectar_formato(caminho)).lower()
+    delimitador = delimitador_padrao(caminho)
+    if formato == "tsv":
+        formato, delimitador = "csv", "\t"
+    consulta = Consulta.criar(colunas, filtros, agrupar_por, metricas, ordenar_por, decrescente, limite)
+
+    motor = motor or _config["motor"]
+    if motor == "auto":
+        motor = "pyarrow" if formato in ("csv", "jsonl", "parquet") and _tem_pyarrow() else "python"
+    if motor == "pyarrow":
+        saida, linhas, lidos = _executar_arrow(caminho, formato, consulta, delimitador)
+    elif formato == "parquet":
+        raise ValidationError("A leitura de arquivos Parquet requer o pacote pyarrow.")
+    else:
+        registros = ler_registros(caminho, formato, delimitador)
+        if formato == "csv":
+            registros = _tipar_registros(registros)
+        saida, linhas, lidos = executar_consulta(registros, consulta)
+
+    resultado = ResultadoConsulta(saida, linhas, lidos, motor, time.perf_counter() - inicio)
+    logger.debug(f"Consulta em {caminho}: {len(linhas)} linha(s) de {lidos} em {resultado.segundos:.3f}s ({motor})")
+    return resultado
+
+
+def consultar_dados(
+    caminho: str,
+    colunas: Any = None,
+    filtros: Any = None,
+    agrupar_por: Any = None,
+    metricas: Any = None,
+    ordenar_por: Optional[str] = None,
+    decrescente: bool = False,
+    limite: Optional[int] = None,
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Consulta um arquivo de dados e devolve só o resultado, em tabela.
+
+    Args:
+        caminho: Arquivo CSV, TSV, JSON, JSON Lines, XML ou Parquet
+        colunas: Colunas do resultado (consultas sem agregação)
+        filtros: Condições, ex.: ``["valor >= 100", "uf == 'SP'"]``
+        agrupar_por: Colunas de agrupamento
+        metricas: ``{"nome": "funcao(coluna)"}`` com soma, media, min, max, contagem ou distintos
+        ordenar_por: Coluna do resultado usada na ordenação
+        decrescente: Ordem decrescente
+        limite: Máximo de linhas do resultado
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Tabela Markdown com o resultado
+    """
+    if limite is None:
+        limite = _config["limite_padrao"]
+    if mcp_client:
+        logger.info(f"Delegando consultar_dados para MCP Server: {caminho}")
+        tarefa_execucao = {
+            "tipo": "executar_ferramenta",
+            "nome_ferramenta": "consultar_dados",
+            "parametros": {
+                "caminho": caminho, "colunas": colunas, "filtros": filtros, "agrupar_por": agrupar_por,
+                "metricas": metricas, "ordenar_por": ordenar_por, "decrescente": decrescente, "limite": limite
+            }
+        }
+        resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+        return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+    return consultar(caminho, colunas, filtros, agrupar_por, metricas, ordenar_por, decrescente, limite).formatar()
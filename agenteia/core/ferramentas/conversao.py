@@ -0,0 +1,534 @@
+"""
+Conversão entre CSV, JSON, JSON Lines e XML em streaming.
+
+Os leitores produzem um registro (dicionário) por vez: ``csv.DictReader``
+linha a linha, JSON Lines linha a linha, arrays JSON elemento a elemento
+(``JSONDecoder.raw_decode`` sobre blocos do arquivo) e XML com
+``iterparse``, limpando cada registro depois de emitido. Os escritores
+gravam incrementalmente; arrays JSON e documentos XML são abertos e fechados
+em volta dos registros. A memória usada depende do tamanho do lote, não do
+arquivo.
+
+Com ``trabalhadores > 1``, os lotes são serializados em paralelo num pool de
+processos (a leitura continua sequencial), mantendo a ordem e no máximo
+``2 * trabalhadores`` lotes em memória. Só compensa quando a serialização
+domina (registros grandes ou aninhados); com registros pequenos a leitura é
+o gargalo e o envio dos lotes aos processos custa mais do que economiza.
+"""
+
+import csv
+import io
+import itertools
+import json
+import os
+import re
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..exceptions import ValidationError
+from ..logs import setup_logging
+from .gravacao import aplicar_permissoes_padrao
+
+logger = setup_logging(__name__)
+
+FORMATOS = ("csv", "json", "jsonl", "xml")
+
+EXTENSOES = {
+    ".csv": "csv", ".tsv": "csv", ".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".xml": "xml",
+}
+
+TAMANHO_LOTE = 5000
+TAMANHO_BLOCO = 1024 * 1024
+TAG_RAIZ = "root"
+TAG_REGISTRO = "registro"
+
+Origem = Union[str, IO]
+
+
+@dataclass
+class ResumoConversao:
+    """Resultado de uma conversão."""
+    origem: str
+    destino: str
+    formato_origem: str
+    formato_destino: str
+    registros: int
+    bytes_lidos: int
+    bytes_escritos: int
+    segundos: float
+
+    @property
+    def mb_por_segundo(self) -> float:
+        return self.bytes_lidos / (1024 * 1024) / self.segundos if self.segundos else 0.0
+
+    def formatar(self) -> str:
+        return (
+            f"Convertido {self.origem} ({self.formato_origem}) -> {self.destino} ({self.formato_destino}): "
+            f"{self.registros} registro(s), {self.bytes_escritos} bytes em {self.segundos:.2f}s "
+            f"({self.mb_por_segundo:.1f} MB/s)"
+        )
+
+
+def detectar_formato(caminho: str) -> str:
+    """Formato pela extensão do arquivo."""
+    formato = EXTENSOES.get(os.path.splitext(caminho)[1].lower())
+    if formato is None:
+        raise ValidationError(f"Não foi possível deduzir o formato de {caminho}; informe o formato explicitamente.")
+    return formato
+
+
+def delimitador_padrao(caminho: str) -> str:
+    """Delimitador de CSV pela extensão: tabulação para .tsv, vírgula para os demais."""
+    return "\t" if caminho.lower().endswith(".tsv") else ","
+
+
+def _abrir(origem: Origem, encoding: str, newline: Optional[str] = None) -> Tuple[IO, bool]:
+    if isinstance(origem, str):
+        return open(origem, "r", encoding=encoding, newline=newline), True
+    return origem, False
+
+
+# ---------------------------------------------------------------- leitores
+
+def ler_csv(origem: Origem, delimitador: str = ",", encoding: str = "utf-8-sig") -> Iterator[Dict[str, Any]]:
+    """Registros de um CSV, uma linha por vez."""
+    arquivo, fechar = _abrir(origem, encoding, newline="")
+    try:
+        yield from csv.DictReader(arquivo, delimiter=delimitador)
+    finally:
+        if fechar:
+            arquivo.close()
+
+
+def ler_jsonl(origem: Origem, encoding: str = "utf-8") -> Iterator[Dict[str, Any]]:
+    """Registros de um arquivo JSON Lines."""
+    arquivo, fechar = _abrir(origem, encoding)
+    try:
+        for numero, linha in enumerate(arquivo, 1):
+            if linha.strip():
+                try:
+                    yield _como_registro(json.loads(linha))
+                except json.JSONDecodeError as e:
+                    raise ValidationError(f"JSON inválido na linha {numero}: {e}")
+    finally:
+        if fechar:
+            arquivo.close()
+
+
+def _como_registro(valor: Any) -> Dict[str, Any]:
+    return valor if isinstance(valor, dict) else {"valor": valor}
+
+
+# O que pode continuar um número cortado no fim do bloco ("1." + "5e10")
+_RESTO_DE_NUMERO = re.compile(r"[\d.eE+-]*\Z")
+
+
+def _pode_estar_incompleto(erro: json.JSONDecodeError, buffer: str) -> bool:
+    # Um valor cortado no fim do buffer falha perto do fim (ou como string
+    # aberta); um erro antes disso é JSON inválido e não melhora lendo mais
+    return len(buffer) - erro.pos <= 10 or erro.msg.startswith("Unterminated string")
+
+
+def ler_json(origem: Origem, encoding: str = "utf-8", tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[Dict[str, Any]]:
+    """
+    Registros de um documento JSON.
+
+    Um array no topo é lido elemento a elemento, em blocos de
+    ``tamanho_bloco`` caracteres; qualquer outro valor é um único registro.
+    Um erro de sintaxe falha no bloco em que aparece, sem ler o resto do
+    arquivo.
+    """
+    arquivo, fechar = _abrir(origem, encoding)
+    decodificador = json.JSONDecoder()
+    buffer = ""
+    posicao = 0
+    fim_arquivo = False
+
+    def ler_mais() -> bool:
+        nonlocal buffer, posicao, fim_arquivo
+        if fim_arquivo:
+            return False
+        bloco = arquivo.read(tamanho_bloco)
+        if not bloco:
+            fim_arquivo = True
+            return False
+        buffer = buffer[posicao:] + bloco
+        posicao = 0
+        return True
+
+    def proximo_caractere() -> str:
+        nonlocal posicao
+        while True:
+            while posicao < len(buffer) and buffer[posicao].isspace():
+                posicao += 1
+            if posicao < len(buffer):
+                return buffer[posicao]
+            if not ler_mais():
+                return ""
+
+    def decodificar() -> Any:
+        nonlocal posicao
+        while True:
+            try:
+                valor, fim = decodificador.raw_decode(buffer, posicao)
+                # Um número no fim do buffer pode continuar no próximo bloco:
+                # raw_decode aceita "1" de "1." ou "1e" e o resto quebraria a leitura
+                numero = isinstance(valor, (int, float)) and not isinstance(valor, bool)
+                if not fim_arquivo and (fim == len(buffer) or numero and _RESTO_DE_NUMERO.match(buffer, fim)):
+                    raise json.JSONDecodeError("valor possivelmente incompleto", buffer, len(buffer))
+            except json.JSONDecodeError as e:
+                if not fim_arquivo and _pode_estar_incompleto(e, buffer):
+                    ler_mais()
+                    continue
+                raise ValidationError(f"JSON inválido: {e.msg}")
+            posicao = fim
+            return valor
+
+    try:
+        if proximo_caractere() != "[":
+            if posicao < len(buffer):
+                valor = decodificar()
+                if proximo_caractere():
+                    raise ValidationError("JSON inválido: conteúdo após o fim do documento")
+                yield _como_registro(valor)
+            return
+
+        posicao += 1
+        if proximo_caractere() == "]":
+            return
+        while True:
+            yield _como_registro(decodificar())
+
+            separador = proximo_caractere()
+            if separador == "]":
+                return
+            if separador != ",":
+                raise ValidationError(f"JSON inválido: esperado ',' ou ']' e encontrado {separador!r}")
+            posicao += 1
+            proximo_caractere()
+    finally:
+        if fechar:
+            arquivo.close()
+
+
+def _elemento_para_dict(elemento: ET.Element) -> Dict[str, Any]:
+    dados: Dict[str, Any] = {f"@{nome}": valor for nome, valor in elemento.attrib.items()}
+    for filho in elemento:
+        valor = _elemento_para_dict(filho) if len(filho) or filho.attrib else (filho.text or "").strip()
+        if filho.tag in dados:
+            if not isinstance(dados[filho.tag], list):
+                dados[filho.tag] = [dados[filho.tag]]
+            dados[filho.tag].append(valor)
+        else:
+            dados[filho.tag] = valor
+    texto = (elemento.text or "").strip()
+    if texto and not len(elemento):
+        dados["#texto"] = texto
+    return dados
+
+
+def ler_xml(origem: Origem, tag_registro: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Registros de um XML com ``iterparse``.
+
+    Cada filho direto da raiz é um registro (ou cada elemento ``tag_registro``,
+    em qualquer profundidade). Os elementos são descartados depois de emitidos.
+    """
+    raiz = None
+    profundidade = 0
+    dentro_de_registro = 0
+    for evento, elemento in ET.iterparse(origem, events=("start", "end")):
+        if evento == "start":
+            profundidade += 1
+            if raiz is None:
+                raiz = elemento
+            if tag_registro and elemento.tag == tag_registro:
+                dentro_de_registro += 1
+            continue
+
+        registro = elemento.tag == tag_registro if tag_registro else profundidade == 2
+        if registro:
+            yield _elemento_para_dict(elemento)
+        profundidade -= 1
+        if tag_registro:
+            if registro:
+                dentro_de_registro -= 1
+                elemento.clear()
+            elif not dentro_de_registro and elemento is not raiz:
+                # Elementos fora de registros também são descartados
+                elemento.clear()
+        if profundidade == 1 and not dentro_de_registro:
+            raiz.clear()
+
+
+def ler_registros(
+    origem: Origem,
+    formato: str,
+    delimitador: str = ",",
+    tag_registro: Optional[str] = None,
+    encoding: str = "utf-8"
+) -> Iterator[Dict[str, Any]]:
+    """Leitor adequado ao formato."""
+    if formato == "csv":
+        return ler_csv(origem, delimitador, "utf-8-sig" if encoding == "utf-8" else encoding)
+    if formato == "jsonl":
+        return ler_jsonl(origem, encoding)
+    if formato == "json":
+        return ler_json(origem, encoding)
+    if formato == "xml":
+        return ler_xml(origem, tag_registro)
+    raise ValidationError(f"Formato de origem não suportado: {formato}")
+
+
+# -------------------------------------------------------------- escritores
+
+_TAG_INVALIDA = re.compile(r"[^\w.-]")
+
+
+@lru_cache(maxsize=1024)
+def _tag(nome: str) -> str:
+    tag = _TAG_INVALIDA.sub("_", str(nome)) or "_"
+    return f"_{tag}" if not (tag[0].isalpha() or tag[0] == "_") else tag
+
+
+def _xml(tag: str, valor: Any, partes: List[str]) -> None:
+    """Acrescenta o elemento a ``partes`` (mais rápido que montar um ``ET.Element`` por registro)."""
+    if not isinstance(valor, dict):
+        if valor is None:
+            partes.append(f"<{tag} />")
+        else:
+            partes.append(f"<{tag}>{escape(str(valor))}</{tag}>")
+        return
+    atributos = "".join(
+        f" {_tag(chave[1:])}={quoteattr('' if item is None else str(item))}"
+        for chave, item in valor.items() if chave.startswith("@")
+    )
+    partes.append(f"<{tag}{atributos}>")
+    for chave, item in valor.items():
+        if chave == "#texto":
+            partes.append(escape("" if item is None else str(item)))
+        elif not chave.startswith("@"):
+            for parte in item if isinstance(item, list) else [item]:
+                _xml(_tag(chave), parte, partes)
+    partes.append(f"</{tag}>")
+
+
+def _celula_csv(valor: Any) -> Any:
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, ensure_ascii=False)
+    return valor
+
+
+def _serializar_lote(
+    formato: str,
+    registros: List[Dict[str, Any]],
+    colunas: Optional[List[str]] = None,
+    delimitador: str = ",",
+    tag_registro: str = TAG_REGISTRO
+) -> str:
+    """Serializa um lote de registros (sem cabeçalho nem separadores entre lotes)."""
+    if formato == "jsonl":
+        return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in registros)
+    if formato == "json":
+        return ",\n".join(json.dumps(r, ensure_ascii=False) for r in registros)
+    if formato == "csv":
+        saida = io.StringIO()
+        escritor = csv.DictWriter(saida, colunas, delimiter=delimitador, extrasaction="ignore", lineterminator="\n")
+        escritor.writerows({k: _celula_csv(v) for k, v in r.items()} for r in registros)
+        return saida.getvalue()
+    if formato == "xml":
+        partes = []
+        for registro in registros:
+            partes.append("  ")
+            _xml(tag_registro, registro, partes)
+            partes.append("\n")
+        return "".join(partes)
+    raise ValidationError(f"Formato de destino não suportado: {formato}")
+
+
+def _lotes(registros: Iterable[Dict[str, Any]], tamanho: int) -> Iterator[List[Dict[str, Any]]]:
+    iterador = iter(registros)
+    while True:
+        lote = list(itertools.islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+def _serializados(
+    lotes: Iterator[List[Dict[str, Any]]],
+    argumentos: Tuple,
+    trabalhadores: int
+) -> Iterator[Tuple[int, str]]:
+    """(registros, texto) de cada lote, em ordem; em paralelo com trabalhadores > 1."""
+    if trabalhadores <= 1:
+        for lote in lotes:
+            yield len(lote), _serializar_lote(argumentos[0], lote, *argumentos[1:])
+        return
+    with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+        pendentes = []
+        for lote in lotes:
+            pendentes.append((len(lote), executor.submit(_serializar_lote, argumentos[0], lote, *argumentos[1:])))
+            # Limita os lotes em memória mantendo a ordem de saída
+            if len(pendentes) >= 2 * trabalhadores:
+                quantidade, futuro = pendentes.pop(0)
+                yield quantidade, futuro.result()
+        for quantidade, futuro in pendentes:
+            yield quantidade, futuro.result()
+
+
+def escrever_registros(
+    registros: Iterable[Dict[str, Any]],
+    destino: IO,
+    formato: str,
+    delimitador: str = ",",
+    tag_registro: str = TAG_REGISTRO,
+    tamanho_lote: int = TAMANHO_LOTE,
+    trabalhadores: int = 1
+) -> int:
+    """
+    Grava os registros incrementalmente num arquivo texto aberto.
+
+    No CSV, as colunas são as chaves do primeiro lote (na ordem em que
+    aparecem); chaves que só surgem depois são ignoradas.
+
+    Returns:
+        Quantidade de registros gravados
+    """
+    if formato not in FORMATOS:
+        raise ValidationError(f"Formato de destino não suportado: {formato}")
+    lotes = _lotes(registros, tamanho_lote)
+    colunas = None
+    if formato == "csv":
+        primeiro = next(lotes, [])
+        colunas = list(dict.fromkeys(chave for registro in primeiro for chave in registro))
+        csv.writer(destino, delimiter=delimitador, lineterminator="\n").writerow(colunas)
+        lotes = itertools.chain([primeiro] if primeiro else [], lotes)
+
+    if formato == "json":
+        destino.write("[\n")
+    elif formato == "xml":
+        destino.write(f'<?xml version="1.0" encoding="utf-8"?>\n<{TAG_RAIZ}>\n')
+
+    total = 0
+    argumentos = (formato, colunas, delimitador, tag_registro)
+    for quantidade, texto in _serializados(lotes, argumentos, trabalhadores):
+        if formato == "json" and total:
+            destino.write(",\n")
+        destino.write(texto)
+        total += quantidade
+
+    if formato == "json":
+        destino.write("\n]\n" if total else "]\n")
+    elif formato == "xml":
+        destino.write(f"</{TAG_RAIZ}>\n")
+    return total
+
+
+def converter_streaming(
+    origem: str,
+    destino: str,
+    formato_origem: Optional[str] = None,
+    formato_destino: Optional[str] = None,
+    delimitador: Optional[str] = None,
+    tag_registro: Optional[str] = None,
+    tamanho_lote: int = TAMANHO_LOTE,
+    trabalhadores: int = 1
+) -> ResumoConversao:
+    """
+    Converte um arquivo em outro formato sem carregá-lo inteiro na memória.
+
+    O resultado é gravado num arquivo temporário ao lado do destino e
+    renomeado no final: uma falha no meio não deixa um destino truncado.
+
+    Args:
+        origem: Arquivo de entrada
+        destino: Arquivo de saída
+        formato_origem: csv, json, jsonl ou xml (deduzido da extensão se omitido)
+        formato_destino: csv, json, jsonl ou xml (deduzido da extensão se omitido)
+        delimitador: Delimitador do CSV (entrada e saída); se omitido, tabulação para .tsv e vírgula para os demais
+        tag_registro: No XML de entrada, o elemento de cada registro; no de saída, o nome do elemento
+        tamanho_lote: Registros por lote de escrita
+        trabalhadores: Processos para serializar os lotes em paralelo
+
+    Returns:
+        Resumo com registros, bytes e tempo
+    """
+    formato_origem = (formato_origem or detectar_formato(origem)).lower()
+    formato_destino = (formato_destino or detectar_formato(destino)).lower()
+    for formato in (formato_origem, formato_destino):
+        if formato not in FORMATOS:
+            raise ValidationError(f"Formato não suportado: {formato} (use {', '.join(FORMATOS)})")
+    if not os.path.isfile(origem):
+        raise ValidationError(f"Arquivo de origem não encontrado: {origem}")
+
+    inicio = time.perf_counter()
+    pasta = os.path.dirname(os.path.abspath(destino))
+    os.makedirs(pasta, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, prefix=f".{os.path.basename(destino)}.", suffix=".tmp")
+    try:
+        with os.fdopen(descritor, "w", encoding="utf-8", newline="") as saida:
+            registros = escrever_registros(
+                ler_registros(origem, formato_origem, delimitador or delimitador_padrao(origem), tag_registro),
+                saida, formato_destino, delimitador or delimitador_padrao(destino), tag_registro or TAG_REGISTRO,
+                tamanho_lote, trabalhadores
+            )
+        aplicar_permissoes_padrao(temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+    resumo = ResumoConversao(
+        origem, destino, formato_origem, formato_destino, registros,
+        os.path.getsize(origem), os.path.getsize(destino), time.perf_counter() - inicio
+    )
+    logger.info(resumo.formatar())
+    return resumo
+
+
+def converter_arquivo(
+    origem: str,
+    destino: str,
+    formato_origem: Optional[str] = None,
+    formato_destino: Optional[str] = None,
+    trabalhadores: int = 1,
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Converte um arquivo entre CSV, JSON, JSON Lines e XML em streaming.
+
+    Args:
+        origem: Arquivo de entrada
+        destino: Arquivo de saída
+        formato_origem: Formato da entrada (deduzido da extensão se omitido)
+        formato_destino: Formato da saída (deduzido da extensão se omitido)
+        trabalhadores: Processos para serializar os lotes em paralelo
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Resumo da conversão
+    """
+    if mcp_client:
+        logger.info(f"Delegando converter_arquivo para MCP Server: {origem} -> {destino}")
+        tarefa_execucao = {
+            "tipo": "executar_ferramenta",
+            "nome_ferramenta": "converter_arquivo",
+            "parametros": {
+                "origem": origem, "destino": destino, "formato_origem": formato_origem,
+                "formato_destino": formato_destino, "trabalhadores": trabalhadores
+            }
+        }
+        resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+        return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+    return converter_streaming(
+        origem, destino, formato_origem, formato_destino, trabalhadores=trabalhadores
+    ).formatar()
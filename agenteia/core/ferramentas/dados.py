@@ -1,16 +1,31 @@
 import json
 import csv
+import os
 import xml.etree.ElementTree as ET
 from typing import Any, Dict, List, Optional, Union
-import pandas as pd
-import numpy as np
-from datetime import datetime
-import logging
 
-logger = logging.getLogger(__name__)
+from ..carregamento import ImportacaoTardia
+from ..logs import setup_logging
+from .consulta_dados import Consulta, executar_consulta, validar_colunas
+from .conversao import converter_streaming
+from .graficos import EspecificacaoGrafico, obter_renderizador
+from .validacao import compilar_schema
 
-def converter_formato(dados: Any, formato_origem: str, formato_destino: str) -> str:
-    """Converte dados entre diferentes formatos (JSON, CSV, XML)."""
+pd = ImportacaoTardia("pandas")
+np = ImportacaoTardia("numpy")
+
+logger = setup_logging(__name__)
+
+def converter_formato(dados: Any, formato_origem: str, formato_destino: str, caminho_saida: Optional[str] = None) -> str:
+    """
+    Converte dados entre diferentes formatos (JSON, CSV, XML).
+
+    Se ``dados`` for o caminho de um arquivo e ``caminho_saida`` for
+    informado, a conversão é feita em streaming, arquivo a arquivo, sem
+    carregar o conteúdo na memória; o retorno é o resumo da conversão.
+    """
+    if caminho_saida and isinstance(dados, str) and os.path.isfile(dados):
+        return converter_streaming(dados, caminho_saida, formato_origem, formato_destino).formatar()
     try:
         # Converter para formato intermediário (dicionário)
         if formato_origem == "json":
@@ -38,48 +53,22 @@ def converter_formato(dados: Any, formato_origem: str, formato_destino: str) ->
         raise
 
 def validar_dados(dados: Any, schema: Dict) -> Dict:
-    """Valida dados contra um schema definido."""
+    """
+    Valida dados contra um schema definido.
+
+    Um dicionário é validado como um registro; listas de registros,
+    DataFrames e tabelas Arrow são validados em bloco, coluna a coluna
+    (veja ``validacao.compilar_schema``).
+    """
     try:
-        erros = []
-        
-        def validar_campo(valor: Any, regras: Dict) -> List[str]:
-            erros_campo = []
-            
-            if "tipo" in regras:
-                tipo_esperado = regras["tipo"]
-                if tipo_esperado == "string" and not isinstance(valor, str):
-                    erros_campo.append(f"Tipo esperado: string, recebido: {type(valor)}")
-                elif tipo_esperado == "number" and not isinstance(valor, (int, float)):
-                    erros_campo.append(f"Tipo esperado: number, recebido: {type(valor)}")
-                elif tipo_esperado == "boolean" and not isinstance(valor, bool):
-                    erros_campo.append(f"Tipo esperado: boolean, recebido: {type(valor)}")
-            
-            if "obrigatorio" in regras and regras["obrigatorio"] and valor is None:
-                erros_campo.append("Campo obrigatório não preenchido")
-            
-            if "min" in regras and valor < regras["min"]:
-                erros_campo.append(f"Valor menor que o mínimo permitido: {regras['min']}")
-            
-            if "max" in regras and valor > regras["max"]:
-                erros_campo.append(f"Valor maior que o máximo permitido: {regras['max']}")
-            
-            if "padrao" in regras and not re.match(regras["padrao"], str(valor)):
-                erros_campo.append(f"Valor não corresponde ao padrão esperado: {regras['padrao']}")
-            
-            return erros_campo
-        
-        for campo, regras in schema.items():
-            if campo in dados:
-                erros_campo = validar_campo(dados[campo], regras)
-                if erros_campo:
-                    erros.append({campo: erros_campo})
-            elif regras.get("obrigatorio", False):
-                erros.append({campo: ["Campo obrigatório não encontrado"]})
-        
-        return {
-            "valido": len(erros) == 0,
-            "erros": erros
-        }
+        compilado = compilar_schema(schema)
+        if isinstance(dados, dict):
+            erros = compilado.validar_registro(dados)
+            return {
+                "valido": len(erros) == 0,
+                "erros": erros
+            }
+        return compilado.validar_lotes([dados]).para_dict()
     except Exception as e:
         logger.error(f"Erro ao validar dados: {e}")
         raise
@@ -87,100 +76,56 @@ def validar_dados(dados: Any, schema: Dict) -> Dict:
 def filtrar_dados(dados: List[Dict], filtros: Dict) -> List[Dict]:
     """Filtra e ordena um conjunto de dados."""
     try:
-        df = pd.DataFrame(dados)
-        
-        # Aplicar filtros
-        for campo, valor in filtros.get("filtros", {}).items():
-            if isinstance(valor, (list, tuple)):
-                df = df[df[campo].isin(valor)]
-            else:
-                df = df[df[campo] == valor]
-        
-        # Aplicar ordenação
-        if "ordenacao" in filtros:
-            campo = filtros["ordenacao"]["campo"]
-            ascendente = filtros["ordenacao"].get("ascendente", True)
-            df = df.sort_values(by=campo, ascending=ascendente)
-        
-        # Aplicar limite
-        if "limite" in filtros:
-            df = df.head(filtros["limite"])
-        
-        return df.to_dict("records")
+        ordenacao = filtros.get("ordenacao", {})
+        consulta = Consulta.criar(
+            filtros=filtros.get("filtros"),
+            ordenar_por=ordenacao.get("campo"),
+            decrescente=not ordenacao.get("ascendente", True),
+            limite=filtros.get("limite")
+        )
+        return executar_consulta(dados, consulta)[1]
     except Exception as e:
         logger.error(f"Erro ao filtrar dados: {e}")
         raise
 
 def agregar_dados(dados: List[Dict], agrupamentos: List[str], metricas: Dict[str, str]) -> Dict:
-    """Realiza agregações e estatísticas nos dados."""
+    """
+    Realiza agregações e estatísticas nos dados.
+
+    Todas as métricas são calculadas numa única passada e só sobre as colunas
+    pedidas: ``{"nome": "funcao(coluna)"}`` ou ``{"coluna": "funcao"}``, com
+    soma, media, min, max, contagem ou distintos.
+
+    Returns:
+        Dicionário com agrupamentos, metricas e resultados (uma linha por grupo)
+
+    Raises:
+        ValidationError: Coluna de agrupamento ou de métrica ausente dos dados
+    """
     try:
-        df = pd.DataFrame(dados)
-        
-        # Realizar agrupamentos
-        grupos = df.groupby(agrupamentos)
-        
-        # Calcular métricas
-        resultados = {}
-        for nome, funcao in metricas.items():
-            if funcao == "soma":
-                resultados[nome] = grupos.sum()
-            elif funcao == "media":
-                resultados[nome] = grupos.mean()
-            elif funcao == "min":
-                resultados[nome] = grupos.min()
-            elif funcao == "max":
-                resultados[nome] = grupos.max()
-            elif funcao == "contagem":
-                resultados[nome] = grupos.size()
-        
+        consulta = Consulta.criar(agrupar_por=agrupamentos, metricas=metricas)
+        # {"total": "soma"} sem coluna "total" é erro, não uma soma vazia
+        validar_colunas(dict.fromkeys(chave for registro in dados for chave in registro), consulta)
         return {
             "agrupamentos": agrupamentos,
-            "metricas": resultados
+            "metricas": metricas,
+            "resultados": executar_consulta(dados, consulta)[1]
         }
     except Exception as e:
         logger.error(f"Erro ao agregar dados: {e}")
         raise
 
 def visualizar_dados(dados: List[Dict], tipo: str, config: Dict) -> str:
-    """Cria visualizações básicas dos dados."""
+    """
+    Cria visualizações básicas dos dados.
+
+    O gráfico é renderizado fora do processo (veja ``graficos``) e gravado
+    num arquivo nomeado pelo conteúdo; dados e configuração iguais devolvem
+    o mesmo arquivo sem desenhar de novo.
+    """
     try:
-        df = pd.DataFrame(dados)
-        
-        if tipo == "grafico_barras":
-            plt.figure(figsize=(10, 6))
-            df.plot(kind="bar", x=config["eixo_x"], y=config["eixo_y"])
-            plt.title(config.get("titulo", "Gráfico de Barras"))
-            plt.xlabel(config.get("label_x", ""))
-            plt.ylabel(config.get("label_y", ""))
-            
-        elif tipo == "grafico_linha":
-            plt.figure(figsize=(10, 6))
-            df.plot(kind="line", x=config["eixo_x"], y=config["eixo_y"])
-            plt.title(config.get("titulo", "Gráfico de Linha"))
-            plt.xlabel(config.get("label_x", ""))
-            plt.ylabel(config.get("label_y", ""))
-            
-        elif tipo == "grafico_pizza":
-            plt.figure(figsize=(10, 6))
-            df.plot(kind="pie", y=config["valores"], labels=config["labels"])
-            plt.title(config.get("titulo", "Gráfico de Pizza"))
-            
-        elif tipo == "histograma":
-            plt.figure(figsize=(10, 6))
-            df[config["coluna"]].hist()
-            plt.title(config.get("titulo", "Histograma"))
-            plt.xlabel(config.get("label_x", ""))
-            plt.ylabel(config.get("label_y", "Frequência"))
-            
-        else:
-            raise ValueError(f"Tipo de visualização não suportado: {tipo}")
-        
-        # Salvar gráfico
-        caminho_arquivo = f"visualizacao_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-        plt.savefig(caminho_arquivo)
-        plt.close()
-        
-        return caminho_arquivo
+        especificacao = EspecificacaoGrafico.de_registros(tipo, dados, config)
+        return obter_renderizador().renderizar(especificacao)
     except Exception as e:
         logger.error(f"Erro ao visualizar dados: {e}")
         raise
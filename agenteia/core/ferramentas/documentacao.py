@@ -1,12 +1,12 @@
 import ast
 import re
 from typing import Dict, List, Optional, Union, Any
-import logging
 from datetime import datetime
 import os
 import json
+from ..logs import setup_logging
 
-logger = logging.getLogger(__name__)
+logger = setup_logging(__name__)
 
 def gerar_documentacao(codigo: str, formato: str = "markdown",
     mcp_client: Optional[Any] = None
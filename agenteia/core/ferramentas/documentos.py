@@ -2,15 +2,24 @@
 Ferramentas para manipulação de documentos
 """
 
+import csv
 import os
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import docx
-from docx.shared import Pt, RGBColor, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import pandas as pd
 import json
 
+from ..carregamento import ImportacaoTardia
+from .documentos_lote import (
+    ESTILO_DATA, ESTILO_SECAO, ESTILO_TITULO, abrir_modelo, adicionar_tabela, salvar_documento
+)
+
+# python-docx só é importado quando um documento é gerado
+docx = ImportacaoTardia("docx")
+Pt = ImportacaoTardia("docx.shared", "Pt")
+RGBColor = ImportacaoTardia("docx.shared", "RGBColor")
+Inches = ImportacaoTardia("docx.shared", "Inches")
+WD_ALIGN_PARAGRAPH = ImportacaoTardia("docx.enum.text", "WD_ALIGN_PARAGRAPH")
+
 def criar_documento_word(
     titulo: str,
     conteudo: List[Dict[str, Any]],
@@ -30,68 +39,34 @@ def criar_documento_word(
         Caminho do arquivo criado
     """
     try:
-        # Criar documento
-        doc = docx.Document()
-        
-        # Configurar margens
-        sections = doc.sections
-        for section in sections:
-            section.top_margin = Inches(1)
-            section.bottom_margin = Inches(1)
-            section.left_margin = Inches(1)
-            section.right_margin = Inches(1)
-        
-        # Adicionar título
-        titulo_paragrafo = doc.add_paragraph()
-        titulo_run = titulo_paragrafo.add_run(titulo)
-        titulo_run.bold = True
-        titulo_run.font.size = Pt(16)
-        titulo_paragrafo.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        # Documento base em cache: margens e estilos nomeados já definidos
+        doc = abrir_modelo()
         
-        # Adicionar data
-        data_paragrafo = doc.add_paragraph()
-        data_run = data_paragrafo.add_run(datetime.now().strftime("%d/%m/%Y"))
-        data_paragrafo.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        # Adicionar título e data
+        doc.add_paragraph(titulo, style=ESTILO_TITULO)
+        doc.add_paragraph(datetime.now().strftime("%d/%m/%Y"), style=ESTILO_DATA)
         
         # Adicionar conteúdo
         for secao in conteudo:
             # Título da seção
             if "titulo" in secao:
-                titulo_secao = doc.add_paragraph()
-                titulo_secao_run = titulo_secao.add_run(secao["titulo"])
-                titulo_secao_run.bold = True
-                titulo_secao_run.font.size = Pt(14)
+                doc.add_paragraph(secao["titulo"], style=ESTILO_SECAO)
             
             # Texto da seção
             if "texto" in secao:
-                texto_paragrafo = doc.add_paragraph()
-                texto_paragrafo.add_run(secao["texto"])
+                doc.add_paragraph(secao["texto"])
             
             # Lista de itens
             if "itens" in secao:
                 for item in secao["itens"]:
-                    item_paragrafo = doc.add_paragraph(style='List Bullet')
-                    item_paragrafo.add_run(str(item))
+                    doc.add_paragraph(str(item), style='List Bullet')
             
-            # Tabela
+            # Tabela (linhas consumidas uma a uma; aceita geradores)
             if "tabela" in secao:
-                tabela = doc.add_table(rows=1, cols=len(secao["tabela"][0]))
-                tabela.style = 'Table Grid'
-                
-                # Cabeçalho
-                header_cells = tabela.rows[0].cells
-                for i, header in enumerate(secao["tabela"][0]):
-                    header_cells[i].text = str(header)
-                
-                # Dados
-                for row_data in secao["tabela"][1:]:
-                    row_cells = tabela.add_row().cells
-                    for i, cell_data in enumerate(row_data):
-                        row_cells[i].text = str(cell_data)
+                adicionar_tabela(doc, secao["tabela"])
         
         # Salvar documento
-        doc.save(caminho_saida)
-        return caminho_saida
+        return salvar_documento(doc, caminho_saida)
         
     except Exception as e:
         raise Exception(f"Erro ao criar documento Word: {e}")
@@ -207,15 +182,15 @@ def converter_para_word(
         _, extensao = os.path.splitext(arquivo_entrada)
         
         if extensao.lower() == '.csv':
-            # Converter CSV para Word
-            df = pd.read_csv(arquivo_entrada)
-            conteudo = [
-                {
-                    "titulo": "Dados do CSV",
-                    "tabela": [df.columns.tolist()] + df.values.tolist()
-                }
-            ]
-            return criar_documento_word("Relatório CSV", conteudo, caminho_saida)
+            # Converter CSV para Word (linhas lidas sob demanda)
+            with open(arquivo_entrada, newline='', encoding='utf-8-sig') as f:
+                conteudo = [
+                    {
+                        "titulo": "Dados do CSV",
+                        "tabela": csv.reader(f)
+                    }
+                ]
+                return criar_documento_word("Relatório CSV", conteudo, caminho_saida)
             
         elif extensao.lower() == '.json':
             # Converter JSON para Word
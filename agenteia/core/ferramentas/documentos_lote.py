@@ -0,0 +1,482 @@
+"""
+Geração de documentos Word em lote a partir de modelos.
+
+Um modelo (.docx) é lido do disco uma única vez por processo e mantido em
+cache como bytes, validado pelo mtime e tamanho; cada documento parte de uma
+cópia desse pacote, que já traz estilos, margens, cabeçalhos e rodapés. Sem
+modelo, usa-se um documento base com estilos nomeados ("Titulo Documento",
+"Titulo Secao", ...), criado uma vez: a formatação é do estilo, não de cada
+parágrafo.
+
+Marcadores ``{{campo}}`` (ou ``{{cliente.nome}}``) em parágrafos, tabelas
+(inclusive aninhadas), cabeçalhos e rodapés são substituídos pelos valores de
+cada registro, só nos runs que contêm o marcador: o resto do parágrafo mantém
+a formatação. Um parágrafo contendo só ``{{tabela:campo}}`` vira uma tabela
+preenchida linha a linha a partir da lista (ou de qualquer iterável) do
+registro.
+
+``GeradorDocumentos`` distribui os registros num pool de processos aquecido
+(cada trabalhador com seu cache de modelos), com no máximo
+``2 * trabalhadores`` documentos em andamento.
+"""
+
+import bisect
+import io
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..carregamento import ImportacaoTardia
+from ..exceptions import ToolError, ValidationError
+from ..logs import setup_logging
+from .gravacao import aplicar_permissoes_padrao
+
+logger = setup_logging(__name__)
+
+docx = ImportacaoTardia("docx")
+Pt = ImportacaoTardia("docx.shared", "Pt")
+Inches = ImportacaoTardia("docx.shared", "Inches")
+WD_ALIGN_PARAGRAPH = ImportacaoTardia("docx.enum.text", "WD_ALIGN_PARAGRAPH")
+WD_STYLE_TYPE = ImportacaoTardia("docx.enum.style", "WD_STYLE_TYPE")
+qn = ImportacaoTardia("docx.oxml.ns", "qn")
+
+_config: Dict[str, Any] = {
+    "trabalhadores": 4,
+}
+
+# Modelos gerados por código (criar_relatorio / criar_curriculo) em vez de um .docx
+MODELOS_INTERNOS = ("relatorio", "curriculo")
+
+ESTILO_TITULO = "Titulo Documento"
+ESTILO_DATA = "Data Documento"
+ESTILO_SECAO = "Titulo Secao"
+ESTILO_TABELA = "Table Grid"
+
+_MARCADOR = re.compile(r"\{\{\s*([\w.-]+)\s*\}\}")
+_MARCADOR_TABELA = re.compile(r"^\s*\{\{\s*tabela:([\w.-]+)\s*\}\}\s*$")
+_NOME_INVALIDO = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def configurar_documentos_lote(config: Optional[Dict[str, Any]] = None) -> None:
+    """Aplica a seção "documentos_lote" do config (trabalhadores)."""
+    global _gerador
+    if config:
+        _config.update(config)
+        with _lock_global:
+            if _gerador is not None:
+                _gerador.fechar()
+                _gerador = None
+
+
+class CacheModelos:
+    """Bytes de cada modelo por caminho, relidos só quando o arquivo muda."""
+
+    def __init__(self):
+        self._entradas: Dict[str, Tuple[int, int, bytes]] = {}
+        self._base: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    def obter(self, caminho: str) -> bytes:
+        caminho = os.path.abspath(caminho)
+        estado = os.stat(caminho)
+        with self._lock:
+            entrada = self._entradas.get(caminho)
+            if entrada and entrada[:2] == (estado.st_mtime_ns, estado.st_size):
+                return entrada[2]
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+        with self._lock:
+            self._entradas[caminho] = (estado.st_mtime_ns, estado.st_size, conteudo)
+        return conteudo
+
+    def base(self) -> bytes:
+        """Documento base com margens e estilos nomeados, criado uma vez."""
+        if self._base is None:
+            saida = io.BytesIO()
+            _criar_documento_base().save(saida)
+            self._base = saida.getvalue()
+        return self._base
+
+
+def _criar_documento_base() -> Any:
+    doc = docx.Document()
+    for secao in doc.sections:
+        secao.top_margin = secao.bottom_margin = Inches(1)
+        secao.left_margin = secao.right_margin = Inches(1)
+
+    estilos = doc.styles
+    titulo = estilos.add_style(ESTILO_TITULO, WD_STYLE_TYPE.PARAGRAPH)
+    titulo.base_style = estilos["Normal"]
+    titulo.font.bold = True
+    titulo.font.size = Pt(16)
+    titulo.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    data = estilos.add_style(ESTILO_DATA, WD_STYLE_TYPE.PARAGRAPH)
+    data.base_style = estilos["Normal"]
+    data.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+    secao = estilos.add_style(ESTILO_SECAO, WD_STYLE_TYPE.PARAGRAPH)
+    secao.base_style = estilos["Normal"]
+    secao.font.bold = True
+    secao.font.size = Pt(14)
+    return doc
+
+
+_modelos = CacheModelos()
+
+
+def abrir_modelo(modelo: Optional[str] = None) -> Any:
+    """Novo ``Document`` a partir do modelo em cache (ou do documento base)."""
+    conteudo = _modelos.obter(modelo) if modelo else _modelos.base()
+    return docx.Document(io.BytesIO(conteudo))
+
+
+def adicionar_tabela(doc: Any, linhas: Iterable[Any], estilo: str = ESTILO_TABELA) -> Optional[Any]:
+    """
+    Acrescenta uma tabela ao documento, consumindo as linhas uma a uma.
+
+    As linhas podem ser sequências (a primeira é o cabeçalho) ou dicionários
+    (o cabeçalho são as chaves do primeiro). Sem linhas, nada é criado.
+    """
+    iterador = iter(linhas)
+    primeira = next(iterador, None)
+    if primeira is None:
+        return None
+    if isinstance(primeira, dict):
+        colunas = list(primeira)
+        cabecalho = colunas
+        iterador = (
+            [linha.get(c, "") for c in colunas] for linha in itertools.chain([primeira], iterador)
+        )
+    else:
+        cabecalho = list(primeira)
+
+    tabela = doc.add_table(rows=1, cols=len(cabecalho))
+    try:
+        tabela.style = estilo
+    except KeyError:
+        logger.debug(f"Estilo de tabela ausente no modelo: {estilo}")
+    for celula, valor in zip(tabela.rows[0].cells, cabecalho):
+        celula.text = str(valor)
+    for linha in iterador:
+        for celula, valor in zip(tabela.add_row().cells, linha):
+            celula.text = "" if valor is None else str(valor)
+    return tabela
+
+
+def _valor(registro: Dict[str, Any], nome: str) -> Any:
+    valor: Any = registro
+    for parte in nome.split("."):
+        if not isinstance(valor, dict):
+            return ""
+        valor = valor.get(parte, "")
+    return valor
+
+
+def _texto(registro: Dict[str, Any], nome: str) -> str:
+    valor = _valor(registro, nome)
+    return "" if valor is None else str(valor)
+
+
+def _substituir_paragrafo(paragrafo: Any, registro: Dict[str, Any]) -> None:
+    if "{{" not in paragrafo.text:
+        return
+    runs = paragrafo.runs
+    textos = [run.text for run in runs]
+    # Do último marcador para o primeiro: as posições dos anteriores não mudam.
+    # Um marcador que o Word quebrou entre runs é trocado no primeiro deles e
+    # removido dos seguintes; os demais runs ficam intactos
+    for marcador in reversed(list(_MARCADOR.finditer("".join(textos)))):
+        fins = list(itertools.accumulate(len(texto) for texto in textos))
+        primeiro = bisect.bisect_right(fins, marcador.start())
+        ultimo = bisect.bisect_right(fins, marcador.end() - 1)
+        sufixo = textos[ultimo][marcador.end() - (fins[ultimo] - len(textos[ultimo])):]
+        prefixo = textos[primeiro][:marcador.start() - (fins[primeiro] - len(textos[primeiro]))]
+        for indice in range(primeiro + 1, ultimo + 1):
+            textos[indice] = ""
+        textos[primeiro] = prefixo + _texto(registro, marcador.group(1))
+        textos[ultimo] += sufixo
+    for run, texto in zip(runs, textos):
+        if run.text != texto:
+            run.text = texto
+
+
+def _paragrafos_tabela(tabela: Any) -> Iterator[Any]:
+    vistas = set()
+    for linha in tabela.rows:
+        for celula in linha.cells:
+            # Uma célula mesclada aparece uma vez por coluna que ocupa
+            if celula._tc in vistas:
+                continue
+            vistas.add(celula._tc)
+            yield from celula.paragraphs
+            for interna in celula.tables:
+                yield from _paragrafos_tabela(interna)
+
+
+def _paragrafos(doc: Any) -> Iterator[Any]:
+    """Parágrafos do corpo, das tabelas (inclusive aninhadas), dos cabeçalhos e dos rodapés."""
+    partes = [doc]
+    for secao in doc.sections:
+        partes.extend(parte for parte in (secao.header, secao.footer) if not parte.is_linked_to_previous)
+    for parte in partes:
+        yield from parte.paragraphs
+        for tabela in parte.tables:
+            yield from _paragrafos_tabela(tabela)
+
+
+def preencher_documento(doc: Any, registro: Dict[str, Any]) -> Any:
+    """Substitui os marcadores ``{{campo}}`` e ``{{tabela:campo}}`` pelos valores do registro."""
+    paragrafos = list(_paragrafos(doc))
+    tabelas = [(p, m.group(1)) for p in paragrafos for m in [_MARCADOR_TABELA.match(p.text)] if m]
+    # Texto antes das tabelas: as linhas de dados não são varridas atrás de marcadores
+    for paragrafo in paragrafos:
+        _substituir_paragrafo(paragrafo, registro)
+    for paragrafo, campo in tabelas:
+        tabela = adicionar_tabela(doc, _valor(registro, campo) or [])
+        if paragrafo._p.getparent().tag == qn("w:tc"):
+            # Uma célula precisa terminar num parágrafo: o do marcador fica, vazio, depois da tabela
+            if tabela is not None:
+                paragrafo._p.addprevious(tabela._tbl)
+            paragrafo.clear()
+            continue
+        if tabela is not None:
+            paragrafo._p.addnext(tabela._tbl)
+        paragrafo._p.getparent().remove(paragrafo._p)
+    return doc
+
+
+def salvar_documento(doc: Any, caminho_saida: str) -> str:
+    """Grava num temporário ao lado do destino e renomeia (sem arquivos pela metade)."""
+    pasta = os.path.dirname(os.path.abspath(caminho_saida))
+    descritor, temporario = tempfile.mkstemp(dir=pasta, prefix=f".{os.path.basename(caminho_saida)}.", suffix=".tmp")
+    os.close(descritor)
+    try:
+        doc.save(temporario)
+        aplicar_permissoes_padrao(temporario)
+        os.replace(temporario, caminho_saida)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    return caminho_saida
+
+
+def gerar_documento(modelo: Optional[str], registro: Dict[str, Any], caminho_saida: str) -> str:
+    """Gera um documento: preenche um modelo .docx ou usa um dos ``MODELOS_INTERNOS``."""
+    if modelo in MODELOS_INTERNOS:
+        from . import documentos
+        if modelo == "relatorio":
+            return documentos.criar_relatorio(registro.get("titulo", "Relatório"), registro, caminho_saida)
+        return documentos.criar_curriculo(registro, caminho_saida)
+    return salvar_documento(preencher_documento(abrir_modelo(modelo), registro), caminho_saida)
+
+
+def _inicializar_trabalhador() -> None:
+    """Importa o python-docx e cria o documento base uma vez por processo."""
+    _modelos.base()
+
+
+def _aquecer() -> int:
+    return os.getpid()
+
+
+def nome_arquivo(padrao: str, indice: int, registro: Dict[str, Any]) -> str:
+    """Nome do arquivo de um registro, ex.: ``"relatorio_{cliente}.docx"`` ou ``"doc_{indice:04d}.docx"``."""
+    campos = {k: v for k, v in registro.items() if isinstance(k, str)}
+    try:
+        nome = padrao.format(**{**campos, "indice": indice})
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValidationError(f"Padrão de nome inválido para o registro {indice}: {e}")
+    nome = _NOME_INVALIDO.sub("_", nome).strip() or f"documento_{indice}"
+    return nome if nome.lower().endswith(".docx") else f"{nome}.docx"
+
+
+@dataclass
+class ResumoGeracao:
+    """Resultado de um lote: arquivos gerados (na ordem dos registros) e falhas por índice."""
+    documentos: List[str] = field(default_factory=list)
+    erros: List[Tuple[int, str]] = field(default_factory=list)
+    segundos: float = 0.0
+
+    @property
+    def documentos_por_segundo(self) -> float:
+        return len(self.documentos) / self.segundos if self.segundos else 0.0
+
+    def formatar(self) -> str:
+        linhas = [
+            f"{len(self.documentos)} documento(s) gerado(s) em {self.segundos:.2f}s "
+            f"({self.documentos_por_segundo:.1f} documentos/s)."
+        ]
+        if self.documentos:
+            pasta = os.path.dirname(self.documentos[0]) or "."
+            linhas.append(f"Pasta: {pasta}")
+        if self.erros:
+            linhas.append(f"{len(self.erros)} falha(s):")
+            linhas.extend(f"- registro {indice}: {erro}" for indice, erro in self.erros[:20])
+        return "\n".join(linhas)
+
+
+class GeradorDocumentos:
+    """Pool de processos aquecido para gerar documentos a partir de registros."""
+
+    def __init__(self, trabalhadores: int = _config["trabalhadores"]):
+        self.trabalhadores = max(1, trabalhadores)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _obter_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.trabalhadores, initializer=_inicializar_trabalhador
+                )
+            return self._executor
+
+    def aquecer(self) -> None:
+        """Inicia os trabalhadores antes do primeiro lote."""
+        executor = self._obter_executor()
+        for futuro in [executor.submit(_aquecer) for _ in range(self.trabalhadores)]:
+            futuro.result()
+
+    def gerar(
+        self,
+        modelo: Optional[str],
+        registros: Iterable[Dict[str, Any]],
+        diretorio_saida: str,
+        padrao_nome: str = "documento_{indice:04d}.docx"
+    ) -> ResumoGeracao:
+        """
+        Gera um documento por registro.
+
+        Args:
+            modelo: Caminho de um .docx com marcadores, "relatorio", "curriculo" ou None (documento base)
+            registros: Dados de cada documento (lidos sob demanda)
+            diretorio_saida: Pasta dos documentos gerados
+            padrao_nome: Nome de cada arquivo, com campos do registro e ``indice``
+
+        Returns:
+            Arquivos gerados, falhas e tempo total
+        """
+        if modelo and modelo not in MODELOS_INTERNOS and not os.path.isfile(modelo):
+            raise ValidationError(f"Modelo não encontrado: {modelo}")
+        os.makedirs(diretorio_saida, exist_ok=True)
+        inicio = time.perf_counter()
+        resumo = ResumoGeracao()
+        nomes_usados: Dict[str, int] = {}
+
+        def destino(indice: int, registro: Dict[str, Any]) -> str:
+            nome = nome_arquivo(padrao_nome, indice, registro)
+            repeticoes = nomes_usados.get(nome, 0)
+            nomes_usados[nome] = repeticoes + 1
+            if repeticoes:
+                base, extensao = os.path.splitext(nome)
+                nome = f"{base}_{repeticoes + 1}{extensao}"
+            return os.path.join(diretorio_saida, nome)
+
+        def registrar(indice: int, futuro: Future) -> None:
+            try:
+                resumo.documentos.append(futuro.result())
+            except Exception as e:
+                logger.warning(f"Falha ao gerar o documento do registro {indice}: {e}")
+                resumo.erros.append((indice, str(e)))
+
+        if self.trabalhadores == 1:
+            for indice, registro in enumerate(registros):
+                futuro: Future = Future()
+                try:
+                    futuro.set_result(gerar_documento(modelo, registro, destino(indice, registro)))
+                except Exception as e:
+                    futuro.set_exception(e)
+                registrar(indice, futuro)
+        else:
+            executor = self._obter_executor()
+            pendentes: List[Tuple[int, Future]] = []
+            for indice, registro in enumerate(registros):
+                try:
+                    caminho = destino(indice, registro)
+                except ValidationError as e:
+                    resumo.erros.append((indice, str(e)))
+                    continue
+                pendentes.append((indice, executor.submit(gerar_documento, modelo, registro, caminho)))
+                # Limita os documentos em andamento (e os registros em memória)
+                if len(pendentes) >= 2 * self.trabalhadores:
+                    registrar(*pendentes.pop(0))
+            for pendente in pendentes:
+                registrar(*pendente)
+
+        resumo.segundos = time.perf_counter() - inicio
+        logger.info(
+            f"Lote de documentos: {len(resumo.documentos)} gerado(s), {len(resumo.erros)} falha(s), "
+            f"{resumo.documentos_por_segundo:.1f} documentos/s"
+        )
+        return resumo
+
+    def fechar(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_gerador: Optional[GeradorDocumentos] = None
+_lock_global = threading.Lock()
+
+
+def obter_gerador() -> GeradorDocumentos:
+    """Gerador compartilhado, criado com a configuração atual."""
+    global _gerador
+    with _lock_global:
+        if _gerador is None:
+            _gerador = GeradorDocumentos(_config["trabalhadores"])
+        return _gerador
+
+
+def gerar_documentos_lote(
+    registros: List[Dict[str, Any]],
+    diretorio_saida: str,
+    modelo: Optional[str] = None,
+    padrao_nome: str = "documento_{indice:04d}.docx",
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Gera um documento Word por registro, em paralelo.
+
+    Args:
+        registros: Dados de cada documento
+        diretorio_saida: Pasta dos documentos gerados
+        modelo: .docx com marcadores ``{{campo}}``/``{{tabela:campo}}``, "relatorio" ou "curriculo"
+        padrao_nome: Nome de cada arquivo, ex.: "relatorio_{cliente}.docx"
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Resumo com a quantidade de documentos, a taxa (documentos/s) e as falhas
+    """
+    if mcp_client:
+        logger.info(f"Delegando gerar_documentos_lote para MCP Server: {len(registros)} registro(s)")
+        tarefa_execucao = {
+            "tipo": "executar_ferramenta",
+            "nome_ferramenta": "gerar_documentos_lote",
+            "parametros": {
+                "registros": registros, "diretorio_saida": diretorio_saida, "modelo": modelo,
+                "padrao_nome": padrao_nome
+            }
+        }
+        resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+        return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+    if isinstance(registros, str):
+        registros = json.loads(registros)
+    try:
+        return obter_gerador().gerar(modelo, registros, diretorio_saida, padrao_nome).formatar()
+    except ValidationError:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao gerar documentos em lote: {e}")
+        raise ToolError(f"Erro ao gerar documentos em lote: {e}")
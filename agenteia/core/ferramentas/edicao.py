@@ -0,0 +1,440 @@
+"""
+Edição de arquivos por patch, sem reescrever o conteúdo inteiro.
+
+Aceita diffs unificados (``--- a/x`` / ``+++ b/x`` / ``@@ ... @@``) ou
+blocos de busca/substituição::
+
+    caminho/do/arquivo.py
+    <<<<<<< BUSCAR
+    trecho atual
+    =======
+    trecho novo
+    >>>>>>> SUBSTITUIR
+
+Todas as edições são validadas em memória antes de qualquer escrita: um
+trecho não encontrado (ou ambíguo) cancela a chamada inteira. Cada arquivo
+é gravado num temporário no mesmo diretório e trocado com ``os.replace``;
+se o arquivo mudou no disco desde a leitura, a troca é recusada.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..exceptions import ConflictError, FileError, ValidationError
+from ..logs import setup_logging
+from .busca import invalidar_caminhos
+from .gravacao import aplicar_permissoes_padrao
+
+logger = setup_logging(__name__)
+
+ACAO_ALTERADO = "alterado"
+ACAO_CRIADO = "criado"
+ACAO_REMOVIDO = "removido"
+
+_CABECALHO_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_INICIO_BLOCO = re.compile(r"^<{7}( |$)")
+_SEPARADOR_BLOCO = re.compile(r"^={7}\s*$")
+_FIM_BLOCO = re.compile(r"^>{7}( |$)")
+
+
+@dataclass
+class Substituicao:
+    """Troca de um trecho exato de um arquivo."""
+    buscar: str
+    substituir: str
+
+
+@dataclass
+class Hunk:
+    """Trecho de um diff unificado."""
+    inicio: int
+    antigas: List[str]
+    novas: List[str]
+    adicionadas: List[str] = field(default_factory=list)
+
+
+@dataclass
+class EdicaoArquivo:
+    """Edições pedidas para um arquivo."""
+    caminho: str
+    substituicoes: List[Substituicao] = field(default_factory=list)
+    hunks: List[Hunk] = field(default_factory=list)
+    criar: bool = False
+    remover: bool = False
+
+
+@dataclass
+class ResultadoEdicao:
+    """Resultado da edição de um arquivo."""
+    caminho: str
+    acao: str
+    edicoes: int
+    bytes_escritos: int
+    bytes_preservados: int
+
+
+def _caminho_do_diff(linha: str) -> Optional[str]:
+    caminho = linha[4:].split("\t")[0].strip()
+    if caminho == "/dev/null":
+        return None
+    if caminho.startswith(("a/", "b/")):
+        caminho = caminho[2:]
+    return caminho
+
+
+def interpretar_diff(texto: str) -> List[EdicaoArquivo]:
+    """Converte um diff unificado (um ou mais arquivos) em edições."""
+    edicoes: List[EdicaoArquivo] = []
+    atual: Optional[EdicaoArquivo] = None
+    hunk: Optional[Hunk] = None
+    linhas = texto.splitlines()
+    i = 0
+    while i < len(linhas):
+        linha = linhas[i]
+        if linha.startswith("--- ") and i + 1 < len(linhas) and linhas[i + 1].startswith("+++ "):
+            origem, destino = _caminho_do_diff(linha), _caminho_do_diff(linhas[i + 1])
+            if origem is None and destino is None:
+                raise ValidationError("Diff sem caminho de arquivo.")
+            caminho = destino or origem
+            criar, remover = origem is None, destino is None
+            atual = next((e for e in edicoes if e.caminho == caminho), None)
+            if atual is None:
+                atual = EdicaoArquivo(caminho=caminho, criar=criar, remover=remover)
+                edicoes.append(atual)
+            elif criar or remover or atual.criar or atual.remover:
+                raise ValidationError(f"{caminho}: o diff cria ou remove um arquivo que aparece em outra seção.")
+            hunk = None
+            i += 2
+            continue
+        cabecalho = _CABECALHO_HUNK.match(linha)
+        if cabecalho:
+            if atual is None:
+                raise ValidationError("Hunk '@@' sem cabeçalho '---'/'+++' de arquivo.")
+            hunk = Hunk(inicio=int(cabecalho.group(1)), antigas=[], novas=[])
+            atual.hunks.append(hunk)
+        elif hunk is not None and linha[:1] in (" ", "-", "+", ""):
+            conteudo = linha[1:]
+            if linha[:1] in (" ", ""):
+                hunk.antigas.append(conteudo)
+                hunk.novas.append(conteudo)
+            elif linha[:1] == "-":
+                hunk.antigas.append(conteudo)
+            else:
+                hunk.novas.append(conteudo)
+                hunk.adicionadas.append(conteudo)
+        i += 1
+    if not edicoes:
+        raise ValidationError("Nenhum arquivo encontrado no diff.")
+    for edicao in edicoes:
+        # Seções do mesmo arquivo viram uma só, com os hunks em ordem de linha
+        edicao.hunks.sort(key=lambda h: h.inicio)
+        # Linhas vazias no fim do texto não fazem parte do último hunk
+        for hunk in edicao.hunks:
+            while hunk.antigas and hunk.novas and hunk.antigas[-1] == "" and hunk.novas[-1] == "" and len(hunk.antigas) > 1:
+                hunk.antigas.pop()
+                hunk.novas.pop()
+    return edicoes
+
+
+def interpretar_blocos(texto: str, caminho_padrao: Optional[str] = None) -> List[EdicaoArquivo]:
+    """Converte blocos BUSCAR/SUBSTITUIR em edições, agrupadas por arquivo."""
+    por_caminho: Dict[str, EdicaoArquivo] = {}
+    caminho = caminho_padrao
+    anterior = None
+    linhas = texto.splitlines(keepends=True)
+    i = 0
+    while i < len(linhas):
+        linha = linhas[i].rstrip("\r\n")
+        if not _INICIO_BLOCO.match(linha):
+            if linha.strip() and not linha.startswith("```"):
+                anterior = linha.strip()
+            i += 1
+            continue
+        if anterior:
+            caminho = anterior
+        if not caminho:
+            raise ValidationError("Bloco de edição sem caminho de arquivo.")
+        buscar, substituir, destino = [], [], None
+        i += 1
+        while i < len(linhas):
+            atual = linhas[i].rstrip("\r\n")
+            if destino is None and _SEPARADOR_BLOCO.match(atual):
+                destino = substituir
+            elif _FIM_BLOCO.match(atual):
+                break
+            else:
+                (buscar if destino is None else destino).append(linhas[i])
+            i += 1
+        else:
+            raise ValidationError(f"Bloco de edição de '{caminho}' sem '>>>>>>>' de fechamento.")
+        if destino is None:
+            raise ValidationError(f"Bloco de edição de '{caminho}' sem separador '======='.")
+        edicao = por_caminho.setdefault(caminho, EdicaoArquivo(caminho=caminho))
+        edicao.substituicoes.append(Substituicao("".join(buscar), "".join(substituir)))
+        anterior = None
+        i += 1
+    if not por_caminho:
+        raise ValidationError("Nenhum bloco BUSCAR/SUBSTITUIR encontrado.")
+    return list(por_caminho.values())
+
+
+def interpretar_edicoes(texto: str, caminho_padrao: Optional[str] = None) -> List[EdicaoArquivo]:
+    """Detecta o formato (blocos ou diff unificado) e interpreta as edições."""
+    if any(_INICIO_BLOCO.match(linha) for linha in texto.splitlines()):
+        return interpretar_blocos(texto, caminho_padrao)
+    if re.search(r"^@@ ", texto, re.MULTILINE) or re.search(r"^--- .*\n\+\+\+ ", texto, re.MULTILINE):
+        return interpretar_diff(texto)
+    raise ValidationError("Formato de edição não reconhecido: use um diff unificado ou blocos BUSCAR/SUBSTITUIR.")
+
+
+def _localizar(linhas: List[str], procuradas: List[str], esperado: int, minimo: int) -> int:
+    """Posição de ``procuradas`` em ``linhas``, começando em ``esperado`` e se afastando dele."""
+    if not procuradas:
+        return max(minimo, min(esperado, len(linhas)))
+    ultimo = len(linhas) - len(procuradas)
+    for distancia in range(0, max(ultimo, 0) + 1):
+        for posicao in (esperado - distancia, esperado + distancia):
+            if minimo <= posicao <= ultimo and linhas[posicao:posicao + len(procuradas)] == procuradas:
+                return posicao
+        if esperado - distancia < minimo and esperado + distancia > ultimo:
+            break
+    return -1
+
+
+def _aplicar_hunks(caminho: str, texto: str, hunks: List[Hunk], quebra: str) -> Tuple[str, int]:
+    final_com_quebra = texto.endswith(("\n", "\r"))
+    linhas = texto.splitlines()
+    resultado: List[str] = []
+    consumido = 0
+    escritos = 0
+    for numero, hunk in enumerate(hunks, 1):
+        posicao = _localizar(linhas, hunk.antigas, max(hunk.inicio - 1, 0), consumido)
+        if posicao < 0:
+            raise ConflictError(f"{caminho}: o hunk {numero} (linha {hunk.inicio}) não corresponde ao conteúdo atual.")
+        resultado.extend(linhas[consumido:posicao])
+        resultado.extend(hunk.novas)
+        consumido = posicao + len(hunk.antigas)
+        escritos += sum(len((n + quebra).encode("utf-8")) for n in hunk.adicionadas)
+    resultado.extend(linhas[consumido:])
+    novo = quebra.join(resultado)
+    if resultado and (final_com_quebra or not texto):
+        novo += quebra
+    return novo, escritos
+
+
+def _aplicar_substituicoes(caminho: str, texto: str, substituicoes: List[Substituicao], quebra: str) -> Tuple[str, int]:
+    escritos = 0
+    for numero, substituicao in enumerate(substituicoes, 1):
+        buscar = substituicao.buscar.replace("\r\n", "\n").replace("\n", quebra)
+        substituir = substituicao.substituir.replace("\r\n", "\n").replace("\n", quebra)
+        if not buscar:
+            if texto:
+                raise ConflictError(f"{caminho}: bloco {numero} com BUSCAR vazio só é aceito para criar arquivos.")
+            texto = substituir
+        else:
+            ocorrencias = texto.count(buscar)
+            sem_quebra = buscar[:-len(quebra)] if buscar.endswith(quebra) else ""
+            if ocorrencias == 0 and sem_quebra and texto.endswith(sem_quebra):
+                # O bloco termina em quebra de linha, mas a última linha do arquivo não
+                texto = texto[:len(texto) - len(buscar) + len(quebra)] + (
+                    substituir[:-len(quebra)] if substituir.endswith(quebra) else substituir
+                )
+                escritos += len(substituir.encode("utf-8"))
+                continue
+            if ocorrencias == 0:
+                raise ConflictError(f"{caminho}: o trecho do bloco {numero} não foi encontrado.")
+            if ocorrencias > 1:
+                raise ConflictError(
+                    f"{caminho}: o trecho do bloco {numero} aparece {ocorrencias} vezes; inclua mais contexto."
+                )
+            texto = texto.replace(buscar, substituir, 1)
+        escritos += len(substituir.encode("utf-8"))
+    return texto, escritos
+
+
+@dataclass
+class _Preparado:
+    edicao: EdicaoArquivo
+    destino: str
+    novo: Optional[bytes]
+    assinatura: Optional[Tuple[int, int]]
+    escritos: int
+    quantidade: int
+
+
+def _assinatura(caminho: str) -> Optional[Tuple[int, int]]:
+    try:
+        info = os.stat(caminho)
+    except FileNotFoundError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def _preparar(edicao: EdicaoArquivo, diretorio_base: str) -> _Preparado:
+    destino = os.path.normpath(os.path.join(diretorio_base, edicao.caminho))
+    assinatura = _assinatura(destino)
+    quantidade = len(edicao.substituicoes) + len(edicao.hunks)
+
+    if edicao.remover:
+        if assinatura is None:
+            raise ConflictError(f"{edicao.caminho}: arquivo a remover não existe.")
+        return _Preparado(edicao, destino, None, assinatura, 0, quantidade)
+
+    if assinatura is None:
+        if not edicao.criar and any(s.buscar for s in edicao.substituicoes):
+            raise ConflictError(f"{edicao.caminho}: arquivo não encontrado.")
+        bruto = b""
+    elif edicao.criar:
+        raise ConflictError(f"{edicao.caminho}: o diff cria um arquivo que já existe.")
+    else:
+        with open(destino, "rb") as f:
+            bruto = f.read()
+
+    bom = b"\xef\xbb\xbf" if bruto.startswith(b"\xef\xbb\xbf") else b""
+    try:
+        texto = bruto[len(bom):].decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValidationError(f"{edicao.caminho}: não é um arquivo de texto UTF-8.")
+    quebra = "\r\n" if "\r\n" in texto else "\n"
+
+    if edicao.hunks:
+        texto, escritos = _aplicar_hunks(edicao.caminho, texto, edicao.hunks, quebra)
+    else:
+        texto, escritos = _aplicar_substituicoes(edicao.caminho, texto, edicao.substituicoes, quebra)
+    return _Preparado(edicao, destino, bom + texto.encode("utf-8"), assinatura, escritos, quantidade)
+
+
+def _gravar(preparado: _Preparado) -> str:
+    """Grava o novo conteúdo num temporário ao lado do destino; retorna o caminho do temporário."""
+    diretorio = os.path.dirname(preparado.destino) or "."
+    os.makedirs(diretorio, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=diretorio, prefix=f".{os.path.basename(preparado.destino)}.", suffix=".tmp")
+    try:
+        with os.fdopen(descritor, "wb") as f:
+            f.write(preparado.novo)
+            f.flush()
+            os.fsync(f.fileno())
+        if preparado.assinatura is not None:
+            shutil.copymode(preparado.destino, temporario)
+        else:
+            aplicar_permissoes_padrao(temporario)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    return temporario
+
+
+def aplicar_edicoes(edicoes: List[EdicaoArquivo], diretorio_base: str = ".") -> List[ResultadoEdicao]:
+    """
+    Aplica edições em um ou mais arquivos.
+
+    Todas as edições são calculadas e todas as assinaturas conferidas antes
+    de qualquer escrita; um conflito em qualquer arquivo cancela a operação
+    inteira.
+
+    Args:
+        edicoes: Edições interpretadas (``interpretar_edicoes``)
+        diretorio_base: Diretório ao qual os caminhos relativos se referem
+
+    Returns:
+        Um ResultadoEdicao por arquivo
+
+    Raises:
+        ConflictError: Trecho não encontrado/ambíguo ou arquivo alterado durante a edição
+        ValidationError: O mesmo arquivo aparece em mais de uma edição
+    """
+    vistos: Dict[str, str] = {}
+    for edicao in edicoes:
+        destino = os.path.normpath(os.path.join(diretorio_base, edicao.caminho))
+        if destino in vistos:
+            raise ValidationError(f"{edicao.caminho}: arquivo repetido nas edições (já pedido como '{vistos[destino]}').")
+        vistos[destino] = edicao.caminho
+
+    preparados = [_preparar(edicao, diretorio_base) for edicao in edicoes]
+    temporarios: Dict[str, str] = {}
+    try:
+        for preparado in preparados:
+            if preparado.novo is not None:
+                temporarios[preparado.destino] = _gravar(preparado)
+
+        # Nenhum arquivo é substituído antes de todos conferirem
+        for preparado in preparados:
+            if _assinatura(preparado.destino) != preparado.assinatura:
+                raise ConflictError(f"{preparado.edicao.caminho}: o arquivo foi alterado durante a edição.")
+
+        resultados = []
+        for preparado in preparados:
+            if preparado.novo is None:
+                os.remove(preparado.destino)
+                resultados.append(ResultadoEdicao(preparado.edicao.caminho, ACAO_REMOVIDO, preparado.quantidade, 0, 0))
+                continue
+            os.replace(temporarios.pop(preparado.destino), preparado.destino)
+            escritos = min(preparado.escritos, len(preparado.novo))
+            resultados.append(ResultadoEdicao(
+                caminho=preparado.edicao.caminho,
+                acao=ACAO_CRIADO if preparado.assinatura is None else ACAO_ALTERADO,
+                edicoes=preparado.quantidade,
+                bytes_escritos=escritos,
+                bytes_preservados=len(preparado.novo) - escritos
+            ))
+        return resultados
+    finally:
+        invalidar_caminhos(preparado.destino for preparado in preparados)
+        for temporario in temporarios.values():
+            try:
+                os.unlink(temporario)
+            except OSError:
+                pass
+
+
+def editar_arquivo(
+    edicoes: str,
+    caminho: Optional[str] = None,
+    diretorio_base: str = ".",
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Aplica um diff unificado ou blocos BUSCAR/SUBSTITUIR a um ou mais arquivos.
+
+    Args:
+        edicoes: Diff unificado ou blocos BUSCAR/SUBSTITUIR
+        caminho: Arquivo usado pelos blocos que não informam o caminho
+        diretorio_base: Diretório ao qual os caminhos relativos se referem
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Resumo por arquivo com bytes escritos e preservados
+    """
+    try:
+        if mcp_client:
+            logger.info("Delegando editar_arquivo para MCP Server")
+            tarefa_execucao = {
+                "tipo": "executar_ferramenta",
+                "nome_ferramenta": "editar_arquivo",
+                "parametros": {"edicoes": edicoes, "caminho": caminho, "diretorio_base": diretorio_base}
+            }
+            resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+            return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+        resultados = aplicar_edicoes(interpretar_edicoes(edicoes, caminho), diretorio_base)
+        linhas = []
+        for r in resultados:
+            if r.acao == ACAO_REMOVIDO:
+                linhas.append(f"{r.caminho}: removido")
+            else:
+                linhas.append(
+                    f"{r.caminho}: {r.acao} ({r.edicoes} edição(ões), "
+                    f"{r.bytes_escritos} bytes escritos, {r.bytes_preservados} bytes preservados)"
+                )
+        return "\n".join(linhas)
+
+    except (ConflictError, ValidationError):
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao editar arquivo: {str(e)}")
+        raise FileError(f"Erro ao editar arquivo: {str(e)}")
@@ -0,0 +1,247 @@
+"""
+Criação de uma árvore de arquivos inteira em uma única chamada.
+
+O manifesto descreve a árvore: dicionários são diretórios e textos (ou
+bytes) são o conteúdo dos arquivos; chaves com "/" também são aceitas
+("css/style.css": "..."). Com ``variaveis``, ``$nome`` e ``${nome}`` em
+caminhos e conteúdos são trocados pelo valor da variável; qualquer outro
+``$`` (sem variável correspondente, ``$$`` de shell, ...) é mantido como está.
+
+Tudo é gravado em paralelo num diretório de preparação ao lado do destino.
+Se o destino ainda não existe, esse diretório é renomeado para o destino
+(operação atômica); se já existe, os arquivos são movidos um a um com
+``os.replace`` e, em caso de erro, os que já tinham sido movidos são
+revertidos. Nada aparece no destino se a preparação falhar.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..exceptions import FileError, ValidationError
+from ..logs import setup_logging
+from .busca import invalidar_caminhos
+from .gravacao import aplicar_permissoes_padrao
+
+logger = setup_logging(__name__)
+
+MAX_TRABALHADORES = 8
+
+_VARIAVEL = re.compile(r"\$(?:([_a-zA-Z][_a-zA-Z0-9]*)|\{([_a-zA-Z][_a-zA-Z0-9]*)\})")
+
+
+@dataclass
+class ResumoEstrutura:
+    """Resultado da criação de uma estrutura."""
+    destino: str
+    arquivos: int
+    diretorios: int
+    bytes_escritos: int
+    substituidos: int
+
+    def formatar(self) -> str:
+        texto = (
+            f"Estrutura criada em {self.destino}: {self.arquivos} arquivo(s), "
+            f"{self.diretorios} diretório(s), {self.bytes_escritos} bytes"
+        )
+        if self.substituidos:
+            texto += f" ({self.substituidos} arquivo(s) existente(s) substituído(s))"
+        return texto
+
+
+def _renderizar(texto: str, variaveis: Optional[Dict[str, Any]]) -> str:
+    # Diferente de Template.safe_substitute, "$$" não vira "$": o conteúdo
+    # (JS, shell, ...) só muda onde há uma variável conhecida
+    if not variaveis:
+        return texto
+
+    def trocar(encontrado: re.Match) -> str:
+        nome = encontrado.group(1) or encontrado.group(2)
+        return str(variaveis[nome]) if nome in variaveis else encontrado.group(0)
+
+    return _VARIAVEL.sub(trocar, texto)
+
+
+def planificar_manifesto(
+    manifesto: Dict[str, Any],
+    variaveis: Optional[Dict[str, Any]] = None
+) -> Tuple[List[str], Dict[str, bytes]]:
+    """
+    Converte o manifesto em uma lista de diretórios e um mapa caminho -> bytes.
+
+    Args:
+        manifesto: Árvore (dicionários aninhados) ou caminhos com "/"
+        variaveis: Valores para os modelos ``$nome`` (opcional)
+
+    Returns:
+        (diretórios, arquivos), com caminhos relativos no formato "a/b/c"; pais antes dos filhos
+
+    Raises:
+        ValidationError: Caminho absoluto, com "..", repetido ou tipo de conteúdo inválido
+    """
+    diretorios: Dict[str, None] = {}
+    arquivos: Dict[str, bytes] = {}
+
+    def visitar(no: Dict[str, Any], prefixo: str) -> None:
+        for nome, valor in no.items():
+            relativo = _renderizar(str(nome), variaveis).replace("\\", "/").strip("/")
+            partes = [p for p in relativo.split("/") if p not in ("", ".")]
+            if not partes or ".." in partes or os.path.isabs(str(nome)) or ":" in partes[0]:
+                raise ValidationError(f"Caminho inválido no manifesto: {nome!r}")
+            caminho = "/".join([prefixo] + partes if prefixo else partes)
+            # Diretórios intermediários de chaves como "a/b/arquivo.txt"
+            for i in range(1, len(caminho.split("/"))):
+                pai = "/".join(caminho.split("/")[:i])
+                if pai in arquivos:
+                    raise ValidationError(f"'{pai}' aparece como arquivo e como diretório no manifesto.")
+                diretorios.setdefault(pai)
+            if isinstance(valor, dict):
+                if caminho in arquivos:
+                    raise ValidationError(f"'{caminho}' aparece como arquivo e como diretório no manifesto.")
+                diretorios.setdefault(caminho)
+                visitar(valor, caminho)
+            elif isinstance(valor, (str, bytes)) or valor is None:
+                if caminho in arquivos or caminho in diretorios:
+                    raise ValidationError(f"Caminho repetido no manifesto: {caminho}")
+                if isinstance(valor, bytes):
+                    arquivos[caminho] = valor
+                else:
+                    arquivos[caminho] = _renderizar(valor or "", variaveis).encode("utf-8")
+            else:
+                raise ValidationError(f"Conteúdo inválido para '{caminho}': {type(valor).__name__}")
+
+    if not isinstance(manifesto, dict) or not manifesto:
+        raise ValidationError("O manifesto deve ser um dicionário não vazio.")
+    visitar(manifesto, "")
+    return list(diretorios), arquivos
+
+
+def _gravar(base: str, relativo: str, dados: bytes) -> int:
+    with open(os.path.join(base, *relativo.split("/")), "wb") as f:
+        f.write(dados)
+    return len(dados)
+
+
+def _mover_para_destino(preparacao: str, destino: str, diretorios: List[str], arquivos: List[str]) -> int:
+    """Move os arquivos preparados para um destino existente, revertendo tudo em caso de erro."""
+    copias = os.path.join(preparacao, ".substituidos")
+    movidos: List[Tuple[str, Optional[str]]] = []
+    criados: List[str] = []
+    try:
+        for relativo in diretorios:
+            caminho = os.path.join(destino, *relativo.split("/"))
+            if not os.path.isdir(caminho):
+                os.mkdir(caminho)
+                criados.append(caminho)
+        for relativo in arquivos:
+            final = os.path.join(destino, *relativo.split("/"))
+            copia = None
+            if os.path.exists(final):
+                copia = os.path.join(copias, *relativo.split("/"))
+                os.makedirs(os.path.dirname(copia), exist_ok=True)
+                os.replace(final, copia)
+            movidos.append((final, copia))
+            os.replace(os.path.join(preparacao, *relativo.split("/")), final)
+        return sum(1 for _, copia in movidos if copia)
+    except BaseException:
+        for final, copia in reversed(movidos):
+            try:
+                if copia:
+                    os.replace(copia, final)
+                elif os.path.exists(final):
+                    os.remove(final)
+            except OSError as e:
+                logger.error(f"Falha ao reverter {final}: {e}")
+        for caminho in reversed(criados):
+            try:
+                os.rmdir(caminho)
+            except OSError:
+                pass
+        raise
+
+
+def criar_estrutura(
+    destino: str,
+    estrutura: Dict[str, Any],
+    variaveis: Optional[Dict[str, Any]] = None,
+    sobrescrever: bool = False,
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Cria uma árvore de diretórios e arquivos a partir de um manifesto.
+
+    Args:
+        destino: Diretório raiz da estrutura
+        estrutura: Manifesto (diretórios como dicionários, arquivos como texto)
+        variaveis: Valores para os modelos ``$nome`` nos caminhos e conteúdos
+        sobrescrever: Substitui arquivos que já existem no destino
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Resumo com a quantidade de arquivos, diretórios e bytes escritos
+    """
+    try:
+        if mcp_client:
+            logger.info(f"Delegando criar_estrutura para MCP Server com destino: {destino}")
+            tarefa_execucao = {
+                "tipo": "executar_ferramenta",
+                "nome_ferramenta": "criar_estrutura",
+                "parametros": {
+                    "destino": destino, "estrutura": estrutura, "variaveis": variaveis, "sobrescrever": sobrescrever
+                }
+            }
+            resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+            return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+        diretorios, arquivos = planificar_manifesto(estrutura, variaveis)
+        destino = os.path.abspath(destino)
+        existe = os.path.exists(destino)
+        if existe and not os.path.isdir(destino):
+            raise FileError(f"O destino existe e não é um diretório: {destino}")
+
+        if existe:
+            for relativo in arquivos:
+                final = os.path.join(destino, *relativo.split("/"))
+                if os.path.isdir(final):
+                    raise FileError(f"Já existe um diretório em {final}")
+                if os.path.exists(final) and not sobrescrever:
+                    raise FileError(f"Arquivo já existe: {final} (use sobrescrever=True)")
+            for relativo in diretorios:
+                caminho = os.path.join(destino, *relativo.split("/"))
+                if os.path.exists(caminho) and not os.path.isdir(caminho):
+                    raise FileError(f"Já existe um arquivo em {caminho}")
+
+        pai = os.path.dirname(destino)
+        os.makedirs(pai, exist_ok=True)
+        preparacao = tempfile.mkdtemp(dir=pai, prefix=f".{os.path.basename(destino)}.")
+        try:
+            for relativo in diretorios:
+                os.makedirs(os.path.join(preparacao, *relativo.split("/")), exist_ok=True)
+            with ThreadPoolExecutor(max_workers=min(MAX_TRABALHADORES, max(1, len(arquivos)))) as executor:
+                escritos = sum(executor.map(lambda item: _gravar(preparacao, *item), arquivos.items()))
+
+            substituidos = 0
+            if existe:
+                substituidos = _mover_para_destino(preparacao, destino, diretorios, list(arquivos))
+            else:
+                # mkdtemp cria o diretório com 0700
+                aplicar_permissoes_padrao(preparacao, diretorio=True)
+                os.rename(preparacao, destino)
+        finally:
+            shutil.rmtree(preparacao, ignore_errors=True)
+
+        invalidar_caminhos([destino])
+        resumo = ResumoEstrutura(destino, len(arquivos), len(diretorios), escritos, substituidos)
+        logger.info(resumo.formatar())
+        return resumo.formatar()
+
+    except (ValidationError, FileError):
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao criar estrutura: {str(e)}")
+        raise FileError(f"Erro ao criar estrutura: {str(e)}")
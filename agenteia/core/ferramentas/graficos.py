@@ -0,0 +1,310 @@
+"""
+Renderização de gráficos fora do processo do agente.
+
+Os gráficos são desenhados com o backend Agg (sem interface gráfica) num pool
+de processos aquecido: cada trabalhador importa o matplotlib uma única vez,
+no inicializador, e atende muitos pedidos. Lotes são distribuídos entre os
+trabalhadores em paralelo.
+
+A saída é endereçada pelo conteúdo: o nome do arquivo é o hash da
+especificação (tipo, dados, títulos, tamanho e formato). Um gráfico já
+renderizado não é desenhado de novo, pedidos iguais simultâneos compartilham
+a mesma renderização e nomes nunca colidem.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..exceptions import ToolError, ValidationError
+from ..logs import setup_logging
+
+logger = setup_logging(__name__)
+
+_config: Dict[str, Any] = {
+    "diretorio": os.path.join("artefatos", "graficos"),
+    "trabalhadores": 2,
+}
+
+TIPOS = ("barras", "linha", "dispersao", "pizza", "histograma")
+
+FORMATOS = ("png", "svg", "pdf")
+
+# Muda quando o desenho muda, para não reaproveitar arquivos antigos
+VERSAO_RENDERIZACAO = 1
+
+_TIPOS_ANTIGOS = {
+    "grafico_barras": "barras", "grafico_linha": "linha", "grafico_pizza": "pizza", "grafico_dispersao": "dispersao",
+}
+
+
+def configurar_graficos(config: Optional[Dict[str, Any]] = None) -> None:
+    """Aplica a seção "graficos" do config (diretorio, trabalhadores)."""
+    global _renderizador
+    if config:
+        _config.update(config)
+        with _lock_global:
+            if _renderizador is not None:
+                _renderizador.fechar()
+                _renderizador = None
+
+
+@dataclass(frozen=True)
+class EspecificacaoGrafico:
+    """O que desenhar: tipo, categorias (eixo x ou fatias) e séries de valores."""
+    tipo: str
+    categorias: Tuple[Any, ...] = ()
+    series: Tuple[Tuple[str, Tuple[float, ...]], ...] = ()
+    titulo: str = ""
+    label_x: str = ""
+    label_y: str = ""
+    largura: float = 10.0
+    altura: float = 6.0
+    dpi: int = 100
+    formato: str = "png"
+    bins: int = 10
+
+    def __post_init__(self) -> None:
+        if self.tipo not in TIPOS:
+            raise ValidationError(f"Tipo de gráfico não suportado: {self.tipo} (use {', '.join(TIPOS)})")
+        if self.formato not in FORMATOS:
+            raise ValidationError(f"Formato de gráfico não suportado: {self.formato} (use {', '.join(FORMATOS)})")
+        if not self.series or not any(valores for _, valores in self.series):
+            raise ValidationError("O gráfico não tem valores.")
+        if self.tipo != "histograma" and any(len(v) != len(self.categorias) for _, v in self.series):
+            raise ValidationError("Cada série precisa de um valor por categoria.")
+
+    def chave(self) -> str:
+        """Hash do conteúdo, usado como nome do arquivo."""
+        conteudo = json.dumps([VERSAO_RENDERIZACAO, asdict(self)], sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def criar(
+        cls,
+        tipo: str,
+        categorias: Sequence[Any] = (),
+        series: Any = None,
+        valores: Optional[Sequence[Any]] = None,
+        **opcoes: Any
+    ) -> "EspecificacaoGrafico":
+        """
+        Monta a especificação a partir de listas e dicionários simples.
+
+        Args:
+            tipo: barras, linha, dispersao, pizza ou histograma
+            categorias: Rótulos do eixo x (ou das fatias)
+            series: ``{nome: valores}`` ou ``[(nome, valores), ...]``
+            valores: Atalho para uma única série sem nome
+            **opcoes: titulo, label_x, label_y, largura, altura, dpi, formato, bins
+        """
+        if series is None:
+            series = {"": valores or []}
+        pares = series.items() if isinstance(series, dict) else series
+        try:
+            normalizadas = tuple(
+                (str(nome), tuple(float(v) if v is not None else float("nan") for v in serie)) for nome, serie in pares
+            )
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Valores do gráfico devem ser numéricos: {e}")
+        campos = {nome: opcoes[nome] for nome in cls.__dataclass_fields__ if nome in opcoes}
+        return cls(_TIPOS_ANTIGOS.get(tipo, tipo), tuple(categorias), normalizadas, **campos)
+
+    @classmethod
+    def de_registros(cls, tipo: str, dados: List[Dict[str, Any]], config: Dict[str, Any]) -> "EspecificacaoGrafico":
+        """Especificação no formato de ``visualizar_dados`` (eixo_x, eixo_y, valores, labels, coluna)."""
+        tipo = _TIPOS_ANTIGOS.get(tipo, tipo)
+        opcoes = {
+            "titulo": config.get("titulo", ""), "label_x": config.get("label_x", ""),
+            "label_y": config.get("label_y", "Frequência" if tipo == "histograma" else ""),
+        }
+        if tipo == "histograma":
+            coluna = config["coluna"]
+            return cls.criar(tipo, series={coluna: [r.get(coluna) for r in dados]}, bins=config.get("bins", 10), **opcoes)
+        if tipo == "pizza":
+            rotulos = config["labels"]
+            categorias = [r.get(rotulos) for r in dados] if isinstance(rotulos, str) else rotulos
+            return cls.criar(tipo, categorias, valores=[r.get(config["valores"]) for r in dados], **opcoes)
+        colunas_y = config["eixo_y"] if isinstance(config["eixo_y"], list) else [config["eixo_y"]]
+        return cls.criar(
+            tipo, [r.get(config["eixo_x"]) for r in dados],
+            series={coluna: [r.get(coluna) for r in dados] for coluna in colunas_y}, **opcoes
+        )
+
+
+def _inicializar_trabalhador() -> None:
+    """Importa o matplotlib (já com Agg) uma vez por processo."""
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+    import matplotlib.figure  # noqa: F401
+    from matplotlib.backends import backend_agg  # noqa: F401
+
+
+def _aquecer() -> int:
+    return os.getpid()
+
+
+def _desenhar(especificacao: Dict[str, Any], destino: str) -> str:
+    """Desenha e grava o gráfico (roda no trabalhador). Usa ``Figure`` direto, sem o estado global do pyplot."""
+    from matplotlib.figure import Figure
+
+    figura = Figure(figsize=(especificacao["largura"], especificacao["altura"]), dpi=especificacao["dpi"])
+    eixos = figura.add_subplot()
+    tipo = especificacao["tipo"]
+    categorias = [str(c) for c in especificacao["categorias"]]
+    series = especificacao["series"]
+
+    if tipo == "barras":
+        largura_barra = 0.8 / len(series)
+        for indice, (nome, valores) in enumerate(series):
+            posicoes = [i + (indice - (len(series) - 1) / 2) * largura_barra for i in range(len(valores))]
+            eixos.bar(posicoes, valores, width=largura_barra, label=nome or None)
+        eixos.set_xticks(range(len(categorias)), categorias, rotation=45 if len(categorias) > 8 else 0)
+    elif tipo in ("linha", "dispersao"):
+        for nome, valores in series:
+            if tipo == "linha":
+                eixos.plot(categorias, valores, marker="o" if len(valores) <= 30 else None, label=nome or None)
+            else:
+                eixos.scatter(categorias, valores, label=nome or None)
+    elif tipo == "pizza":
+        eixos.pie(series[0][1], labels=categorias, autopct="%1.1f%%")
+        eixos.axis("equal")
+    else:
+        valores = [v for v in series[0][1] if v == v]
+        eixos.hist(valores, bins=especificacao["bins"])
+
+    eixos.set_title(especificacao["titulo"])
+    if tipo != "pizza":
+        eixos.set_xlabel(especificacao["label_x"])
+        eixos.set_ylabel(especificacao["label_y"])
+    if len(series) > 1:
+        eixos.legend()
+    figura.tight_layout()
+
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    figura.savefig(temporario, format=especificacao["formato"])
+    os.replace(temporario, destino)
+    return destino
+
+
+class RenderizadorGraficos:
+    """Pool de processos aquecido que grava gráficos num diretório endereçado pelo conteúdo."""
+
+    def __init__(self, diretorio: str = _config["diretorio"], trabalhadores: int = _config["trabalhadores"]):
+        self.diretorio = diretorio
+        self.trabalhadores = max(1, trabalhadores)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pendentes: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def caminho(self, especificacao: EspecificacaoGrafico) -> str:
+        """Arquivo do gráfico (existindo ou não)."""
+        return os.path.join(self.diretorio, f"{especificacao.chave()}.{especificacao.formato}")
+
+    def _obter_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.trabalhadores, initializer=_inicializar_trabalhador
+            )
+        return self._executor
+
+    def aquecer(self) -> None:
+        """Inicia os trabalhadores (e o import do matplotlib) antes do primeiro pedido."""
+        with self._lock:
+            executor = self._obter_executor()
+        for futuro in [executor.submit(_aquecer) for _ in range(self.trabalhadores)]:
+            futuro.result()
+
+    def agendar(self, especificacao: EspecificacaoGrafico) -> Future:
+        """Future com o caminho do gráfico; não renderiza se o arquivo já existir ou já estiver em andamento."""
+        destino = self.caminho(especificacao)
+        with self._lock:
+            if os.path.exists(destino):
+                pronto: Future = Future()
+                pronto.set_result(destino)
+                return pronto
+            futuro = self._pendentes.get(destino)
+            if futuro is None:
+                os.makedirs(self.diretorio, exist_ok=True)
+                futuro = self._obter_executor().submit(_desenhar, asdict(especificacao), destino)
+                self._pendentes[destino] = futuro
+                futuro.add_done_callback(lambda _, d=destino: self._concluir(d))
+            return futuro
+
+    def _concluir(self, destino: str) -> None:
+        with self._lock:
+            self._pendentes.pop(destino, None)
+
+    def renderizar(self, especificacao: EspecificacaoGrafico) -> str:
+        """Caminho do gráfico, renderizando-o se necessário."""
+        return self.renderizar_lote([especificacao])[0]
+
+    def renderizar_lote(self, especificacoes: Iterable[EspecificacaoGrafico]) -> List[str]:
+        """Renderiza vários gráficos em paralelo; os caminhos saem na ordem dos pedidos."""
+        futuros = [self.agendar(e) for e in especificacoes]
+        caminhos = []
+        for futuro in futuros:
+            try:
+                caminhos.append(futuro.result())
+            except BrokenProcessPool as e:
+                with self._lock:
+                    self._executor = None
+                    self._pendentes.clear()
+                raise ToolError(f"O processo de renderização de gráficos falhou: {e}")
+            except Exception as e:
+                raise ToolError(f"Erro ao renderizar gráfico: {e}")
+        return caminhos
+
+    def fechar(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_renderizador: Optional[RenderizadorGraficos] = None
+_lock_global = threading.Lock()
+
+
+def obter_renderizador() -> RenderizadorGraficos:
+    """Renderizador compartilhado, criado com a configuração atual."""
+    global _renderizador
+    with _lock_global:
+        if _renderizador is None:
+            _renderizador = RenderizadorGraficos(_config["diretorio"], _config["trabalhadores"])
+        return _renderizador
+
+
+def gerar_graficos(especificacoes: List[Dict[str, Any]], mcp_client: Optional[Any] = None) -> str:
+    """
+    Gera um ou mais gráficos em paralelo.
+
+    Args:
+        especificacoes: Lista de ``{"tipo", "categorias", "series" ou "valores", "titulo", "label_x", "label_y", ...}``
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Caminho de cada gráfico gerado, um por linha
+    """
+    if mcp_client:
+        logger.info(f"Delegando gerar_graficos para MCP Server: {len(especificacoes)} gráfico(s)")
+        tarefa_execucao = {
+            "tipo": "executar_ferramenta",
+            "nome_ferramenta": "gerar_graficos",
+            "parametros": {"especificacoes": especificacoes}
+        }
+        resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+        return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+    if isinstance(especificacoes, str):
+        especificacoes = json.loads(especificacoes)
+    if isinstance(especificacoes, dict):
+        especificacoes = [especificacoes]
+    graficos = [EspecificacaoGrafico.criar(**dict(e)) for e in especificacoes]
+    caminhos = obter_renderizador().renderizar_lote(graficos)
+    return "\n".join(f"{g.titulo or g.tipo}: {c}" for g, c in zip(graficos, caminhos))
@@ -0,0 +1,34 @@
+"""
+Permissões de arquivos gravados por substituição atômica.
+
+``tempfile.mkstemp`` cria arquivos com modo 0600 e ``tempfile.mkdtemp``
+diretórios com 0700; ao renomear o temporário para o destino, esse modo vai
+junto. ``aplicar_permissoes_padrao`` dá ao temporário o modo que um ``open()``
+ou ``os.makedirs`` comum daria, respeitando a umask do processo.
+"""
+
+import os
+import threading
+
+_lock_umask = threading.Lock()
+
+
+def umask_atual() -> int:
+    """Retorna a umask do processo sem alterá-la."""
+    # os.umask só lê a máscara trocando-a; o lock evita que duas threads
+    # restaurem valores trocados
+    with _lock_umask:
+        umask = os.umask(0)
+        os.umask(umask)
+    return umask
+
+
+def aplicar_permissoes_padrao(caminho: str, diretorio: bool = False) -> None:
+    """
+    Aplica a ``caminho`` o modo padrão de um arquivo (0666) ou diretório (0777) novo, menos a umask.
+
+    Args:
+        caminho: Arquivo ou diretório temporário
+        diretorio: Se o caminho é um diretório
+    """
+    os.chmod(caminho, (0o777 if diretorio else 0o666) & ~umask_atual())
@@ -0,0 +1,382 @@
+"""
+Leitura de arquivos grandes em partes.
+
+Leituras por intervalo de bytes ou de linhas, início/fim do arquivo e busca
+via ``mmap`` — nenhuma delas carrega o arquivo inteiro em memória. Toda saída
+respeita um orçamento de bytes; quando o conteúdo não cabe, é devolvido um
+token de continuação para ler a parte seguinte. ``iterar_blocos`` alimenta
+o indexador do RAG e o upload da interface web.
+"""
+
+import base64
+import codecs
+import json
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from ..exceptions import FileError, ValidationError
+
+_config: Dict[str, Any] = {
+    "orcamento_bytes": 64 * 1024,
+    "tamanho_bloco": 1024 * 1024,
+}
+
+
+def configurar_leitura(config: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Aplica a seção "leitura" do config.
+
+    Args:
+        config: Dicionário com orcamento_bytes (tamanho máximo de uma resposta) e tamanho_bloco
+    """
+    for chave in ("orcamento_bytes", "tamanho_bloco"):
+        if config and chave in config:
+            _config[chave] = int(config[chave])
+
+
+def orcamento_padrao() -> int:
+    """Tamanho máximo (bytes) de um trecho devolvido ao agente."""
+    return _config["orcamento_bytes"]
+
+
+@dataclass
+class TrechoArquivo:
+    """Parte de um arquivo lida dentro do orçamento.
+
+    Attributes:
+        texto: Conteúdo decodificado
+        inicio: Offset (bytes) do início do trecho
+        fim: Offset (bytes) logo após o fim do trecho
+        tamanho_arquivo: Tamanho total do arquivo
+        token: Token para continuar a leitura (None se o trecho chegou ao fim pedido)
+    """
+    texto: str
+    inicio: int
+    fim: int
+    tamanho_arquivo: int
+    token: Optional[str] = None
+
+    @property
+    def truncado(self) -> bool:
+        return self.token is not None
+
+    def formatar(self) -> str:
+        """Texto do trecho com a instrução de continuação, se houver."""
+        if not self.token:
+            return self.texto
+        return (
+            f"{self.texto}\n\n[... exibidos os bytes {self.inicio}-{self.fim} de {self.tamanho_arquivo}. "
+            f"Para continuar, use token='{self.token}']"
+        )
+
+
+def gerar_token(
+    caminho: str,
+    offset: int,
+    fim: Optional[int] = None,
+    linha: Optional[int] = None,
+    fim_linha: Optional[int] = None
+) -> str:
+    """
+    Codifica a posição de continuação de uma leitura.
+
+    Args:
+        caminho: Arquivo lido
+        offset: Byte onde a próxima leitura começa
+        fim: Byte final exclusivo (None = fim do arquivo)
+        linha: Número da linha que começa em ``offset`` (leituras por linhas)
+        fim_linha: Última linha pedida (leituras por linhas)
+    """
+    dados = {"c": os.path.abspath(caminho), "o": offset}
+    if fim is not None:
+        dados["f"] = fim
+    if fim_linha is not None:
+        dados["l"] = linha
+        dados["lf"] = fim_linha
+    return base64.urlsafe_b64encode(json.dumps(dados).encode("utf-8")).decode("ascii")
+
+
+def interpretar_token(token: str) -> Dict[str, Any]:
+    """
+    Decodifica um token de continuação.
+
+    Returns:
+        Dicionário com "caminho", "offset", "fim" (None se a leitura vai até o fim do arquivo)
+        e, em leituras por linhas, "linha" e "fim_linha" (None nas demais)
+    """
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return {
+            "caminho": dados["c"], "offset": int(dados["o"]), "fim": dados.get("f"),
+            "linha": dados.get("l"), "fim_linha": dados.get("lf")
+        }
+    except Exception:
+        raise ValidationError("Token de continuação inválido.")
+
+
+def _verificar_arquivo(caminho: str) -> int:
+    if not os.path.isfile(caminho):
+        raise FileError(f"Arquivo não encontrado: {caminho}")
+    return os.path.getsize(caminho)
+
+
+def _cortar(dados: bytes, completo: bool) -> bytes:
+    """Ajusta o fim de um bloco: de preferência numa quebra de linha, nunca no meio de um caractere UTF-8."""
+    if completo or not dados:
+        return dados
+    quebra = dados.rfind(b"\n")
+    if quebra >= len(dados) // 2:
+        return dados[:quebra + 1]
+    # Recua bytes de continuação (10xxxxxx) para não partir um caractere multibyte
+    fim = len(dados)
+    while fim > 0 and len(dados) - fim < 4 and (dados[fim - 1] & 0xC0) == 0x80:
+        fim -= 1
+    if fim > 0 and dados[fim - 1] >= 0xC0:
+        fim -= 1
+    return dados[:fim] if fim > 0 else dados
+
+
+def ler_intervalo(
+    caminho: str,
+    inicio: int = 0,
+    fim: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    encoding: str = "utf-8"
+) -> TrechoArquivo:
+    """
+    Lê o intervalo de bytes [inicio, fim) de um arquivo, limitado ao orçamento.
+
+    Args:
+        caminho: Caminho do arquivo
+        inicio: Offset inicial (negativo conta a partir do fim)
+        fim: Offset final exclusivo (None = fim do arquivo)
+        max_bytes: Orçamento do trecho (padrão: configuração "leitura.orcamento_bytes")
+        encoding: Codificação do texto
+
+    Returns:
+        TrechoArquivo com token de continuação se o intervalo não coube no orçamento
+    """
+    tamanho = _verificar_arquivo(caminho)
+    max_bytes = max_bytes or orcamento_padrao()
+    if inicio < 0:
+        inicio = max(0, tamanho + inicio)
+    limite = tamanho if fim is None else min(fim, tamanho)
+    if inicio > limite:
+        raise ValidationError(f"Intervalo inválido: início {inicio} além do fim {limite} (arquivo com {tamanho} bytes).")
+
+    with open(caminho, "rb") as f:
+        f.seek(inicio)
+        dados = f.read(min(limite - inicio, max_bytes))
+
+    completo = inicio + len(dados) >= limite
+    dados = _cortar(dados, completo)
+    proximo = inicio + len(dados)
+    token = None if proximo >= limite else gerar_token(caminho, proximo, fim)
+    return TrechoArquivo(dados.decode(encoding, errors="replace"), inicio, proximo, tamanho, token)
+
+
+def ler_linhas(
+    caminho: str,
+    inicio_linha: int = 1,
+    fim_linha: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    encoding: str = "utf-8",
+    offset: int = 0,
+    linha_offset: int = 1
+) -> TrechoArquivo:
+    """
+    Lê as linhas [inicio_linha, fim_linha] (numeradas a partir de 1), limitado ao orçamento.
+
+    O arquivo é percorrido linha a linha, sem carregá-lo inteiro; o token de
+    continuação aponta para o byte da próxima linha não exibida e guarda
+    ``fim_linha``, para que a continuação pare na mesma linha final.
+
+    Args:
+        offset: Byte onde começa a linha ``linha_offset`` (continuação sem reler o início do arquivo)
+        linha_offset: Número da linha que começa em ``offset``
+    """
+    tamanho = _verificar_arquivo(caminho)
+    max_bytes = max_bytes or orcamento_padrao()
+    if inicio_linha < linha_offset or linha_offset < 1 or (fim_linha is not None and fim_linha < inicio_linha):
+        raise ValidationError("Intervalo de linhas inválido.")
+
+    partes: List[bytes] = []
+    usados = 0
+    inicio = fim = offset
+    token = None
+    with open(caminho, "rb") as f:
+        f.seek(offset)
+        numero = linha_offset - 1
+        for linha in iter(f.readline, b""):
+            numero += 1
+            if numero < inicio_linha:
+                fim += len(linha)
+                inicio = fim
+                continue
+            if fim_linha is not None and numero > fim_linha:
+                break
+            if partes and usados + len(linha) > max_bytes:
+                token = gerar_token(caminho, fim, linha=numero, fim_linha=fim_linha)
+                break
+            if not partes and len(linha) > max_bytes:
+                # Uma única linha maior que o orçamento: continua por bytes
+                trecho = ler_intervalo(caminho, fim, fim + len(linha), max_bytes, encoding)
+                return TrechoArquivo(trecho.texto, fim, trecho.fim, tamanho, trecho.token)
+            partes.append(linha)
+            usados += len(linha)
+            fim += len(linha)
+
+    return TrechoArquivo(b"".join(partes).decode(encoding, errors="replace"), inicio, fim, tamanho, token)
+
+
+def ler_fim(caminho: str, linhas: int = 50, max_bytes: Optional[int] = None, encoding: str = "utf-8") -> TrechoArquivo:
+    """
+    Lê as últimas ``linhas`` linhas do arquivo, lendo blocos a partir do fim.
+
+    Args:
+        caminho: Caminho do arquivo
+        linhas: Quantidade de linhas
+        max_bytes: Orçamento do trecho
+        encoding: Codificação do texto
+    """
+    tamanho = _verificar_arquivo(caminho)
+    max_bytes = max_bytes or orcamento_padrao()
+    bloco = 64 * 1024
+    dados = b""
+    posicao = tamanho
+    with open(caminho, "rb") as f:
+        # +1: a última linha pode terminar em "\n"
+        while posicao > 0 and dados.count(b"\n") <= linhas and len(dados) < max_bytes:
+            leitura = min(bloco, posicao)
+            posicao -= leitura
+            f.seek(posicao)
+            dados = f.read(leitura) + dados
+
+    final = dados.rstrip(b"\n")
+    partes = final.split(b"\n")
+    selecionadas = b"\n".join(partes[-linhas:]) + dados[len(final):]
+    if len(selecionadas) > max_bytes:
+        selecionadas = selecionadas[-max_bytes:]
+        quebra = selecionadas.find(b"\n")
+        if 0 <= quebra < len(selecionadas) - 1:
+            selecionadas = selecionadas[quebra + 1:]
+    inicio = tamanho - len(selecionadas)
+    return TrechoArquivo(selecionadas.decode(encoding, errors="replace"), inicio, tamanho, tamanho)
+
+
+def buscar_no_arquivo(
+    caminho: str,
+    padrao: str,
+    regex: bool = False,
+    ignorar_maiusculas: bool = False,
+    max_resultados: int = 100,
+    encoding: str = "utf-8"
+) -> List[Dict[str, Any]]:
+    """
+    Procura um texto (ou expressão regular) em um arquivo mapeado em memória.
+
+    Args:
+        caminho: Caminho do arquivo
+        padrao: Texto ou expressão regular
+        regex: Interpreta ``padrao`` como expressão regular
+        ignorar_maiusculas: Busca sem diferenciar maiúsculas/minúsculas
+        max_resultados: Máximo de ocorrências retornadas
+        encoding: Codificação do arquivo
+
+    Returns:
+        Lista de {"linha", "coluna", "offset", "texto"} para cada ocorrência
+    """
+    tamanho = _verificar_arquivo(caminho)
+    if tamanho == 0 or not padrao:
+        return []
+
+    if regex or ignorar_maiusculas:
+        expressao = padrao if regex else re.escape(padrao)
+        try:
+            compilado = re.compile(expressao.encode(encoding), re.IGNORECASE if ignorar_maiusculas else 0)
+        except re.error as e:
+            raise ValidationError(f"Expressão regular inválida: {e}")
+    else:
+        compilado = None
+    alvo = padrao.encode(encoding)
+
+    resultados: List[Dict[str, Any]] = []
+    with open(caminho, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        def ocorrencias() -> Iterator[int]:
+            if compilado is not None:
+                for correspondencia in compilado.finditer(mm):
+                    yield correspondencia.start()
+                return
+            posicao = mm.find(alvo)
+            while posicao != -1:
+                yield posicao
+                posicao = mm.find(alvo, posicao + max(1, len(alvo)))
+
+        linha_atual, contado_ate, ultima_linha = 1, 0, -1
+        for offset in ocorrencias():
+            inicio_linha = mm.rfind(b"\n", 0, offset) + 1
+            if inicio_linha == ultima_linha:
+                # Uma ocorrência por linha
+                continue
+            linha_atual += mm[contado_ate:inicio_linha].count(b"\n")
+            contado_ate = inicio_linha
+            fim_linha = mm.find(b"\n", offset)
+            fim_linha = tamanho if fim_linha == -1 else fim_linha
+            texto = mm[inicio_linha:min(fim_linha, inicio_linha + 500)].decode(encoding, errors="replace")
+            resultados.append({
+                "linha": linha_atual,
+                "coluna": len(mm[inicio_linha:offset].decode(encoding, errors="replace")) + 1,
+                "offset": offset,
+                "texto": texto.rstrip("\r")
+            })
+            ultima_linha = inicio_linha
+            if len(resultados) >= max_resultados:
+                break
+    return resultados
+
+
+def iterar_blocos(
+    origem: Union[str, BinaryIO],
+    tamanho_bloco: Optional[int] = None,
+    encoding: str = "utf-8",
+    alinhar_linhas: bool = True
+) -> Iterator[str]:
+    """
+    Gera o conteúdo de um arquivo (ou stream binário) em blocos de texto.
+
+    Os bytes são decodificados incrementalmente (um caractere multibyte nunca
+    é partido) e, com ``alinhar_linhas``, cada bloco termina numa quebra de
+    linha sempre que houver uma no bloco.
+
+    Args:
+        origem: Caminho do arquivo ou objeto binário com ``read``
+        tamanho_bloco: Bytes lidos por vez (padrão: configuração "leitura.tamanho_bloco")
+        encoding: Codificação do texto
+        alinhar_linhas: Termina os blocos em quebras de linha
+
+    Yields:
+        Blocos de texto
+    """
+    tamanho_bloco = tamanho_bloco or _config["tamanho_bloco"]
+    decodificador = codecs.getincrementaldecoder(encoding)(errors="replace")
+    arquivo = open(origem, "rb") if isinstance(origem, (str, os.PathLike)) else origem
+    pendente = ""
+    try:
+        for dados in iter(lambda: arquivo.read(tamanho_bloco), b""):
+            texto = pendente + decodificador.decode(dados)
+            pendente = ""
+            if alinhar_linhas:
+                quebra = texto.rfind("\n")
+                if quebra != -1:
+                    texto, pendente = texto[:quebra + 1], texto[quebra + 1:]
+            if texto:
+                yield texto
+        resto = pendente + decodificador.decode(b"", final=True)
+        if resto:
+            yield resto
+    finally:
+        if arquivo is not origem:
+            arquivo.close()
@@ -0,0 +1,210 @@
+"""
+Motor de listagem de diretórios baseado em ``os.scandir``.
+
+Os dados de cada entrada vêm do ``DirEntry`` (tipo já conhecido pelo
+``scandir`` e ``stat`` em cache), sem chamadas extras a ``isfile``/``getsize``.
+A listagem é um gerador: pode ser recursiva (com limite de profundidade),
+filtrada por glob/extensão e paginada com cursor sem carregar o diretório
+inteiro em memória — a ordenação de uma página usa um heap do tamanho da página.
+"""
+
+import base64
+import fnmatch
+import heapq
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..exceptions import FileError, ValidationError
+
+TIPO_ARQUIVO = "arquivo"
+TIPO_DIRETORIO = "diretorio"
+TIPO_LINK = "link"
+
+ORDENACOES: Dict[str, Callable[["EntradaListagem"], Tuple]] = {
+    "nome": lambda e: (e.caminho.casefold(), e.caminho),
+    "tipo": lambda e: (e.tipo != TIPO_DIRETORIO, e.caminho.casefold(), e.caminho),
+    "tamanho": lambda e: (e.tamanho, e.caminho),
+    "modificado": lambda e: (e.modificado, e.caminho),
+}
+
+
+@dataclass
+class EntradaListagem:
+    """Uma entrada da listagem; ``caminho`` é relativo ao diretório listado."""
+    caminho: str
+    nome: str
+    tipo: str
+    tamanho: int
+    modificado: float
+    profundidade: int
+
+    def para_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class PaginaListagem:
+    """Página de uma listagem ordenada, com totais de todas as entradas filtradas."""
+    diretorio: str
+    entradas: List[EntradaListagem] = field(default_factory=list)
+    proximo_cursor: Optional[str] = None
+    total_arquivos: int = 0
+    total_diretorios: int = 0
+    tamanho_total: int = 0
+
+
+def formatar_tamanho(tamanho: int) -> str:
+    """Formata um tamanho em bytes de forma legível."""
+    if tamanho < 1024:
+        return f"{tamanho} bytes"
+    if tamanho < 1024 * 1024:
+        return f"{tamanho / 1024:.1f} KB"
+    if tamanho < 1024 ** 3:
+        return f"{tamanho / (1024 * 1024):.1f} MB"
+    return f"{tamanho / 1024 ** 3:.1f} GB"
+
+
+def _corresponde(entrada: EntradaListagem, padrao: Optional[str], extensao: Optional[str]) -> bool:
+    if extensao and not entrada.nome.lower().endswith(extensao.lower()):
+        return False
+    if padrao:
+        # Padrões com separador comparam o caminho relativo; os demais, só o nome
+        alvo = entrada.caminho if ("/" in padrao or os.sep in padrao) else entrada.nome
+        return fnmatch.fnmatch(alvo, padrao)
+    return True
+
+
+def iterar_entradas(
+    diretorio: str,
+    recursivo: bool = False,
+    profundidade_maxima: Optional[int] = None,
+    padrao: Optional[str] = None,
+    extensao: Optional[str] = None,
+    incluir_ocultos: bool = True,
+    seguir_links: bool = False
+) -> Iterator[EntradaListagem]:
+    """
+    Percorre um diretório com ``os.scandir`` gerando as entradas sob demanda.
+
+    Args:
+        diretorio: Diretório base
+        recursivo: Desce em subdiretórios
+        profundidade_maxima: Profundidade máxima da recursão (0 = só o diretório base)
+        padrao: Glob aplicado ao nome (ou ao caminho relativo, se contiver "/")
+        extensao: Extensão para filtrar (ex.: ".py")
+        incluir_ocultos: Inclui entradas iniciadas por "."
+        seguir_links: Desce em links simbólicos para diretórios
+
+    Yields:
+        EntradaListagem de cada arquivo/diretório que passa pelos filtros
+    """
+    if not os.path.isdir(diretorio):
+        raise FileError(f"Diretório não encontrado: {diretorio}")
+
+    pendentes: List[Tuple[str, str, int]] = [(diretorio, "", 0)]
+    while pendentes:
+        atual, relativo, profundidade = pendentes.pop()
+        try:
+            iterador = os.scandir(atual)
+        except OSError:
+            # Sem permissão ou removido durante a varredura
+            continue
+        with iterador:
+            for item in iterador:
+                if not incluir_ocultos and item.name.startswith("."):
+                    continue
+                try:
+                    link = item.is_symlink()
+                    e_diretorio = item.is_dir(follow_symlinks=seguir_links)
+                    info = item.stat(follow_symlinks=seguir_links)
+                except OSError:
+                    continue
+
+                caminho = f"{relativo}{item.name}" if not relativo else f"{relativo}/{item.name}"
+                tipo = TIPO_DIRETORIO if e_diretorio else (TIPO_LINK if link and not seguir_links else TIPO_ARQUIVO)
+                entrada = EntradaListagem(
+                    caminho=caminho,
+                    nome=item.name,
+                    tipo=tipo,
+                    tamanho=0 if e_diretorio else info.st_size,
+                    modificado=info.st_mtime,
+                    profundidade=profundidade
+                )
+                if _corresponde(entrada, padrao, extensao):
+                    yield entrada
+
+                if e_diretorio and recursivo and (profundidade_maxima is None or profundidade < profundidade_maxima):
+                    pendentes.append((item.path, caminho, profundidade + 1))
+
+
+def _codificar_cursor(ordenar_por: str, decrescente: bool, chave: Tuple) -> str:
+    bruto = json.dumps([ordenar_por, decrescente, list(chave)], ensure_ascii=False)
+    return base64.urlsafe_b64encode(bruto.encode("utf-8")).decode("ascii")
+
+
+def _decodificar_cursor(cursor: str, ordenar_por: str, decrescente: bool) -> Tuple:
+    try:
+        ordem, desc, chave = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValidationError("Cursor de listagem inválido.")
+    if ordem != ordenar_por or desc != decrescente:
+        raise ValidationError("O cursor foi gerado com outra ordenação.")
+    return tuple(chave)
+
+
+def listar_pagina(
+    diretorio: str,
+    ordenar_por: str = "nome",
+    decrescente: bool = False,
+    limite: int = 200,
+    cursor: Optional[str] = None,
+    **filtros: Any
+) -> PaginaListagem:
+    """
+    Lista uma página ordenada de um diretório.
+
+    A ordenação usa um heap de ``limite`` elementos e o cursor guarda a chave
+    da última entrada devolvida, então cada página custa uma varredura com
+    memória proporcional ao tamanho da página.
+
+    Args:
+        diretorio: Diretório base
+        ordenar_por: "nome", "tipo", "tamanho" ou "modificado"
+        decrescente: Inverte a ordem
+        limite: Entradas por página
+        cursor: Cursor retornado pela página anterior
+        **filtros: Argumentos de ``iterar_entradas`` (recursivo, padrao, extensao, ...)
+
+    Returns:
+        PaginaListagem com as entradas e o cursor da próxima página (None na última)
+    """
+    if ordenar_por not in ORDENACOES:
+        raise ValidationError(f"Ordenação inválida: {ordenar_por}. Use uma de: {', '.join(ORDENACOES)}")
+    if limite < 1:
+        raise ValidationError("O limite da página deve ser maior que zero.")
+
+    chave = ORDENACOES[ordenar_por]
+    apos = _decodificar_cursor(cursor, ordenar_por, decrescente) if cursor else None
+    pagina = PaginaListagem(diretorio=diretorio)
+
+    def candidatas() -> Iterator[Tuple[Tuple, EntradaListagem]]:
+        for entrada in iterar_entradas(diretorio, **filtros):
+            if entrada.tipo == TIPO_DIRETORIO:
+                pagina.total_diretorios += 1
+            else:
+                pagina.total_arquivos += 1
+                pagina.tamanho_total += entrada.tamanho
+            valor = chave(entrada)
+            if apos is None or (valor < apos if decrescente else valor > apos):
+                yield valor, entrada
+
+    selecionar = heapq.nlargest if decrescente else heapq.nsmallest
+    # Um item a mais indica se existe próxima página
+    selecionadas = selecionar(limite + 1, candidatas(), key=lambda item: item[0])
+
+    pagina.entradas = [entrada for _, entrada in selecionadas[:limite]]
+    if len(selecionadas) > limite:
+        pagina.proximo_cursor = _codificar_cursor(ordenar_por, decrescente, selecionadas[limite - 1][0])
+    return pagina
@@ -7,15 +7,15 @@ com suporte a tempo limite, cancelamento e tratamento de erros.
 
 import time
 import threading
-import logging
 from typing import Dict, List, Optional, Callable, Any, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import uuid
 from ..exceptions import AgenteError, LoggingError
+from ..logs import setup_logging
 
 # Configuração de logging
-logger = logging.getLogger(__name__)
+logger = setup_logging(__name__)
 
 class TimeoutError(Exception):
     """Exceção lançada quando uma tarefa atinge o tempo limite."""
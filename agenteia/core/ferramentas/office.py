@@ -2,21 +2,25 @@
 Ferramentas para manipulação de arquivos do Microsoft Office
 """
 
+import itertools
 import os
-import logging
-from typing import List, Dict, Any, Optional
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
 from pathlib import Path
 import json
 
-try:
-    import docx
-    import openpyxl
-    import pptx
-except ImportError:
-    logging.warning("Bibliotecas do Office não encontradas. Algumas funcionalidades estarão indisponíveis.")
-
 from ...core.logs import setup_logging
 from ..exceptions import ToolError, FileError
+from ..carregamento import ImportacaoTardia
+from .gravacao import aplicar_permissoes_padrao
+
+# Bibliotecas do Office importadas apenas no primeiro uso de cada formato
+docx = ImportacaoTardia("docx")
+openpyxl = ImportacaoTardia("openpyxl")
+pptx = ImportacaoTardia("pptx")
 
 # Configurar logger
 logger = setup_logging(__name__)
@@ -93,7 +97,186 @@ def ler_word(caminho_arquivo: str,
         logger.error(f"Erro ao ler arquivo Word: {str(e)}")
         raise ToolError(f"Erro ao ler arquivo Word: {str(e)}")
 
-def criar_excel(caminho_arquivo: str, dados: List[List[Any]],
+LINHAS_POR_PAGINA = 100
+
+# Cursores de paginação mantidos abertos (cada um segura o arquivo aberto)
+MAX_CURSORES = 4
+
+
+@contextmanager
+def _abrir_planilha(caminho_arquivo: str):
+    """Pasta de trabalho em modo somente leitura (XML lido sob demanda), sempre fechada ao sair."""
+    wb = openpyxl.load_workbook(caminho_arquivo, read_only=True, data_only=True)
+    try:
+        yield wb
+    finally:
+        wb.close()
+
+
+def _aba(wb: Any, aba: Optional[str]) -> Any:
+    if aba is None:
+        return wb.active
+    if aba not in wb.sheetnames:
+        raise FileError(f"Aba não encontrada: {aba}. Abas disponíveis: {', '.join(wb.sheetnames)}")
+    return wb[aba]
+
+
+class _CursorExcel:
+    """
+    Aba aberta em modo somente leitura, posicionada na linha seguinte à última página lida.
+
+    No modo somente leitura o openpyxl percorre o XML da aba desde o início a
+    cada ``iter_rows``; mantendo o gerador aberto, a página seguinte continua
+    de onde a anterior parou.
+    """
+
+    def __init__(self, caminho_arquivo: str, aba: Optional[str], estado: Tuple[int, int]):
+        self.estado = estado
+        self.wb = openpyxl.load_workbook(caminho_arquivo, read_only=True, data_only=True)
+        try:
+            self.ws = _aba(self.wb, aba)
+        except BaseException:
+            self.wb.close()
+            raise
+        self.nome_aba = self.ws.title
+        self.total = self.ws.max_row
+        self.titulos = next(self.ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        self._linhas: Optional[Iterator[Tuple[Any, ...]]] = None
+        self.proxima = 0
+
+    def ler(self, linha_inicial: int, quantidade: int) -> List[Tuple[Any, ...]]:
+        """Até ``quantidade`` linhas a partir de ``linha_inicial``."""
+        if self._linhas is None or linha_inicial != self.proxima:
+            self._linhas = self.ws.iter_rows(min_row=linha_inicial, values_only=True)
+        linhas = list(itertools.islice(self._linhas, quantidade))
+        self.proxima = linha_inicial + len(linhas)
+        return linhas
+
+    def devolver(self, linha: Tuple[Any, ...]) -> None:
+        """Recoloca uma linha lida a mais no início da próxima leitura."""
+        self._linhas = itertools.chain([linha], self._linhas)
+        self.proxima -= 1
+
+    def fechar(self) -> None:
+        self.wb.close()
+
+
+_cursores: "OrderedDict[Tuple[str, Optional[str]], _CursorExcel]" = OrderedDict()
+_lock_cursores = threading.Lock()
+
+
+def _obter_cursor(caminho_arquivo: str, aba: Optional[str]) -> Tuple[Tuple[str, Optional[str]], _CursorExcel]:
+    chave = (os.path.abspath(caminho_arquivo), aba)
+    info = os.stat(caminho_arquivo)
+    estado = (info.st_mtime_ns, info.st_size)
+    with _lock_cursores:
+        # Retirado do cache enquanto em uso: duas leituras nunca compartilham o gerador
+        cursor = _cursores.pop(chave, None)
+    if cursor is not None and cursor.estado != estado:
+        cursor.fechar()
+        cursor = None
+    return chave, cursor or _CursorExcel(caminho_arquivo, aba, estado)
+
+
+def _guardar_cursor(chave: Tuple[str, Optional[str]], cursor: _CursorExcel) -> None:
+    with _lock_cursores:
+        anterior = _cursores.pop(chave, None)
+        _cursores[chave] = cursor
+        excedentes = [_cursores.popitem(last=False)[1] for _ in range(len(_cursores) - MAX_CURSORES)]
+    for antigo in [anterior] + excedentes:
+        if antigo is not None:
+            antigo.fechar()
+
+
+def fechar_cursores_excel(caminho_arquivo: Optional[str] = None) -> None:
+    """Fecha os cursores de paginação de um arquivo (ou de todos)."""
+    caminho = os.path.abspath(caminho_arquivo) if caminho_arquivo else None
+    with _lock_cursores:
+        chaves = [chave for chave in _cursores if caminho is None or chave[0] == caminho]
+        fechados = [_cursores.pop(chave) for chave in chaves]
+    for cursor in fechados:
+        cursor.fechar()
+
+
+def listar_abas_excel(caminho_arquivo: str) -> List[Dict[str, Any]]:
+    """
+    Lista as abas de um arquivo Excel sem carregar as células.
+
+    Returns:
+        Nome e dimensões declaradas de cada aba (``linhas``/``colunas`` podem
+        ser None quando o arquivo não informa as dimensões)
+    """
+    with _abrir_planilha(caminho_arquivo) as wb:
+        return [
+            {"nome": ws.title, "linhas": ws.max_row, "colunas": ws.max_column}
+            for ws in wb.worksheets
+        ]
+
+
+def iterar_linhas_excel(caminho_arquivo: str, aba: Optional[str] = None, intervalo: Optional[str] = None,
+    linha_inicial: int = 1, linha_final: Optional[int] = None
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Gera as linhas (tuplas de valores) de uma aba, uma por vez.
+
+    Args:
+        caminho_arquivo: Caminho do arquivo Excel
+        aba: Nome da aba (padrão: a aba ativa)
+        intervalo: Intervalo de células, ex.: "B2:D500" (tem precedência sobre as linhas)
+        linha_inicial: Primeira linha (começando em 1)
+        linha_final: Última linha (inclusive; padrão: até o fim)
+
+    Yields:
+        Valores de cada linha
+    """
+    limites: Dict[str, Optional[int]] = {"min_row": linha_inicial, "max_row": linha_final}
+    if intervalo:
+        min_col, min_row, max_col, max_row = openpyxl.utils.cell.range_boundaries(intervalo.upper())
+        limites = {"min_col": min_col, "min_row": min_row, "max_col": max_col, "max_row": max_row}
+    with _abrir_planilha(caminho_arquivo) as wb:
+        yield from _aba(wb, aba).iter_rows(values_only=True, **limites)
+
+
+def escrever_excel(caminho_arquivo: str, abas: Dict[str, Iterable[Sequence[Any]]]) -> Dict[str, int]:
+    """
+    Grava um arquivo Excel em modo somente escrita, consumindo as linhas sob demanda.
+
+    As linhas podem vir de geradores: cada uma é serializada e descartada, de
+    modo que a memória não cresce com o tamanho da planilha. O arquivo é
+    gravado num temporário e renomeado no final.
+
+    Args:
+        caminho_arquivo: Caminho onde o arquivo será salvo
+        abas: Nome da aba -> iterável de linhas
+
+    Returns:
+        Quantidade de linhas gravadas por aba
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    contagens = {}
+    for nome, linhas in abas.items():
+        ws = wb.create_sheet(title=nome)
+        contagens[nome] = 0
+        for linha in linhas:
+            ws.append(list(linha))
+            contagens[nome] += 1
+
+    pasta = os.path.dirname(os.path.abspath(caminho_arquivo))
+    descritor, temporario = tempfile.mkstemp(dir=pasta, prefix=".excel_", suffix=".xlsx")
+    os.close(descritor)
+    try:
+        wb.save(temporario)
+        # mkstemp cria o temporário com 0600
+        aplicar_permissoes_padrao(temporario)
+        fechar_cursores_excel(caminho_arquivo)
+        os.replace(temporario, caminho_arquivo)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    return contagens
+
+
+def criar_excel(caminho_arquivo: str, dados: Iterable[Sequence[Any]], aba: str = "Planilha1",
     mcp_client: Optional[Any] = None
 ) -> str:
     """
@@ -101,7 +284,8 @@ def criar_excel(caminho_arquivo: str, dados: List[List[Any]],
     
     Args:
         caminho_arquivo: Caminho onde o arquivo será salvo
-        dados: Lista de listas contendo os dados a serem escritos
+        dados: Linhas a escrever (lista de listas ou qualquer iterável, inclusive geradores)
+        aba: Nome da aba
         
     Returns:
         Mensagem de confirmação
@@ -113,7 +297,7 @@ def criar_excel(caminho_arquivo: str, dados: List[List[Any]],
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "criar_excel",
-                "parametros": {"caminho_arquivo": caminho_arquivo, "dados": dados}
+                "parametros": {"caminho_arquivo": caminho_arquivo, "dados": list(dados), "aba": aba}
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -122,24 +306,24 @@ def criar_excel(caminho_arquivo: str, dados: List[List[Any]],
             return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
 
         # Lógica existente (fallback local)
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        for linha in dados:
-            ws.append(linha)
-        wb.save(caminho_arquivo)
-        return f"Arquivo Excel criado com sucesso: {caminho_arquivo}"
+        linhas = escrever_excel(caminho_arquivo, {aba: dados})[aba]
+        return f"Arquivo Excel criado com sucesso: {caminho_arquivo} ({linhas} linha(s))"
     except Exception as e:
         logger.error(f"Erro ao criar arquivo Excel: {str(e)}")
         raise ToolError(f"Erro ao criar arquivo Excel: {str(e)}")
 
-def ler_excel(caminho_arquivo: str,
+def ler_excel(caminho_arquivo: str, aba: Optional[str] = None, intervalo: Optional[str] = None,
     mcp_client: Optional[Any] = None
 ) -> List[List[Any]]:
     """
     Lê o conteúdo de um arquivo Excel (.xlsx).
+
+    Para planilhas grandes, prefira ``ler_excel_pagina`` ou ``iterar_linhas_excel``.
     
     Args:
         caminho_arquivo: Caminho do arquivo Excel
+        aba: Nome da aba (padrão: a aba ativa)
+        intervalo: Intervalo de células, ex.: "A1:D100"
         
     Returns:
         Lista de listas contendo os dados lidos
@@ -151,7 +335,7 @@ def ler_excel(caminho_arquivo: str,
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "ler_excel",
-                "parametros": {"caminho_arquivo": caminho_arquivo}
+                "parametros": {"caminho_arquivo": caminho_arquivo, "aba": aba, "intervalo": intervalo}
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -161,14 +345,97 @@ def ler_excel(caminho_arquivo: str,
             return resultado.get("resultado", []) # Retorna lista vazia em caso de erro ou resultado vazio
 
         # Lógica existente (fallback local)
-        wb = openpyxl.load_workbook(caminho_arquivo)
-        ws = wb.active
-        dados = [[cell.value for cell in row] for row in ws.iter_rows()]
-        return dados
+        return [list(linha) for linha in iterar_linhas_excel(caminho_arquivo, aba, intervalo)]
+    except FileError:
+        raise
     except Exception as e:
         logger.error(f"Erro ao ler arquivo Excel: {str(e)}")
         raise ToolError(f"Erro ao ler arquivo Excel: {str(e)}")
 
+def _celula_markdown(valor: Any) -> str:
+    if valor is None:
+        return ""
+    return str(valor).replace("|", "\\|").replace("\n", " ")
+
+def ler_excel_pagina(caminho_arquivo: str, aba: Optional[str] = None, linha_inicial: int = 2,
+    linhas_por_pagina: int = LINHAS_POR_PAGINA, cabecalho: bool = True,
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Lê uma página de linhas de uma planilha, sem carregar o arquivo inteiro.
+
+    Args:
+        caminho_arquivo: Caminho do arquivo Excel
+        aba: Nome da aba (padrão: a aba ativa)
+        linha_inicial: Primeira linha da página (começando em 1)
+        linhas_por_pagina: Quantidade de linhas da página
+        cabecalho: Usar a linha 1 como cabeçalho da tabela
+
+    Returns:
+        Tabela Markdown com a página e, se houver mais linhas, como continuar
+    """
+    try:
+        if mcp_client:
+            logger.info(f"Delegando ler_excel_pagina para MCP Server para caminho: {caminho_arquivo}")
+            tarefa_execucao = {
+                "tipo": "executar_ferramenta",
+                "nome_ferramenta": "ler_excel_pagina",
+                "parametros": {
+                    "caminho_arquivo": caminho_arquivo, "aba": aba, "linha_inicial": linha_inicial,
+                    "linhas_por_pagina": linhas_por_pagina, "cabecalho": cabecalho
+                }
+            }
+            resultado = mcp_client.distribuir_tarefa(
+                tarefa=json.dumps(tarefa_execucao),
+                agente_id="Agente Local"
+            )
+            return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+        linha_inicial = max(1, int(linha_inicial))
+        linhas_por_pagina = max(1, int(linhas_por_pagina))
+        if cabecalho and linha_inicial == 1:
+            linha_inicial = 2
+        chave, cursor = _obter_cursor(caminho_arquivo, aba)
+        try:
+            # Uma linha a mais indica se há próxima página; ela volta para o cursor
+            linhas = cursor.ler(linha_inicial, linhas_por_pagina + 1)
+            ha_mais = len(linhas) > linhas_por_pagina
+            if ha_mais:
+                cursor.devolver(linhas.pop())
+        except BaseException:
+            cursor.fechar()
+            raise
+        _guardar_cursor(chave, cursor)
+        titulos = cursor.titulos if cabecalho else ()
+        total = cursor.total
+        nome_aba = cursor.nome_aba
+
+        largura = max([len(titulos)] + [len(l) for l in linhas]) if (titulos or linhas) else 0
+        if not linhas:
+            return f"Aba '{nome_aba}': nenhuma linha a partir da linha {linha_inicial}."
+
+        titulos = [_celula_markdown(t) or openpyxl.utils.get_column_letter(i + 1) for i, t in enumerate(titulos)]
+        titulos += [openpyxl.utils.get_column_letter(i + 1) for i in range(len(titulos), largura)]
+        tabela = [
+            "| # | " + " | ".join(titulos) + " |",
+            "|---|" + "---|" * largura,
+        ]
+        for numero, linha in enumerate(linhas, linha_inicial):
+            celulas = [_celula_markdown(v) for v in linha] + [""] * (largura - len(linha))
+            tabela.append(f"| {numero} | " + " | ".join(celulas) + " |")
+
+        fim = linha_inicial + len(linhas) - 1
+        resumo = f"Aba '{nome_aba}', linhas {linha_inicial}-{fim}" + (f" de {total}" if total else "") + ":\n"
+        rodape = ""
+        if ha_mais:
+            rodape = f"\n... exibindo {len(linhas)} linhas. Para continuar, use linha_inicial={fim + 1}"
+        return resumo + "\n".join(tabela) + rodape
+    except FileError:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao ler página do Excel: {str(e)}")
+        raise ToolError(f"Erro ao ler página do Excel: {str(e)}")
+
 def criar_ppt(caminho_arquivo: str, titulos: List[str], textos: List[str],
     mcp_client: Optional[Any] = None
 ) -> str:
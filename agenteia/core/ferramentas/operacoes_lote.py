@@ -0,0 +1,368 @@
+"""
+Cópia, movimentação e remoção de árvores de arquivos em lote.
+
+A árvore é percorrida com ``iterar_entradas`` (``os.scandir``), opcionalmente
+filtrada por glob, e os arquivos são processados por um pool de threads. A
+cópia do conteúdo usa ``os.copy_file_range`` (cópia no kernel, sem passar
+pelo espaço do usuário) e, se indisponível, ``os.sendfile`` ou
+``shutil.copyfileobj``. Movimentações dentro do mesmo sistema de arquivos
+são um ``rename``; entre sistemas (EXDEV) viram cópia + remoção.
+
+O progresso é publicado no ``MonitorProgresso`` (um passo por arquivo) e
+toda operação aceita ``simular=True`` para só calcular o plano.
+"""
+
+import errno
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from ..exceptions import FileError
+from ..logs import setup_logging
+from .busca import invalidar_caminhos
+from .listagem import TIPO_DIRETORIO, formatar_tamanho, iterar_entradas
+from .monitoramento import monitor
+
+logger = setup_logging(__name__)
+
+OPERACAO_COPIAR = "copiar"
+OPERACAO_MOVER = "mover"
+OPERACAO_REMOVER = "remover"
+
+TRABALHADORES_PADRAO = 8
+_BLOCO_COPIA = 8 * 1024 * 1024
+
+
+@dataclass
+class ItemPlano:
+    """Arquivo a processar; ``destino`` é None na remoção."""
+    origem: str
+    destino: Optional[str]
+    tamanho: int
+
+
+@dataclass
+class PlanoOperacao:
+    """Arquivos e diretórios que uma operação vai tocar."""
+    operacao: str
+    origem: str
+    destino: Optional[str]
+    arquivos: List[ItemPlano] = field(default_factory=list)
+    diretorios: List[str] = field(default_factory=list)
+
+    @property
+    def bytes_total(self) -> int:
+        return sum(item.tamanho for item in self.arquivos)
+
+
+@dataclass
+class ResultadoOperacao:
+    """Resumo de uma operação em lote."""
+    operacao: str
+    arquivos: int
+    diretorios: int
+    bytes: int
+    duracao: float
+    simulado: bool = False
+    tarefa_id: Optional[str] = None
+    renomeado: bool = False
+    erros: List[str] = field(default_factory=list)
+
+    def formatar(self, plano: Optional[PlanoOperacao] = None, exemplos: int = 10) -> str:
+        verbo = {OPERACAO_COPIAR: "copiado(s)", OPERACAO_MOVER: "movido(s)", OPERACAO_REMOVER: "removido(s)"}[self.operacao]
+        if self.simulado:
+            linhas = [
+                f"Simulação ({self.operacao}): {self.arquivos} arquivo(s), {self.diretorios} diretório(s), "
+                f"{formatar_tamanho(self.bytes)} seriam {verbo.replace('(s)', 's')}."
+            ]
+            if plano:
+                for item in plano.arquivos[:exemplos]:
+                    linhas.append(f"  {item.origem}" + (f" -> {item.destino}" if item.destino else ""))
+                if len(plano.arquivos) > exemplos:
+                    linhas.append(f"  ... e mais {len(plano.arquivos) - exemplos} arquivo(s)")
+            return "\n".join(linhas)
+        texto = (
+            f"{self.arquivos} arquivo(s) e {self.diretorios} diretório(s) {verbo} "
+            f"({formatar_tamanho(self.bytes)} em {self.duracao:.2f}s)"
+        )
+        if self.renomeado:
+            texto += " por renomeação"
+        if self.tarefa_id:
+            texto += f". Tarefa: {self.tarefa_id}"
+        if self.erros:
+            texto += f"\n{len(self.erros)} erro(s):\n" + "\n".join(f"  {erro}" for erro in self.erros[:exemplos])
+        return texto
+
+
+def copiar_conteudo(origem: str, destino: str) -> int:
+    """
+    Copia o conteúdo e os metadados de um arquivo pelo caminho mais rápido disponível.
+
+    Returns:
+        Bytes copiados
+    """
+    tamanho = os.path.getsize(origem)
+    with open(origem, "rb") as entrada, open(destino, "wb") as saida:
+        copiado = 0
+        copiar_kernel = getattr(os, "copy_file_range", None)
+        enviar = getattr(os, "sendfile", None)
+        while copiado < tamanho:
+            try:
+                if copiar_kernel:
+                    enviados = copiar_kernel(entrada.fileno(), saida.fileno(), _BLOCO_COPIA)
+                elif enviar:
+                    enviados = enviar(saida.fileno(), entrada.fileno(), copiado, _BLOCO_COPIA)
+                else:
+                    break
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+                    raise
+                # Sistema de arquivos sem suporte: tenta o próximo mecanismo
+                if copiar_kernel:
+                    copiar_kernel = None
+                    continue
+                enviar = None
+                break
+            if enviados == 0:
+                break
+            copiado += enviados
+        if copiado < tamanho:
+            entrada.seek(copiado)
+            saida.seek(copiado)
+            shutil.copyfileobj(entrada, saida, _BLOCO_COPIA)
+    shutil.copystat(origem, destino)
+    return tamanho
+
+
+def _destino_final(origem: str, destino: str) -> str:
+    """Como em ``cp``/``mv``: um diretório existente recebe a origem dentro dele."""
+    if os.path.isdir(destino):
+        return os.path.join(destino, os.path.basename(os.path.normpath(origem)))
+    return destino
+
+
+def planejar(operacao: str, origem: str, destino: Optional[str] = None, padrao: Optional[str] = None) -> PlanoOperacao:
+    """
+    Calcula os arquivos e diretórios de uma operação, sem tocar no disco.
+
+    Args:
+        operacao: OPERACAO_COPIAR, OPERACAO_MOVER ou OPERACAO_REMOVER
+        origem: Arquivo ou diretório de origem
+        destino: Destino (copiar/mover)
+        padrao: Glob para selecionar arquivos dentro da origem (ex.: "*.log" ou "src/*.py")
+    """
+    if not os.path.exists(origem):
+        raise FileError(f"Origem não encontrada: {origem}")
+    final = _destino_final(origem, destino) if destino else None
+    plano = PlanoOperacao(operacao, origem, final)
+
+    if os.path.isfile(origem):
+        plano.arquivos.append(ItemPlano(origem, final, os.path.getsize(origem)))
+        return plano
+
+    if final and os.path.abspath(final).startswith(os.path.abspath(origem) + os.sep):
+        raise FileError(f"O destino {final} fica dentro da origem {origem}.")
+    if final and not padrao:
+        plano.diretorios.append(final)
+    for entrada in iterar_entradas(origem, recursivo=True, padrao=padrao):
+        partes = entrada.caminho.split("/")
+        caminho = os.path.join(origem, *partes)
+        alvo = os.path.join(final, *partes) if final else None
+        if entrada.tipo == TIPO_DIRETORIO:
+            if not padrao:
+                plano.diretorios.append(alvo or caminho)
+        else:
+            plano.arquivos.append(ItemPlano(caminho, alvo, entrada.tamanho))
+    if padrao and final:
+        # Só os diretórios necessários para os arquivos selecionados
+        plano.diretorios = sorted({os.path.dirname(item.destino) for item in plano.arquivos})
+    return plano
+
+
+def _executar(
+    plano: PlanoOperacao,
+    acao: Callable[[ItemPlano], int],
+    descricao: str,
+    trabalhadores: int
+) -> Tuple[int, List[str], str]:
+    """Processa os arquivos do plano no pool, publicando o progresso. Retorna (bytes, erros, tarefa_id)."""
+    # Um passo extra para a finalização: o monitor conclui a tarefa ao atingir o total
+    tarefa_id = monitor.criar_tarefa(descricao, len(plano.arquivos) + 1)
+    total_bytes, erros = 0, []
+
+    def processar(item: ItemPlano) -> Tuple[int, Optional[str]]:
+        try:
+            return acao(item), None
+        except OSError as e:
+            return 0, f"{item.origem}: {e.strerror or e}"
+
+    with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+        try:
+            for item, (processados, erro) in zip(plano.arquivos, executor.map(processar, plano.arquivos)):
+                total_bytes += processados
+                if erro:
+                    erros.append(erro)
+                # Levanta TarefaCanceladaError se a tarefa foi cancelada no monitor
+                monitor.atualizar_progresso(tarefa_id, 1, os.path.basename(item.origem))
+        except BaseException as e:
+            executor.shutdown(wait=False, cancel_futures=True)
+            monitor.registrar_erro(tarefa_id, e)
+            raise
+    monitor.finalizar_tarefa(tarefa_id, {"bytes": total_bytes, "erros": len(erros)})
+    return total_bytes, erros, tarefa_id
+
+
+def _copiar_item(item: ItemPlano) -> int:
+    if os.path.islink(item.origem):
+        # Links são recriados, não seguidos
+        if os.path.lexists(item.destino):
+            os.remove(item.destino)
+        os.symlink(os.readlink(item.origem), item.destino)
+        return 0
+    return copiar_conteudo(item.origem, item.destino)
+
+
+def copiar_arvore(
+    origem: str,
+    destino: str,
+    padrao: Optional[str] = None,
+    simular: bool = False,
+    trabalhadores: int = TRABALHADORES_PADRAO
+) -> Tuple[ResultadoOperacao, PlanoOperacao]:
+    """
+    Copia um arquivo ou uma árvore (ou os arquivos que casam com ``padrao``) para o destino.
+
+    Returns:
+        (resultado, plano)
+    """
+    inicio = time.perf_counter()
+    plano = planejar(OPERACAO_COPIAR, origem, destino, padrao)
+    if simular:
+        return ResultadoOperacao(OPERACAO_COPIAR, len(plano.arquivos), len(plano.diretorios), plano.bytes_total, 0.0, True), plano
+
+    for diretorio in plano.diretorios:
+        os.makedirs(diretorio, exist_ok=True)
+    if os.path.isfile(origem):
+        os.makedirs(os.path.dirname(os.path.abspath(plano.destino)), exist_ok=True)
+
+    bytes_copiados, erros, tarefa_id = _executar(plano, _copiar_item, f"Copiar {origem} -> {plano.destino}", trabalhadores)
+    invalidar_caminhos([origem, plano.destino])
+    duracao = time.perf_counter() - inicio
+    return ResultadoOperacao(
+        OPERACAO_COPIAR, len(plano.arquivos) - len(erros), len(plano.diretorios), bytes_copiados, duracao,
+        tarefa_id=tarefa_id, erros=erros
+    ), plano
+
+
+def _mover_item(item: ItemPlano) -> int:
+    try:
+        os.replace(item.origem, item.destino)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Outro sistema de arquivos: copia e remove a origem
+        copiar_conteudo(item.origem, item.destino)
+        os.remove(item.origem)
+    return item.tamanho
+
+
+def _remover_diretorios_vazios(raiz: str) -> None:
+    for atual, _, _ in os.walk(raiz, topdown=False):
+        try:
+            os.rmdir(atual)
+        except OSError:
+            pass
+
+
+def mover_arvore(
+    origem: str,
+    destino: str,
+    padrao: Optional[str] = None,
+    simular: bool = False,
+    trabalhadores: int = TRABALHADORES_PADRAO
+) -> Tuple[ResultadoOperacao, PlanoOperacao]:
+    """
+    Move um arquivo ou uma árvore para o destino.
+
+    Sem ``padrao``, tenta primeiro um único ``rename`` (mesmo sistema de
+    arquivos); se a origem e o destino estão em sistemas diferentes, os
+    arquivos são copiados em paralelo e a origem é removida.
+
+    Returns:
+        (resultado, plano)
+    """
+    inicio = time.perf_counter()
+    plano = planejar(OPERACAO_MOVER, origem, destino, padrao)
+    if simular:
+        return ResultadoOperacao(OPERACAO_MOVER, len(plano.arquivos), len(plano.diretorios), plano.bytes_total, 0.0, True), plano
+
+    if not padrao and not os.path.exists(plano.destino):
+        os.makedirs(os.path.dirname(os.path.abspath(plano.destino)), exist_ok=True)
+        try:
+            os.rename(origem, plano.destino)
+            invalidar_caminhos([origem, plano.destino])
+            return ResultadoOperacao(
+                OPERACAO_MOVER, len(plano.arquivos), len(plano.diretorios), plano.bytes_total,
+                time.perf_counter() - inicio, renomeado=True
+            ), plano
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            logger.info(f"{origem} e {plano.destino} estão em sistemas de arquivos diferentes; copiando")
+
+    for diretorio in plano.diretorios:
+        os.makedirs(diretorio, exist_ok=True)
+    bytes_movidos, erros, tarefa_id = _executar(plano, _mover_item, f"Mover {origem} -> {plano.destino}", trabalhadores)
+    if os.path.isdir(origem) and not erros:
+        if padrao:
+            _remover_diretorios_vazios(origem)
+        else:
+            shutil.rmtree(origem, ignore_errors=True)
+    invalidar_caminhos([origem, plano.destino])
+    duracao = time.perf_counter() - inicio
+    return ResultadoOperacao(
+        OPERACAO_MOVER, len(plano.arquivos) - len(erros), len(plano.diretorios), bytes_movidos, duracao,
+        tarefa_id=tarefa_id, erros=erros
+    ), plano
+
+
+def remover_arvore(
+    caminho: str,
+    padrao: Optional[str] = None,
+    simular: bool = False,
+    trabalhadores: int = TRABALHADORES_PADRAO
+) -> Tuple[ResultadoOperacao, PlanoOperacao]:
+    """
+    Remove um diretório inteiro ou só os arquivos que casam com ``padrao``.
+
+    Returns:
+        (resultado, plano)
+    """
+    inicio = time.perf_counter()
+    plano = planejar(OPERACAO_REMOVER, caminho, None, padrao)
+    if not padrao and os.path.isdir(caminho):
+        plano.diretorios.append(caminho)
+    if simular:
+        return ResultadoOperacao(OPERACAO_REMOVER, len(plano.arquivos), len(plano.diretorios), plano.bytes_total, 0.0, True), plano
+
+    def remover(item: ItemPlano) -> int:
+        os.remove(item.origem)
+        return item.tamanho
+
+    bytes_removidos, erros, tarefa_id = _executar(plano, remover, f"Remover {caminho}", trabalhadores)
+    arquivos_removidos = len(plano.arquivos) - len(erros)
+    # Diretórios do mais profundo para o mais raso
+    for diretorio in sorted(plano.diretorios, key=lambda d: -d.count(os.sep)):
+        try:
+            os.rmdir(diretorio)
+        except OSError as e:
+            erros.append(f"{diretorio}: {e.strerror or e}")
+    invalidar_caminhos([caminho])
+    duracao = time.perf_counter() - inicio
+    return ResultadoOperacao(
+        OPERACAO_REMOVER, arquivos_removidos, len(plano.diretorios), bytes_removidos, duracao,
+        tarefa_id=tarefa_id, erros=erros
+    ), plano
@@ -4,11 +4,11 @@ import cProfile
 import pstats
 import io
 from typing import Dict, List, Optional, Union
-import logging
 import re
 from collections import Counter
+from ..logs import setup_logging
 
-logger = logging.getLogger(__name__)
+logger = setup_logging(__name__)
 
 def otimizar_codigo(codigo: str) -> Dict:
     """Sugere otimizações para o código."""
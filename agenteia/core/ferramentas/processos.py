@@ -0,0 +1,388 @@
+"""
+Supervisor de processos baseado em subprocessos asyncio.
+
+Um único loop asyncio, numa thread dedicada, executa todos os comandos. A
+saída de cada processo é lida em blocos, à medida que é produzida, para
+buffers circulares de tamanho fixo — um build verboso ocupa no máximo
+``buffer_bytes`` por stream, e a saída pode ser consultada antes do fim.
+A concorrência é limitada globalmente e por sessão (semáforos), e o
+timeout encerra o grupo de processos inteiro (o shell e seus filhos).
+"""
+
+import asyncio
+import itertools
+import os
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..logs import setup_logging
+
+logger = setup_logging(__name__)
+
+ESTADO_AGUARDANDO = "aguardando"
+ESTADO_EXECUTANDO = "executando"
+ESTADO_CONCLUIDO = "concluido"
+ESTADO_FALHOU = "falhou"
+ESTADO_TIMEOUT = "timeout"
+ESTADO_ENCERRADO = "encerrado"
+
+ESTADOS_FINAIS = (ESTADO_CONCLUIDO, ESTADO_FALHOU, ESTADO_TIMEOUT, ESTADO_ENCERRADO)
+
+SESSAO_PADRAO = "padrao"
+
+# Timeout que desliga o limite de tempo (None usa o timeout_padrao do supervisor)
+SEM_TIMEOUT = 0
+
+_BLOCO_LEITURA = 64 * 1024
+_ESPERA_ENCERRAMENTO = 3.0
+
+
+class BufferCircular:
+    """
+    Guarda os últimos ``capacidade`` bytes de um stream.
+
+    Os offsets são absolutos (contam tudo o que já foi escrito), então um
+    leitor pode pedir "tudo desde o offset N" e saber quanto foi descartado.
+    """
+
+    def __init__(self, capacidade: int):
+        self.capacidade = capacidade
+        self._dados = bytearray()
+        self._inicio = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """Bytes escritos desde o início (inclusive os descartados)."""
+        return self._inicio + len(self._dados)
+
+    @property
+    def descartados(self) -> int:
+        return self._inicio
+
+    def escrever(self, dados: bytes) -> None:
+        with self._lock:
+            if len(dados) >= self.capacidade:
+                self._inicio += len(self._dados) + len(dados) - self.capacidade
+                self._dados = bytearray(dados[-self.capacidade:])
+                return
+            self._dados += dados
+            excesso = len(self._dados) - self.capacidade
+            if excesso > 0:
+                del self._dados[:excesso]
+                self._inicio += excesso
+
+    def ler(self, desde: int = 0) -> Tuple[bytes, int, int]:
+        """
+        Lê os bytes guardados a partir de um offset absoluto.
+
+        Returns:
+            (dados, próximo offset, bytes perdidos entre ``desde`` e o primeiro byte retornado)
+        """
+        with self._lock:
+            perdidos = max(0, self._inicio - desde)
+            posicao = max(desde, self._inicio) - self._inicio
+            return bytes(self._dados[posicao:]), self._inicio + len(self._dados), perdidos
+
+    def texto(self, desde: int = 0, encoding: str = "utf-8") -> str:
+        dados, _, perdidos = self.ler(desde)
+        texto = dados.decode(encoding, errors="replace")
+        return f"[... {perdidos} bytes omitidos]\n{texto}" if perdidos else texto
+
+
+@dataclass
+class ProcessoGerenciado:
+    """Handle de um comando executado pelo supervisor."""
+    id: str
+    comando: str
+    sessao: str
+    stdout: BufferCircular
+    stderr: BufferCircular
+    timeout: Optional[float] = None
+    estado: str = ESTADO_AGUARDANDO
+    pid: Optional[int] = None
+    codigo_saida: Optional[int] = None
+    criado: float = field(default_factory=time.time)
+    inicio: Optional[float] = None
+    fim: Optional[float] = None
+    erro: Optional[str] = None
+    iniciado: threading.Event = field(default_factory=threading.Event, repr=False)
+    concluido: Future = field(default_factory=Future, repr=False)
+    _processo: Any = field(default=None, repr=False)
+    _encerrar: Optional[bool] = field(default=None, repr=False)
+
+    @property
+    def ativo(self) -> bool:
+        return self.estado not in ESTADOS_FINAIS
+
+    def para_dict(self, desde: int = 0, max_caracteres: int = 4000) -> Dict[str, Any]:
+        """Estado do processo e a saída produzida desde o offset ``desde``."""
+        saida = self.stdout.texto(desde)
+        if len(saida) > max_caracteres:
+            saida = f"[... {len(saida) - max_caracteres} caracteres anteriores]\n" + saida[-max_caracteres:]
+        fim = self.fim or time.time()
+        return {
+            "id": self.id,
+            "pid": self.pid,
+            "comando": self.comando,
+            "sessao": self.sessao,
+            "estado": self.estado,
+            "ativo": self.ativo,
+            "codigo_saida": self.codigo_saida,
+            "duracao": round(fim - self.inicio, 3) if self.inicio else 0.0,
+            "saida": saida,
+            "erros": self.stderr.texto()[-max_caracteres:],
+            "proximo_offset": self.stdout.total,
+            "erro": self.erro,
+        }
+
+
+class SupervisorProcessos:
+    """Executa e acompanha comandos num loop asyncio próprio."""
+
+    def __init__(
+        self,
+        max_concorrentes: int = 8,
+        max_por_sessao: int = 4,
+        buffer_bytes: int = 1024 * 1024,
+        timeout_padrao: Optional[float] = 60.0,
+        retencao: int = 100
+    ):
+        self.max_concorrentes = max_concorrentes
+        self.max_por_sessao = max_por_sessao
+        self.buffer_bytes = buffer_bytes
+        self.timeout_padrao = timeout_padrao
+        self.retencao = retencao
+        self._processos: "OrderedDict[str, ProcessoGerenciado]" = OrderedDict()
+        self._contador = itertools.count(1)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._semaforos_sessao: Dict[str, asyncio.Semaphore] = {}
+
+    def configurar(self, config: Optional[Dict[str, Any]] = None) -> None:
+        """Aplica a seção "processos" do config (vale para os próximos comandos)."""
+        if not config:
+            return
+        with self._lock:
+            for chave in ("max_concorrentes", "max_por_sessao", "buffer_bytes", "retencao"):
+                if chave in config:
+                    setattr(self, chave, int(config[chave]))
+            if "timeout_padrao" in config:
+                self.timeout_padrao = config["timeout_padrao"]
+            # Os semáforos são recriados com os novos limites
+            self._semaforo = None
+            self._semaforos_sessao.clear()
+
+    def _garantir_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="SupervisorProcessos", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _semaforos(self, sessao: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        # Chamado só dentro do loop: não há concorrência com outras threads aqui
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.max_concorrentes)
+        if sessao not in self._semaforos_sessao:
+            self._semaforos_sessao[sessao] = asyncio.Semaphore(self.max_por_sessao)
+        return self._semaforo, self._semaforos_sessao[sessao]
+
+    def iniciar(
+        self,
+        comando: str,
+        shell: bool = True,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        sessao: str = SESSAO_PADRAO
+    ) -> ProcessoGerenciado:
+        """
+        Agenda um comando e retorna o handle imediatamente.
+
+        O comando espera na fila enquanto os limites global e da sessão
+        estiverem ocupados. Use ``aguardar`` para bloquear até o fim.
+        ``timeout=None`` usa o ``timeout_padrao``; ``SEM_TIMEOUT`` deixa o
+        comando rodar até terminar ou ser encerrado.
+        """
+        loop = self._garantir_loop()
+        with self._lock:
+            processo = ProcessoGerenciado(
+                id=f"cmd_{next(self._contador)}",
+                comando=comando,
+                sessao=sessao,
+                stdout=BufferCircular(self.buffer_bytes),
+                stderr=BufferCircular(self.buffer_bytes),
+                timeout=self.timeout_padrao if timeout is None else (timeout or None)
+            )
+            self._processos[processo.id] = processo
+            self._podar()
+        asyncio.run_coroutine_threadsafe(self._executar(processo, shell, cwd, env), loop)
+        return processo
+
+    def _podar(self) -> None:
+        """Descarta os handles finalizados mais antigos além da retenção."""
+        finalizados = [p.id for p in self._processos.values() if not p.ativo]
+        for id_ in finalizados[:max(0, len(self._processos) - self.retencao)]:
+            del self._processos[id_]
+
+    async def _bombear(self, stream: asyncio.StreamReader, buffer: BufferCircular) -> None:
+        while True:
+            dados = await stream.read(_BLOCO_LEITURA)
+            if not dados:
+                return
+            buffer.escrever(dados)
+
+    async def _executar(
+        self,
+        processo: ProcessoGerenciado,
+        shell: bool,
+        cwd: Optional[str],
+        env: Optional[Dict[str, str]]
+    ) -> None:
+        global_, da_sessao = self._semaforos(processo.sessao)
+        try:
+            async with global_, da_sessao:
+                if processo._encerrar is not None:
+                    return
+                opcoes: Dict[str, Any] = {"cwd": cwd, "env": env, "stdout": subprocess.PIPE, "stderr": subprocess.PIPE}
+                if os.name == "nt":
+                    opcoes["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+                else:
+                    # Novo grupo de processos: o timeout encerra o shell e todos os filhos
+                    opcoes["start_new_session"] = True
+                if shell:
+                    filho = await asyncio.create_subprocess_shell(processo.comando, **opcoes)
+                else:
+                    filho = await asyncio.create_subprocess_exec(*shlex.split(processo.comando), **opcoes)
+
+                processo._processo = filho
+                processo.pid = filho.pid
+                processo.inicio = time.time()
+                processo.estado = ESTADO_EXECUTANDO
+                processo.iniciado.set()
+                leitores = asyncio.gather(
+                    self._bombear(filho.stdout, processo.stdout),
+                    self._bombear(filho.stderr, processo.stderr)
+                )
+                try:
+                    await asyncio.wait_for(filho.wait(), processo.timeout)
+                except asyncio.TimeoutError:
+                    processo.estado = ESTADO_TIMEOUT
+                    await self._matar_grupo(processo, forcar=False)
+                if processo.estado == ESTADO_EXECUTANDO and processo._encerrar is None:
+                    await leitores
+                else:
+                    # Um neto fora do grupo pode manter o pipe aberto: não espera indefinidamente
+                    try:
+                        await asyncio.wait_for(leitores, _ESPERA_ENCERRAMENTO)
+                    except asyncio.TimeoutError:
+                        pass
+
+                processo.codigo_saida = filho.returncode
+                if processo.estado == ESTADO_EXECUTANDO:
+                    if processo._encerrar is not None:
+                        processo.estado = ESTADO_ENCERRADO
+                    else:
+                        processo.estado = ESTADO_CONCLUIDO if filho.returncode == 0 else ESTADO_FALHOU
+        except Exception as e:
+            processo.estado = ESTADO_FALHOU
+            processo.erro = str(e)
+            logger.error(f"Erro ao executar {processo.id} ({processo.comando}): {e}")
+        finally:
+            processo.fim = processo.fim or time.time()
+            processo.iniciado.set()
+            if not processo.concluido.done():
+                processo.concluido.set_result(processo)
+
+    async def _matar_grupo(self, processo: ProcessoGerenciado, forcar: bool) -> None:
+        """Envia SIGTERM (ou SIGKILL) ao grupo do processo; força após uma espera."""
+        filho = processo._processo
+        if filho is None:
+            if processo.estado == ESTADO_AGUARDANDO:
+                # Ainda na fila: cancela sem esperar a vaga
+                processo.estado = ESTADO_ENCERRADO
+                processo.fim = time.time()
+                processo.iniciado.set()
+                processo.concluido.set_result(processo)
+            return
+        if filho.returncode is not None:
+            return
+        self._sinalizar(filho.pid, forcar)
+        if forcar:
+            return
+        try:
+            await asyncio.wait_for(filho.wait(), _ESPERA_ENCERRAMENTO)
+        except asyncio.TimeoutError:
+            self._sinalizar(filho.pid, True)
+
+    @staticmethod
+    def _sinalizar(pid: int, forcar: bool) -> None:
+        try:
+            if os.name == "nt":
+                subprocess.run(f"taskkill /T {'/F ' if forcar else ''}/PID {pid}", shell=True, capture_output=True)
+            else:
+                os.killpg(os.getpgid(pid), signal.SIGKILL if forcar else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def obter(self, id_ou_pid: Any) -> Optional[ProcessoGerenciado]:
+        """Handle pelo id ("cmd_N") ou pelo PID do processo."""
+        with self._lock:
+            if isinstance(id_ou_pid, str) and id_ou_pid in self._processos:
+                return self._processos[id_ou_pid]
+            try:
+                pid = int(id_ou_pid)
+            except (TypeError, ValueError):
+                return None
+            for processo in self._processos.values():
+                if processo.pid == pid:
+                    return processo
+        return None
+
+    def listar(self, apenas_ativos: bool = False) -> List[ProcessoGerenciado]:
+        with self._lock:
+            return [p for p in self._processos.values() if p.ativo or not apenas_ativos]
+
+    def aguardar(self, processo: ProcessoGerenciado, timeout: Optional[float] = None) -> ProcessoGerenciado:
+        """Bloqueia até o fim do processo (ou até ``timeout`` segundos)."""
+        return processo.concluido.result(timeout)
+
+    def aguardar_inicio(self, processo: ProcessoGerenciado, timeout: Optional[float] = 1.0) -> bool:
+        """Espera o processo sair da fila; False se continuar aguardando após ``timeout``."""
+        return processo.iniciado.wait(timeout)
+
+    def encerrar(self, processo: ProcessoGerenciado, forcar: bool = False) -> bool:
+        """
+        Encerra o grupo do processo. Um comando ainda na fila é cancelado.
+
+        Returns:
+            False se o processo já tinha terminado
+        """
+        if not processo.ativo:
+            return False
+        processo._encerrar = forcar
+        futuro = asyncio.run_coroutine_threadsafe(self._matar_grupo(processo, forcar), self._garantir_loop())
+        futuro.result(_ESPERA_ENCERRAMENTO + 2)
+        processo.concluido.result(_ESPERA_ENCERRAMENTO + 2)
+        return True
+
+
+supervisor = SupervisorProcessos()
+
+
+def configurar_processos(config: Optional[Dict[str, Any]] = None) -> None:
+    """Aplica a seção "processos" do config ao supervisor global."""
+    supervisor.configurar(config)
@@ -0,0 +1,642 @@
+"""
+Registro declarativo das ferramentas do Agente IA.
+
+Cada ferramenta é declarada uma única vez (nome, parâmetros, descrição e
+metadados de custo/idempotência). Os objetos ``Tool``/``StructuredTool`` do
+LangChain só são construídos quando pedidos, uma vez por ``mcp_client``, e
+ficam em cache; a função real (e o submódulo que a contém) só é importada na
+primeira execução.
+"""
+
+import importlib
+import inspect
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ...core.logs import setup_logging
+from .cache import PoliticaCache, cache_resultados, normalizar_caminho
+
+logger = setup_logging(__name__)
+
+_OBRIGATORIO = object()
+
+_TIPOS_JSON = {str: "string", int: "integer", float: "number", bool: "boolean", dict: "object", list: "array"}
+
+MODO_NATIVO = "nativo"
+MODO_FALLBACK = "fallback"
+
+CUSTO_BAIXO = "baixo"
+CUSTO_MEDIO = "medio"
+CUSTO_ALTO = "alto"
+
+
+@dataclass(frozen=True)
+class ParametroFerramenta:
+    """Parâmetro exposto ao modelo."""
+    nome: str
+    tipo: type
+    descricao: str
+    padrao: Any = _OBRIGATORIO
+    destino: Optional[str] = None  # Nome do argumento na função, se diferente
+
+    @property
+    def obrigatorio(self) -> bool:
+        return self.padrao is _OBRIGATORIO
+
+    @property
+    def argumento(self) -> str:
+        return self.destino or self.nome
+
+
+@dataclass(frozen=True)
+class DefinicaoFerramenta:
+    """Declaração de uma ferramenta e dos metadados usados por agendadores e caches.
+
+    Attributes:
+        nome: Nome exposto ao modelo (e chave de deduplicação no registro)
+        funcao: Nome da função exportada por ``agenteia.core.ferramentas``
+        descricao: Descrição curta enviada ao modelo
+        parametros: Parâmetros expostos ao modelo
+        fixos: Argumentos fixos passados à função (ex.: timeout)
+        custo: Classe de custo (``baixo``, ``medio`` ou ``alto``)
+        idempotente: Repetir a chamada com os mesmos argumentos não muda o resultado
+        somente_leitura: A ferramenta não altera arquivos nem o sistema
+        cache: Política de cache do resultado (None = não usa cache)
+        invalida: Caminhos alterados pela ferramenta (invalidam o cache): nomes de parâmetros ou
+            funções que recebem os argumentos e devolvem os caminhos
+    """
+    nome: str
+    funcao: str
+    descricao: str
+    parametros: Tuple[ParametroFerramenta, ...] = ()
+    fixos: Dict[str, Any] = field(default_factory=dict)
+    custo: str = CUSTO_BAIXO
+    idempotente: bool = True
+    somente_leitura: bool = True
+    cache: Optional[PoliticaCache] = None
+    invalida: Tuple[Union[str, Callable[[Dict[str, Any]], Iterable[str]]], ...] = ()
+
+    @property
+    def entrada_simples(self) -> bool:
+        """Ferramentas com um único parâmetro texto recebem a entrada diretamente (sem JSON)."""
+        return len(self.parametros) == 1 and self.parametros[0].tipo is str
+
+    def resolver(self) -> Callable:
+        """Importa (na primeira vez) e retorna a função da ferramenta."""
+        return getattr(importlib.import_module(__package__), self.funcao)
+
+    def esquema(self) -> Dict[str, Any]:
+        """JSON Schema dos parâmetros."""
+        propriedades = {}
+        for parametro in self.parametros:
+            propriedade = {"type": _TIPOS_JSON.get(parametro.tipo, "string"), "description": parametro.descricao}
+            if not parametro.obrigatorio:
+                propriedade["default"] = parametro.padrao
+            propriedades[parametro.nome] = propriedade
+        return {
+            "type": "object",
+            "properties": propriedades,
+            "required": [p.nome for p in self.parametros if p.obrigatorio]
+        }
+
+    def metadados(self) -> Dict[str, Any]:
+        """Metadados da ferramenta (sem construir objetos do LangChain)."""
+        return {
+            "nome": self.nome,
+            "descricao": self.descricao,
+            "esquema": self.esquema(),
+            "custo": self.custo,
+            "idempotente": self.idempotente,
+            "somente_leitura": self.somente_leitura,
+            "cache": self.cache is not None,
+        }
+
+    def chamador(self, mcp_client: Optional[Any] = None) -> Callable[..., Any]:
+        """Cria a função que traduz os argumentos do modelo para a função da ferramenta."""
+        definicao = self
+        aceita_mcp: List[bool] = []
+
+        def executar(argumentos: Dict[str, Any]) -> Any:
+            funcao = definicao.resolver()
+            if not aceita_mcp:
+                aceita_mcp.append("mcp_client" in inspect.signature(funcao).parameters)
+            kwargs = dict(definicao.fixos)
+            for parametro in definicao.parametros:
+                if parametro.nome in argumentos:
+                    kwargs[parametro.argumento] = argumentos[parametro.nome]
+            if aceita_mcp[0]:
+                kwargs["mcp_client"] = mcp_client
+            return funcao(**kwargs)
+
+        def chamar(**argumentos: Any) -> Any:
+            politica = definicao.cache
+            if politica is None or not cache_resultados.ativo_para(definicao.nome):
+                try:
+                    return executar(argumentos)
+                finally:
+                    definicao._invalidar(argumentos)
+
+            valores = definicao._valores(argumentos)
+            chave = cache_resultados.chave(definicao.nome, valores)
+            encontrado, resultado = cache_resultados.obter(chave, definicao.nome)
+            if encontrado:
+                return resultado
+            resultado = executar(argumentos)
+            caminhos = [valores[nome] for nome in politica.caminhos if valores.get(nome)]
+            cache_resultados.guardar(chave, definicao.nome, resultado, caminhos, politica.ttl)
+            return resultado
+
+        return chamar
+
+    def _valores(self, argumentos: Dict[str, Any]) -> Dict[str, Any]:
+        """Argumentos com padrões aplicados e caminhos normalizados (chave do cache)."""
+        valores = {p.nome: argumentos.get(p.nome, None if p.obrigatorio else p.padrao) for p in self.parametros}
+        for nome in self.cache.caminhos if self.cache else ():
+            if valores.get(nome):
+                valores[nome] = normalizar_caminho(valores[nome])
+        return valores
+
+    def _invalidar(self, argumentos: Dict[str, Any]) -> None:
+        """Descarta do cache os resultados afetados por uma ferramenta que altera arquivos."""
+        if self.somente_leitura:
+            return
+        if self.invalida:
+            caminhos: List[Optional[str]] = []
+            try:
+                for item in self.invalida:
+                    if callable(item):
+                        caminhos.extend(item(argumentos))
+                    else:
+                        caminhos.append(argumentos.get(item))
+            except Exception as e:
+                logger.warning(f"Caminhos alterados por {self.nome} não identificados ({e}); invalidando o cache de arquivos")
+                cache_resultados.invalidar_arquivos()
+                return
+            cache_resultados.invalidar_caminhos(caminhos)
+        else:
+            # Sem caminhos declarados (ex.: comando shell), qualquer arquivo pode ter mudado
+            cache_resultados.invalidar_arquivos()
+
+    def descricao_para(self, modo: str) -> str:
+        """Descrição enviada ao modelo; no modo nativo o schema já descreve os argumentos."""
+        if self.entrada_simples:
+            return f"{self.descricao} Entrada: {self.parametros[0].descricao}"
+        if modo == MODO_NATIVO:
+            return self.descricao
+        chaves = ", ".join(f"'{p.nome}'" for p in self.parametros)
+        return f"{self.descricao} Entrada: JSON com {chaves}."
+
+    def construir(self, modo: str, mcp_client: Optional[Any] = None) -> Any:
+        """Constrói o objeto de ferramenta do LangChain para o modo pedido."""
+        from langchain.tools import StructuredTool, Tool
+
+        chamar = self.chamador(mcp_client)
+        descricao = self.descricao_para(modo)
+
+        if self.entrada_simples:
+            nome_parametro = self.parametros[0].nome
+            return Tool(name=self.nome, func=lambda entrada: chamar(**{nome_parametro: entrada}), description=descricao)
+
+        if modo == MODO_FALLBACK:
+            return Tool(name=self.nome, func=lambda entrada: chamar(**self._argumentos_texto(entrada)), description=descricao)
+
+        return StructuredTool.from_function(
+            func=chamar,
+            name=self.nome,
+            description=descricao,
+            args_schema=self._modelo_argumentos()
+        )
+
+    def _argumentos_texto(self, entrada: str) -> Dict[str, Any]:
+        """Interpreta a entrada do modo fallback: JSON ou, se não for JSON, o valor do primeiro parâmetro."""
+        try:
+            argumentos = json.loads(entrada)
+        except (TypeError, ValueError):
+            argumentos = None
+        if isinstance(argumentos, dict):
+            return argumentos
+        return {self.parametros[0].nome: entrada.strip() if isinstance(entrada, str) else entrada}
+
+    def _modelo_argumentos(self) -> type:
+        from pydantic import Field, create_model
+
+        campos = {}
+        for parametro in self.parametros:
+            padrao = ... if parametro.obrigatorio else parametro.padrao
+            campos[parametro.nome] = (parametro.tipo, Field(padrao, description=parametro.descricao))
+        nome_modelo = "".join(parte.capitalize() for parte in self.nome.split("_")) + "Args"
+        return create_model(nome_modelo, **campos)
+
+
+class RegistroFerramentas:
+    """Conjunto de ferramentas, sem nomes repetidos, com cache dos objetos do LangChain por mcp_client."""
+
+    def __init__(self, definicoes: Optional[List[DefinicaoFerramenta]] = None):
+        self._definicoes: Dict[str, DefinicaoFerramenta] = {}
+        self._cache: Dict[Tuple[int, str], Tuple[Any, List[Any]]] = {}
+        self._lock = threading.Lock()
+        for definicao in definicoes or []:
+            self.registrar(definicao)
+
+    def registrar(self, definicao: DefinicaoFerramenta) -> None:
+        """Registra uma ferramenta; um nome repetido substitui a declaração anterior."""
+        with self._lock:
+            if definicao.nome in self._definicoes:
+                logger.warning(f"Ferramenta '{definicao.nome}' declarada mais de uma vez; usando a última declaração.")
+            self._definicoes[definicao.nome] = definicao
+            self._cache.clear()
+
+    def obter(self, nome: str) -> Optional[DefinicaoFerramenta]:
+        """Retorna a declaração de uma ferramenta."""
+        return self._definicoes.get(nome)
+
+    def __iter__(self) -> Iterator[DefinicaoFerramenta]:
+        return iter(list(self._definicoes.values()))
+
+    def __len__(self) -> int:
+        return len(self._definicoes)
+
+    def __contains__(self, nome: str) -> bool:
+        return nome in self._definicoes
+
+    def metadados(self) -> List[Dict[str, Any]]:
+        """Metadados de todas as ferramentas."""
+        return [definicao.metadados() for definicao in self]
+
+    def funcoes(self) -> Dict[str, Callable]:
+        """Mapeamento nome -> função da ferramenta (importa os submódulos)."""
+        return {definicao.nome: definicao.resolver() for definicao in self}
+
+    def ferramentas(self, mcp_client: Optional[Any] = None, modo: str = MODO_NATIVO) -> List[Any]:
+        """
+        Retorna os objetos de ferramenta do LangChain, construídos uma única vez por mcp_client e modo.
+
+        Args:
+            mcp_client: Cliente MCP repassado às ferramentas que o aceitam
+            modo: ``nativo`` (tool calling) ou ``fallback`` (REACT, entrada em texto/JSON)
+
+        Returns:
+            Lista de ferramentas (a mesma lista em chamadas seguintes)
+        """
+        if modo not in (MODO_NATIVO, MODO_FALLBACK):
+            raise ValueError(f"Modo de ferramentas inválido: {modo}")
+        chave = (id(mcp_client), modo)
+        with self._lock:
+            em_cache = self._cache.get(chave)
+            if em_cache is not None and em_cache[0] is mcp_client:
+                return em_cache[1]
+            # Mantém a referência ao mcp_client para que o id da chave não seja reutilizado
+            construidas = [definicao.construir(modo, mcp_client) for definicao in self._definicoes.values()]
+            self._cache[chave] = (mcp_client, construidas)
+            return construidas
+
+    def limpar_cache(self) -> None:
+        """Descarta os objetos de ferramenta construídos."""
+        with self._lock:
+            self._cache.clear()
+
+
+def _texto(nome: str, descricao: str, destino: Optional[str] = None, **kwargs: Any) -> ParametroFerramenta:
+    return ParametroFerramenta(nome, str, descricao, destino=destino, **kwargs)
+
+
+def _arquivos_editados(argumentos: Dict[str, Any]) -> List[str]:
+    """Arquivos citados nas edições de editar_arquivo."""
+    from .edicao import interpretar_edicoes
+    return [edicao.caminho for edicao in interpretar_edicoes(argumentos.get("edicoes") or "", argumentos.get("caminho"))]
+
+
+def _diretorio_graficos(argumentos: Dict[str, Any]) -> List[str]:
+    """Diretório onde gerar_graficos grava as imagens."""
+    from .graficos import obter_renderizador
+    return [obter_renderizador().diretorio]
+
+
+FERRAMENTAS_PADRAO = [
+    DefinicaoFerramenta(
+        nome="listar_arquivos", funcao="listar_arquivos",
+        descricao="Lista arquivos e diretórios de um caminho (paginado; use o cursor indicado para continuar).",
+        parametros=(
+            _texto("diretorio", "Caminho do diretório ('.' para o atual).", padrao="."),
+            _texto("padrao", "Glob para filtrar, ex.: '*.py'.", padrao=None),
+            ParametroFerramenta("recursivo", bool, "Incluir subdiretórios.", padrao=False),
+            _texto("cursor", "Cursor da página anterior.", padrao=None),
+        ),
+        # Sem cache: o mtime do diretório não muda com alterações em subdiretórios nem nos tamanhos dos arquivos
+    ),
+    DefinicaoFerramenta(
+        nome="ler_arquivo", funcao="ler_arquivo",
+        descricao=(
+            "Lê um arquivo de texto. Arquivos grandes são devolvidos em partes: use o token indicado para continuar, "
+            "ou leia só um trecho com modo 'inicio', 'fim', 'linhas' (inicio/fim) ou 'buscar' (padrao)."
+        ),
+        parametros=(
+            _texto("caminho", "caminho do arquivo."),
+            _texto("modo", "'completo', 'inicio', 'fim', 'linhas', 'bytes' ou 'buscar'.", padrao="completo"),
+            ParametroFerramenta("inicio", int, "Linha (ou byte) inicial.", padrao=None),
+            ParametroFerramenta("fim", int, "Linha (ou byte) final.", padrao=None),
+            ParametroFerramenta("linhas", int, "Quantidade de linhas nos modos 'inicio' e 'fim'.", padrao=50),
+            _texto("padrao", "Texto procurado no modo 'buscar'.", padrao=None),
+            _texto("token", "Token de continuação da leitura anterior.", padrao=None),
+            ParametroFerramenta("max_bytes", int, "Tamanho máximo da resposta em bytes (padrão: configuração).", padrao=None),
+        ),
+        cache=PoliticaCache(caminhos=("caminho",))
+    ),
+    DefinicaoFerramenta(
+        nome="buscar_no_workspace", funcao="buscar_no_workspace",
+        descricao=(
+            "Procura um texto ou expressão regular em todos os arquivos do workspace (índice persistente) "
+            "e retorna as ocorrências como caminho:linha. Use em vez de abrir arquivos um a um."
+        ),
+        parametros=(
+            _texto("consulta", "Texto (ou expressão regular, se regex=true) a procurar."),
+            ParametroFerramenta("regex", bool, "Interpretar a consulta como expressão regular.", padrao=False),
+            _texto("padrao_arquivos", "Glob para restringir os arquivos, ex.: '*.py'.", padrao=None),
+            ParametroFerramenta("contexto", int, "Linhas de contexto ao redor de cada ocorrência.", padrao=1),
+            ParametroFerramenta("ignorar_maiusculas", bool, "Não diferenciar maiúsculas de minúsculas.", padrao=False),
+        )
+    ),
+    DefinicaoFerramenta(
+        nome="escrever_arquivo", funcao="escrever_arquivo",
+        descricao="Escreve conteúdo em um arquivo (cria ou sobrescreve).",
+        parametros=(
+            _texto("caminho_do_arquivo", "Caminho do arquivo.", destino="caminho"),
+            _texto("conteudo_para_escrever", "Conteúdo a escrever.", destino="conteudo"),
+        ),
+        somente_leitura=False, invalida=("caminho_do_arquivo",)
+    ),
+    DefinicaoFerramenta(
+        nome="editar_arquivo", funcao="editar_arquivo",
+        descricao=(
+            "Altera arquivos existentes sem reescrevê-los: aplica um diff unificado ou blocos "
+            "'caminho\\n<<<<<<< BUSCAR\\n...\\n=======\\n...\\n>>>>>>> SUBSTITUIR' (vários arquivos por chamada). "
+            "Prefira esta ferramenta a escrever_arquivo para mudanças pontuais."
+        ),
+        parametros=(
+            _texto("edicoes", "Diff unificado ou blocos BUSCAR/SUBSTITUIR."),
+            _texto("caminho", "Arquivo dos blocos que não informam o caminho.", padrao=None),
+        ),
+        custo=CUSTO_MEDIO, idempotente=False, somente_leitura=False, invalida=(_arquivos_editados,)
+    ),
+    DefinicaoFerramenta(
+        nome="criar_diretorio", funcao="criar_diretorio",
+        descricao="Cria um diretório.",
+        parametros=(_texto("caminho", "caminho do diretório."),),
+        somente_leitura=False, invalida=("caminho",)
+    ),
+    DefinicaoFerramenta(
+        nome="criar_estrutura", funcao="criar_estrutura",
+        descricao=(
+            "Cria uma árvore inteira de diretórios e arquivos em uma única chamada (tudo ou nada). "
+            "Use em vez de várias chamadas a criar_diretorio/escrever_arquivo ao gerar projetos."
+        ),
+        parametros=(
+            _texto("destino", "Diretório raiz da estrutura."),
+            ParametroFerramenta(
+                "estrutura", dict,
+                "Manifesto: diretórios como objetos e arquivos como texto, ex.: {'css': {'style.css': '...'}, 'index.html': '...'}."
+            ),
+            ParametroFerramenta("variaveis", dict, "Valores para modelos $nome nos caminhos e conteúdos.", padrao=None),
+            ParametroFerramenta("sobrescrever", bool, "Substituir arquivos existentes.", padrao=False),
+        ),
+        custo=CUSTO_MEDIO, somente_leitura=False, invalida=("destino",)
+    ),
+    DefinicaoFerramenta(
+        nome="copiar_arquivo", funcao="copiar_arquivo",
+        descricao="Copia um arquivo ou diretório inteiro (em paralelo); use simular=true para ver o plano antes.",
+        parametros=(
+            _texto("caminho_origem", "Arquivo ou diretório de origem.", destino="origem"),
+            _texto("caminho_destino", "Caminho de destino.", destino="destino"),
+            _texto("padrao", "Glob para selecionar arquivos dentro da origem, ex.: '*.py'.", padrao=None),
+            ParametroFerramenta("simular", bool, "Só informar o que seria feito.", padrao=False),
+        ),
+        somente_leitura=False, invalida=("caminho_destino",)
+    ),
+    DefinicaoFerramenta(
+        nome="mover_arquivo", funcao="mover_arquivo",
+        descricao="Move um arquivo ou diretório inteiro; use simular=true para ver o plano antes.",
+        parametros=(
+            _texto("caminho_origem", "Arquivo ou diretório de origem.", destino="origem"),
+            _texto("caminho_destino", "Caminho de destino.", destino="destino"),
+            _texto("padrao", "Glob para selecionar arquivos dentro da origem, ex.: '*.py'.", padrao=None),
+            ParametroFerramenta("simular", bool, "Só informar o que seria feito.", padrao=False),
+        ),
+        idempotente=False, somente_leitura=False, invalida=("caminho_origem", "caminho_destino")
+    ),
+    DefinicaoFerramenta(
+        nome="remover_arquivo", funcao="remover_arquivo",
+        descricao="Remove um arquivo.",
+        parametros=(_texto("caminho", "caminho do arquivo."),),
+        idempotente=False, somente_leitura=False, invalida=("caminho",)
+    ),
+    DefinicaoFerramenta(
+        nome="remover_diretorio", funcao="remover_diretorio",
+        descricao="Remove um diretório e todo o seu conteúdo (ou só os arquivos que casam com padrao).",
+        parametros=(
+            _texto("caminho", "caminho do diretório."),
+            _texto("padrao", "Glob dos arquivos a remover, ex.: '*.log'.", padrao=None),
+            ParametroFerramenta("simular", bool, "Só informar o que seria removido.", padrao=False),
+        ),
+        idempotente=False, somente_leitura=False, invalida=("caminho",)
+    ),
+    DefinicaoFerramenta(
+        nome="executar_comando", funcao="executar_comando",
+        descricao="Executa um comando shell e retorna a saída (só o final de saídas muito longas).",
+        parametros=(
+            _texto("comando", "comando a executar."),
+            ParametroFerramenta(
+                "em_segundo_plano", bool,
+                "Retornar logo com o id do processo (acompanhe com verificar_processo).", padrao=False
+            ),
+        ),
+        fixos={"shell": True, "timeout": 60.0},
+        custo=CUSTO_ALTO, idempotente=False, somente_leitura=False
+    ),
+    DefinicaoFerramenta(
+        nome="verificar_processo", funcao="verificar_processo",
+        descricao="Estado e saída de um comando em segundo plano (ou se um PID está ativo).",
+        parametros=(
+            _texto("pid", "id do comando ('cmd_N') ou PID."),
+            ParametroFerramenta("desde", int, "Offset da saída já lida (proximo_offset da chamada anterior).", padrao=0),
+        ),
+        idempotente=False
+    ),
+    DefinicaoFerramenta(
+        nome="encerrar_processo", funcao="encerrar_processo",
+        descricao="Encerra um comando em segundo plano (com seus subprocessos) ou um PID.",
+        parametros=(
+            _texto("pid", "id do comando ('cmd_N') ou PID."),
+            ParametroFerramenta("forcar", bool, "Encerrar imediatamente (SIGKILL).", padrao=False),
+        ),
+        idempotente=False, somente_leitura=False
+    ),
+    DefinicaoFerramenta(
+        nome="listar_processos", funcao="listar_processos",
+        descricao="Lista os processos do sistema (top-N por CPU ou memória) e os comandos em segundo plano.",
+        parametros=(
+            _texto("filtro", "Trecho do nome do processo.", padrao=None),
+            _texto("ordenar_por", "cpu_percent, memoria_percent, memoria_rss, threads, pid ou nome.", padrao="cpu_percent"),
+            ParametroFerramenta("limite", int, "Quantidade máxima de processos.", padrao=20),
+            ParametroFerramenta(
+                "decrescente", bool, "Maiores primeiro (padrão: só para CPU e memória; pid, nome e criado_em crescem).",
+                padrao=None
+            ),
+        ),
+        idempotente=False
+    ),
+    DefinicaoFerramenta(
+        nome="criar_documento_word", funcao="criar_documento_word",
+        descricao="Cria um documento Word (.docx).",
+        parametros=(
+            _texto("titulo", "Título do documento."),
+            ParametroFerramenta("conteudo", list, "Seções: dicionários com 'titulo', 'texto', 'itens' ou 'tabela'."),
+            _texto("caminho_saida", "Arquivo .docx de saída."),
+        ),
+        custo=CUSTO_MEDIO, somente_leitura=False, invalida=("caminho_saida",)
+    ),
+    DefinicaoFerramenta(
+        nome="criar_curriculo", funcao="criar_curriculo",
+        descricao="Cria um currículo em Word.",
+        parametros=(
+            ParametroFerramenta("dados", dict, "Dados: 'nome', 'email', 'objetivo', 'formacao', 'experiencia', 'habilidades'."),
+            _texto("caminho_saida", "Arquivo .docx de saída."),
+        ),
+        custo=CUSTO_MEDIO, somente_leitura=False, invalida=("caminho_saida",)
+    ),
+    DefinicaoFerramenta(
+        nome="criar_relatorio", funcao="criar_relatorio",
+        descricao="Gera um relatório em Word.",
+        parametros=(
+            _texto("titulo", "Título do relatório."),
+            ParametroFerramenta("dados", dict, "Dados: 'resumo', 'metodologia', 'resultados', 'tabela_dados', 'conclusoes', 'recomendacoes'."),
+            _texto("caminho_saida", "Arquivo .docx de saída."),
+        ),
+        custo=CUSTO_MEDIO, somente_leitura=False, invalida=("caminho_saida",)
+    ),
+    DefinicaoFerramenta(
+        nome="converter_para_word", funcao="converter_para_word",
+        descricao="Converte um arquivo de texto (.txt) para Word (.docx).",
+        parametros=(
+            _texto("arquivo_origem", "Arquivo .txt de origem."),
+            _texto("arquivo_destino", "Arquivo .docx de destino."),
+        ),
+        custo=CUSTO_MEDIO, somente_leitura=False, invalida=("arquivo_destino",)
+    ),
+    DefinicaoFerramenta(
+        nome="pesquisar_web", funcao="pesquisar_web",
+        descricao="Pesquisa Zero-Click (respostas instantâneas) no DuckDuckGo.",
+        parametros=(
+            _texto("query", "Termo de busca."),
+            ParametroFerramenta("max_resultados", int, "Máximo de resultados.", padrao=5),
+        ),
+        custo=CUSTO_ALTO, cache=PoliticaCache(ttl=600)
+    ),
+    DefinicaoFerramenta(
+        nome="extrair_texto", funcao="extrair_texto",
+        descricao="Extrai o texto principal de uma página web.",
+        parametros=(_texto("url", "URL da página."),),
+        custo=CUSTO_ALTO, cache=PoliticaCache(ttl=300)
+    ),
+    DefinicaoFerramenta(
+        nome="extrair_textos", funcao="extrair_textos",
+        descricao="Extrai o texto de várias páginas web em paralelo.",
+        parametros=(
+            ParametroFerramenta("urls", list, "URLs das páginas."),
+            ParametroFerramenta("max_caracteres", int, "Limite de caracteres por página.", padrao=4000),
+        ),
+        custo=CUSTO_ALTO, cache=PoliticaCache(ttl=300)
+    ),
+    DefinicaoFerramenta(
+        nome="verificar_urls", funcao="verificar_urls",
+        descricao="Verifica várias URLs em paralelo: status, redirecionamentos e certificado TLS.",
+        parametros=(
+            ParametroFerramenta("urls", list, "URLs a verificar."),
+            ParametroFerramenta("seguranca", bool, "Também verificar os headers de segurança.", padrao=False),
+        ),
+        custo=CUSTO_ALTO, idempotente=False
+    ),
+    DefinicaoFerramenta(
+        nome="converter_arquivo", funcao="converter_arquivo",
+        descricao="Converte um arquivo grande entre CSV, JSON, JSON Lines e XML em streaming.",
+        parametros=(
+            _texto("origem", "Arquivo de entrada."),
+            _texto("destino", "Arquivo de saída."),
+            _texto("formato_origem", "csv, json, jsonl ou xml (padrão: pela extensão).", padrao=None),
+            _texto("formato_destino", "csv, json, jsonl ou xml (padrão: pela extensão).", padrao=None),
+            ParametroFerramenta("trabalhadores", int, "Processos para serializar em paralelo.", padrao=1),
+        ),
+        custo=CUSTO_ALTO, somente_leitura=False, invalida=("destino",)
+    ),
+    DefinicaoFerramenta(
+        nome="consultar_dados", funcao="consultar_dados",
+        descricao=(
+            "Consulta um arquivo CSV/JSON/JSONL/Parquet sem carregá-lo no contexto: filtra, seleciona colunas, "
+            "agrupa e agrega (soma, media, min, max, contagem, distintos) e devolve só o resultado."
+        ),
+        parametros=(
+            _texto("caminho", "Arquivo de dados."),
+            ParametroFerramenta("colunas", list, "Colunas do resultado (sem agregação).", padrao=None),
+            ParametroFerramenta("filtros", list, "Condições, ex.: [\"valor >= 100\", \"uf == 'SP'\"].", padrao=None),
+            ParametroFerramenta("agrupar_por", list, "Colunas de agrupamento.", padrao=None),
+            ParametroFerramenta("metricas", dict, "Métricas, ex.: {\"total\": \"soma(valor)\", \"n\": \"contagem()\"}.", padrao=None),
+            _texto("ordenar_por", "Coluna do resultado para ordenar.", padrao=None),
+            ParametroFerramenta("decrescente", bool, "Ordem decrescente.", padrao=False),
+            ParametroFerramenta("limite", int, "Máximo de linhas do resultado.", padrao=50),
+        ),
+        cache=PoliticaCache(caminhos=("caminho",))
+    ),
+    DefinicaoFerramenta(
+        nome="validar_arquivo", funcao="validar_arquivo",
+        descricao="Valida um arquivo CSV/JSONL/Parquet contra um schema, em lotes, e resume os erros por campo.",
+        parametros=(
+            _texto("caminho", "Arquivo de dados."),
+            ParametroFerramenta(
+                "schema", dict,
+                "Regras por campo, ex.: {\"email\": {\"tipo\": \"string\", \"obrigatorio\": true, \"padrao\": \".+@.+\"}}."
+            ),
+            ParametroFerramenta("max_exemplos", int, "Quantas linhas inválidas detalhar.", padrao=20),
+        ),
+        custo=CUSTO_ALTO, cache=PoliticaCache(caminhos=("caminho",))
+    ),
+    DefinicaoFerramenta(
+        nome="gerar_graficos", funcao="gerar_graficos",
+        descricao=(
+            "Gera gráficos (barras, linha, dispersao, pizza, histograma) em paralelo e devolve os caminhos das imagens. "
+            "Cada item: {\"tipo\", \"categorias\", \"series\": {nome: valores} ou \"valores\", \"titulo\", \"label_x\", \"label_y\"}."
+        ),
+        parametros=(
+            ParametroFerramenta("especificacoes", list, "Lista de gráficos a gerar."),
+        ),
+        custo=CUSTO_ALTO, somente_leitura=False, invalida=(_diretorio_graficos,)
+    ),
+    DefinicaoFerramenta(
+        nome="ler_excel_pagina", funcao="ler_excel_pagina",
+        descricao="Lê uma página de linhas de uma planilha Excel (paginado; use a linha_inicial indicada para continuar).",
+        parametros=(
+            _texto("caminho_arquivo", "Caminho do arquivo .xlsx."),
+            _texto("aba", "Nome da aba (padrão: a ativa).", padrao=None),
+            ParametroFerramenta("linha_inicial", int, "Primeira linha da página.", padrao=2),
+            ParametroFerramenta("linhas_por_pagina", int, "Linhas por página.", padrao=100),
+            ParametroFerramenta("cabecalho", bool, "Usar a linha 1 como cabeçalho.", padrao=True),
+        ),
+        cache=PoliticaCache(caminhos=("caminho_arquivo",))
+    ),
+    DefinicaoFerramenta(
+        nome="gerar_documentos_lote", funcao="gerar_documentos_lote",
+        descricao=(
+            "Gera um documento Word por registro, em paralelo, a partir de um modelo .docx com marcadores "
+            "{{campo}} e {{tabela:campo}} ou dos modelos internos \"relatorio\" e \"curriculo\"."
+        ),
+        parametros=(
+            ParametroFerramenta("registros", list, "Lista de registros (um documento por registro)."),
+            _texto("diretorio_saida", "Pasta onde os documentos serão salvos."),
+            _texto("modelo", "Caminho do modelo .docx, \"relatorio\" ou \"curriculo\".", padrao=None),
+            _texto("padrao_nome", "Nome de cada arquivo, ex.: relatorio_{cliente}.docx.", padrao="documento_{indice:04d}.docx"),
+        ),
+        custo=CUSTO_ALTO, somente_leitura=False, invalida=("diretorio_saida",)
+    ),
+]
+
+registro_ferramentas = RegistroFerramentas(FERRAMENTAS_PADRAO)
@@ -3,73 +3,23 @@ import hashlib
 import jwt
 import bcrypt
 from typing import Dict, List, Optional, Union
-import logging
 from datetime import datetime, timedelta
-import requests
-import ssl
-import socket
 import OpenSSL
 from urllib.parse import urlparse
+from ..logs import setup_logging
 
-logger = logging.getLogger(__name__)
+logger = setup_logging(__name__)
 
 def verificar_seguranca(url: str) -> Dict:
-    """Realiza uma análise básica de segurança de uma URL."""
+    """Realiza uma análise básica de segurança de uma URL.
+
+    Usa o verificador em lote (``verificar_urls`` com ``seguranca=True``
+    audita várias URLs em paralelo).
+    """
     try:
-        resultado = {
-            "url": url,
-            "ssl": False,
-            "certificado": None,
-            "vulnerabilidades": [],
-            "headers_seguranca": {},
-            "recomendacoes": []
-        }
-        
-        # Verificar SSL
-        try:
-            parsed_url = urlparse(url)
-            hostname = parsed_url.netloc
-            
-            context = ssl.create_default_context()
-            with socket.create_connection((hostname, 443)) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    cert = ssock.getpeercert()
-                    resultado["ssl"] = True
-                    resultado["certificado"] = {
-                        "valido_ate": cert["notAfter"],
-                        "emissor": cert["issuer"],
-                        "versao": cert["version"]
-                    }
-        except Exception as e:
-            resultado["vulnerabilidades"].append("SSL não configurado ou inválido")
-            resultado["recomendacoes"].append("Implementar SSL/TLS")
-        
-        # Verificar headers de segurança
-        try:
-            response = requests.get(url)
-            headers = response.headers
-            
-            # Verificar headers importantes
-            headers_seguranca = {
-                "Strict-Transport-Security": headers.get("Strict-Transport-Security"),
-                "X-Frame-Options": headers.get("X-Frame-Options"),
-                "X-Content-Type-Options": headers.get("X-Content-Type-Options"),
-                "X-XSS-Protection": headers.get("X-XSS-Protection"),
-                "Content-Security-Policy": headers.get("Content-Security-Policy")
-            }
-            
-            resultado["headers_seguranca"] = headers_seguranca
-            
-            # Verificar headers ausentes
-            for header, valor in headers_seguranca.items():
-                if not valor:
-                    resultado["vulnerabilidades"].append(f"Header {header} ausente")
-                    resultado["recomendacoes"].append(f"Implementar header {header}")
-        
-        except Exception as e:
-            resultado["vulnerabilidades"].append(f"Erro ao verificar headers: {str(e)}")
-        
-        return resultado
+        from .verificacao_lote import obter_verificador
+        resultado = list(obter_verificador().verificar([url], seguranca=True))[0]
+        return resultado.relatorio_seguranca()
     except Exception as e:
         logger.error(f"Erro ao verificar segurança: {e}")
         raise
@@ -1,4 +1,3 @@
-import logging
 import traceback
 import json
 import time
@@ -12,7 +11,11 @@ import socket
 import requests
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
+from ..amostrador import obter_amostrador
+from ..saude import monitor_saude
+from ..logs import setup_logging
+
+logger = setup_logging(__name__)
 
 def gerar_log(mensagem: str, nivel: str = "INFO", contexto: Dict = None,
     mcp_client: Optional[Any] = None
@@ -159,9 +162,14 @@ def analisar_erro(erro: Exception,
         raise
 
 def monitorar_sistema(
-    mcp_client: Optional[Any] = None
+    mcp_client: Optional[Any] = None,
+    janela_segundos: Optional[int] = None
 ) -> Dict:
-    """Monitora o estado do sistema."""
+    """Monitora o estado do sistema.
+
+    Os valores vêm do amostrador em segundo plano; com ``janela_segundos``
+    também é retornado o agregado (mín/máx/média) dessa janela.
+    """
     try:
         # Refatoração para usar MCP Client se disponível
         if mcp_client:
@@ -169,7 +177,7 @@ def monitorar_sistema(
             tarefa_execucao = {
                 "tipo": "executar_ferramenta",
                 "nome_ferramenta": "monitorar_sistema",
-                "parametros": {}
+                "parametros": {"janela_segundos": janela_segundos}
             }
             resultado = mcp_client.distribuir_tarefa(
                 tarefa=json.dumps(tarefa_execucao),
@@ -184,8 +192,11 @@ def monitorar_sistema(
                 return {"erro": "Erro ao processar resultado do MCP Server", "detalhes": str(e)}
 
         # Lógica existente (fallback local)
+        amostrador = obter_amostrador()
+        amostra = amostrador.ultimo()
         resultado = {
             "timestamp": datetime.now().isoformat(),
+            "amostrado_em": datetime.fromtimestamp(amostra["timestamp"]).isoformat(),
             "sistema": {
                 "plataforma": platform.platform(),
                 "python": sys.version,
@@ -194,40 +205,39 @@ def monitorar_sistema(
             },
             "recursos": {
                 "cpu": {
-                    "percentual": psutil.cpu_percent(interval=1),
-                    "nucleos": psutil.cpu_count(),
-                    "frequencia": psutil.cpu_freq().current if psutil.cpu_freq() else None
+                    "percentual": amostra["cpu_percent"],
+                    "nucleos": amostra["cpu_nucleos"]
                 },
                 "memoria": {
-                    "total": psutil.virtual_memory().total,
-                    "disponivel": psutil.virtual_memory().available,
-                    "percentual": psutil.virtual_memory().percent
+                    "total": amostra["memoria_total"],
+                    "disponivel": amostra["memoria_disponivel"],
+                    "percentual": amostra["memoria_percent"]
                 },
                 "disco": {
-                    "total": psutil.disk_usage('/').total,
-                    "livre": psutil.disk_usage('/').free,
-                    "percentual": psutil.disk_usage('/').percent
+                    "total": amostra["disco_total"],
+                    "livre": amostra["disco_livre"],
+                    "percentual": amostra["disco_percent"]
                 },
                 "rede": {
-                    "conexoes": len(psutil.net_connections()),
-                    "interfaces": psutil.net_if_stats()
+                    "bytes_enviados_por_segundo": amostra["rede_envio_bps"],
+                    "bytes_recebidos_por_segundo": amostra["rede_recepcao_bps"]
                 }
             },
-            "processos": []
+            "processos": amostra["processos"]
         }
         
-        # Listar processos
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            try:
-                resultado["processos"].append(proc.info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        if janela_segundos:
+            resultado["janela"] = amostrador.janela(janela_segundos)
         
         return resultado
     except Exception as e:
         logger.error(f"Erro ao monitorar sistema: {e}")
         raise
 
+def _verificar_conexao_internet() -> int:
+    """Sonda de conectividade usada por verificar_saude."""
+    return requests.get('http://www.google.com', timeout=5).status_code
+
 def verificar_saude(
     mcp_client: Optional[Any] = None
 ) -> Dict:
@@ -261,8 +271,10 @@ def verificar_saude(
             "alertas": []
         }
         
+        amostra = obter_amostrador().ultimo()
+        
         # Verificar CPU
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = amostra["cpu_percent"]
         resultado["componentes"]["cpu"] = {
             "status": "OK" if cpu_percent < 80 else "ALERTA",
             "valor": cpu_percent
@@ -271,31 +283,35 @@ def verificar_saude(
             resultado["alertas"].append(f"CPU com uso alto: {cpu_percent}%")
         
         # Verificar memória
-        mem = psutil.virtual_memory()
+        memoria_percent = amostra["memoria_percent"]
         resultado["componentes"]["memoria"] = {
-            "status": "OK" if mem.percent < 80 else "ALERTA",
-            "valor": mem.percent
+            "status": "OK" if memoria_percent < 80 else "ALERTA",
+            "valor": memoria_percent
         }
-        if mem.percent >= 80:
-            resultado["alertas"].append(f"Memória com uso alto: {mem.percent}%")
+        if memoria_percent >= 80:
+            resultado["alertas"].append(f"Memória com uso alto: {memoria_percent}%")
         
         # Verificar disco
-        disco = psutil.disk_usage('/')
+        disco_percent = amostra["disco_percent"]
         resultado["componentes"]["disco"] = {
-            "status": "OK" if disco.percent < 80 else "ALERTA",
-            "valor": disco.percent
+            "status": "OK" if disco_percent < 80 else "ALERTA",
+            "valor": disco_percent
         }
-        if disco.percent >= 80:
-            resultado["alertas"].append(f"Disco com uso alto: {disco.percent}%")
+        if disco_percent >= 80:
+            resultado["alertas"].append(f"Disco com uso alto: {disco_percent}%")
         
-        # Verificar rede
-        try:
-            response = requests.get('http://www.google.com', timeout=5)
+        # Verificar rede (sonda em segundo plano; na primeira chamada aguarda o resultado)
+        if monitor_saude.obter("internet")["verificado_em"] is None:
+            monitor_saude.registrar("internet", _verificar_conexao_internet, intervalo=60, timeout=5)
+            monitor_saude.iniciar()
+            monitor_saude.atualizar("internet")
+        rede = monitor_saude.obter("internet")
+        if rede["erro"] is None and rede["valor"] is not None:
             resultado["componentes"]["rede"] = {
                 "status": "OK",
-                "valor": response.status_code
+                "valor": rede["valor"]
             }
-        except:
+        else:
             resultado["componentes"]["rede"] = {
                 "status": "ERRO",
                 "valor": None
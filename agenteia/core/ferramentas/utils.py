@@ -13,6 +13,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from ..exceptions import ToolError
+from .graficos import EspecificacaoGrafico, obter_renderizador
 from ...core.logs import setup_logging
 
 logger = setup_logging(__name__)
@@ -133,26 +134,18 @@ def adicionar_grafico_word(dados: dict, caminho: str, titulo: str = "Gráfico")
         Mensagem de confirmação
     """
     try:
-        import matplotlib.pyplot as plt
         from docx import Document
         from docx.shared import Inches
-        import tempfile
-        # Gera gráfico
-        categorias = list(dados.keys())
-        valores = list(dados.values())
-        plt.figure(figsize=(6, 4))
-        plt.bar(categorias, valores)
-        plt.title(titulo)
-        plt.tight_layout()
-        # Salva imagem temporária
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            plt.savefig(tmp.name)
-            plt.close()
-            # Adiciona ao Word
-            doc = Document()
-            doc.add_heading(titulo, 1)
-            doc.add_picture(tmp.name, width=Inches(5))
-            doc.save(caminho)
+        # Gera gráfico (fora do processo, reaproveitado se já existir)
+        especificacao = EspecificacaoGrafico.criar(
+            "barras", list(dados.keys()), valores=list(dados.values()), titulo=titulo, largura=6, altura=4
+        )
+        imagem = obter_renderizador().renderizar(especificacao)
+        # Adiciona ao Word
+        doc = Document()
+        doc.add_heading(titulo, 1)
+        doc.add_picture(imagem, width=Inches(5))
+        doc.save(caminho)
         return f"Gráfico adicionado ao Word com sucesso: {caminho}"
     except Exception as e:
         logger.error(f"Erro ao adicionar gráfico ao Word: {str(e)}")
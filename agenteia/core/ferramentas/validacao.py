@@ -0,0 +1,469 @@
+"""
+Validação de dados em lote a partir de um schema compilado.
+
+O vocabulário é o de ``validar_dados``: ``tipo`` (string, number, boolean),
+``obrigatorio``, ``min``, ``max`` e ``padrao``. ``compilar_schema`` compila as
+expressões regulares uma única vez e transforma cada regra numa verificação
+por coluna, vetorizada sobre uma Series do pandas ou uma coluna Arrow
+(``pyarrow.compute``), que produz uma máscara booleana por linha.
+
+Arquivos são validados em lotes (``read_csv(chunksize=...)``, listas de
+registros do JSON Lines ou ``iter_batches`` do Parquet) e
+só as contagens e alguns exemplos são acumulados: a memória fica limitada ao
+tamanho do lote.
+
+Valores nulos só são verificados por ``obrigatorio``; ``min``/``max`` só se
+aplicam a valores numéricos e ``padrao`` segue a semântica de ``re.match``.
+
+CSVs são lidos como texto e cada célula é convertida pelo próprio conteúdo
+(número, booleano ou texto), não pelo tipo que o pandas inferiria para o
+lote: o resultado não depende de ``tamanho_lote``. Em listas de registros
+(inclusive os lotes do JSON Lines), a presença de cada chave é vista por
+registro: chave ausente é ``ausente`` e chave com null é ``obrigatorio``,
+qualquer que seja o resto do lote.
+"""
+
+import itertools
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern
+
+from ..carregamento import ImportacaoTardia
+from ..exceptions import ValidationError
+from ..logs import setup_logging
+from .consulta_dados import detectar_formato
+from .conversao import ler_jsonl
+
+logger = setup_logging(__name__)
+
+pd = ImportacaoTardia("pandas")
+np = ImportacaoTardia("numpy")
+pa = ImportacaoTardia("pyarrow")
+pc = ImportacaoTardia("pyarrow.compute")
+
+TIPOS = ("string", "number", "boolean")
+
+REGRAS = ("ausente", "obrigatorio", "tipo", "min", "max", "padrao")
+
+TAMANHO_LOTE = 100_000
+
+_TIPOS_PYTHON = {
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+}
+
+
+_LOGICOS = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+
+
+def _nulo(valor: Any) -> bool:
+    return valor is None or (isinstance(valor, float) and valor != valor)
+
+
+def _tipar_coluna(serie: Any) -> Any:
+    """Coluna de CSV lida como texto, com cada célula convertida pelo próprio conteúdo."""
+    preenchidas = serie.notna()
+    numeros = pd.to_numeric(serie, errors="coerce", dtype_backend="numpy_nullable")
+    e_numero = numeros.notna()
+    if e_numero.sum() == preenchidas.sum():
+        return numeros
+    logicos = serie.map(_LOGICOS.get)
+    e_logico = logicos.notna()
+    if e_logico.sum() == preenchidas.sum():
+        return logicos.astype("boolean")
+    if not e_numero.any() and not e_logico.any():
+        return serie
+    # Coluna mista: o teste de tipo passa a ser por valor (coluna object)
+    return serie.astype(object).mask(e_numero, numeros.astype(object)).mask(e_logico, logicos)
+
+
+def _tipar_lote(lote: Any) -> Any:
+    return lote.apply(_tipar_coluna) if len(lote.columns) else lote
+
+
+@dataclass(frozen=True)
+class RegrasCampo:
+    """Regras de um campo, com a expressão já compilada."""
+    campo: str
+    tipo: Optional[str] = None
+    obrigatorio: bool = False
+    minimo: Optional[float] = None
+    maximo: Optional[float] = None
+    padrao: Optional[Pattern] = None
+
+    def mensagem(self, regra: str) -> str:
+        if regra == "ausente":
+            return "Campo obrigatório não encontrado"
+        if regra == "obrigatorio":
+            return "Campo obrigatório não preenchido"
+        if regra == "tipo":
+            return f"Tipo esperado: {self.tipo}"
+        if regra == "min":
+            return f"Valor menor que o mínimo permitido: {self.minimo}"
+        if regra == "max":
+            return f"Valor maior que o máximo permitido: {self.maximo}"
+        return f"Valor não corresponde ao padrão esperado: {self.padrao.pattern}"
+
+    def falhas(self, valor: Any) -> List[str]:
+        """Regras violadas por um valor isolado."""
+        if _nulo(valor):
+            return ["obrigatorio"] if self.obrigatorio else []
+        if self.tipo and not _TIPOS_PYTHON[self.tipo](valor):
+            return ["tipo"]
+        falhas = []
+        if self.minimo is not None or self.maximo is not None:
+            numero = valor if _TIPOS_PYTHON["number"](valor) else None
+            if numero is not None and self.minimo is not None and numero < self.minimo:
+                falhas.append("min")
+            if numero is not None and self.maximo is not None and numero > self.maximo:
+                falhas.append("max")
+        if self.padrao is not None and not self.padrao.match(str(valor)):
+            falhas.append("padrao")
+        return falhas
+
+    def mascaras_pandas(self, tabela: Any, presentes: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Máscaras (arrays numpy de bool) das regras violadas em cada linha de um DataFrame.
+
+        Args:
+            tabela: DataFrame do lote
+            presentes: Máscara das linhas cujo registro tem a chave do campo; sem
+                ela, só a falta da coluna inteira conta como ``ausente``
+        """
+        tipos = pd.api.types
+        linhas = len(tabela)
+        if self.campo not in tabela.columns:
+            return {"ausente": np.ones(linhas, dtype=bool)} if self.obrigatorio else {}
+
+        serie = tabela[self.campo]
+        nulo = serie.isna().to_numpy(dtype=bool)
+        mascaras = {}
+        if self.obrigatorio and presentes is not None:
+            mascaras["ausente"] = ~presentes
+            mascaras["obrigatorio"] = nulo & presentes
+        elif self.obrigatorio:
+            mascaras["obrigatorio"] = nulo
+        verificar = ~nulo
+
+        if self.tipo:
+            if tipos.is_object_dtype(serie.dtype):
+                # Colunas mistas: o teste é por valor, mas só uma vez por linha
+                conforme = serie.map(_TIPOS_PYTHON[self.tipo]).to_numpy(dtype=bool)
+            elif self.tipo == "number":
+                conforme = tipos.is_numeric_dtype(serie.dtype) and not tipos.is_bool_dtype(serie.dtype)
+            elif self.tipo == "boolean":
+                conforme = tipos.is_bool_dtype(serie.dtype)
+            else:
+                conforme = tipos.is_string_dtype(serie.dtype)
+            conforme = np.broadcast_to(np.asarray(conforme, dtype=bool), linhas)
+            mascaras["tipo"] = verificar & ~conforme
+            verificar = verificar & conforme
+
+        if self.minimo is not None or self.maximo is not None:
+            if tipos.is_numeric_dtype(serie.dtype) and not tipos.is_bool_dtype(serie.dtype):
+                numeros = serie.to_numpy(dtype=float, na_value=np.nan)
+            else:
+                numeros = pd.to_numeric(
+                    serie.where(serie.map(_TIPOS_PYTHON["number"])), errors="coerce"
+                ).to_numpy(dtype=float, na_value=np.nan)
+            with np.errstate(invalid="ignore"):
+                if self.minimo is not None:
+                    mascaras["min"] = verificar & (numeros < self.minimo)
+                if self.maximo is not None:
+                    mascaras["max"] = verificar & (numeros > self.maximo)
+
+        if self.padrao is not None:
+            textos = serie if tipos.is_string_dtype(serie.dtype) and not tipos.is_object_dtype(serie.dtype) else serie.astype(str)
+            conforme = textos.str.match(self.padrao).to_numpy(dtype=bool, na_value=False)
+            mascaras["padrao"] = verificar & ~conforme
+        return mascaras
+
+    def mascaras_arrow(self, tabela: Any) -> Dict[str, Any]:
+        """Máscaras das regras violadas em cada linha de uma tabela ou RecordBatch Arrow."""
+        linhas = tabela.num_rows
+        if self.campo not in tabela.schema.names:
+            return {"ausente": np.ones(linhas, dtype=bool)} if self.obrigatorio else {}
+
+        coluna = tabela.column(self.campo)
+        tipo = coluna.type
+        nulo = _numpy(pc.is_null(coluna, nan_is_null=True))
+        mascaras = {}
+        if self.obrigatorio:
+            mascaras["obrigatorio"] = nulo
+        verificar = ~nulo
+
+        numerico = pa.types.is_integer(tipo) or pa.types.is_floating(tipo) or pa.types.is_decimal(tipo)
+        texto = pa.types.is_string(tipo) or pa.types.is_large_string(tipo)
+        if self.tipo:
+            # Colunas Arrow têm um único tipo: a verificação vale para a coluna inteira
+            conforme = {"number": numerico, "boolean": pa.types.is_boolean(tipo), "string": texto}[self.tipo]
+            if not conforme:
+                mascaras["tipo"] = verificar
+                verificar = np.zeros(linhas, dtype=bool)
+
+        if numerico and self.minimo is not None:
+            mascaras["min"] = verificar & _numpy(pc.less(coluna, self.minimo))
+        if numerico and self.maximo is not None:
+            mascaras["max"] = verificar & _numpy(pc.greater(coluna, self.maximo))
+
+        if self.padrao is not None:
+            textos = coluna if texto else pc.cast(coluna, pa.string())
+            try:
+                conforme = _numpy(pc.match_substring_regex(textos, f"^(?:{self.padrao.pattern})"))
+            except pa.lib.ArrowException:
+                # Sintaxe que o RE2 não aceita (ex.: lookahead): usa o ``re`` do Python
+                conforme = np.fromiter(
+                    (v is not None and self.padrao.match(v) is not None for v in textos.to_pylist()),
+                    dtype=bool, count=linhas
+                )
+            mascaras["padrao"] = verificar & ~conforme
+        return mascaras
+
+
+def _numpy(mascara: Any) -> Any:
+    return np.asarray(pc.fill_null(mascara, False), dtype=bool)
+
+
+@dataclass
+class ResultadoLote:
+    """Máscaras de erro de um lote: ``mascaras[campo][regra]`` é True nas linhas que violam a regra."""
+    linhas: int
+    mascaras: Dict[str, Dict[str, Any]]
+    regras: Dict[str, RegrasCampo]
+
+    @property
+    def invalidas(self) -> Any:
+        """Máscara das linhas com pelo menos um erro."""
+        resultado = np.zeros(self.linhas, dtype=bool)
+        for por_regra in self.mascaras.values():
+            for mascara in por_regra.values():
+                resultado |= mascara
+        return resultado
+
+    def contagens(self) -> Dict[str, Dict[str, int]]:
+        """Erros por campo e regra (só os diferentes de zero)."""
+        contagens: Dict[str, Dict[str, int]] = {}
+        for campo, por_regra in self.mascaras.items():
+            for regra, mascara in por_regra.items():
+                quantidade = int(np.count_nonzero(mascara))
+                if quantidade:
+                    contagens.setdefault(campo, {})[regra] = quantidade
+        return contagens
+
+    def erros_linha(self, indice: int) -> Dict[str, List[str]]:
+        """Mensagens de erro de uma linha do lote."""
+        erros: Dict[str, List[str]] = {}
+        for campo, por_regra in self.mascaras.items():
+            for regra, mascara in por_regra.items():
+                if mascara[indice]:
+                    erros.setdefault(campo, []).append(self.regras[campo].mensagem(regra))
+        return erros
+
+
+@dataclass
+class RelatorioValidacao:
+    """Contagens acumuladas de vários lotes e as primeiras linhas inválidas."""
+    linhas: int = 0
+    linhas_invalidas: int = 0
+    contagens: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    exemplos: List[Dict[str, Any]] = field(default_factory=list)
+    segundos: float = 0.0
+
+    @property
+    def valido(self) -> bool:
+        return self.linhas_invalidas == 0
+
+    def adicionar(self, resultado: ResultadoLote, max_exemplos: int) -> None:
+        invalidas = resultado.invalidas
+        for campo, por_regra in resultado.contagens().items():
+            destino = self.contagens.setdefault(campo, {})
+            for regra, quantidade in por_regra.items():
+                destino[regra] = destino.get(regra, 0) + quantidade
+        if len(self.exemplos) < max_exemplos:
+            for indice in np.flatnonzero(invalidas)[:max_exemplos - len(self.exemplos)]:
+                self.exemplos.append({"linha": self.linhas + int(indice), "erros": resultado.erros_linha(indice)})
+        self.linhas += resultado.linhas
+        self.linhas_invalidas += int(np.count_nonzero(invalidas))
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {
+            "valido": self.valido, "linhas": self.linhas, "linhas_invalidas": self.linhas_invalidas,
+            "contagens": self.contagens, "exemplos": self.exemplos,
+        }
+
+    def formatar(self) -> str:
+        if self.valido:
+            return f"{self.linhas} linha(s) válida(s) ({self.segundos:.2f}s)."
+        partes = [f"{self.linhas_invalidas} de {self.linhas} linha(s) inválida(s) ({self.segundos:.2f}s)."]
+        partes.append("| Campo | Regra | Erros |\n|---|---|---|")
+        partes.extend(
+            f"| {campo} | {regra} | {quantidade} |"
+            for campo, por_regra in self.contagens.items() for regra, quantidade in por_regra.items()
+        )
+        if self.exemplos:
+            partes.append("\nPrimeiras linhas inválidas (a partir de 0):")
+            partes.extend(
+                f"- linha {exemplo['linha']}: " + "; ".join(
+                    f"{campo}: {', '.join(mensagens)}" for campo, mensagens in exemplo["erros"].items()
+                )
+                for exemplo in self.exemplos
+            )
+        return "\n".join(partes)
+
+
+class SchemaCompilado:
+    """Schema pronto para validar registros, tabelas e lotes."""
+
+    def __init__(self, regras: List[RegrasCampo]):
+        self.regras = {r.campo: r for r in regras}
+
+    def validar_registro(self, registro: Dict[str, Any]) -> List[Dict[str, List[str]]]:
+        """Erros de um único registro, no formato de ``validar_dados``."""
+        erros = []
+        for campo, regras in self.regras.items():
+            if campo in registro:
+                falhas = regras.falhas(registro[campo])
+            else:
+                falhas = ["ausente"] if regras.obrigatorio else []
+            if falhas:
+                erros.append({campo: [regras.mensagem(f) for f in falhas]})
+        return erros
+
+    def validar_tabela(self, tabela: Any) -> ResultadoLote:
+        """Valida um DataFrame do pandas, uma tabela/RecordBatch Arrow ou uma lista de registros."""
+        presentes: Dict[str, Any] = {}
+        if isinstance(tabela, list):
+            registros = tabela
+            tabela = pd.DataFrame.from_records(registros)
+            # O DataFrame preenche chaves ausentes com NaN: a presença vem dos registros
+            presentes = {
+                campo: np.fromiter((campo in r for r in registros), dtype=bool, count=len(registros))
+                for campo in self.regras
+            }
+        if hasattr(tabela, "schema") and hasattr(tabela, "num_rows"):
+            linhas = tabela.num_rows
+            mascaras = {campo: r.mascaras_arrow(tabela) for campo, r in self.regras.items()}
+        else:
+            linhas = len(tabela)
+            mascaras = {campo: r.mascaras_pandas(tabela, presentes.get(campo)) for campo, r in self.regras.items()}
+        return ResultadoLote(linhas, {c: m for c, m in mascaras.items() if m}, self.regras)
+
+    def validar_lotes(self, lotes: Iterable[Any], max_exemplos: int = 20) -> RelatorioValidacao:
+        """Valida lote a lote, guardando só as contagens e os primeiros exemplos."""
+        inicio = time.perf_counter()
+        relatorio = RelatorioValidacao()
+        for lote in lotes:
+            relatorio.adicionar(self.validar_tabela(lote), max_exemplos)
+        relatorio.segundos = time.perf_counter() - inicio
+        return relatorio
+
+
+_compilados: Dict[str, SchemaCompilado] = {}
+_lock = threading.Lock()
+
+
+def compilar_schema(schema: Dict[str, Dict[str, Any]]) -> SchemaCompilado:
+    """
+    Compila um schema ``{campo: {tipo, obrigatorio, min, max, padrao}}``.
+
+    Schemas iguais são compilados uma única vez.
+
+    Raises:
+        ValidationError: Se o schema tiver tipo, limite ou expressão inválidos
+    """
+    chave = json.dumps(schema, sort_keys=True, default=str)
+    with _lock:
+        compilado = _compilados.get(chave)
+    if compilado is not None:
+        return compilado
+
+    regras = []
+    for campo, definicao in schema.items():
+        tipo = definicao.get("tipo")
+        if tipo is not None and tipo not in TIPOS:
+            raise ValidationError(f"Tipo inválido para {campo}: {tipo} (use {', '.join(TIPOS)})")
+        limites = {}
+        for chave_limite in ("min", "max"):
+            valor = definicao.get(chave_limite)
+            if valor is not None and not _TIPOS_PYTHON["number"](valor):
+                raise ValidationError(f"'{chave_limite}' de {campo} deve ser numérico: {valor!r}")
+            limites[chave_limite] = valor
+        try:
+            padrao = re.compile(definicao["padrao"]) if definicao.get("padrao") else None
+        except re.error as e:
+            raise ValidationError(f"Padrão inválido para {campo}: {e}")
+        regras.append(RegrasCampo(
+            str(campo), tipo, bool(definicao.get("obrigatorio", False)), limites["min"], limites["max"], padrao
+        ))
+
+    compilado = SchemaCompilado(regras)
+    with _lock:
+        _compilados[chave] = compilado
+    return compilado
+
+
+def ler_lotes(caminho: str, tamanho_lote: int = TAMANHO_LOTE, formato: Optional[str] = None) -> Iterator[Any]:
+    """Lotes de um arquivo CSV/TSV, JSON Lines ou Parquet, sem carregá-lo inteiro."""
+    formato = (formato or detectar_formato(caminho)).lower()
+    if formato in ("csv", "tsv"):
+        separador = "\t" if formato == "tsv" or caminho.lower().endswith(".tsv") else ","
+        # dtype=str: a inferência do pandas é por lote e mudaria o tipo de uma célula conforme o lote
+        with pd.read_csv(caminho, sep=separador, chunksize=tamanho_lote, dtype=str) as leitor:
+            for lote in leitor:
+                yield _tipar_lote(lote)
+    elif formato == "jsonl":
+        # Listas de registros: validar_tabela vê quais chaves cada registro tem
+        registros = ler_jsonl(caminho)
+        while True:
+            lote = list(itertools.islice(registros, tamanho_lote))
+            if not lote:
+                break
+            yield lote
+    elif formato == "parquet":
+        import pyarrow.parquet as pq
+        yield from pq.ParquetFile(caminho).iter_batches(batch_size=tamanho_lote)
+    else:
+        raise ValidationError(f"Formato não suportado para validação em lote: {formato} (use csv, jsonl ou parquet)")
+
+
+def validar_arquivo(
+    caminho: str,
+    schema: Dict[str, Dict[str, Any]],
+    tamanho_lote: int = TAMANHO_LOTE,
+    max_exemplos: int = 20,
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Valida um arquivo de dados contra um schema, em lotes.
+
+    Args:
+        caminho: Arquivo CSV, TSV, JSON Lines ou Parquet
+        schema: ``{campo: {"tipo": ..., "obrigatorio": ..., "min": ..., "max": ..., "padrao": ...}}``
+        tamanho_lote: Linhas por lote
+        max_exemplos: Quantas linhas inválidas detalhar
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Resumo com as contagens de erro por campo e regra
+    """
+    if mcp_client:
+        logger.info(f"Delegando validar_arquivo para MCP Server: {caminho}")
+        tarefa_execucao = {
+            "tipo": "executar_ferramenta",
+            "nome_ferramenta": "validar_arquivo",
+            "parametros": {
+                "caminho": caminho, "schema": schema, "tamanho_lote": tamanho_lote, "max_exemplos": max_exemplos
+            }
+        }
+        resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+        return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+    if isinstance(schema, str):
+        schema = json.loads(schema)
+    relatorio = compilar_schema(schema).validar_lotes(ler_lotes(caminho, tamanho_lote), max_exemplos)
+    logger.info(f"Validação de {caminho}: {relatorio.linhas_invalidas}/{relatorio.linhas} linha(s) inválida(s)")
+    return relatorio.formatar()
@@ -0,0 +1,347 @@
+"""
+Verificação de URLs e certificados TLS em lote.
+
+As requisições HEAD usam a sessão HTTP compartilhada do coletor web (mesmo
+pool de conexões e limites por host). O certificado de cada host é obtido
+uma única vez por lote, mesmo com centenas de URLs no mesmo domínio, e os
+resultados (de URLs e de certificados) ficam em cache por ``ttl`` segundos.
+Os resultados são entregues à medida que ficam prontos.
+"""
+
+import asyncio
+import contextlib
+import json
+import queue
+import ssl
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..logs import setup_logging
+from .cache import CacheResultados
+from .coleta_web import ColetorWeb, aiohttp, obter_coletor
+
+logger = setup_logging(__name__)
+
+_config: Dict[str, Any] = {
+    "max_concorrentes": 32,
+    "timeout": 10,
+    "ttl": 300,
+}
+
+HEADERS_SEGURANCA = (
+    "Strict-Transport-Security",
+    "X-Frame-Options",
+    "X-Content-Type-Options",
+    "X-XSS-Protection",
+    "Content-Security-Policy",
+)
+
+_resultados = CacheResultados(max_bytes=8 * 1024 * 1024, max_entradas=20000, metricas=False)
+
+_FIM = object()
+
+
+def configurar_verificacao(config: Optional[Dict[str, Any]] = None) -> None:
+    """Aplica a seção "verificacao_urls" do config (max_concorrentes, timeout, ttl)."""
+    if config:
+        _config.update(config)
+
+
+@dataclass
+class CertificadoTLS:
+    """Certificado apresentado por um host."""
+    host: str
+    porta: int
+    valido: bool
+    valido_ate: Optional[str] = None
+    dias_restantes: Optional[int] = None
+    emissor: Optional[str] = None
+    versao_tls: Optional[str] = None
+    erro: Optional[str] = None
+
+    def resumo(self) -> str:
+        if not self.valido:
+            return f"inválido ({self.erro})"
+        return f"válido, expira em {self.dias_restantes} dia(s)"
+
+
+@dataclass
+class VerificacaoURL:
+    """Resultado da verificação de uma URL."""
+    url: str
+    acessivel: bool = False
+    status_code: Optional[int] = None
+    redireciona: bool = False
+    url_final: Optional[str] = None
+    tempo_ms: Optional[float] = None
+    certificado: Optional[CertificadoTLS] = None
+    headers_seguranca: Dict[str, Optional[str]] = field(default_factory=dict)
+    erro: Optional[str] = None
+    do_cache: bool = False
+
+    @property
+    def https(self) -> bool:
+        return (self.url_final or self.url).startswith("https://")
+
+    def para_dict(self) -> Dict[str, Any]:
+        dados = asdict(self)
+        dados["https"] = self.https
+        return dados
+
+    def relatorio_seguranca(self) -> Dict[str, Any]:
+        """Resultado no formato de ``verificar_seguranca``."""
+        resultado = {
+            "url": self.url,
+            "ssl": bool(self.certificado and self.certificado.valido),
+            "certificado": None,
+            "vulnerabilidades": [],
+            "headers_seguranca": self.headers_seguranca,
+            "recomendacoes": []
+        }
+        if resultado["ssl"]:
+            resultado["certificado"] = {
+                "valido_ate": self.certificado.valido_ate,
+                "emissor": self.certificado.emissor,
+                "versao": self.certificado.versao_tls
+            }
+        else:
+            resultado["vulnerabilidades"].append("SSL não configurado ou inválido")
+            resultado["recomendacoes"].append("Implementar SSL/TLS")
+        if self.erro:
+            resultado["vulnerabilidades"].append(f"Erro ao verificar headers: {self.erro}")
+        else:
+            for header, valor in self.headers_seguranca.items():
+                if not valor:
+                    resultado["vulnerabilidades"].append(f"Header {header} ausente")
+                    resultado["recomendacoes"].append(f"Implementar header {header}")
+        return resultado
+
+    def linha(self) -> str:
+        """Linha da tabela de resultados."""
+        status = str(self.status_code) if self.status_code is not None else "-"
+        tempo = f"{self.tempo_ms:.0f}" if self.tempo_ms is not None else "-"
+        if self.certificado:
+            tls = self.certificado.resumo()
+        else:
+            tls = "-" if not self.https else "não verificado"
+        observacoes = []
+        if self.erro:
+            observacoes.append(self.erro)
+        if self.redireciona:
+            observacoes.append(f"redireciona para {self.url_final}")
+        ausentes = [h for h, v in self.headers_seguranca.items() if not v]
+        if ausentes:
+            observacoes.append(f"headers ausentes: {', '.join(ausentes)}")
+        if self.do_cache:
+            observacoes.append("cache")
+        return f"| {self.url} | {status} | {tempo} | {tls} | {'; '.join(observacoes)} |"
+
+
+CABECALHO_TABELA = "| URL | Status | Tempo (ms) | TLS | Observações |\n|---|---|---|---|---|"
+
+
+def _nome_emissor(certificado: Dict[str, Any]) -> Optional[str]:
+    campos = dict(item for rdn in certificado.get("issuer", ()) for item in rdn)
+    return campos.get("organizationName") or campos.get("commonName")
+
+
+class VerificadorURLs:
+    """Verifica URLs (HEAD) e certificados TLS em paralelo."""
+
+    def __init__(
+        self,
+        coletor: Optional[ColetorWeb] = None,
+        max_concorrentes: int = 32,
+        timeout: float = 10,
+        ttl: float = 300,
+        contexto_ssl: Optional[ssl.SSLContext] = None,
+        cache: Optional[CacheResultados] = None
+    ):
+        """
+        Inicializa o verificador.
+
+        Args:
+            coletor: Coletor web cuja sessão e loop são usados (padrão: o global)
+            max_concorrentes: URLs verificadas ao mesmo tempo
+            timeout: Timeout de cada requisição e de cada handshake TLS
+            ttl: Validade dos resultados em cache, em segundos
+            contexto_ssl: Contexto TLS (padrão: o do sistema, que valida a cadeia)
+            cache: Cache dos resultados (padrão: o do módulo)
+        """
+        self.coletor = coletor or obter_coletor()
+        self.max_concorrentes = max_concorrentes
+        self.timeout = timeout
+        self.ttl = ttl
+        self.contexto_ssl = contexto_ssl or ssl.create_default_context()
+        self.cache = cache if cache is not None else _resultados
+        # Handshakes em andamento por (host, porta): URLs do mesmo host esperam o mesmo
+        self._certificados: Dict[Tuple[str, int], asyncio.Task] = {}
+
+    async def _buscar_certificado(self, host: str, porta: int) -> CertificadoTLS:
+        try:
+            _, escritor = await asyncio.wait_for(
+                asyncio.open_connection(host, porta, ssl=self.contexto_ssl, server_hostname=host), self.timeout
+            )
+        except ssl.SSLCertVerificationError as e:
+            return CertificadoTLS(host, porta, False, erro=e.verify_message or str(e))
+        except (OSError, asyncio.TimeoutError, ssl.SSLError) as e:
+            return CertificadoTLS(host, porta, False, erro=str(e) or type(e).__name__)
+        try:
+            certificado = escritor.get_extra_info("peercert") or {}
+            objeto_ssl = escritor.get_extra_info("ssl_object")
+            expira = ssl.cert_time_to_seconds(certificado["notAfter"]) if "notAfter" in certificado else None
+            return CertificadoTLS(
+                host, porta, True,
+                valido_ate=certificado.get("notAfter"),
+                dias_restantes=int((expira - time.time()) // 86400) if expira else None,
+                emissor=_nome_emissor(certificado),
+                versao_tls=objeto_ssl.version() if objeto_ssl else None
+            )
+        finally:
+            escritor.close()
+            with contextlib.suppress(Exception):
+                await escritor.wait_closed()
+
+    async def certificado(self, host: str, porta: int = 443) -> CertificadoTLS:
+        """Certificado do host (do cache, de um handshake em andamento ou de um novo)."""
+        chave = CacheResultados.chave("certificado_tls", {"host": host, "porta": porta})
+        encontrado, valor = self.cache.obter(chave, "certificado_tls")
+        if encontrado:
+            return valor
+        tarefa = self._certificados.get((host, porta))
+        if tarefa is None:
+            tarefa = asyncio.ensure_future(self._buscar_certificado(host, porta))
+            self._certificados[(host, porta)] = tarefa
+            tarefa.add_done_callback(lambda _: self._certificados.pop((host, porta), None))
+        resultado = await asyncio.shield(tarefa)
+        self.cache.guardar(chave, "certificado_tls", resultado, ttl=self.ttl)
+        return resultado
+
+    async def _requisitar(self, sessao: Any, url: str, cabecalhos: bool) -> VerificacaoURL:
+        resultado = VerificacaoURL(url)
+        opcoes: Dict[str, Any] = {
+            "allow_redirects": True, "timeout": aiohttp.ClientTimeout(total=self.timeout), "ssl": self.contexto_ssl
+        }
+        inicio = time.perf_counter()
+        async with self.coletor.limitador.reservar(urlsplit(url).netloc):
+            async with sessao.head(url, **opcoes) as resposta:
+                if resposta.status in (405, 501):
+                    # Servidor sem suporte a HEAD: GET sem ler o corpo
+                    resposta = await sessao.get(url, **opcoes)
+                    resposta.release()
+                resultado.tempo_ms = (time.perf_counter() - inicio) * 1000
+                resultado.status_code = resposta.status
+                resultado.acessivel = resposta.status < 400
+                resultado.redireciona = bool(resposta.history)
+                resultado.url_final = str(resposta.url)
+                if cabecalhos:
+                    resultado.headers_seguranca = {h: resposta.headers.get(h) for h in HEADERS_SEGURANCA}
+        return resultado
+
+    async def verificar_url(self, url: str, seguranca: bool = False) -> VerificacaoURL:
+        """
+        Verifica uma URL: status (HEAD), redirecionamentos e, se HTTPS, o certificado.
+
+        Args:
+            url: URL a verificar
+            seguranca: Também coleta os headers de segurança
+        """
+        chave = CacheResultados.chave("verificar_url", {"url": url, "seguranca": seguranca})
+        encontrado, valor = self.cache.obter(chave, "verificar_url")
+        if encontrado:
+            return replace(valor, do_cache=True)
+
+        sessao = await self.coletor.obter_sessao()
+        try:
+            resultado = await self._requisitar(sessao, url, seguranca)
+        except asyncio.TimeoutError:
+            resultado = VerificacaoURL(url, erro=f"Timeout após {self.timeout}s")
+        except (aiohttp.ClientError, ValueError) as e:
+            resultado = VerificacaoURL(url, erro=str(e) or type(e).__name__)
+
+        partes = urlsplit(resultado.url_final or url)
+        if partes.scheme == "https" and partes.hostname:
+            resultado.certificado = await self.certificado(partes.hostname, partes.port or 443)
+        self.cache.guardar(chave, "verificar_url", resultado, ttl=self.ttl)
+        return resultado
+
+    async def _lote(self, urls: List[str], seguranca: bool, fila: "queue.Queue") -> None:
+        semaforo = asyncio.Semaphore(self.max_concorrentes)
+
+        async def verificar(url: str) -> None:
+            async with semaforo:
+                try:
+                    fila.put(await self.verificar_url(url, seguranca))
+                except Exception as e:
+                    logger.error(f"Erro ao verificar {url}: {e}")
+                    fila.put(VerificacaoURL(url, erro=str(e)))
+
+        try:
+            # URLs repetidas são verificadas uma vez
+            await asyncio.gather(*(verificar(url) for url in dict.fromkeys(urls)))
+        finally:
+            fila.put(_FIM)
+
+    def verificar(self, urls: List[str], seguranca: bool = False) -> Iterator[VerificacaoURL]:
+        """
+        Verifica as URLs em paralelo, entregando cada resultado assim que fica pronto.
+
+        Interromper a iteração cancela as verificações pendentes.
+        """
+        fila: "queue.Queue" = queue.Queue()
+        futuro = self.coletor.agendar(self._lote(list(urls), seguranca, fila))
+        try:
+            while True:
+                item = fila.get()
+                if item is _FIM:
+                    break
+                yield item
+            futuro.result()
+        finally:
+            futuro.cancel()
+
+
+def obter_verificador() -> VerificadorURLs:
+    """Verificador com a configuração atual, sobre o coletor web global."""
+    return VerificadorURLs(
+        max_concorrentes=_config["max_concorrentes"], timeout=_config["timeout"], ttl=_config["ttl"]
+    )
+
+
+def verificar_urls(
+    urls: List[str],
+    seguranca: bool = False,
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Verifica uma lista de URLs em paralelo (status, redirecionamentos e certificado TLS).
+
+    Args:
+        urls: URLs a verificar
+        seguranca: Também verifica os headers de segurança de cada resposta
+        mcp_client: Instância do MCPClient para delegar a tarefa
+
+    Returns:
+        Tabela com uma linha por URL, na ordem em que as verificações terminaram
+    """
+    if mcp_client:
+        logger.info(f"Delegando verificar_urls para MCP Server ({len(urls)} URLs)")
+        tarefa_execucao = {
+            "tipo": "executar_ferramenta",
+            "nome_ferramenta": "verificar_urls",
+            "parametros": {"urls": urls, "seguranca": seguranca}
+        }
+        resultado = mcp_client.distribuir_tarefa(tarefa=json.dumps(tarefa_execucao), agente_id="Agente Local")
+        return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+    if isinstance(urls, str):
+        urls = [urls]
+    linhas = [CABECALHO_TABELA]
+    acessiveis = 0
+    for resultado in obter_verificador().verificar(urls, seguranca):
+        linhas.append(resultado.linha())
+        acessiveis += resultado.acessivel
+    linhas.append(f"\n{acessiveis} de {len(linhas) - 1} URL(s) acessível(is).")
+    return "\n".join(linhas)
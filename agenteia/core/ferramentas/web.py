@@ -2,12 +2,11 @@
 Ferramentas para pesquisa na web
 """
 
-import requests
 import json # Manter caso outras funções o usem
 from typing import Dict, List, Optional, Any
-from bs4 import BeautifulSoup # Manter caso outras funções o usem
-from duckduckgo_search import DDGS
 from ..exceptions import WebError
+from .coleta_web import obter_coletor, pesquisar
+from .verificacao_lote import obter_verificador
 from ...core.logs import setup_logging
 from ..mcp_client import MCPClient # Importar MCPClient
 from pydantic import BaseModel, Field # Importar BaseModel e Field para PesquisarWebArgs
@@ -45,9 +44,8 @@ def pesquisar_web(mcp_client: Optional[Any] = None, query: str = "", max_resulta
             except Exception as e:
                 logger.warning(f"Falha ao usar MCP Server, usando implementação local: {e}")
         
-        # Implementação local usando DuckDuckGo
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_resultados))
+        # Implementação local usando DuckDuckGo (sessão compartilhada entre pesquisas)
+        results = pesquisar(query, max_resultados)
             
         if not results:
             return "Nenhum resultado encontrado."
@@ -57,7 +55,7 @@ def pesquisar_web(mcp_client: Optional[Any] = None, query: str = "", max_resulta
         for i, result in enumerate(results, 1):
             output.append(f"{i}. {result['title']}")
             output.append(f"   {result['body']}")
-            output.append(f"   Fonte: {result['link']}\n")
+            output.append(f"   Fonte: {result.get('href') or result.get('link')}\n")
             
         return "\n".join(output)
         
@@ -93,56 +91,81 @@ def extrair_texto(url: str,
             )
             return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
 
-        # Faz requisição
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # Extrai texto
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove scripts e estilos
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Extrai texto
-        texto = soup.get_text()
-        
-        # Limpa texto
-        linhas = (linha.strip() for linha in texto.splitlines())
-        chunks = (frase.strip() for linha in linhas for frase in linha.split("  "))
-        texto = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return texto
-        
-    except requests.exceptions.RequestException as e:
+        # Requisição condicional (ETag/Last-Modified) se a página está no cache em disco
+        resposta = obter_coletor().extrair_lote([url])[0]
+        if not resposta.ok:
+            logger.error(f"Erro ao extrair texto: {resposta.erro}")
+            raise WebError(f"Erro ao extrair texto: {resposta.erro}")
+        return resposta.texto
+
+    except WebError:
+        raise
+    except Exception as e:
         logger.error(f"Erro ao extrair texto: {str(e)}")
         raise WebError(f"Erro ao extrair texto: {str(e)}")
 
+def extrair_textos(urls: List[str],
+    max_caracteres: Optional[int] = 4000,
+    mcp_client: Optional[Any] = None
+) -> str:
+    """
+    Extrai o texto de várias páginas web em paralelo.
+    
+    Args:
+        urls: URLs das páginas
+        max_caracteres: Limite de caracteres por página (None para o texto completo)
+        mcp_client: Instância do MCPClient para delegar a tarefa
+        
+    Returns:
+        Texto de cada página, precedido da URL; falhas são indicadas por página
+    """
+    try:
+        if mcp_client:
+            logger.info(f"Delegando extrair_textos para MCP Server ({len(urls)} URLs)")
+            tarefa_execucao = {
+                "tipo": "executar_ferramenta",
+                "nome_ferramenta": "extrair_textos",
+                "parametros": {"urls": urls, "max_caracteres": max_caracteres}
+            }
+            resultado = mcp_client.distribuir_tarefa(
+                tarefa=json.dumps(tarefa_execucao),
+                agente_id="Agente Local"
+            )
+            return resultado.get("resultado", "Erro: Resultado vazio do MCP Server.")
+
+        if isinstance(urls, str):
+            urls = [urls]
+        secoes = []
+        for resposta in obter_coletor().extrair_lote(urls):
+            if not resposta.ok:
+                secoes.append(f"## {resposta.url}\nErro: {resposta.erro}")
+                continue
+            texto = resposta.texto
+            if max_caracteres and len(texto) > max_caracteres:
+                texto = texto[:max_caracteres] + f"\n[... {len(texto) - max_caracteres} caracteres omitidos]"
+            secoes.append(f"## {resposta.url}\n{texto}")
+        return "\n\n".join(secoes)
+        
+    except Exception as e:
+        logger.error(f"Erro ao extrair textos: {str(e)}")
+        raise WebError(f"Erro ao extrair textos: {str(e)}")
+
 def verificar_url(url: str) -> Dict[str, bool]:
     """
     Verifica se uma URL está acessível.
     
+    Para listas de URLs, use ``verificar_urls`` (verificação em paralelo).
+    
     Args:
         url: URL para verificar
         
     Returns:
         Dicionário com status da verificação
     """
-    try:
-        # Faz requisição
-        response = requests.head(url, timeout=5, allow_redirects=True)
-        
-        return {
-            "acessivel": response.status_code == 200,
-            "redireciona": len(response.history) > 0,
-            "https": url.startswith("https://"),
-            "status_code": response.status_code
-        }
-        
-    except requests.exceptions.RequestException:
-        return {
-            "acessivel": False,
-            "redireciona": False,
-            "https": url.startswith("https://"),
-            "status_code": None
-        } 
\ No newline at end of file
+    resultado = list(obter_verificador().verificar([url]))[0]
+    return {
+        "acessivel": resultado.status_code == 200,
+        "redireciona": resultado.redireciona,
+        "https": url.startswith("https://"),
+        "status_code": resultado.status_code
+    }
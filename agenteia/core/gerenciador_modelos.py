@@ -6,12 +6,15 @@ import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
 from langchain_ollama import ChatOllama
-from langchain_openai import ChatOpenAI
 import json
 
 from ..config import CONFIG
 from .logs import setup_logging
 from .exceptions import AgenteError
+from .carregamento import ImportacaoTardia
+
+# langchain_openai só é importado quando o OpenRouter é usado
+ChatOpenAI = ImportacaoTardia("langchain_openai", "ChatOpenAI")
 
 logger = setup_logging(__name__)
 
@@ -1,55 +1,280 @@
 """
 Módulo para configuração de logging.
+
+Todos os loggers criados por ``setup_logging`` compartilham um único
+``QueueHandler``: a thread da requisição só enfileira o registro, e uma única
+thread (``QueueListener``) escreve nos arquivos rotativos e no console. Depois
+de ``parar_logging`` (ex.: no encerramento) os loggers passam a escrever de
+forma síncrona, sem perder registros.
 """
 
 import os
+import atexit
 import logging
+import queue
+import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+FORMATO = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Configuração efetiva (sobrescrita por configurar_logging)
+_config: Dict[str, Any] = {
+    "nivel": "INFO",
+    "niveis": {},
+    "diretorio": "logs",
+    "max_bytes": 10 * 1024 * 1024,  # 10MB
+    "backup_count": 5,
+    "console": True,
+    "max_caracteres": 4000,
+    "tamanho_fila": 10000,
+}
+
+_lock = threading.Lock()
+_fila: Optional[queue.Queue] = None
+# Handler instalado nos loggers configurados: o QueueHandler ou, após parar_logging, um _HandlerSincrono
+_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+
+
+def resumir(valor: Any, max_caracteres: int = 500) -> str:
+    """
+    Gera uma representação curta de um valor grande (prompt, histórico, config) para log.
+
+    Args:
+        valor: Valor a ser resumido
+        max_caracteres: Tamanho máximo do texto retornado (sem o sufixo)
+
+    Returns:
+        Texto truncado, com a quantidade de caracteres omitidos
+    """
+    if isinstance(valor, dict):
+        texto = f"dict({len(valor)} chaves: {', '.join(map(str, list(valor)[:20]))}) {valor!r}"
+    elif isinstance(valor, (list, tuple)):
+        texto = f"{type(valor).__name__}({len(valor)} itens) {valor!r}"
+    else:
+        texto = valor if isinstance(valor, str) else repr(valor)
+    if len(texto) <= max_caracteres:
+        return texto
+    return f"{texto[:max_caracteres]}... [+{len(texto) - max_caracteres} caracteres]"
+
+
+class _QueueHandlerDescartavel(QueueHandler):
+    """QueueHandler barato para a thread da requisição.
+
+    Formata a mensagem uma única vez (truncando-a se passar de
+    ``max_caracteres``) e descarta o registro se a fila estiver cheia, em vez
+    de bloquear quem está logando.
+    """
+
+    descartados = 0
+
+    def __init__(self, fila: queue.Queue, max_caracteres: int = 0):
+        super().__init__(fila)
+        self.max_caracteres = max_caracteres
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        mensagem = record.getMessage()
+        if self.max_caracteres and len(mensagem) > self.max_caracteres:
+            mensagem = f"{mensagem[:self.max_caracteres]}... [+{len(mensagem) - self.max_caracteres} caracteres]"
+        # Mantém exc_info: a formatação do traceback fica para a thread de escrita
+        record.msg = mensagem
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _QueueHandlerDescartavel.descartados += 1
+
+
+class _HandlerPorModulo(logging.Handler):
+    """Escreve cada registro em ``logs/<logger>.log``, executado na thread do listener."""
+
+    def __init__(self, diretorio: str, max_bytes: int, backup_count: int):
+        super().__init__()
+        self.diretorio = Path(diretorio)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._arquivos: Dict[str, RotatingFileHandler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self._arquivos.get(record.name)
+        if handler is None:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.diretorio / f"{record.name}.log",
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding="utf-8"
+            )
+            handler.setFormatter(self.formatter)
+            self._arquivos[record.name] = handler
+        handler.emit(record)
+
+    def close(self) -> None:
+        for handler in self._arquivos.values():
+            handler.close()
+        self._arquivos.clear()
+        super().close()
+
+
+class _HandlerSincrono(logging.Handler):
+    """Escreve direto nos handlers de saída; usado quando a thread de escrita está parada."""
+
+    def __init__(self, handlers: List[logging.Handler]):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def close(self) -> None:
+        for handler in self.handlers:
+            handler.close()
+        super().close()
+
+
+def _criar_handlers() -> List[logging.Handler]:
+    """Handlers de saída (arquivo por módulo e, opcionalmente, console)."""
+    formato = logging.Formatter(FORMATO)
+    handlers = [_HandlerPorModulo(_config["diretorio"], _config["max_bytes"], _config["backup_count"])]
+    if _config["console"]:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formato)
+    return handlers
+
+
+def _instalar(novo: logging.Handler) -> None:
+    """Troca o handler de todos os loggers configurados pelo novo. Chamada com _lock."""
+    global _handler
+    antigo, _handler = _handler, novo
+    for logger in _loggers_configurados():
+        if antigo is not None:
+            logger.removeHandler(antigo)
+        logger.addHandler(novo)
+    if isinstance(antigo, _HandlerSincrono):
+        antigo.close()
+
+
+def _iniciar_pipeline() -> None:
+    """Cria a fila e o QueueHandler compartilhado, inicia a thread de escrita e o instala. Chamada com _lock."""
+    global _fila, _listener
+
+    _fila = queue.Queue(maxsize=_config["tamanho_fila"])
+    _listener = QueueListener(_fila, *_criar_handlers(), respect_handler_level=True)
+    _listener.start()
+    _instalar(_QueueHandlerDescartavel(_fila, _config["max_caracteres"]))
+
+
+def _parar_listener() -> None:
+    """Descarrega a fila e encerra a thread de escrita. Chamada com _lock."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def _nivel_para(nome: str) -> int:
+    """Nível efetivo de um logger: a sobrescrita mais específica por prefixo ou o nível global."""
+    niveis = _config["niveis"]
+    partes = nome.split(".")
+    for i in range(len(partes), 0, -1):
+        prefixo = ".".join(partes[:i])
+        if prefixo in niveis:
+            return logging.getLevelName(str(niveis[prefixo]).upper())
+    return logging.getLevelName(str(_config["nivel"]).upper())
+
+
+def parar_logging() -> None:
+    """
+    Descarrega a fila e encerra a thread de escrita.
+
+    Os loggers já configurados passam a escrever de forma síncrona; o próximo
+    ``configurar_logging`` (ou um novo ``setup_logging``) religa a fila.
+    """
+    with _lock:
+        if _listener is not None:
+            _parar_listener()
+            _instalar(_HandlerSincrono(_criar_handlers()))
+
+
+atexit.register(parar_logging)
+
+
+def configurar_logging(config: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Aplica a seção "logging" da configuração.
+
+    Aceita ``nivel``/``level``, ``niveis`` (sobrescritas por módulo, ex.:
+    ``{"agenteia.core.agente": "DEBUG"}``), ``max_caracteres``, ``console``,
+    ``max_bytes``/``max_size`` e ``backup_count``. A variável de ambiente
+    AGENTEIA_LOG_NIVEIS (``modulo=NIVEL,outro=NIVEL``) complementa ``niveis``.
+
+    Args:
+        config: Seção "logging" do config
+    """
+    config = config or {}
+    with _lock:
+        _config["nivel"] = config.get("nivel", config.get("level", _config["nivel"]))
+        _config["niveis"] = dict(config.get("niveis", _config["niveis"]))
+        _config["max_bytes"] = config.get("max_bytes", config.get("max_size", _config["max_bytes"]))
+        for chave in ("backup_count", "console", "max_caracteres", "diretorio", "tamanho_fila"):
+            if chave in config:
+                _config[chave] = config[chave]
+
+        for item in filter(None, os.getenv("AGENTEIA_LOG_NIVEIS", "").split(",")):
+            if "=" in item:
+                modulo, nivel = item.split("=", 1)
+                _config["niveis"][modulo.strip()] = nivel.strip()
+
+        # Recria o pipeline com os novos handlers, mantendo os loggers já configurados
+        if _handler is not None:
+            _parar_listener()
+            _iniciar_pipeline()
+
+        for logger in _loggers_configurados():
+            logger.setLevel(_nivel_para(logger.name))
+
+
+def _loggers_configurados():
+    """Loggers que usam o pipeline de fila."""
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        if isinstance(logger, logging.Logger) and getattr(logger, "_agenteia_fila", False):
+            yield logger
+
 
 def setup_logging(name: str) -> logging.Logger:
     """
     Configura o logging para um módulo.
-    
+
     Args:
         name: Nome do módulo para o logger
-        
+
     Returns:
         Logger configurado
     """
     # Criar logger
     logger = logging.getLogger(name)
-    
+
     # Se já estiver configurado, retornar
     if logger.handlers:
         return logger
-        
-    # Configurar nível
-    logger.setLevel(logging.INFO)
-    
-    # Criar diretório de logs se não existir
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    # Configurar formato
-    formato = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    
-    # Handler para arquivo
-    arquivo_handler = RotatingFileHandler(
-        log_dir / f"{name}.log",
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    arquivo_handler.setFormatter(formato)
-    
-    # Handler para console
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formato)
-    
-    # Adicionar handlers
-    logger.addHandler(arquivo_handler)
-    logger.addHandler(console_handler)
-    
-    return logger 
\ No newline at end of file
+
+    with _lock:
+        if _listener is None:
+            _iniciar_pipeline()
+
+        # Configurar nível (global ou sobrescrita por módulo)
+        logger.setLevel(_nivel_para(name))
+        logger.addHandler(_handler)
+        logger._agenteia_fila = True
+
+    return logger
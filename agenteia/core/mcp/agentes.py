@@ -11,15 +11,17 @@ import json
 from ..logs import setup_logging
 from ..exceptions import AgenteError
 from .monitor import MonitorProgresso
+from .fila import FilaTarefas
 from ..agente import ProvedorModelo
 
 class GerenciadorAgentes:
     """Gerencia o registro e execução de agentes."""
     
-    def __init__(self, monitor: MonitorProgresso):
+    def __init__(self, monitor: MonitorProgresso, fila: Optional[FilaTarefas] = None):
         """Inicializa o gerenciador de agentes."""
         self.logger = setup_logging(__name__)
         self.monitor = monitor
+        self.fila = fila
         self._agentes: Dict[str, Dict[str, Any]] = {}
         self._historico_tarefas: Dict[str, List[Dict[str, Any]]] = {}
         
@@ -135,6 +137,21 @@ class GerenciadorAgentes:
                 
             raise AgenteError(f"Falha ao distribuir tarefa: {e}")
             
+    def enfileirar_tarefa(self, payload: Dict[str, Any], max_tentativas: Optional[int] = None) -> str:
+        """Envia uma tarefa para a fila persistente, para execução por um worker."""
+        if self.fila is None:
+            raise AgenteError("Fila de tarefas não configurada")
+
+        tarefa_id = self.fila.enfileirar(payload, max_tentativas=max_tentativas)
+        self.logger.info(f"Tarefa {tarefa_id} enfileirada: {payload.get('tipo')}")
+        return tarefa_id
+
+    def obter_tarefa(self, tarefa_id: str) -> Optional[Dict[str, Any]]:
+        """Consulta o estado de uma tarefa enfileirada."""
+        if self.fila is None:
+            raise AgenteError("Fila de tarefas não configurada")
+        return self.fila.obter(tarefa_id)
+
     def _selecionar_agente(self, tarefa: str) -> Dict[str, Any]:
         """Seleciona o agente mais adequado para uma tarefa."""
         # Implementar lógica de seleção baseada em especialidades
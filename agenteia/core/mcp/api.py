@@ -3,24 +3,32 @@ Interface web do MCP Server usando FastAPI.
 """
 
 from typing import Dict, Any, Optional, List
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
-import psutil
-import requests
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import json
 
 from .server import MCPServer
-from ..ferramentas import listar_arquivos, ler_arquivo, escrever_arquivo, criar_diretorio, copiar_arquivo, mover_arquivo, remover_arquivo, remover_diretorio, executar_comando, pesquisar_web
-from ..ferramentas.documentos import criar_documento_word, criar_curriculo, criar_relatorio, converter_para_word
+from .fila import FilaTarefas
+from .worker import carregar_config_mcp, carregar_ferramentas_padrao
+from ..config import CONFIG
+from ..saude import monitor_saude, sonda_ollama
+from ..amostrador import obter_amostrador
+from ..metricas import ao_coletar, atualizar_fila, gerar_metricas
+from ..rastreamento import CABECALHO_SPAN, CABECALHO_TRACE, definir_trace_id, restaurar_trace, span
 
 # Modelos Pydantic
 class TarefaRequest(BaseModel):
     """Modelo para requisição de tarefa."""
     tarefa: str
     agente_id: Optional[str] = None
+    assincrono: bool = False
+    
+class ReenfileirarRequest(BaseModel):
+    """Modelo para reenfileiramento de tarefas mortas."""
+    ids: Optional[List[str]] = None
     
 class FerramentaRequest(BaseModel):
     """Modelo para requisição de ferramenta."""
@@ -56,24 +64,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def rastrear_requisicao(request: Request, call_next):
+    """Continua o trace recebido no cabeçalho X-Trace-Id (ou inicia um) e mede a requisição."""
+    tokens = definir_trace_id(request.headers.get(CABECALHO_TRACE), request.headers.get(CABECALHO_SPAN))
+    try:
+        with span(f"{request.method} {request.url.path}", categoria="mcp") as span_requisicao:
+            response = await call_next(request)
+            span_requisicao.atributos["status"] = response.status_code
+        response.headers[CABECALHO_TRACE] = span_requisicao.trace_id
+        return response
+    finally:
+        restaurar_trace(tokens)
+
 # Inicializar MCP Server
 mcp = MCPServer()
 
 # Registrar ferramentas no MCP Server
-mcp.registrar_ferramenta("listar_arquivos", listar_arquivos)
-mcp.registrar_ferramenta("ler_arquivo", ler_arquivo)
-mcp.registrar_ferramenta("escrever_arquivo", escrever_arquivo)
-mcp.registrar_ferramenta("criar_diretorio", criar_diretorio)
-mcp.registrar_ferramenta("copiar_arquivo", copiar_arquivo)
-mcp.registrar_ferramenta("mover_arquivo", mover_arquivo)
-mcp.registrar_ferramenta("remover_arquivo", remover_arquivo)
-mcp.registrar_ferramenta("remover_diretorio", remover_diretorio)
-mcp.registrar_ferramenta("executar_comando", executar_comando)
-mcp.registrar_ferramenta("criar_documento_word", criar_documento_word)
-mcp.registrar_ferramenta("criar_curriculo", criar_curriculo)
-mcp.registrar_ferramenta("criar_relatorio", criar_relatorio)
-mcp.registrar_ferramenta("converter_para_word", converter_para_word)
-mcp.registrar_ferramenta("pesquisar_web", pesquisar_web)
+for nome_ferramenta, funcao_ferramenta in carregar_ferramentas_padrao().items():
+    mcp.registrar_ferramenta(nome_ferramenta, funcao_ferramenta)
+
+# Fila persistente consumida pelos workers (run_mcp_worker.py)
+config_mcp = carregar_config_mcp()
+fila = FilaTarefas.de_config(config_mcp)
+ao_coletar(lambda: atualizar_fila(fila.estatisticas()))
+
+# Sondas de saúde executadas em segundo plano; /status apenas lê o cache
+config_saude = config_mcp.get("saude", {})
+monitor_saude.registrar(
+    "ollama",
+    sonda_ollama(CONFIG.get("ollama", {}).get("base_url", "http://localhost:11434"), timeout=config_saude.get("timeout", 3)),
+    intervalo=config_saude.get("intervalo_ollama", 15),
+    timeout=config_saude.get("timeout", 3)
+)
+
+# Amostragem de CPU/memória/disco/rede em segundo plano, compartilhada por /status e /metricas
+# (a thread só é iniciada no startup da aplicação, não na importação)
+config_amostrador = config_mcp.get("amostrador", {})
+amostrador = obter_amostrador(
+    iniciar=False,
+    intervalo=config_amostrador.get("intervalo", 5),
+    capacidade=config_amostrador.get("capacidade", 720),
+    top_n=config_amostrador.get("top_processos", 5)
+)
+
+@app.on_event("startup")
+async def iniciar_monitor_saude():
+    """Inicia as verificações de saúde e a amostragem do sistema em segundo plano."""
+    monitor_saude.iniciar()
+    amostrador.iniciar()
+
+@app.on_event("shutdown")
+async def parar_monitor_saude():
+    """Interrompe as verificações de saúde."""
+    monitor_saude.parar()
+    amostrador.parar()
 
 # Rotas
 @app.get("/")
@@ -83,28 +128,18 @@ async def root():
 
 @app.get("/status")
 async def obter_status():
-    """Obtém o status do sistema."""
-    try:
-        # Verificar status do Ollama
-        try:
-            response = requests.get("http://localhost:11434/api/version")
-            ollama_online = response.status_code == 200
-        except:
-            ollama_online = False
-            
-        # Obter métricas do sistema
-        cpu_uso = psutil.cpu_percent()
-        memoria_uso = psutil.virtual_memory().percent
-        disco_uso = psutil.disk_usage('/').percent
-        
-        return {
-            "ollama_online": ollama_online,
-            "cpu_uso": cpu_uso,
-            "memoria_uso": memoria_uso,
-            "disco_uso": disco_uso
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Obtém o status do sistema a partir do último snapshot das sondas de saúde."""
+    ollama = monitor_saude.obter("ollama")
+    amostra = amostrador.ultimo()
+
+    return {
+        "ollama_online": bool(ollama["valor"]) and ollama["erro"] is None,
+        "cpu_uso": amostra["cpu_percent"],
+        "memoria_uso": amostra["memoria_percent"],
+        "disco_uso": amostra["disco_percent"],
+        "amostrado_em": amostra["timestamp"],
+        "verificacoes": monitor_saude.snapshot()
+    }
 
 @app.post("/agentes/{nome}")
 async def registrar_agente(nome: str, agente_info: AgenteInfo):
@@ -153,9 +188,26 @@ async def distribuir_tarefa(request: TarefaRequest):
                 if not nome_ferramenta:
                     raise ValueError("Nome da ferramenta não especificado na tarefa de execução.")
                     
+                # Execução assíncrona: a tarefa vai para a fila e é executada por um worker
+                if request.assincrono:
+                    tarefa_id = fila.enfileirar(tarefa_data)
+                    mcp.logger.info(f"Tarefa '{nome_ferramenta}' enfileirada com id {tarefa_id}")
+                    return JSONResponse(status_code=202, content={"tarefa_id": tarefa_id, "status": "pendente"})
+                    
                 # Chamar o método executar_ferramenta do MCP Server
                 mcp.logger.info(f"Encaminhando execução da ferramenta '{nome_ferramenta}' para mcp.executar_ferramenta com parâmetros: {parametros}")
-                resultado_execucao = mcp.executar_ferramenta(nome_ferramenta, **parametros)
+                # Continua o trace de quem enviou a tarefa (o mesmo campo usado pelos workers da fila)
+                trace = tarefa_data.get("trace") or {}
+                tokens = (
+                    definir_trace_id(trace[CABECALHO_TRACE], trace.get(CABECALHO_SPAN))
+                    if trace.get(CABECALHO_TRACE) else None
+                )
+                try:
+                    with span(f"ferramenta.{nome_ferramenta}", categoria="ferramenta"):
+                        resultado_execucao = mcp.executar_ferramenta(nome_ferramenta, **parametros)
+                finally:
+                    if tokens is not None:
+                        restaurar_trace(tokens)
                 mcp.logger.info(f"Execução via mcp.executar_ferramenta concluída. Resultado: {resultado_execucao}")
                 
                 return {"resultado": resultado_execucao} # Retorna o resultado da execução da ferramenta
@@ -184,6 +236,29 @@ async def distribuir_tarefa(request: TarefaRequest):
         mcp.logger.error(f"Erro inesperado na rota /tarefas: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erro interno do servidor ao processar tarefa: {str(e)}")
 
+@app.get("/tarefas/{tarefa_id}")
+async def obter_tarefa(tarefa_id: str):
+    """Obtém o estado e o resultado de uma tarefa enfileirada."""
+    tarefa = fila.obter(tarefa_id)
+    if tarefa is None:
+        raise HTTPException(status_code=404, detail=f"Tarefa {tarefa_id} não encontrada")
+    return tarefa
+
+@app.get("/fila")
+async def obter_estatisticas_fila():
+    """Obtém profundidade, tarefas em execução e mortas da fila."""
+    return fila.estatisticas()
+
+@app.get("/fila/mortas")
+async def listar_tarefas_mortas(limite: int = 100):
+    """Lista as tarefas que esgotaram as tentativas."""
+    return fila.listar_mortas(limite)
+
+@app.post("/fila/mortas/reenfileirar")
+async def reenfileirar_tarefas_mortas(request: ReenfileirarRequest):
+    """Devolve tarefas mortas para a fila."""
+    return {"reenfileiradas": fila.reenfileirar_mortas(request.ids)}
+
 @app.get("/ferramentas")
 async def listar_ferramentas_mcp():
     """Lista todas as ferramentas registradas no MCP Server."""
@@ -214,9 +289,19 @@ async def executar_ferramenta(nome: str, request: FerramentaRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/metricas")
-async def obter_metricas():
-    """Obtém métricas do sistema."""
-    return mcp.monitorar_recursos()
+async def obter_metricas(janela: Optional[int] = None):
+    """Obtém métricas do sistema, incluindo as séries do amostrador (opcionalmente limitadas a uma janela em segundos)."""
+    return {
+        **mcp.monitorar_recursos(),
+        "serie": amostrador.serie(janela),
+        "agregado": amostrador.janela(janela) if janela else None
+    }
+
+@app.get("/metrics")
+async def exportar_metricas():
+    """Exporta as métricas no formato Prometheus."""
+    conteudo, tipo = gerar_metricas()
+    return Response(content=conteudo, media_type=tipo)
 
 @app.get("/relatorio")
 async def gerar_relatorio():
@@ -0,0 +1,355 @@
+"""
+Fila de tarefas persistente do MCP Server.
+
+As tarefas são gravadas em um banco SQLite local, de modo que sobrevivem a
+reinícios do servidor e podem ser consumidas por vários processos worker ao
+mesmo tempo. Cada tarefa reservada fica invisível para os demais workers
+durante um tempo de visibilidade; se o worker morrer sem concluir, a tarefa
+volta a ficar disponível. Tarefas que esgotam as tentativas vão para a fila
+de mortas (dead-letter) para inspeção manual.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..logs import setup_logging
+
+logger = setup_logging(__name__)
+
+# Status possíveis de uma tarefa na fila
+STATUS_PENDENTE = "pendente"
+STATUS_EM_EXECUCAO = "em_execucao"
+STATUS_CONCLUIDA = "concluida"
+STATUS_MORTA = "morta"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tarefas (
+    id TEXT PRIMARY KEY,
+    fila TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    max_tentativas INTEGER NOT NULL,
+    visivel_em REAL NOT NULL,
+    criada_em REAL NOT NULL,
+    atualizada_em REAL NOT NULL,
+    worker TEXT,
+    resultado TEXT,
+    erro TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tarefas_disponiveis ON tarefas (fila, status, visivel_em);
+"""
+
+
+class FilaTarefas:
+    """Fila de tarefas durável com timeout de visibilidade, retentativas e dead-letter."""
+
+    def __init__(
+        self,
+        caminho: str = "data/mcp_fila.db",
+        visibilidade_segundos: float = 300.0,
+        max_tentativas: int = 3,
+        atraso_retry: float = 1.0,
+        fila: str = "padrao"
+    ):
+        """
+        Inicializa a fila.
+
+        Args:
+            caminho: Caminho do arquivo SQLite
+            visibilidade_segundos: Tempo que uma tarefa reservada fica invisível para outros workers
+            max_tentativas: Número máximo de execuções antes de ir para a fila de mortas
+            atraso_retry: Atraso base (segundos) antes de uma nova tentativa; dobra a cada falha
+            fila: Nome lógico da fila dentro do banco
+        """
+        self.caminho = str(caminho)
+        self.visibilidade_segundos = visibilidade_segundos
+        self.max_tentativas = max_tentativas
+        self.atraso_retry = atraso_retry
+        self.fila = fila
+        self._local = threading.local()
+
+        if self.caminho != ":memory:":
+            Path(self.caminho).parent.mkdir(parents=True, exist_ok=True)
+        self._conexao().executescript(_SCHEMA)
+
+    @classmethod
+    def de_config(cls, config_mcp: Dict[str, Any]) -> "FilaTarefas":
+        """Cria a fila a partir da seção "mcp" do config.json do MCP Server."""
+        config_fila = config_mcp.get("fila", {})
+        retry = config_mcp.get("retry", {})
+        return cls(
+            caminho=config_fila.get("caminho", "data/mcp_fila.db"),
+            visibilidade_segundos=config_fila.get("visibilidade_segundos", 300),
+            max_tentativas=config_fila.get("max_tentativas", retry.get("max_tentativas", 3)),
+            atraso_retry=config_fila.get("atraso_retry", retry.get("intervalo_retry", 1)),
+            fila=config_fila.get("nome", "padrao")
+        )
+
+    def _conexao(self) -> sqlite3.Connection:
+        """Retorna a conexão SQLite da thread atual (sqlite3 não compartilha conexões entre threads)."""
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.row_factory = sqlite3.Row
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.execute("PRAGMA busy_timeout=30000")
+            self._local.conexao = conexao
+        return conexao
+
+    def fechar(self) -> None:
+        """Fecha a conexão da thread atual."""
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is not None:
+            conexao.close()
+            self._local.conexao = None
+
+    def enfileirar(
+        self,
+        payload: Dict[str, Any],
+        max_tentativas: Optional[int] = None,
+        atraso_segundos: float = 0.0,
+        tarefa_id: Optional[str] = None
+    ) -> str:
+        """
+        Adiciona uma tarefa à fila.
+
+        Args:
+            payload: Conteúdo da tarefa (precisa ser serializável em JSON)
+            max_tentativas: Sobrescreve o limite de tentativas da fila
+            atraso_segundos: Atraso antes da tarefa ficar visível
+            tarefa_id: ID explícito (gerado se omitido)
+
+        Returns:
+            ID da tarefa
+        """
+        tarefa_id = tarefa_id or str(uuid.uuid4())
+        agora = time.time()
+        self._conexao().execute(
+            "INSERT INTO tarefas (id, fila, payload, status, tentativas, max_tentativas, visivel_em, criada_em, atualizada_em) "
+            "VALUES (?, ?, ?, ?, 0, ?, ?, ?, ?)",
+            (
+                tarefa_id,
+                self.fila,
+                json.dumps(payload, ensure_ascii=False),
+                STATUS_PENDENTE,
+                max_tentativas or self.max_tentativas,
+                agora + atraso_segundos,
+                agora,
+                agora
+            )
+        )
+        logger.debug(f"Tarefa {tarefa_id} enfileirada na fila '{self.fila}'")
+        return tarefa_id
+
+    def reservar(self, worker_id: str, visibilidade_segundos: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Reserva a próxima tarefa disponível para um worker.
+
+        Tarefas em execução cuja visibilidade expirou (worker morto ou travado)
+        são entregues novamente; se já esgotaram as tentativas, vão para a fila
+        de mortas.
+
+        Args:
+            worker_id: Identificador do worker
+            visibilidade_segundos: Sobrescreve o timeout de visibilidade padrão
+
+        Returns:
+            Dicionário da tarefa reservada ou None se a fila estiver vazia
+        """
+        visibilidade = visibilidade_segundos or self.visibilidade_segundos
+        conexao = self._conexao()
+        agora = time.time()
+
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                linha = conexao.execute(
+                    "SELECT * FROM tarefas WHERE fila = ? AND status IN (?, ?) AND visivel_em <= ? "
+                    "ORDER BY visivel_em LIMIT 1",
+                    (self.fila, STATUS_PENDENTE, STATUS_EM_EXECUCAO, agora)
+                ).fetchone()
+                if linha is None:
+                    conexao.execute("COMMIT")
+                    return None
+
+                if linha["tentativas"] >= linha["max_tentativas"]:
+                    # Só chega aqui uma tarefa em execução cujo worker não respondeu a tempo
+                    conexao.execute(
+                        "UPDATE tarefas SET status = ?, erro = ?, atualizada_em = ? WHERE id = ?",
+                        (
+                            STATUS_MORTA,
+                            f"Visibilidade expirada após {linha['tentativas']} tentativa(s) (worker: {linha['worker']})",
+                            agora,
+                            linha["id"]
+                        )
+                    )
+                    logger.warning(f"Tarefa {linha['id']} movida para a fila de mortas após expirar a visibilidade")
+                    continue
+
+                conexao.execute(
+                    "UPDATE tarefas SET status = ?, tentativas = tentativas + 1, visivel_em = ?, worker = ?, atualizada_em = ? "
+                    "WHERE id = ?",
+                    (STATUS_EM_EXECUCAO, agora + visibilidade, worker_id, agora, linha["id"])
+                )
+                conexao.execute("COMMIT")
+                break
+        except Exception:
+            conexao.execute("ROLLBACK")
+            raise
+
+        return self.obter(linha["id"])
+
+    def renovar(self, tarefa_id: str, worker_id: str, visibilidade_segundos: Optional[float] = None) -> bool:
+        """Estende a visibilidade de uma tarefa em execução (heartbeat do worker)."""
+        agora = time.time()
+        cursor = self._conexao().execute(
+            "UPDATE tarefas SET visivel_em = ?, atualizada_em = ? WHERE id = ? AND status = ? AND worker = ?",
+            (agora + (visibilidade_segundos or self.visibilidade_segundos), agora, tarefa_id, STATUS_EM_EXECUCAO, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def concluir(self, tarefa_id: str, resultado: Any, worker_id: Optional[str] = None) -> bool:
+        """
+        Marca uma tarefa como concluída e grava o resultado.
+
+        Returns:
+            False se a tarefa não estava mais reservada por este worker
+            (por exemplo, a visibilidade expirou e outro worker a assumiu)
+        """
+        return self._finalizar(
+            tarefa_id,
+            worker_id,
+            "status = ?, resultado = ?, erro = NULL",
+            (STATUS_CONCLUIDA, json.dumps(resultado, ensure_ascii=False, default=str))
+        )
+
+    def falhar(self, tarefa_id: str, erro: str, worker_id: Optional[str] = None) -> bool:
+        """
+        Registra a falha de uma execução.
+
+        A tarefa volta para a fila com backoff exponencial ou, se esgotou as
+        tentativas, vai para a fila de mortas.
+        """
+        tarefa = self.obter(tarefa_id)
+        if tarefa is None:
+            return False
+
+        if tarefa["tentativas"] >= tarefa["max_tentativas"]:
+            logger.warning(f"Tarefa {tarefa_id} movida para a fila de mortas: {erro}")
+            return self._finalizar(tarefa_id, worker_id, "status = ?, erro = ?", (STATUS_MORTA, erro))
+
+        atraso = self.atraso_retry * (2 ** max(0, tarefa["tentativas"] - 1))
+        return self._finalizar(
+            tarefa_id,
+            worker_id,
+            "status = ?, erro = ?, visivel_em = ?",
+            (STATUS_PENDENTE, erro, time.time() + atraso)
+        )
+
+    def _finalizar(self, tarefa_id: str, worker_id: Optional[str], campos: str, valores: tuple) -> bool:
+        """Atualiza uma tarefa em execução, opcionalmente exigindo que pertença ao worker."""
+        sql = f"UPDATE tarefas SET {campos}, atualizada_em = ? WHERE id = ? AND status = ?"
+        parametros = [*valores, time.time(), tarefa_id, STATUS_EM_EXECUCAO]
+        if worker_id is not None:
+            sql += " AND worker = ?"
+            parametros.append(worker_id)
+        cursor = self._conexao().execute(sql, parametros)
+        if cursor.rowcount != 1:
+            logger.warning(f"Tarefa {tarefa_id} não está mais reservada por {worker_id}; atualização ignorada")
+            return False
+        return True
+
+    def obter(self, tarefa_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna os dados de uma tarefa ou None se não existir."""
+        linha = self._conexao().execute("SELECT * FROM tarefas WHERE id = ?", (tarefa_id,)).fetchone()
+        return self._linha_para_dict(linha) if linha else None
+
+    def listar_mortas(self, limite: int = 100) -> List[Dict[str, Any]]:
+        """Lista as tarefas na fila de mortas, das mais recentes para as mais antigas."""
+        linhas = self._conexao().execute(
+            "SELECT * FROM tarefas WHERE fila = ? AND status = ? ORDER BY atualizada_em DESC LIMIT ?",
+            (self.fila, STATUS_MORTA, limite)
+        ).fetchall()
+        return [self._linha_para_dict(linha) for linha in linhas]
+
+    def reenfileirar_mortas(self, ids: Optional[List[str]] = None) -> int:
+        """
+        Devolve tarefas mortas para a fila, zerando as tentativas.
+
+        Args:
+            ids: IDs específicos (todas as mortas se omitido)
+
+        Returns:
+            Número de tarefas reenfileiradas
+        """
+        agora = time.time()
+        sql = "UPDATE tarefas SET status = ?, tentativas = 0, visivel_em = ?, atualizada_em = ?, worker = NULL WHERE fila = ? AND status = ?"
+        parametros: List[Any] = [STATUS_PENDENTE, agora, agora, self.fila, STATUS_MORTA]
+        if ids:
+            sql += f" AND id IN ({','.join('?' for _ in ids)})"
+            parametros.extend(ids)
+        return self._conexao().execute(sql, parametros).rowcount
+
+    def limpar_concluidas(self, mais_antigas_que_segundos: float = 86400) -> int:
+        """Remove tarefas concluídas mais antigas que o limite informado."""
+        limite = time.time() - mais_antigas_que_segundos
+        return self._conexao().execute(
+            "DELETE FROM tarefas WHERE fila = ? AND status = ? AND atualizada_em < ?",
+            (self.fila, STATUS_CONCLUIDA, limite)
+        ).rowcount
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Retorna profundidade e idade da fila, úteis para decisões de autoscaling.
+
+        Returns:
+            Dicionário com contagens por status, profundidade (pendentes + em execução)
+            e idade em segundos da tarefa pendente mais antiga
+        """
+        conexao = self._conexao()
+        agora = time.time()
+        contagens = {
+            STATUS_PENDENTE: 0,
+            STATUS_EM_EXECUCAO: 0,
+            STATUS_CONCLUIDA: 0,
+            STATUS_MORTA: 0
+        }
+        for linha in conexao.execute(
+            "SELECT status, COUNT(*) AS total FROM tarefas WHERE fila = ? GROUP BY status", (self.fila,)
+        ):
+            contagens[linha["status"]] = linha["total"]
+
+        linha = conexao.execute(
+            "SELECT MIN(criada_em) AS mais_antiga, "
+            "SUM(CASE WHEN visivel_em <= ? THEN 1 ELSE 0 END) AS visiveis "
+            "FROM tarefas WHERE fila = ? AND status = ?",
+            (agora, self.fila, STATUS_PENDENTE)
+        ).fetchone()
+
+        return {
+            "fila": self.fila,
+            "pendentes": contagens[STATUS_PENDENTE],
+            "pendentes_visiveis": linha["visiveis"] or 0,
+            "em_execucao": contagens[STATUS_EM_EXECUCAO],
+            "concluidas": contagens[STATUS_CONCLUIDA],
+            "mortas": contagens[STATUS_MORTA],
+            "profundidade": contagens[STATUS_PENDENTE] + contagens[STATUS_EM_EXECUCAO],
+            "idade_mais_antiga_segundos": (agora - linha["mais_antiga"]) if linha["mais_antiga"] else 0.0,
+            "timestamp": agora
+        }
+
+    @staticmethod
+    def _linha_para_dict(linha: sqlite3.Row) -> Dict[str, Any]:
+        """Converte uma linha do banco em dicionário, decodificando os campos JSON."""
+        tarefa = dict(linha)
+        tarefa["payload"] = json.loads(tarefa["payload"])
+        if tarefa.get("resultado") is not None:
+            tarefa["resultado"] = json.loads(tarefa["resultado"])
+        return tarefa
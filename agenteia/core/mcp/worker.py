@@ -0,0 +1,173 @@
+"""
+Worker de execução de tarefas do MCP Server.
+
+Cada worker é um processo independente que retira tarefas da fila persistente
+(ver ``fila.py``), executa a ferramenta pedida e grava o resultado de volta.
+Vários workers podem consumir a mesma fila em paralelo.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ..logs import setup_logging
+from ..rastreamento import CABECALHO_SPAN, CABECALHO_TRACE, definir_trace_id, restaurar_trace, span
+from .fila import FilaTarefas
+
+logger = setup_logging(__name__)
+
+CONFIG_MCP_PADRAO = Path(__file__).parent / "config.json"
+
+
+def carregar_config_mcp(caminho: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Carrega a seção "mcp" do arquivo de configuração do MCP Server.
+
+    Args:
+        caminho: Caminho do config.json (usa MCP_CONFIG ou o arquivo padrão se omitido)
+
+    Returns:
+        Dicionário de configuração do MCP
+    """
+    caminho = caminho or os.environ.get("MCP_CONFIG") or str(CONFIG_MCP_PADRAO)
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f).get("mcp", {})
+    except Exception as e:
+        logger.error(f"Erro ao carregar configuração do MCP de {caminho}: {e}")
+        return {}
+
+
+def carregar_ferramentas_padrao() -> Dict[str, Callable]:
+    """Retorna o registro de ferramentas que o MCP Server expõe para execução."""
+    from ..ferramentas.registro import registro_ferramentas
+
+    return registro_ferramentas.funcoes()
+
+
+class WorkerMCP:
+    """Consome tarefas da fila e as executa usando o registro de ferramentas."""
+
+    def __init__(
+        self,
+        fila: FilaTarefas,
+        ferramentas: Dict[str, Callable],
+        worker_id: Optional[str] = None,
+        intervalo_poll: float = 1.0
+    ):
+        """
+        Inicializa o worker.
+
+        Args:
+            fila: Fila de onde as tarefas serão retiradas
+            ferramentas: Mapeamento nome -> função da ferramenta
+            worker_id: Identificador do worker (gerado a partir do host/PID se omitido)
+            intervalo_poll: Espera (segundos) entre consultas quando a fila está vazia
+        """
+        self.fila = fila
+        self.ferramentas = ferramentas
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.intervalo_poll = intervalo_poll
+        self.parar_event = threading.Event()
+        self.processadas = 0
+        self.falhas = 0
+
+    def executar_payload(self, payload: Dict[str, Any]) -> Any:
+        """
+        Executa o conteúdo de uma tarefa.
+
+        Raises:
+            ValueError: Se o payload não for uma execução de ferramenta válida
+        """
+        if not isinstance(payload, dict) or payload.get("tipo") != "executar_ferramenta":
+            raise ValueError(f"Tipo de tarefa não suportado: {payload.get('tipo') if isinstance(payload, dict) else type(payload)}")
+
+        nome_ferramenta = payload.get("nome_ferramenta")
+        if nome_ferramenta not in self.ferramentas:
+            raise ValueError(f"Ferramenta não registrada: {nome_ferramenta}")
+
+        # Continua o trace de quem enfileirou a tarefa, se informado
+        trace = payload.get("trace") or {}
+        tokens = definir_trace_id(trace.get(CABECALHO_TRACE), trace.get(CABECALHO_SPAN))
+        try:
+            with span(f"ferramenta.{nome_ferramenta}", categoria="worker", worker=self.worker_id):
+                return self.ferramentas[nome_ferramenta](**payload.get("parametros", {}))
+        finally:
+            restaurar_trace(tokens)
+
+    def _manter_visibilidade(self, tarefa_id: str, concluida: threading.Event) -> None:
+        """Renova a visibilidade da tarefa enquanto ela estiver sendo executada."""
+        intervalo = max(1.0, self.fila.visibilidade_segundos / 3)
+        while not concluida.wait(intervalo):
+            if not self.fila.renovar(tarefa_id, self.worker_id):
+                logger.warning(f"Não foi possível renovar a visibilidade da tarefa {tarefa_id}")
+                return
+
+    def processar_uma(self) -> bool:
+        """
+        Reserva e executa uma única tarefa.
+
+        Returns:
+            True se uma tarefa foi processada, False se a fila estava vazia
+        """
+        tarefa = self.fila.reservar(self.worker_id)
+        if tarefa is None:
+            return False
+
+        tarefa_id = tarefa["id"]
+        logger.info(f"Worker {self.worker_id} executando tarefa {tarefa_id} (tentativa {tarefa['tentativas']})")
+
+        concluida = threading.Event()
+        heartbeat = threading.Thread(target=self._manter_visibilidade, args=(tarefa_id, concluida), daemon=True)
+        heartbeat.start()
+        inicio = time.time()
+        try:
+            resultado = self.executar_payload(tarefa["payload"])
+            concluida.set()
+            self.fila.concluir(tarefa_id, resultado, worker_id=self.worker_id)
+            self.processadas += 1
+            logger.info(f"Tarefa {tarefa_id} concluída em {time.time() - inicio:.2f}s")
+        except Exception as e:
+            concluida.set()
+            self.falhas += 1
+            logger.error(f"Erro ao executar tarefa {tarefa_id}: {e}")
+            self.fila.falhar(tarefa_id, f"{type(e).__name__}: {e}\n{traceback.format_exc()}", worker_id=self.worker_id)
+        finally:
+            heartbeat.join(timeout=1)
+        return True
+
+    def executar(self, max_tarefas: Optional[int] = None) -> int:
+        """
+        Loop principal do worker.
+
+        Args:
+            max_tarefas: Encerra após processar este número de tarefas (infinito se omitido)
+
+        Returns:
+            Número de tarefas processadas
+        """
+        logger.info(f"Worker {self.worker_id} iniciado na fila '{self.fila.fila}'")
+        processadas = 0
+        while not self.parar_event.is_set():
+            if max_tarefas is not None and processadas >= max_tarefas:
+                break
+            try:
+                if self.processar_uma():
+                    processadas += 1
+                    continue
+            except Exception as e:
+                logger.error(f"Erro no loop do worker {self.worker_id}: {e}")
+            self.parar_event.wait(self.intervalo_poll)
+
+        logger.info(f"Worker {self.worker_id} encerrado após {processadas} tarefa(s)")
+        return processadas
+
+    def parar(self) -> None:
+        """Sinaliza para o loop encerrar após a tarefa atual."""
+        self.parar_event.set()
@@ -0,0 +1,260 @@
+"""
+Métricas Prometheus do Agente IA e do MCP Server.
+
+Concentra a definição de todas as métricas (latência de LLM, RAG, ferramentas
+e filas) em um registro próprio, exposto em ``/metrics`` pelo MCP Server e pelo
+servidor de chat. Se ``prometheus_client`` não estiver instalado, as métricas
+viram objetos nulos e a instrumentação continua funcionando sem custo.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logs import setup_logging
+
+logger = setup_logging(__name__)
+
+try:
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+    PROMETHEUS_DISPONIVEL = True
+except ImportError:
+    PROMETHEUS_DISPONIVEL = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    logger.warning("prometheus_client não encontrado. As métricas não serão exportadas.")
+
+
+class _MetricaNula:
+    """Substituto sem efeito para métricas quando prometheus_client não está disponível."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        pass
+
+    def labels(self, *args: Any, **kwargs: Any) -> "_MetricaNula":
+        return self
+
+    def observe(self, valor: float) -> None:
+        pass
+
+    def inc(self, valor: float = 1) -> None:
+        pass
+
+    def dec(self, valor: float = 1) -> None:
+        pass
+
+    def set(self, valor: float) -> None:
+        pass
+
+    def set_function(self, funcao: Callable[[], float]) -> None:
+        pass
+
+
+if PROMETHEUS_DISPONIVEL:
+    REGISTRO = CollectorRegistry()
+    _Counter, _Gauge, _Histogram = Counter, Gauge, Histogram
+else:
+    REGISTRO = None
+    _Counter = _Gauge = _Histogram = _MetricaNula
+
+_BUCKETS_LATENCIA = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+_BUCKETS_TOKENS_SEGUNDO = (1, 2, 5, 10, 20, 30, 50, 75, 100, 200)
+
+# LLM
+LLM_TTFT = _Histogram(
+    "agenteia_llm_ttft_segundos", "Tempo até o primeiro token",
+    ["provedor", "modelo"], buckets=_BUCKETS_LATENCIA, registry=REGISTRO
+)
+LLM_DURACAO = _Histogram(
+    "agenteia_llm_duracao_segundos", "Duração total da geração",
+    ["provedor", "modelo"], buckets=_BUCKETS_LATENCIA, registry=REGISTRO
+)
+LLM_TOKENS_POR_SEGUNDO = _Histogram(
+    "agenteia_llm_tokens_por_segundo", "Taxa de geração de tokens",
+    ["provedor", "modelo"], buckets=_BUCKETS_TOKENS_SEGUNDO, registry=REGISTRO
+)
+LLM_TOKENS = _Counter(
+    "agenteia_llm_tokens_gerados", "Tokens gerados",
+    ["provedor", "modelo"], registry=REGISTRO
+)
+LLM_ERROS = _Counter(
+    "agenteia_llm_erros", "Erros em chamadas ao LLM",
+    ["provedor", "modelo"], registry=REGISTRO
+)
+LLM_EM_ANDAMENTO = _Gauge(
+    "agenteia_llm_requisicoes_em_andamento", "Chamadas ao LLM em andamento",
+    ["provedor"], registry=REGISTRO
+)
+
+# RAG
+RAG_LATENCIA = _Histogram(
+    "agenteia_rag_busca_segundos", "Latência da busca no vector store",
+    buckets=_BUCKETS_LATENCIA, registry=REGISTRO
+)
+RAG_BUSCAS = _Counter(
+    "agenteia_rag_buscas", "Buscas no vector store por resultado (acerto, vazio, erro)",
+    ["resultado"], registry=REGISTRO
+)
+RAG_DOCUMENTOS = _Counter(
+    "agenteia_rag_documentos_recuperados", "Documentos recuperados pelo RAG",
+    registry=REGISTRO
+)
+
+# Ferramentas
+FERRAMENTA_DURACAO = _Histogram(
+    "agenteia_ferramenta_duracao_segundos", "Duração da execução de ferramentas",
+    ["ferramenta"], buckets=_BUCKETS_LATENCIA, registry=REGISTRO
+)
+FERRAMENTA_ERROS = _Counter(
+    "agenteia_ferramenta_erros", "Erros na execução de ferramentas",
+    ["ferramenta"], registry=REGISTRO
+)
+FERRAMENTAS_EM_ANDAMENTO = _Gauge(
+    "agenteia_ferramentas_em_andamento", "Ferramentas em execução",
+    registry=REGISTRO
+)
+
+# Cache de resultados de ferramentas
+CACHE_FERRAMENTAS = _Counter(
+    "agenteia_cache_ferramentas", "Consultas ao cache de resultados por ferramenta e resultado (acerto, falha)",
+    ["ferramenta", "resultado"], registry=REGISTRO
+)
+CACHE_FERRAMENTAS_BYTES = _Gauge(
+    "agenteia_cache_ferramentas_bytes", "Memória estimada usada pelo cache de resultados",
+    registry=REGISTRO
+)
+
+# Filas
+FILA_TAREFAS = _Gauge(
+    "agenteia_fila_tarefas", "Tarefas na fila por status",
+    ["fila", "status"], registry=REGISTRO
+)
+FILA_IDADE = _Gauge(
+    "agenteia_fila_idade_mais_antiga_segundos", "Idade da tarefa pendente mais antiga",
+    ["fila"], registry=REGISTRO
+)
+
+_coletores: List[Callable[[], None]] = []
+_coletores_lock = threading.Lock()
+
+
+def ao_coletar(funcao: Callable[[], None]) -> None:
+    """Registra uma função chamada antes de cada exportação (para atualizar gauges)."""
+    with _coletores_lock:
+        _coletores.append(funcao)
+
+
+def gerar_metricas() -> Tuple[bytes, str]:
+    """
+    Gera o conteúdo do endpoint ``/metrics``.
+
+    Returns:
+        Tupla (conteúdo, content-type)
+    """
+    with _coletores_lock:
+        coletores = list(_coletores)
+    for funcao in coletores:
+        try:
+            funcao()
+        except Exception as e:
+            logger.error(f"Erro ao atualizar métricas antes da exportação: {e}")
+
+    if not PROMETHEUS_DISPONIVEL:
+        return b"# prometheus_client nao instalado\n", CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRO), CONTENT_TYPE_LATEST
+
+
+def atualizar_fila(estatisticas: Dict[str, Any]) -> None:
+    """Atualiza os gauges de fila a partir de ``FilaTarefas.estatisticas()``."""
+    fila = estatisticas.get("fila", "padrao")
+    for status in ("pendentes", "em_execucao", "mortas"):
+        FILA_TAREFAS.labels(fila, status).set(estatisticas.get(status, 0))
+    FILA_IDADE.labels(fila).set(estatisticas.get("idade_mais_antiga_segundos", 0.0))
+
+
+def identificar_modelo(llm: Any) -> Tuple[str, str]:
+    """Retorna (provedor, modelo) de uma instância de LLM do LangChain."""
+    # ChatOpenAI (usado para o OpenRouter) expõe model_name; ChatOllama expõe model
+    modelo_openai = getattr(llm, "model_name", None)
+    if modelo_openai:
+        return "openrouter", str(modelo_openai)
+    return "ollama", str(getattr(llm, "model", None) or type(llm).__name__)
+
+
+class MedicaoLLM:
+    """Mede uma chamada ao LLM: tempo até o primeiro token, duração e tokens/s.
+
+    Uso::
+
+        with MedicaoLLM(provedor, modelo) as medicao:
+            for chunk in llm.stream(prompt):
+                medicao.token()
+    """
+
+    def __init__(self, provedor: str, modelo: str):
+        self.provedor = provedor
+        self.modelo = modelo
+        self.tokens = 0
+        self.ttft: Optional[float] = None
+        self.duracao: Optional[float] = None
+        self._inicio = 0.0
+
+    def __enter__(self) -> "MedicaoLLM":
+        self._inicio = time.perf_counter()
+        LLM_EM_ANDAMENTO.labels(self.provedor).inc()
+        return self
+
+    def _registrar_ttft(self) -> None:
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self._inicio
+            LLM_TTFT.labels(self.provedor, self.modelo).observe(self.ttft)
+
+    def token(self, quantidade: int = 1) -> None:
+        """Registra tokens recebidos; o primeiro registro define o TTFT."""
+        self._registrar_ttft()
+        self.tokens += quantidade
+
+    def definir_tokens(self, quantidade: int) -> None:
+        """
+        Define o total de tokens de uma chamada sem streaming.
+
+        Sem streaming o primeiro token chega junto com a resposta completa,
+        então o TTFT registrado é o tempo até a resposta.
+        """
+        self._registrar_ttft()
+        self.tokens = quantidade
+
+    def __exit__(self, tipo, valor, tb) -> bool:
+        self.duracao = time.perf_counter() - self._inicio
+        LLM_EM_ANDAMENTO.labels(self.provedor).dec()
+        # GeneratorExit: o consumidor do stream parou de ler; não conta como erro
+        if tipo is not None and not issubclass(tipo, GeneratorExit):
+            LLM_ERROS.labels(self.provedor, self.modelo).inc()
+            return False
+
+        LLM_DURACAO.labels(self.provedor, self.modelo).observe(self.duracao)
+        if self.tokens:
+            LLM_TOKENS.labels(self.provedor, self.modelo).inc(self.tokens)
+            if self.duracao > 0:
+                LLM_TOKENS_POR_SEGUNDO.labels(self.provedor, self.modelo).observe(self.tokens / self.duracao)
+        return False
+
+
+def contar_tokens_resposta(resposta: Any) -> int:
+    """Obtém a contagem de tokens de saída de uma resposta do LangChain (aproximada se ausente)."""
+    uso = getattr(resposta, "usage_metadata", None) or {}
+    if uso.get("output_tokens"):
+        return int(uso["output_tokens"])
+    conteudo = getattr(resposta, "content", resposta)
+    return len(str(conteudo).split()) if conteudo else 0
+
+
+def registrar_busca_rag(duracao: float, documentos: Optional[int], erro: bool = False) -> None:
+    """Registra latência e resultado de uma busca no vector store."""
+    RAG_LATENCIA.observe(duracao)
+    if erro:
+        RAG_BUSCAS.labels("erro").inc()
+    elif documentos:
+        RAG_BUSCAS.labels("acerto").inc()
+        RAG_DOCUMENTOS.inc(documentos)
+    else:
+        RAG_BUSCAS.labels("vazio").inc()
@@ -0,0 +1,148 @@
+"""
+Perfil de tempo de importação na inicialização.
+
+Executa um script (ou a importação de um módulo) com ``python -X importtime``
+e mostra quais módulos mais custam no cold start.
+
+Uso:
+    python -m agenteia.core.perfil_importacao main.py --help
+    python -m agenteia.core.perfil_importacao --modulo agenteia.core.agente --por-pacote
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RAIZ = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class RegistroImportacao:
+    """Uma linha da saída de ``-X importtime`` (tempos em segundos)."""
+    modulo: str
+    proprio: float
+    acumulado: float
+    nivel: int
+
+
+@dataclass
+class PerfilImportacao:
+    """Resultado de uma execução com ``-X importtime``."""
+    comando: List[str]
+    codigo_saida: int
+    duracao: float
+    registros: List[RegistroImportacao] = field(default_factory=list)
+
+    @property
+    def total_importacao(self) -> float:
+        """Soma do tempo próprio de todas as importações, em segundos."""
+        return sum(r.proprio for r in self.registros)
+
+    @property
+    def modulos(self) -> List[str]:
+        """Módulos importados, na ordem de conclusão."""
+        return [r.modulo for r in self.registros]
+
+    def mais_lentos(self, quantidade: int = 20) -> List[RegistroImportacao]:
+        """Módulos com maior tempo acumulado (incluindo os que eles importam)."""
+        return sorted(self.registros, key=lambda r: r.acumulado, reverse=True)[:quantidade]
+
+    def por_pacote(self, quantidade: int = 20) -> List[Tuple[str, float]]:
+        """Tempo próprio somado por pacote de topo (ex.: ``langchain``, ``pandas``)."""
+        totais: Dict[str, float] = defaultdict(float)
+        for registro in self.registros:
+            totais[registro.modulo.split(".")[0]] += registro.proprio
+        return sorted(totais.items(), key=lambda item: item[1], reverse=True)[:quantidade]
+
+
+def _interpretar(saida: str) -> List[RegistroImportacao]:
+    registros = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+        try:
+            proprio, acumulado, nome = linha[len("import time:"):].split("|", 2)
+            proprio_us, acumulado_us = int(proprio), int(acumulado)
+        except ValueError:
+            # Cabeçalho ("self [us] | cumulative | imported package")
+            continue
+        recuo = len(nome) - len(nome.lstrip(" "))
+        registros.append(RegistroImportacao(
+            modulo=nome.strip(),
+            proprio=proprio_us / 1_000_000,
+            acumulado=acumulado_us / 1_000_000,
+            nivel=max(0, (recuo - 1) // 2)
+        ))
+    return registros
+
+
+def medir_importacoes(argumentos: List[str], modulo: Optional[str] = None, timeout: float = 120.0) -> PerfilImportacao:
+    """
+    Executa um script (ou importa um módulo) em um processo novo com ``-X importtime``.
+
+    Args:
+        argumentos: Script e argumentos (ex.: ``["main.py", "--help"]``)
+        modulo: Se informado, mede ``import <modulo>`` em vez de um script
+        timeout: Tempo máximo de execução em segundos
+
+    Returns:
+        PerfilImportacao com os tempos de cada módulo
+    """
+    comando = [sys.executable, "-X", "importtime"]
+    comando += ["-c", f"import {modulo}"] if modulo else list(argumentos)
+
+    ambiente = dict(os.environ)
+    ambiente["PYTHONPATH"] = os.pathsep.join(filter(None, [str(RAIZ), ambiente.get("PYTHONPATH")]))
+    # Sem bytecode em cache o resultado mediria compilação, não importação
+    ambiente.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        comando, cwd=RAIZ, env=ambiente, stdin=subprocess.DEVNULL,
+        capture_output=True, text=True, timeout=timeout
+    )
+    return PerfilImportacao(
+        comando=comando,
+        codigo_saida=processo.returncode,
+        duracao=time.perf_counter() - inicio,
+        registros=_interpretar(processo.stderr)
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Perfil de tempo de importação na inicialização")
+    parser.add_argument("--modulo", help="Mede 'import MODULO' em vez de executar um script")
+    parser.add_argument("--top", type=int, default=25, help="Quantidade de linhas exibidas (padrão: 25)")
+    parser.add_argument("--por-pacote", action="store_true", help="Agrupa o tempo próprio por pacote de topo")
+    parser.add_argument("script", nargs=argparse.REMAINDER, help="Script e argumentos (ex.: main.py --help)")
+    args = parser.parse_args(argv)
+
+    if not args.modulo and not args.script:
+        parser.error("informe um script ou --modulo")
+
+    perfil = medir_importacoes(args.script, modulo=args.modulo)
+    alvo = f"import {args.modulo}" if args.modulo else " ".join(args.script)
+    print(f"{alvo}: {perfil.duracao * 1000:.0f} ms de execução, "
+          f"{perfil.total_importacao * 1000:.0f} ms em {len(perfil.registros)} importações "
+          f"(código de saída {perfil.codigo_saida})\n")
+
+    if args.por_pacote:
+        print(f"{'pacote':<40} {'próprio (ms)':>12}")
+        for pacote, total in perfil.por_pacote(args.top):
+            print(f"{pacote:<40} {total * 1000:>12.1f}")
+    else:
+        print(f"{'módulo':<60} {'acumulado (ms)':>14} {'próprio (ms)':>12}")
+        for registro in perfil.mais_lentos(args.top):
+            print(f"{registro.modulo:<60} {registro.acumulado * 1000:>14.1f} {registro.proprio * 1000:>12.1f}")
+    return 0 if perfil.codigo_saida == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Rastreamento leve de spans por requisição.
+
+Cada turno do agente (e cada requisição ao MCP Server) recebe um trace id
+propagado por ``contextvars``; os spans são gravados em um arquivo rotativo no
+formato Chrome trace-event (``"ph": "X"``), que pode ser aberto diretamente no
+chrome://tracing ou no Perfetto para ver o caminho crítico de um turno lento.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Iterator, Optional, Tuple, TypeVar
+
+from .logs import setup_logging
+
+logger = setup_logging(__name__)
+
+CABECALHO_TRACE = "X-Trace-Id"
+CABECALHO_SPAN = "X-Span-Id"
+
+_trace_id: ContextVar[Optional[str]] = ContextVar("agenteia_trace_id", default=None)
+_span_id: ContextVar[Optional[str]] = ContextVar("agenteia_span_id", default=None)
+
+T = TypeVar("T")
+
+
+class EscritorTrace:
+    """Grava eventos de trace em um arquivo JSON rotativo (formato Chrome trace-event).
+
+    O arquivo começa com ``[`` e cada evento termina com ``,``; o colchete de
+    fechamento é opcional no formato, então o arquivo pode ser aberto a
+    qualquer momento, mesmo com o processo em execução. O buffer é descarregado
+    ao fim de cada span raiz e, no máximo, a cada ``intervalo_descarga``
+    segundos, para que spans longos ou sem raiz finalizada também cheguem ao disco.
+    """
+
+    def __init__(
+        self,
+        caminho: str = "logs/traces.json",
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 3,
+        intervalo_descarga: float = 1.0
+    ):
+        self.caminho = Path(caminho)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.intervalo_descarga = intervalo_descarga
+        self._lock = threading.Lock()
+        self._arquivo = None
+        self._ultima_descarga = time.monotonic()
+
+    def _abrir(self) -> None:
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        novo = not self.caminho.exists() or self.caminho.stat().st_size == 0
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+        if novo:
+            self._arquivo.write("[\n")
+
+    def _rotacionar(self) -> None:
+        self._arquivo.close()
+        self._arquivo = None
+        for i in range(self.backup_count - 1, 0, -1):
+            origem = self.caminho.with_name(f"{self.caminho.name}.{i}")
+            if origem.exists():
+                os.replace(origem, self.caminho.with_name(f"{self.caminho.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.caminho, self.caminho.with_name(f"{self.caminho.name}.1"))
+        else:
+            self.caminho.unlink()
+
+    def escrever(self, evento: Dict[str, Any], descarregar: bool = False) -> None:
+        """Acrescenta um evento ao arquivo de trace."""
+        linha = json.dumps(evento, ensure_ascii=False, default=str) + ",\n"
+        with self._lock:
+            try:
+                if self._arquivo is None:
+                    self._abrir()
+                self._arquivo.write(linha)
+                agora = time.monotonic()
+                if descarregar or agora - self._ultima_descarga >= self.intervalo_descarga:
+                    self._ultima_descarga = agora
+                    self._arquivo.flush()
+                    if self._arquivo.tell() >= self.max_bytes:
+                        self._rotacionar()
+            except Exception as e:
+                logger.error(f"Erro ao gravar evento de trace: {e}")
+
+    def fechar(self) -> None:
+        """Fecha o arquivo de trace."""
+        with self._lock:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+
+_config = {"habilitado": True}
+_escritor: Optional[EscritorTrace] = None
+_escritor_lock = threading.Lock()
+
+
+def configurar_rastreamento(config: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Configura o rastreamento a partir da seção "rastreamento" do config.
+
+    Args:
+        config: Dicionário com habilitado, arquivo, max_bytes e backup_count
+    """
+    global _escritor
+    config = config or {}
+    with _escritor_lock:
+        if _escritor is not None:
+            _escritor.fechar()
+            _escritor = None
+        _config.clear()
+        _config.update({"habilitado": True, **config})
+
+
+def _obter_escritor() -> EscritorTrace:
+    global _escritor
+    if _escritor is None:
+        with _escritor_lock:
+            if _escritor is None:
+                _escritor = EscritorTrace(
+                    caminho=_config.get("arquivo", "logs/traces.json"),
+                    max_bytes=_config.get("max_bytes", 50 * 1024 * 1024),
+                    backup_count=_config.get("backup_count", 3),
+                    intervalo_descarga=_config.get("intervalo_descarga", 1.0)
+                )
+                atexit.register(_escritor.fechar)
+    return _escritor
+
+
+def rastreamento_habilitado() -> bool:
+    """Indica se os spans estão sendo gravados."""
+    return bool(_config.get("habilitado", True))
+
+
+def obter_trace_id() -> Optional[str]:
+    """Retorna o trace id do contexto atual."""
+    return _trace_id.get()
+
+
+def definir_trace_id(trace_id: Optional[str], span_pai: Optional[str] = None) -> Tuple[Token, Token]:
+    """
+    Define o trace id (e o span pai) do contexto atual, ex.: a partir de um cabeçalho HTTP.
+
+    Returns:
+        Tokens para restaurar o contexto com ``restaurar_trace``
+    """
+    return _trace_id.set(trace_id), _span_id.set(span_pai)
+
+
+def restaurar_trace(tokens: Tuple[Token, Token]) -> None:
+    """Restaura o contexto anterior a ``definir_trace_id``."""
+    _trace_id.reset(tokens[0])
+    _span_id.reset(tokens[1])
+
+
+def cabecalhos_trace() -> Dict[str, str]:
+    """Cabeçalhos para propagar o trace atual em chamadas HTTP."""
+    cabecalhos = {}
+    if _trace_id.get():
+        cabecalhos[CABECALHO_TRACE] = _trace_id.get()
+    if _span_id.get():
+        cabecalhos[CABECALHO_SPAN] = _span_id.get()
+    return cabecalhos
+
+
+class Span:
+    """Intervalo de tempo medido, gravado como evento completo (``"ph": "X"``)."""
+
+    def __init__(self, nome: str, categoria: str = "agente", **atributos: Any):
+        self.nome = nome
+        self.categoria = categoria
+        self.atributos = atributos
+        self.span_id = uuid.uuid4().hex[:16]
+        self.raiz = _trace_id.get() is None
+        self.trace_id = _trace_id.get() or uuid.uuid4().hex
+        self.pai = _span_id.get()
+        self._inicio_us = time.time_ns() // 1000
+        self._inicio = time.perf_counter()
+        self._tokens: Optional[Tuple[Token, Token]] = None
+
+    def ativar(self) -> "Span":
+        """Torna este span o span atual do contexto."""
+        self._tokens = definir_trace_id(self.trace_id, self.span_id)
+        return self
+
+    def finalizar(self, erro: Optional[BaseException] = None, **atributos: Any) -> None:
+        """Encerra o span e grava o evento."""
+        duracao_us = int((time.perf_counter() - self._inicio) * 1_000_000)
+        if self._tokens is not None:
+            try:
+                restaurar_trace(self._tokens)
+            except ValueError:
+                # Span finalizado em outro contexto (ex.: callbacks em threads diferentes)
+                pass
+            self._tokens = None
+
+        if not rastreamento_habilitado():
+            return
+
+        args = {"trace_id": self.trace_id, "span_id": self.span_id, "pai": self.pai, **self.atributos, **atributos}
+        if erro is not None:
+            args["erro"] = f"{type(erro).__name__}: {erro}"
+        _obter_escritor().escrever({
+            "name": self.nome,
+            "cat": self.categoria,
+            "ph": "X",
+            "ts": self._inicio_us,
+            "dur": duracao_us,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args
+        }, descarregar=self.raiz)
+
+
+@contextmanager
+def span(nome: str, categoria: str = "agente", **atributos: Any) -> Iterator[Span]:
+    """
+    Mede um bloco de código como span do trace atual (inicia um trace se não houver).
+
+    Exemplo::
+
+        with span("rag.similarity_search", k=3) as s:
+            docs = vector_store.similarity_search(...)
+            s.atributos["documentos"] = len(docs)
+    """
+    atual = Span(nome, categoria, **atributos).ativar()
+    try:
+        yield atual
+    except BaseException as e:
+        atual.finalizar(erro=None if isinstance(e, GeneratorExit) else e)
+        raise
+    else:
+        atual.finalizar()
+
+
+def span_gerador(
+    nome: str, gerador: Generator[T, None, Any], categoria: str = "agente", **atributos: Any
+) -> Generator[T, None, None]:
+    """
+    Repassa os itens de um gerador medindo-o como um span.
+
+    Ao contrário de ``with span(...): yield ...``, o span só é o contexto atual
+    enquanto o gerador executa: antes de cada ``yield`` o contexto de quem
+    consome é restaurado, e o estado do gerador (inclusive spans abertos dentro
+    dele) é retomado na próxima iteração.
+    """
+    atual = Span(nome, categoria, **atributos)
+    estado = (atual.trace_id, atual.span_id)
+
+    def avancar(funcao: Callable[[], T]) -> T:
+        nonlocal estado
+        tokens = definir_trace_id(*estado)
+        try:
+            return funcao()
+        finally:
+            estado = (_trace_id.get(), _span_id.get())
+            restaurar_trace(tokens)
+
+    try:
+        while True:
+            try:
+                item = avancar(gerador.__next__)
+            except StopIteration:
+                break
+            try:
+                yield item
+            except GeneratorExit:
+                avancar(gerador.close)
+                raise
+    except BaseException as e:
+        atual.finalizar(erro=None if isinstance(e, GeneratorExit) else e)
+        raise
+    atual.finalizar()
+
+
+def rastrear(nome: Optional[str] = None, categoria: str = "agente") -> Callable:
+    """Decorador que mede a função (síncrona ou assíncrona) como um span."""
+    def decorador(funcao: Callable) -> Callable:
+        nome_span = nome or funcao.__qualname__
+
+        if inspect.iscoroutinefunction(funcao):
+            @functools.wraps(funcao)
+            async def wrapper_async(*args, **kwargs):
+                with span(nome_span, categoria):
+                    return await funcao(*args, **kwargs)
+            return wrapper_async
+
+        @functools.wraps(funcao)
+        def wrapper(*args, **kwargs):
+            with span(nome_span, categoria):
+                return funcao(*args, **kwargs)
+        return wrapper
+    return decorador
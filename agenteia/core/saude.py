@@ -0,0 +1,254 @@
+"""
+Módulo de verificação de saúde em segundo plano.
+
+As sondas (Ollama, OpenRouter, conectividade) são executadas periodicamente
+por uma thread própria, com tempo limite, e o resultado fica em cache. As rotas
+de status apenas leem o último snapshot, sem nunca fazer I/O na requisição.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from .logs import setup_logging
+
+logger = setup_logging(__name__)
+
+
+@dataclass
+class Sonda:
+    """Uma verificação registrada no monitor de saúde.
+
+    Atributos:
+        nome: Identificador da sonda
+        funcao: Função sem argumentos que retorna o valor a ser cacheado
+        intervalo: Período entre execuções, em segundos
+        timeout: Tempo máximo de espera pelo resultado, em segundos
+        valor: Último valor obtido com sucesso
+        erro: Erro da última execução (None se bem-sucedida)
+        timestamp: Momento do último resultado com sucesso
+        verificado_em: Momento da última execução (com sucesso ou não)
+        duracao: Duração da última execução, em segundos
+        proxima_execucao: Momento da próxima execução agendada
+        em_execucao: Future da execução em andamento, se houver
+        iniciada_em: Momento em que a execução em andamento começou
+    """
+    nome: str
+    funcao: Callable[[], Any]
+    intervalo: float
+    timeout: float
+    valor: Any = None
+    erro: Optional[str] = None
+    timestamp: Optional[float] = None
+    verificado_em: Optional[float] = None
+    duracao: Optional[float] = None
+    proxima_execucao: float = 0.0
+    em_execucao: Optional[Future] = field(default=None, repr=False)
+    iniciada_em: Optional[float] = None
+
+
+class MonitorSaude:
+    """Executa sondas de saúde em segundo plano e serve snapshots cacheados."""
+
+    def __init__(self, intervalo: float = 30.0, timeout: float = 5.0, max_workers: int = 4):
+        """
+        Inicializa o monitor.
+
+        Args:
+            intervalo: Intervalo padrão entre execuções de cada sonda, em segundos
+            timeout: Tempo limite padrão de cada sonda, em segundos
+            max_workers: Número de threads para execução das sondas
+        """
+        self.intervalo = intervalo
+        self.timeout = timeout
+        self._sondas: Dict[str, Sonda] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sonda-saude")
+        self._parar = threading.Event()
+        self._acordar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def registrar(
+        self,
+        nome: str,
+        funcao: Callable[[], Any],
+        intervalo: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """
+        Registra (ou substitui) uma sonda e agenda sua execução imediata.
+
+        Args:
+            nome: Identificador da sonda
+            funcao: Função sem argumentos que retorna o estado a cachear
+            intervalo: Intervalo entre execuções (usa o padrão do monitor se omitido)
+            timeout: Tempo limite (usa o padrão do monitor se omitido)
+        """
+        with self._lock:
+            anterior = self._sondas.get(nome)
+            sonda = Sonda(
+                nome=nome,
+                funcao=funcao,
+                intervalo=intervalo or self.intervalo,
+                timeout=timeout or self.timeout
+            )
+            if anterior is not None:
+                # Mantém o último valor conhecido até a nova sonda responder
+                sonda.valor, sonda.erro = anterior.valor, anterior.erro
+                sonda.timestamp, sonda.verificado_em = anterior.timestamp, anterior.verificado_em
+            self._sondas[nome] = sonda
+        self._acordar.set()
+
+    def iniciar(self) -> None:
+        """Inicia a thread de verificação (idempotente)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._loop, name="monitor-saude", daemon=True)
+            self._thread.start()
+        logger.info("Monitor de saúde iniciado")
+
+    def parar(self) -> None:
+        """Interrompe a thread de verificação."""
+        self._parar.set()
+        self._acordar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def atualizar(self, nome: Optional[str] = None, aguardar: bool = True) -> None:
+        """
+        Força a execução imediata de uma sonda (ou de todas).
+
+        Args:
+            nome: Sonda a executar (todas se omitido)
+            aguardar: Espera o resultado, respeitando o timeout da sonda
+        """
+        with self._lock:
+            sondas = [self._sondas[nome]] if nome else list(self._sondas.values())
+        futuros = [(sonda, self._disparar(sonda, time.time())) for sonda in sondas]
+        if aguardar:
+            for sonda, futuro in futuros:
+                if futuro is None:
+                    continue
+                try:
+                    futuro.result(timeout=sonda.timeout)
+                except Exception:
+                    pass
+                self._verificar_timeout(sonda, time.time())
+
+    def obter(self, nome: str, max_idade: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Retorna o snapshot cacheado de uma sonda.
+
+        Args:
+            nome: Identificador da sonda
+            max_idade: Idade (segundos) a partir da qual o valor é considerado obsoleto
+                (padrão: duas vezes o intervalo da sonda)
+
+        Returns:
+            Dicionário com valor, erro, timestamp, idade_segundos e obsoleto
+        """
+        sonda = self._sondas.get(nome)
+        if sonda is None:
+            return {
+                "valor": None,
+                "erro": "Sonda não registrada",
+                "timestamp": None,
+                "verificado_em": None,
+                "duracao": None,
+                "idade_segundos": None,
+                "obsoleto": True
+            }
+
+        agora = time.time()
+        idade = (agora - sonda.timestamp) if sonda.timestamp else None
+        limite = max_idade if max_idade is not None else 2 * sonda.intervalo
+        return {
+            "valor": sonda.valor,
+            "erro": sonda.erro,
+            "timestamp": sonda.timestamp,
+            "verificado_em": sonda.verificado_em,
+            "duracao": sonda.duracao,
+            "idade_segundos": idade,
+            "obsoleto": idade is None or idade > limite or sonda.erro is not None
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna o snapshot de todas as sondas registradas."""
+        return {nome: self.obter(nome) for nome in list(self._sondas)}
+
+    def _disparar(self, sonda: Sonda, agora: float) -> Optional[Future]:
+        """Submete uma sonda ao executor, se ela ainda não estiver em execução."""
+        with self._lock:
+            if sonda.em_execucao is not None and not sonda.em_execucao.done():
+                return sonda.em_execucao
+            sonda.iniciada_em = agora
+            sonda.proxima_execucao = agora + sonda.intervalo
+            futuro = self._executor.submit(sonda.funcao)
+            sonda.em_execucao = futuro
+        futuro.add_done_callback(lambda f, s=sonda, inicio=agora: self._registrar_resultado(s, f, inicio))
+        return futuro
+
+    def _registrar_resultado(self, sonda: Sonda, futuro: Future, inicio: float) -> None:
+        """Grava o resultado de uma execução no cache."""
+        agora = time.time()
+        with self._lock:
+            sonda.verificado_em = agora
+            sonda.duracao = agora - inicio
+            try:
+                sonda.valor = futuro.result()
+                sonda.erro = None
+                sonda.timestamp = agora
+            except Exception as e:
+                sonda.erro = f"{type(e).__name__}: {e}"
+                logger.warning(f"Sonda '{sonda.nome}' falhou: {sonda.erro}")
+
+    def _verificar_timeout(self, sonda: Sonda, agora: float) -> None:
+        """Marca como erro uma sonda que passou do tempo limite, mantendo o último valor."""
+        with self._lock:
+            futuro = sonda.em_execucao
+            if futuro is None or futuro.done() or sonda.iniciada_em is None:
+                return
+            if agora - sonda.iniciada_em > sonda.timeout and sonda.erro != "timeout":
+                sonda.erro = "timeout"
+                sonda.verificado_em = agora
+                logger.warning(f"Sonda '{sonda.nome}' excedeu o tempo limite de {sonda.timeout}s")
+
+    def _loop(self) -> None:
+        """Loop da thread de verificação."""
+        while not self._parar.is_set():
+            agora = time.time()
+            with self._lock:
+                sondas = list(self._sondas.values())
+
+            proxima = agora + self.intervalo
+            for sonda in sondas:
+                self._verificar_timeout(sonda, agora)
+                if sonda.proxima_execucao <= agora:
+                    self._disparar(sonda, agora)
+                proxima = min(proxima, sonda.proxima_execucao)
+                em_execucao = sonda.em_execucao is not None and not sonda.em_execucao.done()
+                if em_execucao and sonda.erro != "timeout":
+                    proxima = min(proxima, sonda.iniciada_em + sonda.timeout)
+
+            self._acordar.wait(max(0.05, proxima - time.time()))
+            self._acordar.clear()
+
+
+def sonda_ollama(base_url: str, timeout: float = 3.0) -> Callable[[], Dict[str, Any]]:
+    """Cria uma sonda que verifica a versão do servidor Ollama."""
+    def verificar() -> Dict[str, Any]:
+        import requests
+
+        response = requests.get(f"{base_url}/api/version", timeout=timeout)
+        response.raise_for_status()
+        return {"online": True, "versao": response.json().get("version")}
+    return verificar
+
+
+# Instância global compartilhada pelo agente e pelo MCP Server
+monitor_saude = MonitorSaude()
@@ -0,0 +1,200 @@
+"""
+Tabela de processos do sistema com objetos ``psutil.Process`` persistentes.
+
+``Process.cpu_percent(interval=None)`` compara com a chamada anterior *no
+mesmo objeto*: criar um ``Process`` novo a cada consulta sempre retorna 0.
+A tabela mantém um objeto por PID entre as atualizações (descartando os que
+terminaram ou cujo PID foi reutilizado), então o uso de CPU de cada amostra é
+o delta desde a amostra anterior. As atualizações acontecem no máximo uma vez
+por ``intervalo``; consultas filtradas, ordenadas e top-N são respondidas a
+partir do último snapshot.
+"""
+
+import heapq
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .logs import setup_logging
+
+logger = setup_logging(__name__)
+
+# Atributos lidos em uma única chamada as_dict (que usa oneshot internamente)
+ATRIBUTOS = (
+    "name", "username", "status", "cpu_percent", "memory_percent",
+    "memory_info", "create_time", "num_threads"
+)
+
+CAMPOS_ORDENACAO = ("cpu_percent", "memoria_percent", "memoria_rss", "threads", "criado_em", "pid", "nome")
+
+
+def _normalizar(pid: int, info: Dict[str, Any], primeira_amostra: bool) -> Dict[str, Any]:
+    memoria = info.get("memory_info")
+    return {
+        "pid": pid,
+        "nome": info.get("name") or "",
+        "usuario": info.get("username"),
+        "status": info.get("status"),
+        # Na primeira amostra de um processo não há base de comparação
+        "cpu_percent": None if primeira_amostra else info.get("cpu_percent"),
+        "memoria_percent": info.get("memory_percent"),
+        "memoria_rss": getattr(memoria, "rss", None),
+        "criado_em": info.get("create_time"),
+        "threads": info.get("num_threads"),
+    }
+
+
+class TabelaProcessos:
+    """Snapshot periódico dos processos do sistema."""
+
+    def __init__(self, intervalo: float = 2.0, psutil_modulo: Optional[Any] = None):
+        """
+        Inicializa a tabela.
+
+        Args:
+            intervalo: Idade máxima do snapshot, em segundos, antes de uma nova leitura
+            psutil_modulo: Módulo compatível com psutil (padrão: psutil, importado no primeiro uso)
+        """
+        self.intervalo = intervalo
+        self._psutil = psutil_modulo
+        self._processos: Dict[int, Any] = {}
+        self._snapshot: Dict[int, Dict[str, Any]] = {}
+        self._atualizado_em: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def psutil(self) -> Any:
+        if self._psutil is None:
+            import psutil
+            self._psutil = psutil
+        return self._psutil
+
+    def _amostrar(self, pid: int) -> Optional[Dict[str, Any]]:
+        """Lê um processo reaproveitando (ou criando) seu objeto Process."""
+        ps = self.psutil
+        processo = self._processos.get(pid)
+        try:
+            # is_running compara o create_time: detecta PID reutilizado
+            primeira_amostra = processo is None or not processo.is_running()
+            if primeira_amostra:
+                processo = ps.Process(pid)
+                self._processos[pid] = processo
+            info = processo.as_dict(ATRIBUTOS, ad_value=None)
+        except (ps.NoSuchProcess, ps.AccessDenied):
+            self._processos.pop(pid, None)
+            return None
+        return _normalizar(pid, info, primeira_amostra)
+
+    def atualizar(self, forcar: bool = False) -> Dict[int, Dict[str, Any]]:
+        """
+        Atualiza o snapshot se ele for mais velho que ``intervalo``.
+
+        Args:
+            forcar: Atualiza mesmo que o snapshot seja recente
+
+        Returns:
+            Snapshot atual (PID -> informações)
+        """
+        with self._lock:
+            agora = time.monotonic()
+            if not forcar and self._atualizado_em is not None and agora - self._atualizado_em < self.intervalo:
+                return self._snapshot
+
+            vivos = set(self.psutil.pids())
+            for pid in list(self._processos):
+                if pid not in vivos:
+                    del self._processos[pid]
+
+            snapshot = {}
+            for pid in vivos:
+                info = self._amostrar(pid)
+                if info is not None:
+                    snapshot[pid] = info
+            self._snapshot = snapshot
+            self._atualizado_em = agora
+            return snapshot
+
+    def consultar(
+        self,
+        filtro: Optional[str] = None,
+        usuario: Optional[str] = None,
+        ordenar_por: str = "cpu_percent",
+        decrescente: bool = True,
+        limite: Optional[int] = None,
+        min_cpu: Optional[float] = None,
+        min_memoria: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Consulta o snapshot.
+
+        Args:
+            filtro: Trecho do nome do processo (sem diferenciar maiúsculas)
+            usuario: Usuário dono do processo
+            ordenar_por: Campo de ordenação (um de ``CAMPOS_ORDENACAO``)
+            decrescente: Maiores primeiro
+            limite: Retorna só os N primeiros (top-N)
+            min_cpu: Uso mínimo de CPU (%)
+            min_memoria: Uso mínimo de memória (%)
+
+        Returns:
+            Lista de processos (cópias dos registros do snapshot)
+        """
+        if ordenar_por not in CAMPOS_ORDENACAO:
+            raise ValueError(f"Campo de ordenação inválido: {ordenar_por} (use um de {', '.join(CAMPOS_ORDENACAO)})")
+
+        filtro = filtro.lower() if filtro else None
+        itens = [
+            p for p in self.atualizar().values()
+            if (filtro is None or filtro in p["nome"].lower())
+            and (usuario is None or p["usuario"] == usuario)
+            and (min_cpu is None or (p["cpu_percent"] or 0.0) >= min_cpu)
+            and (min_memoria is None or (p["memoria_percent"] or 0.0) >= min_memoria)
+        ]
+
+        if ordenar_por == "nome":
+            chave = lambda p: p["nome"].lower()
+        else:
+            chave = lambda p: p[ordenar_por] if p[ordenar_por] is not None else -1
+        if limite is not None:
+            selecionar = heapq.nlargest if decrescente else heapq.nsmallest
+            itens = selecionar(limite, itens, key=chave)
+        else:
+            itens.sort(key=chave, reverse=decrescente)
+        return [dict(p) for p in itens]
+
+    def obter(self, pid: int) -> Optional[Dict[str, Any]]:
+        """
+        Informações de um processo.
+
+        Um PID ausente do snapshot (processo iniciado depois da última
+        atualização) é lido na hora e passa a ser acompanhado.
+
+        Returns:
+            Registro do processo ou None se ele não existir
+        """
+        snapshot = self.atualizar()
+        if pid in snapshot:
+            return dict(snapshot[pid])
+        with self._lock:
+            info = self._amostrar(pid)
+            if info is not None:
+                self._snapshot[pid] = info
+        return dict(info) if info else None
+
+
+_tabela: Optional[TabelaProcessos] = None
+_tabela_lock = threading.Lock()
+
+
+def obter_tabela(**kwargs: Any) -> TabelaProcessos:
+    """
+    Retorna a tabela de processos global, criando-a no primeiro uso.
+
+    Args:
+        **kwargs: Parâmetros de TabelaProcessos (usados apenas na criação)
+    """
+    global _tabela
+    with _tabela_lock:
+        if _tabela is None:
+            _tabela = TabelaProcessos(**kwargs)
+        return _tabela
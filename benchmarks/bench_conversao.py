@@ -0,0 +1,112 @@
+"""
+Benchmark da conversão de formatos: carregar tudo na memória vs. streaming.
+
+Cada conversão roda num subprocesso para medir o pico de memória (RSS)
+isoladamente.
+
+Uso:
+    python benchmarks/bench_conversao.py [--mb 200] [--trabalhadores 4]
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+RAIZ = str(Path(__file__).parent.parent)
+
+
+def gerar_csv(caminho: str, megabytes: int) -> int:
+    linhas = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["id", "nome", "email", "cidade", "valor", "ativo"])
+        while f.tell() < megabytes * 1024 * 1024:
+            for _ in range(10000):
+                escritor.writerow([linhas, f"Cliente {linhas}", f"cliente{linhas}@exemplo.com",
+                                   f"Cidade {linhas % 500}", f"{linhas * 1.37:.2f}", linhas % 2 == 0])
+                linhas += 1
+    return linhas
+
+
+def converter_na_memoria(origem: str, destino: str, formato: str) -> None:
+    """O que o agente fazia antes: lê tudo, monta o resultado inteiro e grava."""
+    with open(origem, newline="", encoding="utf-8") as f:
+        registros = list(csv.DictReader(f))
+    if formato == "json":
+        texto = json.dumps(registros, ensure_ascii=False, indent=2)
+    elif formato == "jsonl":
+        texto = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in registros)
+    else:
+        import xml.etree.ElementTree as ET
+        raiz = ET.Element("root")
+        for registro in registros:
+            elemento = ET.SubElement(raiz, "registro")
+            for chave, valor in registro.items():
+                ET.SubElement(elemento, chave).text = valor
+        texto = ET.tostring(raiz, encoding="unicode")
+    with open(destino, "w", encoding="utf-8") as f:
+        f.write(texto)
+
+
+def filho(modo: str, origem: str, destino: str, formato: str, trabalhadores: int) -> None:
+    import resource
+    from agenteia.core.ferramentas.conversao import converter_streaming
+
+    inicio = time.perf_counter()
+    if modo == "memoria":
+        converter_na_memoria(origem, destino, formato)
+    else:
+        converter_streaming(origem, destino, "csv", formato, trabalhadores=trabalhadores)
+    segundos = time.perf_counter() - inicio
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        pico //= 1024
+    print(json.dumps({"segundos": segundos, "pico_kb": pico}))
+
+
+def medir(modo: str, origem: str, destino: str, formato: str, trabalhadores: int = 1) -> dict:
+    saida = subprocess.run(
+        [sys.executable, __file__, "--filho", modo, origem, destino, formato, str(trabalhadores)],
+        capture_output=True, text=True, check=True, cwd=RAIZ
+    )
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da conversão de formatos")
+    parser.add_argument("--mb", type=int, default=200)
+    parser.add_argument("--trabalhadores", type=int, default=4)
+    parser.add_argument("--filho", nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        modo, origem, destino, formato, trabalhadores = args.filho
+        filho(modo, origem, destino, formato, int(trabalhadores))
+        return
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        origem = os.path.join(diretorio, "dados.csv")
+        linhas = gerar_csv(origem, args.mb)
+        megabytes = os.path.getsize(origem) / (1024 * 1024)
+        print(f"CSV com {linhas} linhas ({megabytes:.0f} MB)")
+        print(f"{'conversão':<10} {'modo':<22} {'tempo (s)':>10} {'MB/s':>8} {'pico RSS (MB)':>14}")
+        for formato in ("jsonl", "json", "xml"):
+            destino = os.path.join(diretorio, f"saida.{formato}")
+            modos = [("memoria", "na memória", 1), ("streaming", "streaming", 1),
+                     ("streaming", f"streaming x{args.trabalhadores}", args.trabalhadores)]
+            for modo, rotulo, trabalhadores in modos:
+                resultado = medir(modo, origem, destino, formato, trabalhadores)
+                print(f"csv->{formato:<5} {rotulo:<22} {resultado['segundos']:10.2f} "
+                      f"{megabytes / resultado['segundos']:8.1f} {resultado['pico_kb'] / 1024:14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark da geração de documentos em lote: documentos/s em série vs. pool de processos.
+
+Uso:
+    python benchmarks/bench_documentos.py [--documentos 500] [--trabalhadores 4]
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import docx
+
+from agenteia.core.ferramentas.documentos_lote import GeradorDocumentos
+
+
+def criar_modelo(caminho: str) -> None:
+    doc = docx.Document()
+    doc.add_heading("Relatório de {{cliente}}", 0)
+    doc.add_paragraph("Período: {{periodo}} - total de {{total}} pedidos.")
+    doc.add_paragraph("{{tabela:pedidos}}")
+    doc.add_paragraph("Atenciosamente, {{responsavel}}.")
+    doc.save(caminho)
+
+
+def registros(quantidade: int):
+    for i in range(quantidade):
+        pedidos = [{"pedido": i * 100 + j, "produto": f"item {j}", "valor": j * 1.5} for j in range(20)]
+        yield {
+            "cliente": f"Cliente {i}", "periodo": "2026-01", "total": len(pedidos),
+            "pedidos": pedidos, "responsavel": "Equipe"
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da geração de documentos em lote")
+    parser.add_argument("--documentos", type=int, default=500)
+    parser.add_argument("--trabalhadores", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        modelo = str(Path(pasta) / "modelo.docx")
+        criar_modelo(modelo)
+        print(f"{args.documentos} documentos, tabela de 20 linhas cada")
+        for trabalhadores in (1, args.trabalhadores):
+            gerador = GeradorDocumentos(trabalhadores)
+            if trabalhadores > 1:
+                gerador.aquecer()
+            try:
+                resumo = gerador.gerar(
+                    modelo, registros(args.documentos), str(Path(pasta) / f"saida_{trabalhadores}")
+                )
+            finally:
+                gerador.fechar()
+            print(f"{trabalhadores} trabalhador(es): {resumo.segundos:8.2f} s ({resumo.documentos_por_segundo:.1f} documentos/s)")
+
+
+if __name__ == "__main__":
+    main()
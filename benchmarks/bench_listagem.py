@@ -0,0 +1,55 @@
+"""
+Benchmark da listagem de diretórios: os.listdir + stat por item vs. os.scandir.
+
+Uso:
+    python benchmarks/bench_listagem.py [--arquivos 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agenteia.core.ferramentas.listagem import iterar_entradas, listar_pagina
+
+
+def listar_antigo(diretorio: str) -> int:
+    """Reproduz o laço antigo de listar_arquivos (listdir + isfile/getsize/isdir)."""
+    itens = []
+    for item in os.listdir(diretorio):
+        caminho = os.path.join(diretorio, item)
+        if os.path.isfile(caminho):
+            itens.append((item, os.path.getsize(caminho)))
+        elif os.path.isdir(caminho):
+            itens.append((item, 0))
+    return len(sorted(itens))
+
+
+def medir(funcao, *args) -> float:
+    inicio = time.perf_counter()
+    funcao(*args)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de listagem de diretórios")
+    parser.add_argument("--arquivos", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for i in range(args.arquivos):
+            with open(os.path.join(diretorio, f"arquivo_{i:06d}.txt"), "w") as f:
+                f.write("x" * (i % 100))
+
+        print(f"Diretório com {args.arquivos} arquivos")
+        print(f"listdir + isfile/getsize/isdir:   {medir(listar_antigo, diretorio):8.1f} ms")
+        print(f"scandir (todas as entradas):      {medir(lambda d: sum(1 for _ in iterar_entradas(d)), diretorio):8.1f} ms")
+        print(f"scandir + página ordenada (200):  {medir(lambda d: listar_pagina(d, limite=200), diretorio):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark do custo por chamada de log na thread da requisição.
+
+Compara o handler síncrono antigo (RotatingFileHandler + console por logger)
+com o pipeline de fila de ``agenteia.core.logs``.
+
+Uso:
+    python benchmarks/bench_logs.py [--chamadas 20000]
+"""
+
+import argparse
+import io
+import logging
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from agenteia.core import logs
+
+
+def medir(logger: logging.Logger, chamadas: int, mensagem: str) -> float:
+    """Retorna o tempo médio (µs) de uma chamada logger.info."""
+    inicio = time.perf_counter()
+    for i in range(chamadas):
+        logger.info("%s %d", mensagem, i)
+    return (time.perf_counter() - inicio) / chamadas * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de logging")
+    parser.add_argument("--chamadas", type=int, default=20000)
+    parser.add_argument("--tamanho", type=int, default=200, help="Tamanho da mensagem em caracteres")
+    args = parser.parse_args()
+
+    mensagem = "x" * args.tamanho
+    console = io.StringIO()  # evita que o terminal domine a medição
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Handler síncrono (comportamento anterior de setup_logging)
+        sincrono = logging.getLogger("bench.sincrono")
+        sincrono.propagate = False
+        sincrono.setLevel(logging.INFO)
+        formato = logging.Formatter(logs.FORMATO)
+        for handler in (
+            RotatingFileHandler(Path(diretorio) / "sincrono.log", maxBytes=10 * 1024 * 1024, backupCount=5),
+            logging.StreamHandler(console),
+        ):
+            handler.setFormatter(formato)
+            sincrono.addHandler(handler)
+        tempo_sincrono = medir(sincrono, args.chamadas, mensagem)
+
+        # Pipeline de fila
+        logs.configurar_logging({"diretorio": diretorio, "console": False, "tamanho_fila": args.chamadas * 2})
+        fila = logs.setup_logging("bench.fila")
+        fila.propagate = False
+        tempo_fila = medir(fila, args.chamadas, mensagem)
+        inicio = time.perf_counter()
+        logs.parar_logging()
+        tempo_descarga = time.perf_counter() - inicio
+
+    print(f"Chamadas: {args.chamadas} | mensagem: {args.tamanho} caracteres")
+    print(f"Síncrono (arquivo + console): {tempo_sincrono:8.2f} µs/chamada")
+    print(f"Fila (QueueHandler):          {tempo_fila:8.2f} µs/chamada")
+    print(f"Descarga da fila no encerramento: {tempo_descarga * 1000:.1f} ms")
+    print(f"Registros descartados (fila cheia): {logs._QueueHandlerDescartavel.descartados}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark da validação: registro a registro vs. schema compilado sobre colunas.
+
+Uso:
+    python benchmarks/bench_validacao.py [--linhas 1000000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from agenteia.core.ferramentas.validacao import compilar_schema
+
+SCHEMA = {
+    "id": {"tipo": "number", "obrigatorio": True, "min": 1},
+    "email": {"tipo": "string", "obrigatorio": True, "padrao": r"[^@]+@[\w.]+\.\w+"},
+    "idade": {"tipo": "number", "min": 0, "max": 120},
+    "ativo": {"tipo": "boolean"},
+}
+
+
+def gerar(linhas: int) -> pd.DataFrame:
+    aleatorio = np.random.default_rng(42)
+    emails = np.where(aleatorio.random(linhas) < 0.01, "invalido", "usuario@exemplo.com.br")
+    return pd.DataFrame({
+        "id": np.arange(linhas),
+        "email": emails,
+        "idade": aleatorio.integers(-5, 130, linhas),
+        "ativo": aleatorio.random(linhas) < 0.5,
+    })
+
+
+def medir(funcao, *args) -> float:
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da validação em lote")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--lote", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tabela = gerar(args.linhas)
+    schema = compilar_schema(SCHEMA)
+    registros = tabela.to_dict("records")
+
+    def por_registro():
+        return sum(1 for registro in registros if schema.validar_registro(registro))
+
+    def em_lotes():
+        lotes = (tabela.iloc[i:i + args.lote] for i in range(0, len(tabela), args.lote))
+        return schema.validar_lotes(lotes)
+
+    print(f"{args.linhas} linhas, {len(SCHEMA)} campos")
+    print(f"Registro a registro:       {medir(por_registro):8.2f} s")
+    print(f"Colunas (lotes de {args.lote}): {medir(em_lotes):8.2f} s")
+    print(em_lotes().formatar().splitlines()[0])
+
+
+if __name__ == "__main__":
+    main()
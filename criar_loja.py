@@ -1,4 +1,4 @@
-from ferramentas import criar_estrutura_pastas
+from agenteia.core.ferramentas.estrutura import criar_estrutura
 
 estrutura = {
     "index.html": """<!DOCTYPE html>
@@ -42,4 +42,4 @@ estrutura = {
     }
 }
 
-criar_estrutura_pastas('c:/teste', estrutura) 
\ No newline at end of file
+print(criar_estrutura('c:/teste', estrutura)) 
\ No newline at end of file
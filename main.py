@@ -8,20 +8,22 @@ import sys
 import logging
 import argparse
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 # Adicionar diretório raiz ao PYTHONPATH
 root_dir = Path(__file__).parent
 sys.path.append(str(root_dir))
 
-from agenteia.core.agente import AgenteIA
 from agenteia.core.config import CONFIG, validar_configuracoes
-from agenteia.logs import setup_logging
+from agenteia.core.logs import setup_logging
+
+if TYPE_CHECKING:
+    from agenteia.core.agente import AgenteIA
 
 # Configuração de logging
 logger = setup_logging(__name__)
 
-def inicializar_agente() -> Optional[AgenteIA]:
+def inicializar_agente() -> Optional["AgenteIA"]:
     """
     Inicializa o agente com as configurações apropriadas.
     
@@ -29,6 +31,9 @@ def inicializar_agente() -> Optional[AgenteIA]:
         AgenteIA: Instância do agente ou None se houver erro
     """
     try:
+        # Importado aqui para que `--help` não carregue LangChain/Chroma
+        from agenteia.core.agente import AgenteIA
+
         # Validar configurações
         validar_configuracoes()
         
@@ -47,7 +52,7 @@ def inicializar_agente() -> Optional[AgenteIA]:
         logger.error(f"Erro ao inicializar agente: {e}")
         return None
 
-def cli_loop(agente: AgenteIA) -> None:
+def cli_loop(agente: "AgenteIA") -> None:
     """
     Executa o loop de interação via linha de comando.
     
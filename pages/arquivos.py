@@ -4,8 +4,10 @@ Página de gerenciamento de arquivos
 
 import streamlit as st
 import os
-from pathlib import Path
-from agenteia.core.ferramentas import ListarArquivos, ListarUnidades
+from agenteia.core.ferramentas import listar_unidades
+from agenteia.core.ferramentas.listagem import ORDENACOES, TIPO_DIRETORIO, formatar_tamanho, listar_pagina
+
+ITENS_POR_PAGINA = 200
 
 st.set_page_config(
     page_title="Arquivos - AgenteIA",
@@ -18,9 +20,7 @@ st.title("📁 Gerenciamento de Arquivos")
 # Listar unidades
 st.header("💿 Unidades")
 try:
-    ferramenta = ListarUnidades()
-    unidades = ferramenta._run()
-    st.text(unidades)
+    st.text(listar_unidades())
 except Exception as e:
     st.error(f"❌ Erro ao listar unidades: {e}")
 
@@ -30,28 +30,68 @@ diretorio_atual = st.text_input(
     "Caminho do diretório",
     value=os.getcwd()
 )
+col_padrao, col_ordem, col_recursivo = st.columns([2, 1, 1])
+with col_padrao:
+    padrao = st.text_input("Filtro (glob)", value="", placeholder="*.py")
+with col_ordem:
+    ordenar_por = st.selectbox("Ordenar por", list(ORDENACOES), index=list(ORDENACOES).index("tipo"))
+with col_recursivo:
+    recursivo = st.checkbox("Incluir subpastas")
+
+# Cursores das páginas visitadas (o primeiro é None: início da listagem)
+consulta = (diretorio_atual, padrao, ordenar_por, recursivo)
+if st.session_state.get("arquivos_consulta") != consulta:
+    st.session_state["arquivos_consulta"] = consulta
+    st.session_state["arquivos_cursores"] = [None]
+cursores = st.session_state["arquivos_cursores"]
 
-if st.button("🔍 Listar Arquivos"):
-    try:
-        ferramenta = ListarArquivos()
-        arquivos = ferramenta._run(diretorio_atual)
+try:
+    pagina = listar_pagina(
+        diretorio_atual,
+        ordenar_por=ordenar_por,
+        limite=ITENS_POR_PAGINA,
+        cursor=cursores[-1],
+        recursivo=recursivo,
+        padrao=padrao or None
+    )
+    
+    # Exibir arquivos em colunas
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.markdown("### 📋 Arquivos e Pastas")
+        st.dataframe(
+            [
+                {
+                    "": "📁" if e.tipo == TIPO_DIRETORIO else "📄",
+                    "Caminho": e.caminho,
+                    "Tamanho": "" if e.tipo == TIPO_DIRETORIO else formatar_tamanho(e.tamanho),
+                }
+                for e in pagina.entradas
+            ],
+            use_container_width=True
+        )
+        anterior, proxima = st.columns(2)
+        with anterior:
+            if len(cursores) > 1 and st.button("⬅️ Página anterior"):
+                cursores.pop()
+                st.rerun()
+        with proxima:
+            if pagina.proximo_cursor and st.button("Próxima página ➡️"):
+                cursores.append(pagina.proximo_cursor)
+                st.rerun()
         
-        # Exibir arquivos em colunas
-        col1, col2 = st.columns([3, 1])
+    with col2:
+        st.markdown("### 📊 Informações")
+        st.info(f"""
+        - Arquivos: {pagina.total_arquivos}
+        - Pastas: {pagina.total_diretorios}
+        - Tamanho total: {formatar_tamanho(pagina.tamanho_total)}
+        - Página: {len(cursores)}
+        """)
         
-        with col1:
-            st.markdown("### 📋 Arquivos e Pastas")
-            st.text(arquivos)
-            
-        with col2:
-            st.markdown("### 📊 Informações")
-            st.info(f"""
-            - Total de itens: {len(arquivos.split('\\n'))}
-            - Diretório atual: {diretorio_atual}
-            """)
-            
-    except Exception as e:
-        st.error(f"❌ Erro ao listar arquivos: {e}")
+except Exception as e:
+    st.error(f"❌ Erro ao listar arquivos: {e}")
 
 # Ações
 st.header("⚡ Ações")
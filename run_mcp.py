@@ -10,8 +10,6 @@ import argparse
 # Adicionar diretório raiz ao PYTHONPATH
 sys.path.append(str(Path(__file__).parent))
 
-from agenteia.core.mcp.api import iniciar_servidor
-
 def main():
     """Função principal."""
     parser = argparse.ArgumentParser(description="Iniciar MCP Server")
@@ -39,6 +37,9 @@ def main():
     if args.config:
         os.environ["MCP_CONFIG"] = args.config
         
+    # Importado após o parse para que `--help` responda sem carregar FastAPI e o servidor
+    from agenteia.core.mcp.api import iniciar_servidor
+
     print(f"Iniciando MCP Server em {args.host}:{args.porta}")
     iniciar_servidor(host=args.host, porta=args.porta)
     
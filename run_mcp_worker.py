@@ -0,0 +1,97 @@
+"""
+Script para iniciar workers do MCP Server.
+
+Os workers consomem a fila persistente de tarefas, de modo que tarefas
+enfileiradas sobrevivem a reinícios do servidor e podem ser distribuídas
+entre vários processos.
+"""
+
+import os
+import sys
+from pathlib import Path
+import argparse
+import multiprocessing
+
+# Adicionar diretório raiz ao PYTHONPATH
+sys.path.append(str(Path(__file__).parent))
+
+from agenteia.core.mcp.fila import FilaTarefas
+from agenteia.core.mcp.worker import WorkerMCP, carregar_config_mcp, carregar_ferramentas_padrao
+
+def iniciar_worker(config_path, worker_id, intervalo, max_tarefas):
+    """Executa um worker no processo atual."""
+    config_mcp = carregar_config_mcp(config_path)
+    fila = FilaTarefas.de_config(config_mcp)
+    worker = WorkerMCP(
+        fila,
+        carregar_ferramentas_padrao(),
+        worker_id=worker_id,
+        intervalo_poll=intervalo or config_mcp.get("fila", {}).get("intervalo_poll", 1.0)
+    )
+    try:
+        worker.executar(max_tarefas=max_tarefas)
+    except KeyboardInterrupt:
+        worker.parar()
+    finally:
+        fila.fechar()
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description="Iniciar workers do MCP Server")
+    parser.add_argument(
+        "--config",
+        type=str,
+        help="Caminho para arquivo de configuração"
+    )
+    parser.add_argument(
+        "--worker-id",
+        type=str,
+        help="Identificador do worker (padrão: host-pid)"
+    )
+    parser.add_argument(
+        "--intervalo",
+        type=float,
+        help="Intervalo de consulta à fila quando vazia, em segundos"
+    )
+    parser.add_argument(
+        "--max-tarefas",
+        type=int,
+        help="Encerrar após processar este número de tarefas"
+    )
+    parser.add_argument(
+        "--processos",
+        type=int,
+        default=1,
+        help="Número de processos worker (padrão: 1)"
+    )
+
+    args = parser.parse_args()
+
+    if args.config:
+        os.environ["MCP_CONFIG"] = args.config
+
+    if args.processos <= 1:
+        print("Iniciando worker do MCP Server")
+        iniciar_worker(args.config, args.worker_id, args.intervalo, args.max_tarefas)
+        return
+
+    print(f"Iniciando {args.processos} workers do MCP Server")
+    processos = []
+    for i in range(args.processos):
+        worker_id = f"{args.worker_id}-{i}" if args.worker_id else None
+        processo = multiprocessing.Process(
+            target=iniciar_worker,
+            args=(args.config, worker_id, args.intervalo, args.max_tarefas)
+        )
+        processo.start()
+        processos.append(processo)
+
+    try:
+        for processo in processos:
+            processo.join()
+    except KeyboardInterrupt:
+        for processo in processos:
+            processo.terminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import pytest
+
+from agenteia.core.amostrador import AmostradorSistema, BufferCircular
+
+def test_buffer_circular_descarta_mais_antigos():
+    buffer = BufferCircular(3)
+    assert buffer.ultimo() is None
+    for valor in range(5):
+        buffer.adicionar(valor)
+    assert len(buffer) == 3
+    assert buffer.valores() == [2.0, 3.0, 4.0]
+    assert buffer.valores(2) == [3.0, 4.0]
+    assert buffer.ultimo() == 4.0
+
+def test_buffer_circular_capacidade_invalida():
+    with pytest.raises(ValueError):
+        BufferCircular(0)
+
+def coletor_falso():
+    contador = {"n": 0}
+
+    def coletar(top_n):
+        contador["n"] += 1
+        n = contador["n"]
+        return {
+            "cpu_percent": 10.0 * n,
+            "cpu_nucleos": 4,
+            "memoria_percent": 50.0,
+            "memoria_total": 1000,
+            "memoria_disponivel": 500,
+            "disco_percent": 20.0,
+            "disco_total": 100,
+            "disco_livre": 80,
+            "rede_bytes_enviados": 1000 * n,
+            "rede_bytes_recebidos": 2000 * n,
+            "processos": [{"pid": 1, "name": "init", "cpu_percent": 0.0}][:top_n],
+        }
+    return coletar
+
+def test_amostrador_series_e_janela():
+    amostrador = AmostradorSistema(capacidade=2, coletor=coletor_falso())
+    for _ in range(3):
+        amostrador.amostrar()
+
+    serie = amostrador.serie()
+    assert serie["cpu_percent"] == [20.0, 30.0]
+    assert len(serie["timestamp"]) == 2
+    assert all(v >= 0 for v in serie["rede_envio_bps"])
+
+    janela = amostrador.janela(60)
+    assert janela["amostras"] == 2
+    assert janela["cpu_percent"] == {"min": 20.0, "max": 30.0, "media": 25.0, "ultimo": 30.0}
+
+def test_ultimo_coleta_quando_vazio():
+    amostrador = AmostradorSistema(coletor=coletor_falso())
+    ultimo = amostrador.ultimo()
+    assert ultimo["cpu_percent"] == 10.0
+    assert ultimo["processos"][0]["pid"] == 1
+    assert ultimo["idade_segundos"] >= 0
+
+def test_obter_amostrador_sem_iniciar(monkeypatch):
+    from agenteia.core import amostrador as modulo
+    monkeypatch.setattr(modulo, "_amostrador", None)
+    amostrador = modulo.obter_amostrador(iniciar=False, coletor=coletor_falso())
+    try:
+        assert amostrador._thread is None
+        assert modulo.obter_amostrador(iniciar=False) is amostrador
+    finally:
+        amostrador.parar()
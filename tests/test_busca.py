@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from agenteia.core.exceptions import ValidationError
+from agenteia.core.ferramentas.busca import IndiceBusca, trigramas, trigramas_da_consulta
+
+@pytest.fixture
+def workspace(tmp_path):
+    raiz = tmp_path / "ws"
+    (raiz / "pacote").mkdir(parents=True)
+    (raiz / "node_modules").mkdir()
+    (raiz / "pacote" / "modelo.py").write_text("import os\n\nclass Usuario:\n    pass\n")
+    (raiz / "pacote" / "servico.py").write_text("from .modelo import Usuario\n\ndef criar():\n    return Usuario()\n")
+    (raiz / "leia.md").write_text("Documentação do projeto\n")
+    (raiz / "node_modules" / "dep.js").write_text("class Usuario {}\n")
+    (raiz / "imagem.bin").write_bytes(b"\0Usuario")
+    return raiz
+
+@pytest.fixture
+def indice(workspace, tmp_path):
+    indice = IndiceBusca(str(workspace), str(tmp_path / "indice.sqlite3"), ignorar=["node_modules"])
+    yield indice
+    indice.fechar()
+
+def test_trigramas_da_consulta_regex():
+    assert trigramas_da_consulta("class Usu", regex=False) == trigramas(b"class usu")
+    assert trigramas_da_consulta(r"def \w+\(", regex=True) == trigramas(b"def ")
+    # Alternativas não garantem nenhum trecho literal
+    assert trigramas_da_consulta("abc|xyz", regex=True) == set()
+
+def test_busca_literal_e_regex(indice):
+    ocorrencias = indice.buscar("class Usuario")
+    assert [(o.caminho, o.linha) for o in ocorrencias] == [("pacote/modelo.py", 3)]
+    ocorrencias = indice.buscar(r"Usuario\(\)", regex=True, contexto=1)
+    assert ocorrencias[0].caminho == "pacote/servico.py"
+    assert ocorrencias[0].antes == ["def criar():"]
+    assert indice.candidatos(trigramas(b"documenta")) == ["leia.md"]
+    with pytest.raises(ValidationError):
+        indice.buscar("(", regex=True)
+
+def test_atualizacao_incremental(indice, workspace):
+    assert indice.atualizar()["arquivos"] == 4
+    assert indice.atualizar()["indexados"] == 0
+
+    arquivo = workspace / "pacote" / "modelo.py"
+    arquivo.write_text("class Cliente:\n    pass\n")
+    os.utime(arquivo, ns=(1, 1))
+    (workspace / "leia.md").unlink()
+    assert indice.atualizar() == {"arquivos": 3, "indexados": 1, "removidos": 1}
+    assert indice.buscar("class Usuario") == []
+    assert indice.buscar("Cliente", padrao_arquivos="*.py")[0].linha == 1
+
+def test_escritas_das_ferramentas_invalidam_o_indice(workspace, tmp_path, monkeypatch):
+    from agenteia.core.ferramentas import busca
+    from agenteia.core.ferramentas.arquivos import escrever_arquivo
+    from agenteia.core.ferramentas.edicao import editar_arquivo
+    monkeypatch.setattr(busca, "_indices", {})
+    indice = busca.obter_indice(str(workspace), str(tmp_path / "indice.sqlite3"))
+    indice.intervalo_atualizacao = 3600
+    assert indice.buscar("Fornecedor") == []
+
+    escrever_arquivo(str(workspace / "pacote" / "novo.py"), "class Fornecedor:\n    pass\n")
+    editar_arquivo(f"{workspace / 'leia.md'}\n<<<<<<< BUSCAR\nDocumentação do projeto\n=======\nGuia do projeto\n>>>>>>> SUBSTITUIR\n")
+    assert [o.caminho for o in indice.buscar("Fornecedor")] == ["pacote/novo.py"]
+    assert [o.caminho for o in indice.buscar("guia", ignorar_maiusculas=True)] == ["leia.md"]
+    assert indice.buscar("Documentação") == []
+    indice.fechar()
+
+def test_operacoes_em_arvore_invalidam_o_indice(workspace, tmp_path, monkeypatch):
+    from agenteia.core.ferramentas import busca
+    from agenteia.core.ferramentas.arquivos import remover_arquivo
+    from agenteia.core.ferramentas.operacoes_lote import copiar_arvore, mover_arvore, remover_arvore
+    monkeypatch.setattr(busca, "_indices", {})
+    indice = busca.obter_indice(str(workspace), str(tmp_path / "indice.sqlite3"))
+    indice.intervalo_atualizacao = 3600
+    assert len(indice.buscar("class Usuario")) == 1
+
+    copiar_arvore(str(workspace / "pacote"), str(workspace / "copia"))
+    assert len(indice.buscar("class Usuario")) == 2
+    mover_arvore(str(workspace / "copia"), str(workspace / "movido"))
+    assert sorted(o.caminho for o in indice.buscar("class Usuario")) == ["movido/modelo.py", "pacote/modelo.py"]
+    remover_arvore(str(workspace / "movido"))
+    remover_arquivo(str(workspace / "pacote" / "servico.py"))
+    assert [o.caminho for o in indice.buscar("Usuario")] == ["pacote/modelo.py"]
+    indice.fechar()
+
+def test_atualizacao_completa_em_segundo_plano(indice, workspace):
+    indice.atualizar()
+    (workspace / "externo.txt").write_text("alterado fora das ferramentas\n")
+    indice.intervalo_atualizacao = 0
+    indice.buscar("qualquer")
+    indice._thread_atualizacao.join(5)
+    assert indice.buscar("fora das ferramentas")[0].caminho == "externo.txt"
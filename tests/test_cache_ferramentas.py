@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from agenteia.core.ferramentas.cache import CacheResultados, cache_resultados
+from agenteia.core.ferramentas.registro import registro_ferramentas
+
+@pytest.fixture
+def cache_global():
+    cache_resultados.configurar({"habilitado": True, "desabilitadas": []})
+    cache_resultados.limpar()
+    yield cache_resultados
+    cache_resultados.configurar({"desabilitadas": []})
+    cache_resultados.limpar()
+
+def test_lru_respeita_limite_de_bytes():
+    cache = CacheResultados(max_bytes=2000)
+    for i in range(5):
+        cache.guardar(f"k{i}", "ler_arquivo", "x" * 500)
+    cache.obter("k2")
+    cache.guardar("k5", "ler_arquivo", "x" * 500)
+    assert cache.estatisticas()["bytes"] <= 2000
+    assert cache.obter("k2")[0]
+    assert not cache.obter("k0")[0]
+
+def test_entrada_validada_por_mtime_e_tamanho(tmp_path):
+    arquivo = tmp_path / "a.txt"
+    arquivo.write_text("um")
+    cache = CacheResultados()
+    cache.guardar("k", "ler_arquivo", "um", caminhos=[str(arquivo)])
+    assert cache.obter("k") == (True, "um")
+    arquivo.write_text("dois")
+    assert cache.obter("k") == (False, None)
+
+def test_ttl_expira():
+    cache = CacheResultados()
+    cache.guardar("k", "pesquisar_web", "resultado", ttl=0.01)
+    time.sleep(0.02)
+    assert not cache.obter("k")[0]
+
+def test_invalidacao_de_caminho_afeta_listagem_do_diretorio(tmp_path):
+    cache = CacheResultados()
+    cache.guardar("lista", "listar_arquivos", "...", caminhos=[str(tmp_path)])
+    cache.guardar("outro", "ler_arquivo", "...", caminhos=[str(tmp_path.parent / "fora.txt")])
+    assert cache.invalidar_caminhos([str(tmp_path / "novo.txt")]) == 1
+    assert cache.estatisticas()["entradas"] == 1
+
+def test_cache_sem_metricas_nao_altera_gauge_nem_contadores(monkeypatch):
+    from agenteia.core.ferramentas import cache as modulo_cache
+    publicados = []
+
+    class Registro:
+        def set(self, valor):
+            publicados.append(("bytes", valor))
+
+        def labels(self, *rotulos):
+            publicados.append(rotulos)
+            return self
+
+        def inc(self):
+            pass
+
+    monkeypatch.setattr(modulo_cache, "CACHE_FERRAMENTAS_BYTES", Registro())
+    monkeypatch.setattr(modulo_cache, "CACHE_FERRAMENTAS", Registro())
+    interno = CacheResultados(metricas=False)
+    interno.guardar("k", "verificar_url", "ok")
+    interno.obter("k")
+    interno.obter("outra", "verificar_url")
+    interno.limpar()
+    assert publicados == []
+
+    CacheResultados().guardar("k", "ler_arquivo", "ok")
+    assert publicados and publicados[-1][0] == "bytes"
+
+def test_ferramentas_do_registro_usam_e_invalidam_cache(tmp_path, cache_global):
+    arquivo = str(tmp_path / "notas.txt")
+    ler = registro_ferramentas.obter("ler_arquivo").chamador()
+    escrever = registro_ferramentas.obter("escrever_arquivo").chamador()
+
+    escrever(caminho_do_arquivo=arquivo, conteudo_para_escrever="v1")
+    assert ler(caminho=arquivo) == "v1"
+    assert ler(caminho=arquivo) == "v1"
+    assert cache_global.estatisticas()["acertos"] == 1
+
+    escrever(caminho_do_arquivo=arquivo, conteudo_para_escrever="v2")
+    assert cache_global.estatisticas()["entradas"] == 0
+    assert ler(caminho=arquivo) == "v2"
+
+def test_ferramenta_desabilitada_nao_usa_cache(tmp_path, cache_global):
+    cache_global.configurar({"desabilitadas": ["ler_arquivo"]})
+    arquivo = tmp_path / "b.txt"
+    arquivo.write_text("b")
+    ler = registro_ferramentas.obter("ler_arquivo").chamador()
+    ler(caminho=str(arquivo))
+    ler(caminho=str(arquivo))
+    assert cache_global.estatisticas()["entradas"] == 0
+
+def test_listagens_nao_usam_cache(tmp_path, cache_global):
+    listar = registro_ferramentas.obter("listar_arquivos").chamador()
+    (tmp_path / "sub").mkdir()
+    listar(diretorio=str(tmp_path), recursivo=True)
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    assert "b.txt" in listar(diretorio=str(tmp_path), recursivo=True)
+    assert cache_global.estatisticas()["entradas"] == 0
+
+def test_editar_arquivo_invalida_so_os_arquivos_editados(tmp_path, cache_global):
+    editado, outro = tmp_path / "a.txt", tmp_path / "b.txt"
+    editado.write_text("um\n")
+    outro.write_text("dois\n")
+    ler = registro_ferramentas.obter("ler_arquivo").chamador()
+    ler(caminho=str(editado))
+    ler(caminho=str(outro))
+    editar = registro_ferramentas.obter("editar_arquivo").chamador()
+    editar(edicoes=f"{editado}\n<<<<<<< BUSCAR\num\n=======\nuno\n>>>>>>> SUBSTITUIR\n")
+    assert cache_global.estatisticas()["entradas"] == 1
+    assert ler(caminho=str(editado)) == "uno\n"
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agenteia.core.ferramentas.coleta_web import (
+    CacheHTTP, ColetorWeb, EntradaCache, LimitadorHost, extrair_texto_html
+)
+
+PAGINA = b"<html><head><style>p{}</style><script>var x;</script></head><body>\n<h1>Titulo</h1>\n<p>Texto  da pagina</p>\n</body></html>"
+
+def _tem(modulo):
+    try:
+        __import__(modulo)
+        return True
+    except ImportError:
+        return False
+
+class Servidor(BaseHTTPRequestHandler):
+    """Servidor local: responde com ETag (304 quando o ETag confere); /lenta/N demora 0,2 s."""
+    requisicoes = []
+    simultaneas = 0
+    max_simultaneas = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with Servidor.lock:
+            Servidor.requisicoes.append((self.path, self.headers.get("If-None-Match")))
+            Servidor.simultaneas += 1
+            Servidor.max_simultaneas = max(Servidor.max_simultaneas, Servidor.simultaneas)
+        try:
+            if self.path.startswith("/lenta"):
+                time.sleep(0.2)
+            if self.path == "/ausente":
+                self.send_response(404)
+                self.end_headers()
+                return
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(PAGINA)))
+            self.end_headers()
+            self.wfile.write(PAGINA)
+        finally:
+            with Servidor.lock:
+                Servidor.simultaneas -= 1
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def servidor():
+    Servidor.requisicoes = []
+    Servidor.max_simultaneas = 0
+    http = ThreadingHTTPServer(("127.0.0.1", 0), Servidor)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{http.server_address[1]}"
+    http.shutdown()
+
+def test_cache_em_disco_guarda_validadores(tmp_path):
+    cache = CacheHTTP(str(tmp_path), max_bytes=300)
+    assert cache.obter("http://a/") is None
+    cache.guardar(EntradaCache("http://a/", '"v1"', None, "text/html", "utf-8", b"x" * 100))
+    entrada = cache.obter("http://a/")
+    assert entrada.etag == '"v1"' and entrada.corpo == b"x" * 100
+    time.sleep(0.01)
+    cache.guardar(EntradaCache("http://b/", None, "Mon, 01 Jan 2024", None, None, b"y" * 100))
+    cache.podar()
+    assert cache.obter("http://a/") is None and cache.obter("http://b/").modificado == "Mon, 01 Jan 2024"
+
+def test_limitador_espaca_requisicoes_ao_mesmo_host():
+    async def cenario():
+        limitador = LimitadorHost(max_por_host=2, intervalo=0.05)
+        inicios = []
+        simultaneas = [0, 0]
+
+        async def requisicao(host):
+            async with limitador.reservar(host):
+                inicios.append((host, time.monotonic()))
+                simultaneas[0] += 1
+                simultaneas[1] = max(simultaneas[1], simultaneas[0])
+                await asyncio.sleep(0.1)
+                simultaneas[0] -= 1
+
+        await asyncio.gather(*(requisicao("a") for _ in range(4)), requisicao("b"))
+        return inicios, simultaneas[1]
+
+    inicios, max_simultaneas = asyncio.run(cenario())
+    tempos = [t for host, t in inicios if host == "a"]
+    assert all(b - a >= 0.045 for a, b in zip(tempos, tempos[1:]))
+    assert max_simultaneas <= 3
+
+def test_extracao_descarta_scripts_e_estilos():
+    if not (_tem("lxml") or _tem("bs4")):
+        pytest.skip("lxml ou bs4 necessário")
+    texto = extrair_texto_html(PAGINA, "utf-8")
+    assert texto == "Titulo\nTexto\nda pagina"
+    assert extrair_texto_html(b"  ") == ""
+
+def test_lote_paralelo_com_cache_condicional(servidor, tmp_path):
+    pytest.importorskip("aiohttp")
+    if not (_tem("lxml") or _tem("bs4")):
+        pytest.skip("lxml ou bs4 necessário")
+    coletor = ColetorWeb(max_por_host=2, intervalo_por_host=0, cache=CacheHTTP(str(tmp_path)))
+    try:
+        urls = [f"{servidor}/lenta/{i}" for i in range(6)] + [f"{servidor}/ausente"]
+        respostas = coletor.extrair_lote(urls)
+        assert [r.url for r in respostas] == urls
+        assert all(r.texto == "Titulo\nTexto\nda pagina" and not r.do_cache for r in respostas[:6])
+        assert respostas[6].erro == "HTTP 404 Not Found"
+        assert Servidor.max_simultaneas <= 2
+
+        segunda = coletor.extrair_lote([urls[0]])[0]
+        assert segunda.do_cache and segunda.status == 304 and segunda.texto == respostas[0].texto
+        assert Servidor.requisicoes[-1] == ("/lenta/0", '"v1"')
+    finally:
+        coletor.fechar()
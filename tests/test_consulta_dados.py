@@ -0,0 +1,99 @@
+import pytest
+
+from agenteia.core.exceptions import ValidationError
+from agenteia.core.ferramentas.consulta_dados import Consulta, consultar, executar_consulta
+
+CSV = (
+    "uf,cidade,valor,ativo\n"
+    "SP,Santos,10,true\n"
+    "SP,Campinas,30.5,false\n"
+    "RJ,Niterói,7,true\n"
+    "MG,Uberaba,,true\n"
+    "RJ,Petrópolis,100,true\n"
+)
+
+@pytest.fixture
+def arquivo(tmp_path):
+    caminho = tmp_path / "vendas.csv"
+    caminho.write_text(CSV, encoding="utf-8")
+    return str(caminho)
+
+def test_agregacao_em_uma_passada(arquivo):
+    resultado = consultar(
+        arquivo, agrupar_por="uf", filtros=["ativo == true"],
+        metricas={"total": "soma(valor)", "media": "media(valor)", "n": "contagem()", "maior": "max(valor)"},
+        ordenar_por="total", decrescente=True, motor="python"
+    )
+    assert resultado.colunas == ["uf", "total", "media", "n", "maior"]
+    assert resultado.linhas == [
+        {"uf": "RJ", "total": 107, "media": 53.5, "n": 2, "maior": 100},
+        {"uf": "SP", "total": 10, "media": 10.0, "n": 1, "maior": 10},
+        {"uf": "MG", "total": None, "media": None, "n": 1, "maior": None},
+    ]
+    assert resultado.linhas_lidas == 5
+
+def test_filtros_projecao_ordem_e_limite(arquivo):
+    resultado = consultar(
+        arquivo, colunas=["cidade"], filtros={"uf": ["SP", "RJ"], "valor": {">": 8}},
+        ordenar_por="valor", limite=2, motor="python"
+    )
+    assert resultado.linhas == [{"cidade": "Santos"}, {"cidade": "Campinas"}]
+    # Sem ordenação a leitura para no limite
+    assert consultar(arquivo, limite=1, motor="python").linhas_lidas == 1
+    tabela = consultar(arquivo, colunas="cidade,valor", filtros=["cidade contem polis"], motor="python").formatar()
+    assert tabela.splitlines()[:3] == ["| cidade | valor |", "|---|---|", "| Petrópolis | 100 |"]
+
+def test_parametros_invalidos(arquivo):
+    with pytest.raises(ValidationError):
+        Consulta.criar(metricas={"x": "mediana(valor)"})
+    with pytest.raises(ValidationError):
+        Consulta.criar(filtros=["valor ~ 3"])
+    with pytest.raises(ValidationError):
+        Consulta.criar(agrupar_por=["uf"], metricas={"total": "soma(valor)"}, ordenar_por="valor")
+    with pytest.raises(ValidationError):
+        consultar(arquivo.replace(".csv", ".parquet"))
+
+def test_agregar_e_filtrar_listas_de_dicionarios():
+    from agenteia.core.ferramentas.dados import agregar_dados, filtrar_dados
+    dados = [{"tipo": "a", "v": 1, "w": 5}, {"tipo": "b", "v": 2, "w": 6}, {"tipo": "a", "v": 3, "w": 7}]
+    resultado = agregar_dados(dados, ["tipo"], {"v": "soma", "maior_w": "max(w)"})
+    assert resultado["resultados"] == [{"tipo": "a", "v": 4, "maior_w": 7}, {"tipo": "b", "v": 2, "maior_w": 6}]
+    filtrados = filtrar_dados(dados, {"filtros": {"tipo": "a"}, "ordenacao": {"campo": "v", "ascendente": False}})
+    assert [d["v"] for d in filtrados] == [3, 1]
+    colunas, linhas, lidos = executar_consulta(iter(dados), Consulta.criar(metricas=["contagem()"]))
+    assert linhas == [{"contagem()": 3}] and lidos == 3
+    with pytest.raises(ValidationError, match="total"):
+        agregar_dados(dados, ["tipo"], {"total": "soma"})
+
+def test_motor_pyarrow_equivale_ao_python(arquivo):
+    pytest.importorskip("pyarrow")
+    parametros = dict(
+        agrupar_por=["uf"], filtros=["valor >= 7"], metricas={"total": "soma(valor)", "n": "contagem()"},
+        ordenar_por="uf"
+    )
+    arrow = consultar(arquivo, motor="pyarrow", **parametros)
+    python = consultar(arquivo, motor="python", **parametros)
+    assert arrow.linhas == python.linhas
+    # Linha com valor nulo (MG), "!=" e literal booleano em texto
+    consultas = [
+        dict(agrupar_por=["uf"], metricas={"total": "soma(valor)", "n": "contagem(valor)"}, ordenar_por="uf"),
+        dict(colunas=["cidade"], filtros=["valor != 10"], ordenar_por="cidade"),
+        dict(colunas=["cidade"], filtros={"ativo": "true", "uf": {"nao_in": ["RJ"]}}, ordenar_por="cidade"),
+    ]
+    for parametros in consultas:
+        arrow = consultar(arquivo, motor="pyarrow", **parametros)
+        python = consultar(arquivo, motor="python", **parametros)
+        assert arrow.linhas == python.linhas and python.linhas
+
+@pytest.mark.parametrize("motor", ["python", "pyarrow"])
+def test_literal_convertido_para_o_tipo_da_coluna(tmp_path, motor):
+    if motor == "pyarrow":
+        pytest.importorskip("pyarrow")
+    caminho = tmp_path / "anos.csv"
+    caminho.write_text("ano,data,nome\n2024,2024-03-01,a\n2023,2023-03-01,\n", encoding="utf-8")
+    resultado = consultar(str(caminho), filtros={"ano": "2024"}, motor=motor)
+    assert resultado.linhas == [{"ano": 2024, "data": "2024-03-01", "nome": "a"}]
+    assert consultar(str(caminho), filtros=["data < 2024-01-01"], motor=motor).linhas == [
+        {"ano": 2023, "data": "2023-03-01", "nome": None}
+    ]
+    assert consultar(str(caminho), filtros={"ano": ["2023", "x"]}, motor=motor).linhas[0]["ano"] == 2023
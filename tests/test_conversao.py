@@ -0,0 +1,87 @@
+import io
+import json
+import os
+
+import pytest
+
+from agenteia.core.exceptions import ValidationError
+from agenteia.core.ferramentas.conversao import converter_streaming, ler_json, ler_xml
+
+def test_csv_para_jsonl_e_de_volta(tmp_path):
+    origem = tmp_path / "dados.csv"
+    origem.write_text("id,nome\n1,Ana\n2,\"Silva, João\"\n", encoding="utf-8")
+    resumo = converter_streaming(str(origem), str(tmp_path / "dados.jsonl"), tamanho_lote=1)
+    assert resumo.registros == 2 and resumo.formato_destino == "jsonl"
+    linhas = (tmp_path / "dados.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(l) for l in linhas] == [{"id": "1", "nome": "Ana"}, {"id": "2", "nome": "Silva, João"}]
+
+    converter_streaming(str(tmp_path / "dados.jsonl"), str(tmp_path / "copia.csv"))
+    assert (tmp_path / "copia.csv").read_text(encoding="utf-8") == origem.read_text(encoding="utf-8")
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+def test_array_json_lido_em_blocos_pequenos():
+    registros = [{"n": i, "texto": "x" * (i % 7), "lista": [i, {"a": None}]} for i in range(50)] + [12345]
+    texto = json.dumps(registros, indent=1)
+    lidos = list(ler_json(io.StringIO(texto), tamanho_bloco=8))
+    assert lidos == registros[:-1] + [{"valor": 12345}]
+    assert list(ler_json(io.StringIO(" [ ] "))) == []
+    assert list(ler_json(io.StringIO('{"a": 1}'))) == [{"a": 1}]
+    with pytest.raises(ValidationError):
+        list(ler_json(io.StringIO('[{"a": 1} {"b": 2}]'), tamanho_bloco=4))
+
+def test_array_de_numeros_em_qualquer_tamanho_de_bloco():
+    texto = '[12345678901234567890, 1.5e10, -0.25, 3E-2, 7]'
+    for tamanho_bloco in range(1, 41):
+        assert list(ler_json(io.StringIO(texto), tamanho_bloco=tamanho_bloco)) == [
+            {"valor": 12345678901234567890}, {"valor": 1.5e10}, {"valor": -0.25}, {"valor": 3e-2}, {"valor": 7}
+        ]
+
+def test_json_invalido_falha_sem_ler_o_resto():
+    for texto in ('[{"a": 1}, {oops}, ', '{oops} '):
+        arquivo = io.StringIO(texto + '{"b": 2}, ' * 100000 + "]")
+        with pytest.raises(ValidationError):
+            list(ler_json(arquivo, tamanho_bloco=64))
+        assert arquivo.tell() <= 128
+    assert list(ler_json(io.StringIO("42"), tamanho_bloco=1)) == [{"valor": 42}]
+
+def test_tsv_usa_tabulacao_e_permissao_padrao(tmp_path):
+    from agenteia.core.ferramentas.gravacao import umask_atual
+    origem = tmp_path / "dados.tsv"
+    origem.write_text("id\tnome\n1\tSilva, Ana\n", encoding="utf-8")
+    converter_streaming(str(origem), str(tmp_path / "dados.jsonl"))
+    assert json.loads((tmp_path / "dados.jsonl").read_text(encoding="utf-8")) == {"id": "1", "nome": "Silva, Ana"}
+    converter_streaming(str(tmp_path / "dados.jsonl"), str(tmp_path / "copia.tsv"))
+    assert (tmp_path / "copia.tsv").read_text(encoding="utf-8") == origem.read_text(encoding="utf-8")
+    assert os.stat(tmp_path / "copia.tsv").st_mode & 0o777 == 0o666 & ~umask_atual()
+
+def test_xml_registros_com_atributos_e_repeticoes():
+    xml = (
+        '<pedidos><pedido id="1"><item>a</item><item>b</item><total>3</total></pedido>'
+        '<pedido id="2"><cliente tipo="pj">ACME</cliente></pedido></pedidos>'
+    )
+    registros = list(ler_xml(io.BytesIO(xml.encode())))
+    assert registros == [
+        {"@id": "1", "item": ["a", "b"], "total": "3"},
+        {"@id": "2", "cliente": {"@tipo": "pj", "#texto": "ACME"}},
+    ]
+    aninhado = b"<r><grupo><pedido id='9'/></grupo><pedido id='10'/></r>"
+    assert list(ler_xml(io.BytesIO(aninhado), tag_registro="pedido")) == [{"@id": "9"}, {"@id": "10"}]
+
+def test_paralelo_gera_a_mesma_saida(tmp_path):
+    origem = tmp_path / "dados.jsonl"
+    origem.write_text("".join(json.dumps({"id": i, "dados": {"v": i * 2}}) + "\n" for i in range(1000)))
+    for formato in ("json", "xml", "csv"):
+        converter_streaming(str(origem), str(tmp_path / f"seq.{formato}"), tamanho_lote=64)
+        converter_streaming(str(origem), str(tmp_path / f"par.{formato}"), tamanho_lote=64, trabalhadores=2)
+        assert (tmp_path / f"seq.{formato}").read_bytes() == (tmp_path / f"par.{formato}").read_bytes()
+    assert len(json.loads((tmp_path / "par.json").read_text())) == 1000
+    assert list(ler_xml(str(tmp_path / "seq.xml")))[1] == {"id": "1", "dados": {"v": "2"}}
+
+def test_converter_formato_grava_no_caminho_de_saida(tmp_path):
+    from agenteia.core.ferramentas.dados import converter_formato
+    origem = tmp_path / "dados.json"
+    origem.write_text('[{"a": 1}, {"a": 2, "b": 3}]')
+    resumo = converter_formato(str(origem), "json", "csv", caminho_saida=str(tmp_path / "saida.csv"))
+    assert "2 registro(s)" in resumo
+    # Colunas: união das chaves do primeiro lote
+    assert (tmp_path / "saida.csv").read_text() == "a,b\n1,\n2,3\n"
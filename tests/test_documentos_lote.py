@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from agenteia.core.exceptions import ValidationError
+from agenteia.core.ferramentas.documentos_lote import (
+    CacheModelos, ESTILO_TITULO, GeradorDocumentos, abrir_modelo, preencher_documento
+)
+
+@pytest.fixture
+def modelo(tmp_path):
+    doc = docx.Document()
+    doc.add_paragraph("Cliente: {{nome}} - total {{pedido.total}}")
+    dividido = doc.add_paragraph()
+    dividido.add_run("Cidade: {{cid")
+    dividido.add_run("ade}}")
+    doc.add_paragraph("{{tabela:itens}}")
+    doc.sections[0].footer.add_paragraph("Rodapé de {{nome}}")
+    caminho = tmp_path / "modelo.docx"
+    doc.save(str(caminho))
+    return str(caminho)
+
+def test_preenche_marcadores_e_tabela(modelo):
+    registro = {
+        "nome": "Ana", "pedido": {"total": 10}, "cidade": "Santos",
+        "itens": [{"produto": "caneta", "qtd": 2}, {"produto": "{{nome}}", "qtd": 1}]
+    }
+    doc = preencher_documento(abrir_modelo(modelo), registro)
+    assert [p.text for p in doc.paragraphs] == ["Cliente: Ana - total 10", "Cidade: Santos"]
+    # Os dados da tabela não são tratados como marcadores
+    assert [[c.text for c in linha.cells] for linha in doc.tables[0].rows] == [
+        ["produto", "qtd"], ["caneta", "2"], ["{{nome}}", "1"]
+    ]
+    assert doc.sections[0].footer.paragraphs[-1].text == "Rodapé de Ana"
+
+def test_cache_reutiliza_modelo_ate_mudar(modelo):
+    cache = CacheModelos()
+    primeiro = cache.obter(modelo)
+    assert cache.obter(modelo) is primeiro
+    doc = docx.Document()
+    doc.add_paragraph("outro modelo, maior que o anterior")
+    doc.save(modelo)
+    assert cache.obter(modelo) != primeiro
+    assert cache.base() is cache.base()
+
+def test_lote_em_paralelo_com_falhas(modelo, tmp_path):
+    registros = [{"nome": f"C{i}", "pedido": {"total": i}, "cidade": "X", "itens": []} for i in range(5)]
+    registros.insert(2, {"pedido": {}})  # sem "nome": falha no nome do arquivo
+    gerador = GeradorDocumentos(trabalhadores=2)
+    try:
+        resumo = gerador.gerar(modelo, registros, str(tmp_path / "saida"), "doc_{nome}.docx")
+    finally:
+        gerador.fechar()
+    assert [os.path.basename(c) for c in resumo.documentos] == [f"doc_C{i}.docx" for i in range(5)]
+    assert [indice for indice, _ in resumo.erros] == [2]
+    assert docx.Document(resumo.documentos[3]).paragraphs[0].text == "Cliente: C3 - total 3"
+    from agenteia.core.ferramentas.gravacao import umask_atual
+    assert os.stat(resumo.documentos[0]).st_mode & 0o777 == 0o666 & ~umask_atual()
+    assert not [nome for nome in os.listdir(tmp_path / "saida") if nome.endswith(".tmp")]
+    with pytest.raises(ValidationError):
+        GeradorDocumentos(1).gerar(str(tmp_path / "inexistente.docx"), registros, str(tmp_path))
+
+def test_relatorio_usa_estilos_nomeados_e_aceita_tabela_vazia(tmp_path):
+    from agenteia.core.ferramentas.documentos import criar_relatorio
+    caminho = criar_relatorio("Vendas", {"resumo": "ok", "tabela_dados": []}, str(tmp_path / "r.docx"))
+    doc = docx.Document(caminho)
+    assert doc.paragraphs[0].text == "Vendas" and doc.paragraphs[0].style.name == ESTILO_TITULO
+    assert not doc.tables
+
+def test_marcador_quebrado_mantem_formatacao_e_tabelas_sao_varridas(tmp_path):
+    doc = docx.Document()
+    paragrafo = doc.add_paragraph()
+    paragrafo.add_run("Cliente: ").bold = True
+    paragrafo.add_run("{{no")
+    paragrafo.add_run("me}} de ")
+    paragrafo.add_run("{{cidade}}").italic = True
+    celulas = doc.add_table(rows=1, cols=2).rows[0].cells
+    celulas[0].text = "Total: {{total}}"
+    celulas[1].text = "{{tabela:itens}}"
+    celulas[1].add_table(rows=1, cols=1).rows[0].cells[0].text = "{{nome}}"
+    caminho = tmp_path / "modelo.docx"
+    doc.save(str(caminho))
+
+    registro = {"nome": "Ana", "cidade": "Santos", "total": 10, "itens": [{"produto": "caneta"}]}
+    doc = preencher_documento(abrir_modelo(str(caminho)), registro)
+    runs = doc.paragraphs[0].runs
+    assert [(r.text, r.bold, r.italic) for r in runs] == [
+        ("Cliente: ", True, None), ("Ana", None, None), (" de ", None, None), ("Santos", None, True)
+    ]
+    celulas = doc.tables[0].rows[0].cells
+    assert celulas[0].text == "Total: 10"
+    assert [[c.text for c in linha.cells] for linha in celulas[1].tables[0].rows] == [["produto"], ["caneta"]]
+    assert celulas[1].tables[1].rows[0].cells[0].text == "Ana"
+    # A célula continua terminando num parágrafo
+    assert celulas[1]._tc[-1].tag.endswith("}p")
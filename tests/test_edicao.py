@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from agenteia.core.exceptions import ConflictError, ValidationError
+from agenteia.core.ferramentas.edicao import (
+    aplicar_edicoes, editar_arquivo, interpretar_edicoes
+)
+
+@pytest.fixture
+def projeto(tmp_path):
+    (tmp_path / "app.py").write_text("import os\n\ndef soma(a, b):\n    return a + b\n\nprint(soma(1, 2))\n")
+    (tmp_path / "win.txt").write_bytes(b"um\r\ndois\r\ntres\r\n")
+    return tmp_path
+
+def test_blocos_em_varios_arquivos(projeto):
+    edicoes = (
+        "app.py\n<<<<<<< BUSCAR\n    return a + b\n=======\n    return a + b + 0\n>>>>>>> SUBSTITUIR\n"
+        "win.txt\n<<<<<<< BUSCAR\ndois\n=======\nDOIS\n>>>>>>> SUBSTITUIR\n"
+    )
+    resultados = aplicar_edicoes(interpretar_edicoes(edicoes), str(projeto))
+    assert [r.caminho for r in resultados] == ["app.py", "win.txt"]
+    assert "return a + b + 0\n" in (projeto / "app.py").read_text()
+    # Quebras de linha do arquivo são preservadas
+    assert (projeto / "win.txt").read_bytes() == b"um\r\nDOIS\r\ntres\r\n"
+    assert resultados[1].bytes_escritos == 6
+    assert resultados[1].bytes_preservados == 10
+
+def test_diff_unificado_com_deslocamento(projeto):
+    diff = (
+        "--- a/app.py\n+++ b/app.py\n"
+        "@@ -1,3 +1,3 @@\n-import os\n+import sys\n \n def soma(a, b):\n"
+        "@@ -9,1 +9,1 @@\n-print(soma(1, 2))\n+print(soma(3, 4))\n"
+    )
+    saida = editar_arquivo(diff, diretorio_base=str(projeto))
+    assert "app.py: alterado (2 edição(ões)" in saida
+    assert (projeto / "app.py").read_text() == "import sys\n\ndef soma(a, b):\n    return a + b\n\nprint(soma(3, 4))\n"
+
+def test_diff_cria_e_remove_arquivos(projeto):
+    diff = (
+        "--- /dev/null\n+++ b/novo.txt\n@@ -0,0 +1,2 @@\n+linha 1\n+linha 2\n"
+        "--- a/win.txt\n+++ /dev/null\n@@ -1,3 +0,0 @@\n-um\n-dois\n-tres\n"
+    )
+    editar_arquivo(diff, diretorio_base=str(projeto))
+    assert (projeto / "novo.txt").read_text() == "linha 1\nlinha 2\n"
+    assert not (projeto / "win.txt").exists()
+
+def test_conflito_nao_altera_nenhum_arquivo(projeto):
+    original = (projeto / "app.py").read_text()
+    edicoes = (
+        "app.py\n<<<<<<< BUSCAR\nimport os\n=======\nimport sys\n>>>>>>> SUBSTITUIR\n"
+        "win.txt\n<<<<<<< BUSCAR\nquatro\n=======\nQUATRO\n>>>>>>> SUBSTITUIR\n"
+    )
+    with pytest.raises(ConflictError, match="não foi encontrado"):
+        editar_arquivo(edicoes, diretorio_base=str(projeto))
+    assert (projeto / "app.py").read_text() == original
+    assert not [nome for nome in os.listdir(projeto) if nome.endswith(".tmp")]
+
+def test_trecho_ambiguo_e_rejeitado(projeto):
+    (projeto / "repetido.txt").write_text("x = 1\nx = 1\n")
+    with pytest.raises(ConflictError, match="2 vezes"):
+        editar_arquivo("<<<<<<< BUSCAR\nx = 1\n=======\nx = 2\n>>>>>>> SUBSTITUIR\n", caminho="repetido.txt", diretorio_base=str(projeto))
+
+def test_alteracao_concorrente_nao_altera_nenhum_arquivo(projeto, monkeypatch):
+    from agenteia.core.ferramentas import edicao
+    original = (projeto / "app.py").read_text()
+    gravar = edicao._gravar
+
+    def gravar_e_alterar(preparado):
+        temporario = gravar(preparado)
+        if preparado.edicao.caminho == "win.txt":
+            (projeto / "win.txt").write_bytes(b"alterado por outro processo\n")
+        return temporario
+
+    monkeypatch.setattr(edicao, "_gravar", gravar_e_alterar)
+    edicoes = (
+        "app.py\n<<<<<<< BUSCAR\nimport os\n=======\nimport sys\n>>>>>>> SUBSTITUIR\n"
+        "win.txt\n<<<<<<< BUSCAR\ndois\n=======\nDOIS\n>>>>>>> SUBSTITUIR\n"
+    )
+    with pytest.raises(ConflictError, match="alterado durante a edição"):
+        editar_arquivo(edicoes, diretorio_base=str(projeto))
+    assert (projeto / "app.py").read_text() == original
+    assert not [nome for nome in os.listdir(projeto) if nome.endswith(".tmp")]
+
+def test_secoes_do_mesmo_arquivo_sao_unidas(projeto):
+    diff = (
+        "--- a/app.py\n+++ b/app.py\n@@ -6,1 +6,1 @@\n-print(soma(1, 2))\n+print(soma(3, 4))\n"
+        "--- a/app.py\n+++ b/app.py\n@@ -1,1 +1,1 @@\n-import os\n+import sys\n"
+    )
+    edicoes = interpretar_edicoes(diff)
+    assert len(edicoes) == 1
+    aplicar_edicoes(edicoes, str(projeto))
+    assert (projeto / "app.py").read_text() == "import sys\n\ndef soma(a, b):\n    return a + b\n\nprint(soma(3, 4))\n"
+
+def test_caminho_repetido_e_rejeitado(projeto):
+    edicoes = (
+        "app.py\n<<<<<<< BUSCAR\nimport os\n=======\nimport sys\n>>>>>>> SUBSTITUIR\n"
+        "./app.py\n<<<<<<< BUSCAR\nprint(soma(1, 2))\n=======\nprint(3)\n>>>>>>> SUBSTITUIR\n"
+    )
+    with pytest.raises(ValidationError, match="repetido"):
+        editar_arquivo(edicoes, diretorio_base=str(projeto))
+    assert "import os" in (projeto / "app.py").read_text()
+
+def test_arquivo_criado_respeita_umask(projeto):
+    from agenteia.core.ferramentas.gravacao import umask_atual
+    editar_arquivo("--- /dev/null\n+++ b/novo.txt\n@@ -0,0 +1,1 @@\n+linha\n", diretorio_base=str(projeto))
+    assert os.stat(projeto / "novo.txt").st_mode & 0o777 == 0o666 & ~umask_atual()
+
+def test_bloco_na_ultima_linha_sem_quebra(projeto):
+    (projeto / "sem_quebra.txt").write_text("a\nb")
+    editar_arquivo("<<<<<<< BUSCAR\nb\n=======\nc\n>>>>>>> SUBSTITUIR\n", caminho="sem_quebra.txt", diretorio_base=str(projeto))
+    assert (projeto / "sem_quebra.txt").read_text() == "a\nc"
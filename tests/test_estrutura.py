@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from agenteia.core.exceptions import FileError, ValidationError
+from agenteia.core.ferramentas import estrutura as modulo
+from agenteia.core.ferramentas.estrutura import criar_estrutura, planificar_manifesto
+
+MANIFESTO = {
+    "index.html": "<title>$titulo</title>",
+    "css": {"style.css": "body { margin: 0; }"},
+    "js/main.js": "$(function () {});",
+    "img": {"produtos": {}},
+}
+
+def test_planificar_manifesto():
+    diretorios, arquivos = planificar_manifesto(MANIFESTO, {"titulo": "Loja"})
+    assert diretorios == ["css", "js", "img", "img/produtos"]
+    assert arquivos["index.html"] == b"<title>Loja</title>"
+    # "$" sem variável correspondente é mantido
+    assert arquivos["js/main.js"] == b"$(function () {});"
+    _, arquivos = planificar_manifesto({"run.sh": "echo $$ ${titulo} $outro"}, {"titulo": "Loja"})
+    assert arquivos["run.sh"] == b"echo $$ Loja $outro"
+    for invalido in ({"../fora.txt": ""}, {"/abs.txt": ""}, {"a": "", "a/b": ""}):
+        with pytest.raises(ValidationError):
+            planificar_manifesto(invalido)
+
+def test_cria_destino_novo_sem_deixar_preparacao(tmp_path):
+    destino = tmp_path / "loja"
+    saida = criar_estrutura(str(destino), MANIFESTO, {"titulo": "Loja"})
+    assert "3 arquivo(s), 4 diretório(s)" in saida
+    assert (destino / "css" / "style.css").read_text() == "body { margin: 0; }"
+    assert (destino / "img" / "produtos").is_dir()
+    assert os.listdir(tmp_path) == ["loja"]
+    # A raiz não herda o 0700 do diretório de preparação
+    assert os.stat(destino).st_mode & 0o777 == os.stat(destino / "css").st_mode & 0o777
+
+def test_destino_existente_exige_sobrescrever(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "style.css").write_text("antigo")
+    with pytest.raises(FileError, match="já existe"):
+        criar_estrutura(str(tmp_path), MANIFESTO)
+    assert not (tmp_path / "index.html").exists()
+    assert "1 arquivo(s) existente(s) substituído(s)" in criar_estrutura(str(tmp_path), MANIFESTO, sobrescrever=True)
+    assert (tmp_path / "css" / "style.css").read_text() == "body { margin: 0; }"
+
+def test_falha_ao_mover_reverte_arquivos(tmp_path, monkeypatch):
+    (tmp_path / "index.html").write_text("original")
+    substituir = os.replace
+    def falhar_no_js(origem, destino):
+        if destino.endswith("main.js"):
+            raise OSError("disco cheio")
+        return substituir(origem, destino)
+    monkeypatch.setattr(modulo.os, "replace", falhar_no_js)
+    with pytest.raises(FileError):
+        criar_estrutura(str(tmp_path), MANIFESTO, sobrescrever=True)
+    assert (tmp_path / "index.html").read_text() == "original"
+    assert sorted(os.listdir(tmp_path)) == ["index.html"]
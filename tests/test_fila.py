@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+from agenteia.core.mcp.fila import (
+    FilaTarefas, STATUS_PENDENTE, STATUS_EM_EXECUCAO, STATUS_CONCLUIDA, STATUS_MORTA
+)
+from agenteia.core.mcp.worker import WorkerMCP
+
+@pytest.fixture
+def fila(tmp_path):
+    fila = FilaTarefas(caminho=tmp_path / "fila.db", visibilidade_segundos=60, max_tentativas=2, atraso_retry=0)
+    yield fila
+    fila.fechar()
+
+def tarefa_ferramenta(nome, **parametros):
+    return {"tipo": "executar_ferramenta", "nome_ferramenta": nome, "parametros": parametros}
+
+def test_enfileirar_e_reservar(fila):
+    tarefa_id = fila.enfileirar({"valor": 1})
+    tarefa = fila.reservar("w1")
+    assert tarefa["id"] == tarefa_id
+    assert tarefa["status"] == STATUS_EM_EXECUCAO
+    assert tarefa["tentativas"] == 1
+    assert tarefa["payload"] == {"valor": 1}
+    assert fila.reservar("w2") is None
+
+def test_concluir_grava_resultado(fila):
+    tarefa_id = fila.enfileirar({"valor": 1})
+    fila.reservar("w1")
+    assert fila.concluir(tarefa_id, {"ok": True}, worker_id="w1")
+    tarefa = fila.obter(tarefa_id)
+    assert tarefa["status"] == STATUS_CONCLUIDA
+    assert tarefa["resultado"] == {"ok": True}
+
+def test_tarefas_persistem_entre_instancias(tmp_path):
+    caminho = tmp_path / "fila.db"
+    primeira = FilaTarefas(caminho=caminho)
+    tarefa_id = primeira.enfileirar({"valor": 1})
+    primeira.fechar()
+
+    segunda = FilaTarefas(caminho=caminho)
+    assert segunda.reservar("w1")["id"] == tarefa_id
+    segunda.fechar()
+
+def test_visibilidade_expirada_reentrega_tarefa(fila):
+    tarefa_id = fila.enfileirar({"valor": 1})
+    fila.reservar("w1", visibilidade_segundos=0.01)
+    time.sleep(0.02)
+    tarefa = fila.reservar("w2")
+    assert tarefa["id"] == tarefa_id
+    assert tarefa["worker"] == "w2"
+    assert tarefa["tentativas"] == 2
+    # O worker original não pode mais concluir a tarefa
+    assert not fila.concluir(tarefa_id, "atrasado", worker_id="w1")
+
+def test_falhas_levam_para_fila_de_mortas(fila):
+    tarefa_id = fila.enfileirar({"valor": 1})
+    fila.reservar("w1")
+    fila.falhar(tarefa_id, "erro 1", worker_id="w1")
+    assert fila.obter(tarefa_id)["status"] == STATUS_PENDENTE
+
+    fila.reservar("w1")
+    fila.falhar(tarefa_id, "erro 2", worker_id="w1")
+    assert fila.obter(tarefa_id)["status"] == STATUS_MORTA
+    assert [t["id"] for t in fila.listar_mortas()] == [tarefa_id]
+
+    assert fila.reenfileirar_mortas() == 1
+    assert fila.reservar("w1")["tentativas"] == 1
+
+def test_estatisticas(fila):
+    fila.enfileirar({"valor": 1})
+    fila.enfileirar({"valor": 2})
+    fila.reservar("w1")
+    estatisticas = fila.estatisticas()
+    assert estatisticas["pendentes"] == 1
+    assert estatisticas["em_execucao"] == 1
+    assert estatisticas["profundidade"] == 2
+
+def test_worker_executa_ferramenta(fila):
+    sucesso = fila.enfileirar(tarefa_ferramenta("somar", a=1, b=2))
+    desconhecida = fila.enfileirar(tarefa_ferramenta("inexistente"), max_tentativas=1)
+
+    worker = WorkerMCP(fila, {"somar": lambda a, b: a + b}, worker_id="w1", intervalo_poll=0)
+    assert worker.executar(max_tarefas=2) == 2
+
+    assert fila.obter(sucesso)["resultado"] == 3
+    morta = fila.obter(desconhecida)
+    assert morta["status"] == STATUS_MORTA
+    assert "Ferramenta não registrada" in morta["erro"]
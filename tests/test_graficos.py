@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from agenteia.core.exceptions import ValidationError
+from agenteia.core.ferramentas.graficos import EspecificacaoGrafico, RenderizadorGraficos
+
+@pytest.fixture
+def renderizador(tmp_path):
+    pytest.importorskip("matplotlib")
+    renderizador = RenderizadorGraficos(str(tmp_path / "graficos"), trabalhadores=2)
+    yield renderizador
+    renderizador.fechar()
+
+def test_chave_depende_so_do_conteudo():
+    a = EspecificacaoGrafico.criar("barras", ["a", "b"], valores=[1, 2], titulo="Vendas")
+    b = EspecificacaoGrafico.criar("grafico_barras", ("a", "b"), series={"": [1.0, 2.0]}, titulo="Vendas")
+    assert a == b and a.chave() == b.chave()
+    assert a.chave() != EspecificacaoGrafico.criar("barras", ["a", "b"], valores=[1, 3], titulo="Vendas").chave()
+
+def test_especificacoes_invalidas():
+    with pytest.raises(ValidationError):
+        EspecificacaoGrafico.criar("radar", ["a"], valores=[1])
+    with pytest.raises(ValidationError):
+        EspecificacaoGrafico.criar("linha", ["a", "b"], valores=[1])
+    with pytest.raises(ValidationError):
+        EspecificacaoGrafico.criar("barras", ["a"], valores=["muito"])
+
+def test_registros_no_formato_de_visualizar_dados():
+    dados = [{"mes": "jan", "vendas": 10, "custos": 4}, {"mes": "fev", "vendas": 12, "custos": 5}]
+    grafico = EspecificacaoGrafico.de_registros(
+        "grafico_linha", dados, {"eixo_x": "mes", "eixo_y": ["vendas", "custos"], "titulo": "Mensal"}
+    )
+    assert grafico.tipo == "linha" and grafico.categorias == ("jan", "fev")
+    assert grafico.series == (("vendas", (10.0, 12.0)), ("custos", (4.0, 5.0)))
+    histograma = EspecificacaoGrafico.de_registros("histograma", dados, {"coluna": "vendas"})
+    assert histograma.label_y == "Frequência" and histograma.series == (("vendas", (10.0, 12.0)),)
+
+def test_lote_em_paralelo_e_sem_rerenderizar(renderizador):
+    graficos = [
+        EspecificacaoGrafico.criar(tipo, ["a", "b", "c"], valores=[3, 1, 2], titulo=tipo)
+        for tipo in ("barras", "linha", "dispersao", "pizza", "histograma")
+    ]
+    caminhos = renderizador.renderizar_lote(graficos + graficos[:1])
+    assert len(set(caminhos)) == 5 and caminhos[0] == caminhos[-1]
+    assert all(os.path.basename(c) == f"{g.chave()}.png" for g, c in zip(graficos, caminhos))
+    with open(caminhos[0], "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    modificado = os.stat(caminhos[0]).st_mtime_ns
+    futuro = renderizador.agendar(graficos[0])
+    assert futuro.done() and futuro.result() == caminhos[0]
+    assert os.stat(caminhos[0]).st_mtime_ns == modificado
+    assert [n for n in os.listdir(renderizador.diretorio) if n.endswith(".tmp")] == []
@@ -0,0 +1,53 @@
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+from agenteia.core.carregamento import ImportacaoTardia, exportacoes_tardias
+from agenteia.core.perfil_importacao import medir_importacoes
+
+# Orçamento de importação no cold start (soma do tempo próprio de cada módulo)
+ORCAMENTO_SEGUNDOS = float(os.getenv("AGENTEIA_ORCAMENTO_INICIALIZACAO", "0.5"))
+
+MODULOS_PESADOS = {
+    "langchain", "langchain_core", "langchain_community", "langchain_openai", "langchain_chroma",
+    "chromadb", "pandas", "numpy", "docx", "openpyxl", "pptx", "bs4", "duckduckgo_search",
+    "fastapi", "uvicorn"
+}
+
+@pytest.mark.parametrize("script", ["main.py", "run_mcp.py", "run_mcp_worker.py"])
+def test_help_dentro_do_orcamento(script):
+    perfil = medir_importacoes([script, "--help"])
+    assert perfil.codigo_saida == 0
+    pesados = {m.split(".")[0] for m in perfil.modulos} & MODULOS_PESADOS
+    assert not pesados, f"{script} --help importou {sorted(pesados)}"
+    assert perfil.total_importacao < ORCAMENTO_SEGUNDOS, perfil.mais_lentos(10)
+
+def test_importacao_do_servidor_mcp_dentro_do_orcamento():
+    # `run_mcp.py --help` responde antes de importar o servidor; aqui o módulo é importado de fato
+    pytest.importorskip("fastapi")
+    if importlib.util.find_spec("agenteia.core.mcp.server") is None:
+        pytest.skip("agenteia.core.mcp.server (MCPServer) não está presente nesta árvore")
+    perfil = medir_importacoes([], modulo="agenteia.core.mcp.api")
+    assert perfil.codigo_saida == 0
+    # FastAPI e uvicorn são o próprio servidor; o resto deve ficar para o primeiro uso
+    pesados = {m.split(".")[0] for m in perfil.modulos} & (MODULOS_PESADOS - {"fastapi", "uvicorn"})
+    assert not pesados, f"a importação do servidor MCP carregou {sorted(pesados)}"
+    assert perfil.total_importacao < ORCAMENTO_SEGUNDOS, perfil.mais_lentos(10)
+
+def test_importacao_tardia_so_carrega_no_uso():
+    dumps = ImportacaoTardia("json", "dumps")
+    assert "não carregado" in repr(dumps)
+    assert dumps({"a": 1}) == '{"a": 1}'
+    assert ImportacaoTardia("json").loads("[1]") == [1]
+
+def test_exportacoes_tardias(monkeypatch):
+    pacote = types.ModuleType("pacote_tardio")
+    monkeypatch.setitem(sys.modules, "pacote_tardio", pacote)
+    getattr_tardio = exportacoes_tardias("pacote_tardio", {"medir_importacoes": "agenteia.core.perfil_importacao"})
+    assert getattr_tardio("medir_importacoes") is medir_importacoes
+    assert pacote.medir_importacoes is medir_importacoes
+    with pytest.raises(AttributeError):
+        getattr_tardio("inexistente")
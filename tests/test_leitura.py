@@ -0,0 +1,72 @@
+import pytest
+
+from agenteia.core.exceptions import FileError
+from agenteia.core.ferramentas.arquivos import ler_arquivo
+from agenteia.core.ferramentas.leitura import (
+    buscar_no_arquivo, iterar_blocos, ler_fim, ler_intervalo, ler_linhas
+)
+
+@pytest.fixture
+def arquivo(tmp_path):
+    caminho = tmp_path / "log.txt"
+    caminho.write_text("".join(f"linha {i} çã\n" for i in range(1, 1001)), encoding="utf-8")
+    return caminho
+
+def test_intervalo_com_orcamento_continua_pelo_token(arquivo):
+    from agenteia.core.ferramentas.leitura import interpretar_token
+    partes, inicio = [], 0
+    while True:
+        trecho = ler_intervalo(str(arquivo), inicio, max_bytes=1000)
+        assert len(trecho.texto.encode("utf-8")) <= 1000
+        partes.append(trecho.texto)
+        if not trecho.truncado:
+            break
+        inicio = interpretar_token(trecho.token)["offset"]
+    assert "".join(partes) == arquivo.read_text(encoding="utf-8")
+
+def test_linhas_inicio_e_fim(arquivo):
+    assert ler_linhas(str(arquivo), 10, 12).texto == "linha 10 çã\nlinha 11 çã\nlinha 12 çã\n"
+    assert ler_fim(str(arquivo), 2).texto == "linha 999 çã\nlinha 1000 çã\n"
+
+def test_continuacao_de_linhas_para_na_linha_final(arquivo):
+    saida = ler_arquivo(str(arquivo), modo="linhas", inicio=10, fim=40, max_bytes=200)
+    paginas = [saida.split("\n\n[...")[0]]
+    while "token='" in saida:
+        token = saida.rsplit("token='", 1)[1].rstrip("']")
+        saida = ler_arquivo(str(arquivo), token=token, max_bytes=200)
+        paginas.append(saida.split("\n\n[...")[0])
+    assert len(paginas) > 1
+    assert "".join(paginas) == ler_linhas(str(arquivo), 10, 40).texto
+
+def test_busca_mmap_retorna_linhas(arquivo):
+    ocorrencias = buscar_no_arquivo(str(arquivo), "linha 50 ")
+    assert [(o["linha"], o["coluna"]) for o in ocorrencias] == [(50, 1)]
+    assert len(buscar_no_arquivo(str(arquivo), r"linha 9\d\d ", regex=True)) == 100
+    assert buscar_no_arquivo(str(arquivo), "inexistente") == []
+
+def test_blocos_nao_partem_caracteres_nem_linhas(arquivo):
+    blocos = list(iterar_blocos(str(arquivo), tamanho_bloco=100))
+    assert "".join(blocos) == arquivo.read_text(encoding="utf-8")
+    assert all(bloco.endswith("\n") for bloco in blocos)
+    assert "�" not in "".join(blocos)
+
+def test_ferramenta_ler_arquivo(arquivo, tmp_path):
+    pequeno = tmp_path / "p.txt"
+    pequeno.write_text("conteúdo")
+    assert ler_arquivo(str(pequeno)) == "conteúdo"
+
+    saida = ler_arquivo(str(arquivo), max_bytes=500)
+    token = saida.rsplit("token='", 1)[1].rstrip("']")
+    assert ler_arquivo(str(arquivo), token=token, max_bytes=500).startswith("linha ")
+    assert ler_arquivo(str(arquivo), modo="buscar", padrao="linha 7 ") == "7: linha 7 çã"
+    with pytest.raises(FileError):
+        ler_arquivo(str(arquivo), token=token.replace(token[:4], "AAAA"))
+
+def test_registro_repassa_linhas_e_max_bytes(arquivo):
+    from agenteia.core.ferramentas.registro import registro_ferramentas
+    definicao = registro_ferramentas.obter("ler_arquivo")
+    assert {"linhas", "max_bytes"} <= set(definicao.esquema()["properties"])
+    ler = definicao.chamador()
+    assert ler(caminho=str(arquivo), modo="fim", linhas=2).startswith("linha 999 çã\nlinha 1000 çã")
+    saida = ler(caminho=str(arquivo), max_bytes=300)
+    assert "token='" in saida and len(saida.rsplit("token='", 1)[0].encode("utf-8")) < 1000
@@ -0,0 +1,51 @@
+import pytest
+
+from agenteia.core.exceptions import ValidationError
+from agenteia.core.ferramentas.arquivos import listar_arquivos
+from agenteia.core.ferramentas.listagem import iterar_entradas, listar_pagina
+
+@pytest.fixture
+def arvore(tmp_path):
+    (tmp_path / "src" / "pacote").mkdir(parents=True)
+    (tmp_path / "src" / "a.py").write_text("a")
+    (tmp_path / "src" / "pacote" / "b.py").write_text("bb")
+    (tmp_path / "leia.txt").write_text("texto")
+    (tmp_path / ".oculto").write_text("")
+    return tmp_path
+
+def test_listagem_nao_recursiva(arvore):
+    nomes = {e.caminho for e in iterar_entradas(str(arvore))}
+    assert nomes == {"src", "leia.txt", ".oculto"}
+
+def test_recursao_com_profundidade_e_glob(arvore):
+    todos = {e.caminho for e in iterar_entradas(str(arvore), recursivo=True, padrao="*.py")}
+    assert todos == {"src/a.py", "src/pacote/b.py"}
+    rasos = {e.caminho for e in iterar_entradas(str(arvore), recursivo=True, profundidade_maxima=1, padrao="*.py")}
+    assert rasos == {"src/a.py"}
+    assert not any(e.nome.startswith(".") for e in iterar_entradas(str(arvore), incluir_ocultos=False))
+
+def test_paginacao_com_cursor_percorre_tudo_sem_repetir(tmp_path):
+    for i in range(25):
+        (tmp_path / f"arq{i:02d}.txt").write_text("x" * i)
+    vistos, cursor = [], None
+    while True:
+        pagina = listar_pagina(str(tmp_path), ordenar_por="tamanho", decrescente=True, limite=10, cursor=cursor)
+        vistos += [e.nome for e in pagina.entradas]
+        cursor = pagina.proximo_cursor
+        if cursor is None:
+            break
+    assert vistos == [f"arq{i:02d}.txt" for i in range(24, -1, -1)]
+    assert pagina.total_arquivos == 25
+
+def test_cursor_de_outra_ordenacao_rejeitado(tmp_path):
+    for i in range(3):
+        (tmp_path / f"{i}.txt").write_text("")
+    cursor = listar_pagina(str(tmp_path), limite=1).proximo_cursor
+    with pytest.raises(ValidationError):
+        listar_pagina(str(tmp_path), ordenar_por="tamanho", cursor=cursor)
+
+def test_ferramenta_listar_arquivos_pagina(arvore):
+    saida = listar_arquivos(str(arvore), recursivo=True, limite=2)
+    assert "Total: 4 arquivo(s) e 2 pasta(s)" in saida
+    assert "📁 src/" in saida
+    assert "cursor='" in saida
@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+
+from agenteia.core.logs import configurar_logging, parar_logging, resumir, setup_logging
+
+@pytest.fixture
+def diretorio_logs(tmp_path):
+    configurar_logging({"diretorio": str(tmp_path), "console": False, "niveis": {}, "max_caracteres": 50})
+    setup_logging("teste.logs")
+    yield tmp_path
+    configurar_logging({"diretorio": "logs", "console": True, "niveis": {}, "max_caracteres": 4000})
+
+def test_resumir_trunca_valores_grandes():
+    assert resumir("curto") == "curto"
+    texto = resumir("x" * 1000, 100)
+    assert texto.startswith("x" * 100)
+    assert "+900 caracteres" in texto
+    assert resumir({"a": 1, "b": 2}).startswith("dict(2 chaves: a, b)")
+
+def test_setup_logging_usa_handler_de_fila(diretorio_logs):
+    logger = setup_logging("teste.logs")
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+def test_registros_gravados_por_modulo_e_truncados(diretorio_logs):
+    logger = setup_logging("teste.logs")
+    logger.info("%s", "y" * 200)
+    parar_logging()
+    conteudo = (diretorio_logs / "teste.logs.log").read_text(encoding="utf-8")
+    assert "y" * 50 in conteudo
+    assert "y" * 51 not in conteudo
+    assert "+150 caracteres" in conteudo
+
+def test_registros_apos_parar_logging_nao_se_perdem(diretorio_logs):
+    logger = setup_logging("teste.logs")
+    parar_logging()
+    assert not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers)
+    logger.warning("depois de parar")
+    conteudo = (diretorio_logs / "teste.logs.log").read_text(encoding="utf-8")
+    assert "depois de parar" in conteudo
+    # A reconfiguração religa a fila
+    configurar_logging({})
+    assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+def test_sobrescrita_de_nivel_por_modulo(diretorio_logs):
+    logger = setup_logging("teste.logs.detalhe")
+    configurar_logging({"niveis": {"teste.logs": "DEBUG"}})
+    assert logger.level == logging.DEBUG
+    assert setup_logging("teste.outro").level == logging.INFO
+
+def test_nivel_por_variavel_de_ambiente(diretorio_logs, monkeypatch):
+    monkeypatch.setenv("AGENTEIA_LOG_NIVEIS", "teste.logs=ERROR")
+    configurar_logging({})
+    assert setup_logging("teste.logs").level == logging.ERROR
+    monkeypatch.delenv("AGENTEIA_LOG_NIVEIS")
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agenteia.core import metricas
+from agenteia.core.metricas import MedicaoLLM, contar_tokens_resposta, gerar_metricas, identificar_modelo
+
+def test_medicao_llm_stream():
+    with MedicaoLLM("ollama", "teste") as medicao:
+        for _ in range(3):
+            medicao.token()
+    assert medicao.tokens == 3
+    assert medicao.ttft is not None
+    assert medicao.duracao >= medicao.ttft
+
+def test_medicao_llm_sem_streaming_registra_ttft():
+    with MedicaoLLM("ollama", "teste") as medicao:
+        medicao.definir_tokens(5)
+    assert medicao.tokens == 5
+    assert medicao.ttft is not None and medicao.duracao >= medicao.ttft
+
+def test_medicao_llm_propaga_erro():
+    with pytest.raises(RuntimeError):
+        with MedicaoLLM("ollama", "teste"):
+            raise RuntimeError("falha")
+
+def test_identificar_modelo():
+    assert identificar_modelo(SimpleNamespace(model_name="deepseek/r1")) == ("openrouter", "deepseek/r1")
+    assert identificar_modelo(SimpleNamespace(model="qwen3:1.7b")) == ("ollama", "qwen3:1.7b")
+
+def test_contar_tokens_resposta():
+    assert contar_tokens_resposta(SimpleNamespace(usage_metadata={"output_tokens": 7}, content="a b")) == 7
+    assert contar_tokens_resposta(SimpleNamespace(content="um dois tres")) == 3
+
+@pytest.fixture
+def coletores(monkeypatch):
+    """Isola a lista global de coletores; restaurada ao final do teste."""
+    monkeypatch.setattr(metricas, "_coletores", [])
+    return metricas._coletores
+
+def test_gerar_metricas_executa_coletores(coletores):
+    chamadas = []
+    metricas.ao_coletar(lambda: chamadas.append(1))
+    assert len(coletores) == 1
+    conteudo, tipo = gerar_metricas()
+    assert chamadas
+    assert isinstance(conteudo, bytes)
+    assert tipo.startswith("text/plain")
+
+def test_metricas_exportadas():
+    pytest.importorskip("prometheus_client")
+    with MedicaoLLM("ollama", "exportado") as medicao:
+        medicao.token()
+    metricas.registrar_busca_rag(0.01, 2)
+    conteudo, _ = gerar_metricas()
+    assert b'agenteia_llm_ttft_segundos_count{modelo="exportado",provedor="ollama"} 1.0' in conteudo
+    assert b'agenteia_rag_buscas_total{resultado="acerto"}' in conteudo
@@ -0,0 +1,64 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+from agenteia.core.exceptions import FileError
+from agenteia.core.ferramentas.office import (
+    criar_excel, escrever_excel, iterar_linhas_excel, ler_excel, ler_excel_pagina, listar_abas_excel
+)
+
+@pytest.fixture
+def planilha(tmp_path):
+    caminho = str(tmp_path / "vendas.xlsx")
+    linhas = ((i, f"item {i}", i * 1.5) for i in range(1, 251))
+    escrever_excel(caminho, {"Resumo": [["total", 250]], "Vendas": itertools.chain([("id", "nome", "valor")], linhas)})
+    return caminho
+
+def test_escrita_de_gerador_e_leitura_por_aba_e_intervalo(planilha):
+    assert [aba["nome"] for aba in listar_abas_excel(planilha)] == ["Resumo", "Vendas"]
+    assert ler_excel(planilha) == [["total", 250]]
+    assert ler_excel(planilha, aba="Vendas", intervalo="b2:c3") == [["item 1", 1.5], ["item 2", 3]]
+    linhas = iterar_linhas_excel(planilha, "Vendas", linha_inicial=250)
+    assert list(linhas) == [(249, "item 249", 373.5), (250, "item 250", 375)]
+    with pytest.raises(FileError):
+        ler_excel(planilha, aba="Inexistente")
+
+def test_paginacao(planilha):
+    pagina = ler_excel_pagina(planilha, aba="Vendas", linhas_por_pagina=2)
+    assert pagina.splitlines() == [
+        "Aba 'Vendas', linhas 2-3:",
+        "| # | id | nome | valor |",
+        "|---|---|---|---|",
+        "| 2 | 1 | item 1 | 1.5 |",
+        "| 3 | 2 | item 2 | 3 |",
+        "... exibindo 2 linhas. Para continuar, use linha_inicial=4",
+    ]
+    ultima = ler_excel_pagina(planilha, aba="Vendas", linha_inicial=250, linhas_por_pagina=10)
+    assert "| 251 | 250 | item 250 | 375 |" in ultima and "Para continuar" not in ultima
+    assert "nenhuma linha" in ler_excel_pagina(planilha, aba="Vendas", linha_inicial=900)
+
+def test_criar_excel_aceita_iteravel(tmp_path):
+    caminho = str(tmp_path / "novo.xlsx")
+    assert criar_excel(caminho, ([i, i * i] for i in range(3)), aba="Quadrados").endswith("(3 linha(s))")
+    assert ler_excel(caminho, aba="Quadrados") == [[0, 0], [1, 1], [2, 4]]
+    assert [p.name for p in tmp_path.iterdir()] == ["novo.xlsx"]
+
+def test_paginas_seguidas_continuam_do_cursor(planilha, monkeypatch):
+    from agenteia.core.ferramentas import office
+    leituras = []
+    ler = office._CursorExcel.ler
+    monkeypatch.setattr(office._CursorExcel, "ler", lambda self, inicio, n: leituras.append(self._linhas is not None and inicio == self.proxima) or ler(self, inicio, n))
+    paginas = [ler_excel_pagina(planilha, aba="Vendas", linha_inicial=inicio, linhas_por_pagina=2) for inicio in (2, 4, 6)]
+    assert "| 6 | 5 | item 5 | 7.5 |" in paginas[2]
+    # Só a primeira página abre um gerador novo; as outras continuam do anterior
+    assert leituras == [False, True, True]
+
+    escrever_excel(planilha, {"Vendas": [("id",), (99,)]})
+    assert "| 2 | 99 |" in ler_excel_pagina(planilha, aba="Vendas")
+
+def test_arquivo_gravado_respeita_umask(planilha):
+    import os
+    from agenteia.core.ferramentas.gravacao import umask_atual
+    assert os.stat(planilha).st_mode & 0o777 == 0o666 & ~umask_atual()
@@ -0,0 +1,71 @@
+import errno
+import os
+
+import pytest
+
+from agenteia.core.ferramentas import operacoes_lote
+from agenteia.core.ferramentas.arquivos import copiar_arquivo, remover_diretorio
+from agenteia.core.ferramentas.monitoramento import monitor
+from agenteia.core.ferramentas.operacoes_lote import (
+    copiar_arvore, copiar_conteudo, mover_arvore, remover_arvore
+)
+
+@pytest.fixture
+def arvore(tmp_path):
+    origem = tmp_path / "origem"
+    (origem / "sub" / "interno").mkdir(parents=True)
+    (origem / "a.txt").write_text("a" * 100)
+    (origem / "sub" / "b.log").write_text("b" * 10)
+    (origem / "sub" / "interno" / "c.txt").write_bytes(os.urandom(300000))
+    return origem
+
+def conteudo(raiz):
+    return {
+        os.path.relpath(os.path.join(pasta, nome), raiz): open(os.path.join(pasta, nome), "rb").read()
+        for pasta, _, nomes in os.walk(raiz) for nome in nomes
+    }
+
+def test_copia_de_arvore_com_progresso(arvore, tmp_path):
+    resultado, _ = copiar_arvore(str(arvore), str(tmp_path / "copia"))
+    assert conteudo(tmp_path / "copia") == conteudo(arvore)
+    assert resultado.arquivos == 3 and resultado.bytes == 300110
+    status = monitor.obter_status(resultado.tarefa_id)
+    assert status["status"] == "concluida" and status["progresso"] == "4/4"
+
+def test_copia_sem_copy_file_range_usa_fallback(arvore, tmp_path, monkeypatch):
+    def sem_suporte(*args):
+        raise OSError(errno.EXDEV, "cross-device")
+    monkeypatch.setattr(operacoes_lote.os, "copy_file_range", sem_suporte, raising=False)
+    destino = tmp_path / "c.txt"
+    copiar_conteudo(str(arvore / "sub" / "interno" / "c.txt"), str(destino))
+    assert destino.read_bytes() == (arvore / "sub" / "interno" / "c.txt").read_bytes()
+
+def test_simulacao_e_glob(arvore, tmp_path):
+    saida = copiar_arquivo(str(arvore), str(tmp_path / "copia"), padrao="*.txt", simular=True)
+    assert saida.startswith("Simulação (copiar): 2 arquivo(s)")
+    assert not (tmp_path / "copia").exists()
+
+    resultado, _ = copiar_arvore(str(arvore), str(tmp_path / "copia"), padrao="*.txt")
+    assert sorted(conteudo(tmp_path / "copia")) == ["a.txt", os.path.join("sub", "interno", "c.txt")]
+
+def test_mover_renomeia_ou_copia_entre_sistemas(arvore, tmp_path, monkeypatch):
+    esperado = conteudo(arvore)
+    resultado, _ = mover_arvore(str(arvore), str(tmp_path / "movido"))
+    assert resultado.renomeado and not arvore.exists()
+    assert conteudo(tmp_path / "movido") == esperado
+
+    # Simula origem e destino em sistemas de arquivos diferentes
+    def rename_exdev(*args):
+        raise OSError(errno.EXDEV, "cross-device")
+    monkeypatch.setattr(operacoes_lote.os, "rename", rename_exdev)
+    monkeypatch.setattr(operacoes_lote.os, "replace", rename_exdev)
+    resultado, _ = mover_arvore(str(tmp_path / "movido"), str(tmp_path / "final"))
+    assert not resultado.renomeado and resultado.arquivos == 3
+    assert conteudo(tmp_path / "final") == esperado
+    assert not (tmp_path / "movido").exists()
+
+def test_remocao_por_padrao_e_completa(arvore):
+    resultado, _ = remover_arvore(str(arvore), padrao="*.log")
+    assert resultado.arquivos == 1 and not (arvore / "sub" / "b.log").exists()
+    assert "removido(s)" in remover_diretorio(str(arvore))
+    assert not arvore.exists()
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+
+import pytest
+
+from agenteia.core.exceptions import ToolError
+from agenteia.core.ferramentas.comandos import encerrar_processo, executar_comando, verificar_processo
+from agenteia.core.ferramentas.processos import BufferCircular, SupervisorProcessos, supervisor
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="comandos POSIX")
+
+PYTHON = sys.executable
+
+def test_buffer_circular_guarda_o_final():
+    buffer = BufferCircular(10)
+    buffer.escrever(b"0123456789")
+    buffer.escrever(b"abcd")
+    dados, proximo, perdidos = buffer.ler(0)
+    assert dados == b"456789abcd" and proximo == 14 and perdidos == 4
+    buffer.escrever(b"x" * 25)
+    assert buffer.ler(14) == (b"x" * 10, 39, 15)
+    assert buffer.texto(37) == "xx"
+    assert buffer.texto(0).startswith("[... 29 bytes omitidos]")
+
+def test_saida_e_lida_durante_a_execucao():
+    supervisor = SupervisorProcessos(buffer_bytes=1024)
+    codigo = "import time\nprint('inicio', flush=True)\ntime.sleep(1)\nprint('x' * 5000)"
+    processo = supervisor.iniciar(f'{PYTHON} -c "{codigo}"', timeout=10)
+    limite = time.time() + 5
+    while b"inicio" not in processo.stdout.ler()[0] and time.time() < limite:
+        time.sleep(0.02)
+    assert processo.ativo and processo.para_dict()["saida"].startswith("inicio")
+
+    supervisor.aguardar(processo, 10)
+    assert processo.codigo_saida == 0
+    assert processo.stdout.total == 5008 and processo.stdout.descartados == 5008 - 1024
+
+def test_limite_de_concorrencia_por_sessao():
+    supervisor = SupervisorProcessos(max_concorrentes=4, max_por_sessao=1)
+    primeiro = supervisor.iniciar("sleep 0.5", sessao="a")
+    segundo = supervisor.iniciar("sleep 0.5", sessao="a")
+    outra = supervisor.iniciar("sleep 0.5", sessao="b")
+    supervisor.aguardar_inicio(primeiro)
+    supervisor.aguardar_inicio(outra)
+    assert segundo.estado == "aguardando" and outra.estado == "executando"
+    supervisor.aguardar(segundo, 10)
+    assert segundo.inicio >= primeiro.fim
+
+def test_timeout_encerra_o_grupo_de_processos():
+    supervisor = SupervisorProcessos()
+    processo = supervisor.iniciar("sleep 30 & echo $!; wait", timeout=0.5)
+    supervisor.aguardar(processo, 10)
+    assert processo.estado == "timeout"
+    neto = int(processo.stdout.texto().strip())
+    time.sleep(0.1)
+    # Sem o pai, o neto pode ficar como zumbi até ser recolhido pelo init
+    assert not os.path.exists(f"/proc/{neto}") or open(f"/proc/{neto}/stat").read().split()[2] == "Z"
+    with pytest.raises(ToolError, match="Timeout"):
+        executar_comando("sleep 5", timeout=0.2)
+
+def test_ferramentas_consultam_e_encerram_comandos_em_segundo_plano():
+    assert executar_comando("echo ola") == "ola"
+    resposta = executar_comando("echo pronto; sleep 30", em_segundo_plano=True)
+    id_ = resposta.split(": ")[1].split(" ")[0]
+    limite = time.time() + 5
+    while "pronto" not in verificar_processo(id_)["saida"] and time.time() < limite:
+        time.sleep(0.02)
+    status = verificar_processo(id_)
+    assert status["ativo"] and status["proximo_offset"] == 7
+    # O timeout vale só para comandos em primeiro plano
+    assert supervisor.obter(id_).timeout is None
+    assert "encerrado com sucesso" in encerrar_processo(id_)
+    status = verificar_processo(id_, desde=7)
+    assert status["estado"] == "encerrado" and status["saida"] == ""
+    assert "não está ativo" in encerrar_processo(id_)
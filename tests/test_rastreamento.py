@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import pytest
+
+from agenteia.core import rastreamento
+from agenteia.core.rastreamento import (
+    CABECALHO_TRACE, cabecalhos_trace, configurar_rastreamento, definir_trace_id,
+    obter_trace_id, rastrear, restaurar_trace, span, span_gerador
+)
+
+@pytest.fixture
+def arquivo_trace(tmp_path):
+    caminho = tmp_path / "traces.json"
+    configurar_rastreamento({"arquivo": str(caminho)})
+    yield caminho
+    configurar_rastreamento({"habilitado": False})
+
+def ler_eventos(caminho):
+    rastreamento._obter_escritor().fechar()
+    # O colchete final é opcional no formato; fecha para ler como JSON
+    return json.loads(caminho.read_text(encoding="utf-8").rstrip().rstrip(",") + "]")
+
+def test_spans_aninhados_compartilham_trace(arquivo_trace):
+    with span("raiz") as raiz:
+        with span("filho", k=3):
+            assert obter_trace_id() == raiz.trace_id
+    assert obter_trace_id() is None
+
+    eventos = {e["name"]: e for e in ler_eventos(arquivo_trace)}
+    assert eventos["filho"]["ph"] == "X"
+    assert eventos["filho"]["args"]["trace_id"] == eventos["raiz"]["args"]["trace_id"]
+    assert eventos["filho"]["args"]["pai"] == eventos["raiz"]["args"]["span_id"]
+    assert eventos["filho"]["args"]["k"] == 3
+    assert eventos["raiz"]["dur"] >= eventos["filho"]["dur"]
+
+def test_span_registra_erro(arquivo_trace):
+    with pytest.raises(ValueError):
+        with span("falha"):
+            raise ValueError("ruim")
+    evento = ler_eventos(arquivo_trace)[0]
+    assert "ValueError" in evento["args"]["erro"]
+
+def test_trace_propagado_por_cabecalho(arquivo_trace):
+    tokens = definir_trace_id("abc123")
+    try:
+        with span("requisicao"):
+            assert cabecalhos_trace()[CABECALHO_TRACE] == "abc123"
+    finally:
+        restaurar_trace(tokens)
+    assert ler_eventos(arquivo_trace)[0]["args"]["trace_id"] == "abc123"
+
+def test_decorador_async(arquivo_trace):
+    @rastrear("tarefa_async")
+    async def tarefa():
+        return obter_trace_id()
+
+    assert asyncio.run(tarefa()) is not None
+    assert ler_eventos(arquivo_trace)[0]["name"] == "tarefa_async"
+
+def test_rastreamento_desabilitado(tmp_path):
+    caminho = tmp_path / "traces.json"
+    configurar_rastreamento({"habilitado": False, "arquivo": str(caminho)})
+    with span("ignorado"):
+        pass
+    assert not caminho.exists()
+
+def test_span_gerador_restaura_contexto_entre_yields(arquivo_trace):
+    def gerar():
+        with span("interno"):
+            for i in range(2):
+                yield obter_trace_id()
+
+    gerador = span_gerador("externo", gerar())
+    trace_interno = next(gerador)
+    # Entre os yields o consumidor continua no próprio contexto
+    assert obter_trace_id() is None
+    assert next(gerador) == trace_interno
+    assert list(gerador) == []
+
+    eventos = {e["name"]: e for e in ler_eventos(arquivo_trace)}
+    assert eventos["interno"]["args"]["pai"] == eventos["externo"]["args"]["span_id"]
+    assert eventos["externo"]["args"]["trace_id"] == trace_interno
+
+def test_escritor_descarrega_spans_filhos_por_intervalo(tmp_path):
+    caminho = tmp_path / "traces.json"
+    escritor = rastreamento.EscritorTrace(str(caminho), intervalo_descarga=0)
+    try:
+        escritor.escrever({"name": "filho"})
+        assert "filho" in caminho.read_text(encoding="utf-8")
+    finally:
+        escritor.fechar()
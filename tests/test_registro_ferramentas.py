@@ -0,0 +1,63 @@
+import pytest
+
+from agenteia.core import ferramentas
+from agenteia.core.ferramentas.registro import (
+    MODO_FALLBACK, MODO_NATIVO, DefinicaoFerramenta, ParametroFerramenta, RegistroFerramentas, registro_ferramentas
+)
+
+def definicao_teste(**kwargs):
+    return DefinicaoFerramenta(
+        nome="ferramenta_teste", funcao="ferramenta_teste", descricao="Ferramenta de teste.",
+        parametros=(
+            ParametroFerramenta("caminho_origem", str, "Origem.", destino="origem"),
+            ParametroFerramenta("limite", int, "Limite.", padrao=5),
+        ),
+        **kwargs
+    )
+
+def test_registro_padrao_sem_nomes_repetidos():
+    nomes = [d["nome"] for d in registro_ferramentas.metadados()]
+    assert len(nomes) == len(set(nomes)) == len(registro_ferramentas)
+    assert registro_ferramentas.obter("executar_comando").custo == "alto"
+    assert not registro_ferramentas.obter("remover_arquivo").idempotente
+    assert registro_ferramentas.obter("ler_arquivo").somente_leitura
+
+def test_registrar_nome_repetido_substitui():
+    registro = RegistroFerramentas([definicao_teste(), definicao_teste(custo="medio")])
+    assert len(registro) == 1
+    assert registro.obter("ferramenta_teste").custo == "medio"
+
+def test_esquema_e_descricoes():
+    definicao = definicao_teste()
+    esquema = definicao.esquema()
+    assert esquema["required"] == ["caminho_origem"]
+    assert esquema["properties"]["limite"] == {"type": "integer", "description": "Limite.", "default": 5}
+    # No modo nativo o schema descreve os argumentos; o fallback explica o JSON
+    assert definicao.descricao_para(MODO_NATIVO) == "Ferramenta de teste."
+    assert "'caminho_origem', 'limite'" in definicao.descricao_para(MODO_FALLBACK)
+
+def test_chamador_traduz_argumentos(monkeypatch):
+    chamadas = []
+
+    def ferramenta_teste(origem, limite=5, timeout=None, mcp_client=None):
+        chamadas.append((origem, limite, timeout, mcp_client))
+        return "ok"
+
+    monkeypatch.setattr(ferramentas, "ferramenta_teste", ferramenta_teste, raising=False)
+    cliente = object()
+    chamar = definicao_teste(fixos={"timeout": 1.0}).chamador(cliente)
+    assert chamar(caminho_origem="a.txt") == "ok"
+    assert chamadas == [("a.txt", 5, 1.0, cliente)]
+
+def test_chamador_omite_mcp_client_se_nao_aceito(monkeypatch):
+    monkeypatch.setattr(ferramentas, "ferramenta_teste", lambda origem, limite=5: (origem, limite), raising=False)
+    assert definicao_teste().chamador(object())(caminho_origem="b", limite=2) == ("b", 2)
+
+def test_ferramentas_construidas_uma_vez_por_cliente():
+    pytest.importorskip("langchain")
+    registro = RegistroFerramentas([definicao_teste()])
+    cliente = object()
+    nativas = registro.ferramentas(cliente, MODO_NATIVO)
+    assert registro.ferramentas(cliente, MODO_NATIVO) is nativas
+    assert registro.ferramentas(None, MODO_NATIVO) is not nativas
+    assert registro.ferramentas(cliente, MODO_FALLBACK)[0].name == "ferramenta_teste"
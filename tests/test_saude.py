@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from agenteia.core.saude import MonitorSaude
+
+@pytest.fixture
+def monitor():
+    monitor = MonitorSaude(intervalo=60, timeout=0.2)
+    yield monitor
+    monitor.parar()
+
+def test_sonda_nao_registrada_e_obsoleta(monitor):
+    snapshot = monitor.obter("inexistente")
+    assert snapshot["valor"] is None
+    assert snapshot["obsoleto"]
+
+def test_atualizar_grava_valor_em_cache(monitor):
+    chamadas = []
+    monitor.registrar("contador", lambda: chamadas.append(1) or len(chamadas))
+    monitor.atualizar("contador")
+
+    snapshot = monitor.obter("contador")
+    assert snapshot["valor"] == 1
+    assert snapshot["erro"] is None
+    assert not snapshot["obsoleto"]
+    # Leituras não executam a sonda novamente
+    monitor.obter("contador")
+    assert len(chamadas) == 1
+
+def test_erro_mantem_ultimo_valor(monitor):
+    estado = {"falhar": False}
+
+    def sonda():
+        if estado["falhar"]:
+            raise ConnectionError("offline")
+        return "ok"
+
+    monitor.registrar("servico", sonda)
+    monitor.atualizar("servico")
+    estado["falhar"] = True
+    monitor.atualizar("servico")
+
+    snapshot = monitor.obter("servico")
+    assert snapshot["valor"] == "ok"
+    assert "offline" in snapshot["erro"]
+    assert snapshot["obsoleto"]
+
+def test_timeout_nao_bloqueia_leitura(monitor):
+    liberar = threading.Event()
+    monitor.registrar("lenta", lambda: liberar.wait(5))
+
+    inicio = time.time()
+    monitor.atualizar("lenta")
+    assert time.time() - inicio < 1
+    assert monitor.obter("lenta")["erro"] == "timeout"
+    liberar.set()
+
+def test_thread_executa_sondas_em_segundo_plano(monitor):
+    monitor.registrar("rapida", lambda: "ok")
+    monitor.iniciar()
+    limite = time.time() + 2
+    while monitor.obter("rapida")["valor"] is None and time.time() < limite:
+        time.sleep(0.01)
+    assert monitor.obter("rapida")["valor"] == "ok"
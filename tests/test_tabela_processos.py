@@ -0,0 +1,113 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from agenteia.core.tabela_processos import TabelaProcessos
+
+class NoSuchProcess(Exception):
+    pass
+
+class AccessDenied(Exception):
+    pass
+
+def psutil_falso(processos):
+    """processos: pid -> {"name", "cpu", "create_time"}; cpu é o tempo acumulado."""
+    criados = []
+
+    class Process:
+        def __init__(self, pid):
+            if pid not in processos:
+                raise NoSuchProcess(pid)
+            self.pid = pid
+            self._criado = processos[pid]["create_time"]
+            self._ultimo_cpu = None
+            criados.append(pid)
+
+        def is_running(self):
+            return self.pid in processos and processos[self.pid]["create_time"] == self._criado
+
+        def as_dict(self, atributos, ad_value=None):
+            if not self.is_running():
+                raise NoSuchProcess(self.pid)
+            dados = processos[self.pid]
+            cpu = dados["cpu"]
+            # Como no psutil: o percentual é o delta desde a chamada anterior no mesmo objeto
+            percentual = 0.0 if self._ultimo_cpu is None else cpu - self._ultimo_cpu
+            self._ultimo_cpu = cpu
+            return {
+                "name": dados["name"], "username": dados.get("username", "user"), "status": "running",
+                "cpu_percent": percentual, "memory_percent": dados.get("mem", 1.0),
+                "memory_info": SimpleNamespace(rss=dados.get("mem", 1.0) * 1024 * 1024),
+                "create_time": self._criado, "num_threads": 1,
+            }
+
+    modulo = SimpleNamespace(
+        pids=lambda: list(processos), Process=Process, NoSuchProcess=NoSuchProcess, AccessDenied=AccessDenied
+    )
+    return modulo, criados
+
+@pytest.fixture
+def processos():
+    return {
+        1: {"name": "init", "cpu": 0.0, "create_time": 1.0},
+        10: {"name": "python", "cpu": 5.0, "create_time": 2.0, "mem": 30.0},
+        11: {"name": "Python3", "cpu": 1.0, "create_time": 3.0, "mem": 5.0, "username": "root"},
+    }
+
+def test_objetos_reaproveitados_e_cpu_por_delta(processos):
+    modulo, criados = psutil_falso(processos)
+    tabela = TabelaProcessos(intervalo=0, psutil_modulo=modulo)
+    assert all(p["cpu_percent"] is None for p in tabela.atualizar().values())
+    processos[10]["cpu"] += 40.0
+    snapshot = tabela.atualizar()
+    assert snapshot[10]["cpu_percent"] == 40.0 and snapshot[1]["cpu_percent"] == 0.0
+    assert sorted(criados) == [1, 10, 11]
+
+def test_processos_encerrados_e_pid_reutilizado(processos):
+    modulo, criados = psutil_falso(processos)
+    tabela = TabelaProcessos(intervalo=0, psutil_modulo=modulo)
+    tabela.atualizar()
+    del processos[1]
+    processos[10] = {"name": "outro", "cpu": 99.0, "create_time": 50.0}
+    snapshot = tabela.atualizar()
+    assert 1 not in snapshot
+    assert snapshot[10]["nome"] == "outro" and snapshot[10]["cpu_percent"] is None
+    assert criados.count(10) == 2
+
+def test_snapshot_respeita_intervalo(processos):
+    modulo, _ = psutil_falso(processos)
+    tabela = TabelaProcessos(intervalo=60, psutil_modulo=modulo)
+    tabela.atualizar()
+    processos[12] = {"name": "novo", "cpu": 0.0, "create_time": 9.0}
+    assert 12 not in tabela.atualizar()
+    # PID fora do snapshot é lido na hora
+    assert tabela.obter(12)["nome"] == "novo"
+    assert tabela.obter(999) is None
+    assert 12 in tabela.atualizar(forcar=True)
+
+def test_consultas_filtradas_ordenadas_e_top_n(processos):
+    modulo, _ = psutil_falso(processos)
+    tabela = TabelaProcessos(intervalo=0, psutil_modulo=modulo)
+    tabela.atualizar()
+    processos[10]["cpu"] += 10.0
+    processos[11]["cpu"] += 20.0
+    assert [p["pid"] for p in tabela.consultar(limite=2)] == [11, 10]
+    tabela.intervalo = 60
+    assert [p["pid"] for p in tabela.consultar(filtro="PYTHON", ordenar_por="memoria_percent")] == [10, 11]
+    assert [p["pid"] for p in tabela.consultar(usuario="root")] == [11]
+    assert [p["nome"] for p in tabela.consultar(ordenar_por="nome", decrescente=False)] == ["init", "python", "Python3"]
+    assert [p["pid"] for p in tabela.consultar(min_cpu=15)] == [11]
+    with pytest.raises(ValueError):
+        tabela.consultar(ordenar_por="inexistente")
+
+def test_listar_processos_ordem_padrao_por_campo(processos, monkeypatch):
+    from agenteia.core.ferramentas import comandos
+    modulo, _ = psutil_falso(processos)
+    tabela = TabelaProcessos(intervalo=60, psutil_modulo=modulo)
+    monkeypatch.setattr(comandos, "obter_tabela", lambda: tabela)
+    pids = lambda saida: [int(pid) for pid in re.findall(r"PID: (\d+), CPU", saida)]
+    crescentes = sorted(processos)
+    assert pids(comandos.listar_processos(ordenar_por="pid", limite=2)) == crescentes[:2]
+    assert pids(comandos.listar_processos(ordenar_por="pid", limite=2, decrescente=True)) == crescentes[::-1][:2]
+    assert pids(comandos.listar_processos(ordenar_por="memoria_percent", limite=1)) == [10]
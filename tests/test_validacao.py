@@ -0,0 +1,90 @@
+import pytest
+
+from agenteia.core.exceptions import ValidationError
+from agenteia.core.ferramentas.validacao import compilar_schema
+
+SCHEMA = {
+    "id": {"tipo": "number", "obrigatorio": True, "min": 1},
+    "email": {"tipo": "string", "padrao": r"[^@]+@\w+\.\w+"},
+    "nota": {"tipo": "number", "max": 10},
+    "uf": {"obrigatorio": True},
+}
+
+def test_registro_isolado_usa_o_schema_compilado():
+    schema = compilar_schema(SCHEMA)
+    assert compilar_schema(dict(SCHEMA)) is schema
+    erros = schema.validar_registro({"id": 0, "email": "sem-arroba", "nota": "alta"})
+    assert erros == [
+        {"id": ["Valor menor que o mínimo permitido: 1"]},
+        {"email": [r"Valor não corresponde ao padrão esperado: [^@]+@\w+\.\w+"]},
+        {"nota": ["Tipo esperado: number"]},
+        {"uf": ["Campo obrigatório não encontrado"]},
+    ]
+    assert schema.validar_registro({"id": 3, "email": None, "uf": "SP"}) == []
+
+def test_schema_invalido():
+    with pytest.raises(ValidationError):
+        compilar_schema({"a": {"tipo": "data"}})
+    with pytest.raises(ValidationError):
+        compilar_schema({"a": {"padrao": "("}})
+    with pytest.raises(ValidationError):
+        compilar_schema({"a": {"min": "1"}})
+
+def test_mascaras_por_linha_no_dataframe():
+    pd = pytest.importorskip("pandas")
+    tabela = pd.DataFrame({
+        "id": [1, 0, None, 7],
+        "email": ["a@b.com", "ruim", "c@d.org", None],
+        "nota": [9.5, 11, 3, None],
+        "uf": ["SP", "RJ", None, "MG"],
+    })
+    resultado = compilar_schema(SCHEMA).validar_tabela(tabela)
+    assert resultado.invalidas.tolist() == [False, True, True, False]
+    assert resultado.mascaras["id"]["min"].tolist() == [False, True, False, False]
+    assert resultado.contagens() == {
+        "id": {"obrigatorio": 1, "min": 1}, "email": {"padrao": 1}, "nota": {"max": 1}, "uf": {"obrigatorio": 1},
+    }
+    assert resultado.erros_linha(2) == {
+        "id": ["Campo obrigatório não preenchido"], "uf": ["Campo obrigatório não preenchido"],
+    }
+
+def test_arquivo_em_lotes_soma_contagens(tmp_path):
+    pytest.importorskip("pandas")
+    from agenteia.core.ferramentas.validacao import ler_lotes
+    caminho = tmp_path / "dados.csv"
+    caminho.write_text("id,email,nota,uf\n" + "".join(f"{i},u{i}@x.com,{i % 12},SP\n" for i in range(25)))
+    relatorio = compilar_schema(SCHEMA).validar_lotes(ler_lotes(str(caminho), tamanho_lote=10), max_exemplos=2)
+    # id 0 fica abaixo do mínimo; notas 11 (i = 11 e 23) acima do máximo
+    assert relatorio.linhas == 25 and relatorio.linhas_invalidas == 3
+    assert relatorio.contagens == {"id": {"min": 1}, "nota": {"max": 2}}
+    assert [e["linha"] for e in relatorio.exemplos] == [0, 11]
+
+@pytest.mark.parametrize("tamanho_lote", [1, 2, 3, 10])
+def test_contagens_nao_dependem_do_tamanho_do_lote(tmp_path, tamanho_lote):
+    pytest.importorskip("pandas")
+    from agenteia.core.ferramentas.validacao import ler_lotes
+    caminho = tmp_path / "dados.csv"
+    caminho.write_text("valor,codigo\n10,01\n20,02\nabc,03\n40,x4\n")
+    schema = {"valor": {"tipo": "number", "max": 30}, "codigo": {"padrao": r"\d+$"}}
+    relatorio = compilar_schema(schema).validar_lotes(ler_lotes(str(caminho), tamanho_lote=tamanho_lote))
+    assert relatorio.contagens == {"valor": {"tipo": 1, "max": 1}, "codigo": {"padrao": 1}}
+
+@pytest.mark.parametrize("tamanho_lote", [1, 2, 3, 100])
+def test_chave_ausente_e_nula_nao_dependem_do_lote(tmp_path, tamanho_lote):
+    pytest.importorskip("pandas")
+    from agenteia.core.ferramentas.validacao import ler_lotes
+    caminho = tmp_path / "dados.jsonl"
+    caminho.write_text('{"id": 1}\n{"id": 2, "nome": "a"}\n{"id": 3, "nome": null}\n{"id": 4}\n')
+    schema = {"nome": {"tipo": "string", "obrigatorio": True}}
+    relatorio = compilar_schema(schema).validar_lotes(ler_lotes(str(caminho), tamanho_lote=tamanho_lote))
+    assert relatorio.contagens == {"nome": {"ausente": 2, "obrigatorio": 1}}
+    assert [e["linha"] for e in relatorio.exemplos] == [0, 2, 3]
+
+def test_tabela_arrow_equivale_ao_dataframe():
+    pd = pytest.importorskip("pandas")
+    pa = pytest.importorskip("pyarrow")
+    tabela = pd.DataFrame({"id": [1, 0, None], "email": ["a@b.com", "ruim", None], "nota": [1.0, 2.0, 30.0]})
+    schema = compilar_schema(SCHEMA)
+    arrow = schema.validar_tabela(pa.Table.from_pandas(tabela))
+    assert arrow.contagens() == schema.validar_tabela(tabela).contagens()
+    assert arrow.invalidas.tolist() == [True, True, True]
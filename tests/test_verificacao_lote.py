@@ -0,0 +1,114 @@
+import asyncio
+import shutil
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agenteia.core.ferramentas.cache import CacheResultados
+from agenteia.core.ferramentas.coleta_web import ColetorWeb
+from agenteia.core.ferramentas.verificacao_lote import CertificadoTLS, VerificacaoURL, VerificadorURLs
+
+class Servidor(BaseHTTPRequestHandler):
+    """Servidor HTTPS local: /ok com headers de segurança, /antigo redireciona, o resto é 404."""
+
+    def do_HEAD(self):
+        if self.path == "/antigo":
+            self.send_response(301)
+            self.send_header("Location", "/ok")
+        elif self.path == "/ok":
+            self.send_response(200)
+            self.send_header("Strict-Transport-Security", "max-age=63072000")
+            self.send_header("X-Frame-Options", "DENY")
+        else:
+            self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def certificado(tmp_path_factory):
+    if not shutil.which("openssl"):
+        pytest.skip("openssl não encontrado")
+    pasta = tmp_path_factory.mktemp("tls")
+    cert, chave = str(pasta / "cert.pem"), str(pasta / "chave.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "30", "-keyout", chave, "-out", cert,
+         "-subj", "/O=Teste Local/CN=localhost", "-addext", "subjectAltName=DNS:localhost"],
+        check=True, capture_output=True
+    )
+    return cert, chave
+
+@pytest.fixture(scope="module")
+def servidor(certificado):
+    http = ThreadingHTTPServer(("localhost", 0), Servidor)
+    contexto = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    contexto.load_cert_chain(*certificado)
+    http.socket = contexto.wrap_socket(http.socket, server_side=True)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    yield f"https://localhost:{http.server_address[1]}"
+    http.shutdown()
+
+@pytest.fixture
+def verificador(certificado):
+    coletor = ColetorWeb(intervalo_por_host=0)
+    verificador = VerificadorURLs(
+        coletor=coletor, contexto_ssl=ssl.create_default_context(cafile=certificado[0]), cache=CacheResultados()
+    )
+    yield verificador
+    coletor.fechar()
+
+def test_certificado_buscado_uma_vez_por_host(servidor, verificador, monkeypatch):
+    porta = int(servidor.rsplit(":", 1)[1])
+    chamadas = []
+    buscar = verificador._buscar_certificado
+    async def contar(host, porta):
+        chamadas.append(host)
+        return await buscar(host, porta)
+    monkeypatch.setattr(verificador, "_buscar_certificado", contar)
+
+    async def cenario():
+        return await asyncio.gather(*(verificador.certificado("localhost", porta) for _ in range(10)))
+    resultados = asyncio.run(cenario())
+    assert chamadas == ["localhost"]
+    assert all(r is resultados[0] for r in resultados)
+    assert resultados[0].valido and resultados[0].emissor == "Teste Local"
+    assert 28 <= resultados[0].dias_restantes <= 30 and resultados[0].versao_tls.startswith("TLS")
+    # Do cache (TTL), sem novo handshake
+    asyncio.run(verificador.certificado("localhost", porta))
+    assert chamadas == ["localhost"]
+
+def test_certificado_nao_confiavel(servidor):
+    porta = int(servidor.rsplit(":", 1)[1])
+    verificador = VerificadorURLs(coletor=ColetorWeb(), cache=CacheResultados())
+    resultado = asyncio.run(verificador.certificado("localhost", porta))
+    assert not resultado.valido and "self" in resultado.erro.lower()
+
+def test_linha_da_tabela_e_relatorio_de_seguranca():
+    resultado = VerificacaoURL(
+        "https://a.com/x", acessivel=True, status_code=200, redireciona=True, url_final="https://a.com/y",
+        tempo_ms=12.4, certificado=CertificadoTLS("a.com", 443, True, "Jan  1 00:00:00 2030 GMT", 400, "CA", "TLSv1.3"),
+        headers_seguranca={"X-Frame-Options": "DENY", "Content-Security-Policy": None}
+    )
+    assert resultado.linha() == (
+        "| https://a.com/x | 200 | 12 | válido, expira em 400 dia(s) | "
+        "redireciona para https://a.com/y; headers ausentes: Content-Security-Policy |"
+    )
+    relatorio = resultado.relatorio_seguranca()
+    assert relatorio["ssl"] and relatorio["certificado"]["emissor"] == "CA"
+    assert relatorio["vulnerabilidades"] == ["Header Content-Security-Policy ausente"]
+
+def test_lote_em_paralelo_com_cache(servidor, verificador):
+    pytest.importorskip("aiohttp")
+    urls = [f"{servidor}/ok", f"{servidor}/antigo", f"{servidor}/ausente", f"{servidor}/ok"]
+    resultados = {r.url: r for r in verificador.verificar(urls, seguranca=True)}
+    assert len(resultados) == 3
+    assert resultados[urls[0]].acessivel and resultados[urls[0]].certificado.valido
+    assert resultados[urls[0]].headers_seguranca["X-Frame-Options"] == "DENY"
+    assert resultados[urls[1]].redireciona and resultados[urls[1]].url_final == urls[0]
+    assert resultados[urls[2]].status_code == 404 and not resultados[urls[2]].acessivel
+    assert all(r.do_cache for r in verificador.verificar(urls[:2], seguranca=True))
@@ -1,6 +1,8 @@
-from flask import Flask, render_template, jsonify, request, send_file
+from flask import Flask, render_template, jsonify, request, send_file, Response
 from agenteia.core.agente import AgenteIA
 from agenteia.core.config import CONFIG
+from agenteia.core.metricas import gerar_metricas
+from agenteia.core.ferramentas.leitura import ler_intervalo
 import asyncio
 import threading
 import queue
@@ -69,6 +71,11 @@ def get_status():
         return jsonify({**modelo_status, "status_agente_detalhado": status_agente_detalhado})
     return jsonify(modelo_status)
 
+@app.route('/metrics')
+def metrics():
+    conteudo, tipo = gerar_metricas()
+    return Response(conteudo, mimetype=tipo)
+
 @app.route('/upload_arquivo', methods=['POST'])
 def upload_arquivo():
     if 'arquivo' not in request.files:
@@ -86,8 +93,11 @@ def upload_arquivo():
         os.makedirs('temp', exist_ok=True)
         arquivo.save(caminho_temporario)
 
-        with open(caminho_temporario, 'r', encoding='utf-8') as f:
-            file_content = f.read()
+        # Só o início do arquivo (dentro do orçamento de leitura) vai para o prompt
+        trecho = ler_intervalo(caminho_temporario)
+        file_content = trecho.texto
+        if trecho.truncado:
+            file_content += f"\n\n[... arquivo truncado: exibidos {trecho.fim} de {trecho.tamanho_arquivo} bytes]"
 
         prompt_com_conteudo_arquivo = f"Analise o seguinte conteúdo do arquivo '{filename}':\n\n{file_content}"
 